@@ -12,6 +12,7 @@ import sys
 from pathlib import Path
 
 from .render.ansi import build_screen_lines
+from .git_revision import GIT_DIFF_BASE_HEAD
 from .runtime import run_pager
 from .source_pane import SourcePane
 from .source_pane.highlighting import rendered_preview_row
@@ -36,7 +37,13 @@ def _default_render_width() -> int:
     return max(1, term.columns)
 
 
-def render_source_view(path: Path, style: str, no_color: bool, max_cols: int) -> str:
+def render_source_view(
+    path: Path,
+    style: str,
+    no_color: bool,
+    max_cols: int,
+    diff_base: str = GIT_DIFF_BASE_HEAD,
+) -> str:
     """Render source-pane rows for ``path`` using UI rendering code paths."""
     target = path.resolve()
     rendered_for_path = SourcePane.build_rendered_for_path(
@@ -47,6 +54,7 @@ def render_source_view(path: Path, style: str, no_color: bool, max_cols: int) ->
         dir_skip_gitignored=True,
         prefer_git_diff=True,
         dir_show_size_labels=True,
+        diff_base=diff_base,
     )
     text_lines = build_screen_lines(rendered_for_path.text, max_cols, wrap=False)
     out: list[str] = []
@@ -102,6 +110,12 @@ def main(default_path: Path | None = None) -> None:
         default=None,
         help="Column width for --render output (default: terminal width).",
     )
+    parser.add_argument(
+        "--diff-base",
+        metavar="REV",
+        default=None,
+        help="Git revision to diff against: branch, commit, or merge-base[:BRANCH] (default: HEAD).",
+    )
     args = parser.parse_args()
 
     if args.render is not None:
@@ -111,7 +125,15 @@ def main(default_path: Path | None = None) -> None:
         if not render_path.exists():
             raise SystemExit(f"Path not found: {render_path}")
         max_cols = args.max_cols if args.max_cols is not None else _default_render_width()
-        sys.stdout.write(render_source_view(render_path, args.style, args.no_color, max_cols))
+        sys.stdout.write(
+            render_source_view(
+                render_path,
+                args.style,
+                args.no_color,
+                max_cols,
+                diff_base=args.diff_base or GIT_DIFF_BASE_HEAD,
+            )
+        )
         return
 
     if default_path is None:
@@ -131,6 +153,7 @@ def main(default_path: Path | None = None) -> None:
         args.nopager,
         args.theme,
         workspace_paths=raw_paths,
+        diff_base=args.diff_base,
     )
 
 
@@ -2,7 +2,8 @@
 
 This package contains non-UI tree primitives:
 - file/directory entry datatypes with nested children
-- filesystem scanning/build helpers
+- filesystem scanning/build helpers over a shared per-directory listing cache
+- a canonical-path cache invalidated by the tree watcher
 - watch-signature hooks for fs/git change detection
 - snapshot refresh helpers keyed by watch signatures
 """
@@ -15,12 +16,32 @@ from .fs import (
     build_file_tree,
     list_directory_children,
     maybe_gitignore_matcher,
+    normalize_expanded_paths,
+    prefetch_directory_listings,
+    refresh_file_tree,
     safe_file_size,
     safe_mtime_ns,
 )
+from .listing import (
+    DirectoryListing,
+    cached_directory_listing,
+    cached_directory_listings,
+    clear_directory_listing_cache,
+    invalidate_directory_listing,
+    restat_directory_listing_file,
+    restat_directory_listing_files,
+)
+from .paths import canonical_path, clear_canonical_path_cache, invalidate_canonical_paths
 from .snapshot import FileTreeSnapshot, build_file_tree_snapshot, refresh_file_tree_snapshot
-from .watch import build_git_watch_signature, build_tree_watch_signature, resolve_git_paths
-from .doc_summary import cached_top_file_doc_summary, clear_doc_summary_cache, top_file_doc_summary
+from .watch import build_git_watch_signature, build_tree_watch_signature, resolve_git_paths, stat_tree_hot_paths
+from .doc_summary import (
+    cached_top_file_doc_summary,
+    clear_doc_summary_cache,
+    load_doc_summary_store,
+    lookup_cached_top_file_doc_summary,
+    save_doc_summary_store,
+    top_file_doc_summary,
+)
 
 __all__ = [
     "DirectoryEntry",
@@ -31,14 +52,31 @@ __all__ = [
     "safe_mtime_ns",
     "maybe_gitignore_matcher",
     "list_directory_children",
+    "normalize_expanded_paths",
+    "prefetch_directory_listings",
     "build_file_tree",
+    "DirectoryListing",
+    "cached_directory_listing",
+    "cached_directory_listings",
+    "clear_directory_listing_cache",
+    "invalidate_directory_listing",
+    "restat_directory_listing_file",
+    "restat_directory_listing_files",
+    "refresh_file_tree",
+    "canonical_path",
+    "clear_canonical_path_cache",
+    "invalidate_canonical_paths",
     "FileTreeSnapshot",
     "build_file_tree_snapshot",
     "refresh_file_tree_snapshot",
     "build_tree_watch_signature",
+    "stat_tree_hot_paths",
     "build_git_watch_signature",
     "resolve_git_paths",
     "top_file_doc_summary",
     "cached_top_file_doc_summary",
     "clear_doc_summary_cache",
+    "load_doc_summary_store",
+    "lookup_cached_top_file_doc_summary",
+    "save_doc_summary_store",
 ]
@@ -1,16 +1,32 @@
-"""Top-of-file one-line summary extraction with small metadata cache."""
+"""Top-of-file one-line summary extraction with small metadata cache.
+
+Summaries are cached by ``(resolved path, mtime_ns, size)``, so a hit only
+costs a ``stat``. The app loads the cache from ``DOC_SUMMARY_STORE_PATH`` at
+startup and writes it back on exit (``load_doc_summary_store`` /
+``save_doc_summary_store``), so directory previews of folders seen in an
+earlier session render doc labels without reading file contents. The store
+holds the same ``DOC_SUMMARY_CACHE_MAX`` most recently used entries as the
+in-memory LRU; entries whose file changed simply never match again.
+"""
 
 from __future__ import annotations
 
 from collections import OrderedDict
+import json
+import os
 from pathlib import Path
 import re
+import tempfile
 import threading
 
+from platformdirs import user_cache_dir
+
 DOC_SUMMARY_READ_BYTES = 4_096
 DOC_SUMMARY_MAX_FILE_BYTES = 256 * 1024
 DOC_SUMMARY_MAX_CHARS = 96
 DOC_SUMMARY_CACHE_MAX = 4_096
+DOC_SUMMARY_STORE_VERSION = 1
+DOC_SUMMARY_STORE_PATH = Path(user_cache_dir("lazyviewer", appauthor=False)) / "doc_summaries.json"
 
 _CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
 _CODING_COOKIE_RE = re.compile(r"^#.*coding[:=]\s*[-\w.]+")
@@ -19,6 +35,7 @@ _LINE_COMMENT_PREFIXES = ("#", "//", "--", ";")
 _DOC_SUMMARY_CACHE: OrderedDict[tuple[str, int, int], str | None] = OrderedDict()
 _DOC_SUMMARY_CACHE_LOCK = threading.RLock()
 _CACHE_MISS = object()
+_DOC_SUMMARY_CACHE_DIRTY = False
 
 
 def _sanitize_terminal_text(source: str) -> str:
@@ -164,6 +181,19 @@ def _doc_summary_cache_key(path: Path, size_bytes: int | None) -> tuple[str, int
     return str(resolved), int(stat.st_mtime_ns), size
 
 
+def lookup_cached_top_file_doc_summary(path: Path, size_bytes: int | None) -> tuple[bool, str | None]:
+    """Return ``(hit, summary)`` from the cache alone, never reading ``path``."""
+    cache_key = _doc_summary_cache_key(path, size_bytes)
+    if cache_key is None:
+        return False, None
+    with _DOC_SUMMARY_CACHE_LOCK:
+        cached = _DOC_SUMMARY_CACHE.get(cache_key, _CACHE_MISS)
+        if cached is _CACHE_MISS:
+            return False, None
+        _DOC_SUMMARY_CACHE.move_to_end(cache_key)
+        return True, cached
+
+
 def cached_top_file_doc_summary(path: Path, size_bytes: int | None) -> str | None:
     """Return cached top-of-file summary for ``path`` when possible."""
     cache_key = _doc_summary_cache_key(path, size_bytes)
@@ -177,23 +207,107 @@ def cached_top_file_doc_summary(path: Path, size_bytes: int | None) -> str | Non
     summary = top_file_doc_summary(path, size_bytes)
 
     if cache_key is not None:
+        global _DOC_SUMMARY_CACHE_DIRTY
         with _DOC_SUMMARY_CACHE_LOCK:
             _DOC_SUMMARY_CACHE[cache_key] = summary
             _DOC_SUMMARY_CACHE.move_to_end(cache_key)
             while len(_DOC_SUMMARY_CACHE) > DOC_SUMMARY_CACHE_MAX:
                 _DOC_SUMMARY_CACHE.popitem(last=False)
+            _DOC_SUMMARY_CACHE_DIRTY = True
 
     return summary
 
 
 def clear_doc_summary_cache() -> None:
     """Clear in-memory top-of-file summary cache."""
+    global _DOC_SUMMARY_CACHE_DIRTY
     with _DOC_SUMMARY_CACHE_LOCK:
         _DOC_SUMMARY_CACHE.clear()
+        _DOC_SUMMARY_CACHE_DIRTY = False
+
+
+def load_doc_summary_store(path: Path | None = None) -> int:
+    """Merge summaries persisted at ``path`` into the cache; return entries added.
+
+    Missing, unreadable, or malformed stores are ignored. Entries already in
+    the cache win, and loaded ones rank as least recently used.
+    """
+    store_path = DOC_SUMMARY_STORE_PATH if path is None else path
+    try:
+        data = json.loads(store_path.read_text(encoding="utf-8"))
+    except Exception:
+        return 0
+    if not isinstance(data, dict) or data.get("version") != DOC_SUMMARY_STORE_VERSION:
+        return 0
+    raw_entries = data.get("entries")
+    if not isinstance(raw_entries, list):
+        return 0
+
+    loaded: OrderedDict[tuple[str, int, int], str | None] = OrderedDict()
+    for raw in raw_entries[-DOC_SUMMARY_CACHE_MAX:]:
+        if not isinstance(raw, list) or len(raw) != 4:
+            continue
+        raw_path, mtime_ns, size, summary = raw
+        if (
+            not isinstance(raw_path, str)
+            or isinstance(mtime_ns, bool)
+            or not isinstance(mtime_ns, int)
+            or isinstance(size, bool)
+            or not isinstance(size, int)
+            or not (summary is None or isinstance(summary, str))
+        ):
+            continue
+        # The store lives outside the repo; never trust it with terminal bytes.
+        loaded[(raw_path, mtime_ns, size)] = _normalize_doc_summary(summary) if summary is not None else None
+
+    added = 0
+    with _DOC_SUMMARY_CACHE_LOCK:
+        for key, summary in reversed(loaded.items()):
+            if len(_DOC_SUMMARY_CACHE) >= DOC_SUMMARY_CACHE_MAX:
+                break
+            if key in _DOC_SUMMARY_CACHE:
+                continue
+            _DOC_SUMMARY_CACHE[key] = summary
+            _DOC_SUMMARY_CACHE.move_to_end(key, last=False)
+            added += 1
+    return added
+
+
+def save_doc_summary_store(path: Path | None = None) -> bool:
+    """Persist the cache to ``path`` when it changed; return whether it was written.
+
+    Written atomically (temp file + rename), least recently used first.
+    Filesystem errors are ignored so shutdown never fails on a cache write.
+    """
+    global _DOC_SUMMARY_CACHE_DIRTY
+    store_path = DOC_SUMMARY_STORE_PATH if path is None else path
+    with _DOC_SUMMARY_CACHE_LOCK:
+        if not _DOC_SUMMARY_CACHE_DIRTY:
+            return False
+        entries = [[key[0], key[1], key[2], summary] for key, summary in _DOC_SUMMARY_CACHE.items()]
+        _DOC_SUMMARY_CACHE_DIRTY = False
+
+    payload = json.dumps({"version": DOC_SUMMARY_STORE_VERSION, "entries": entries}, separators=(",", ":"))
+    try:
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{store_path.name}.", dir=store_path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, store_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except Exception:
+        return False
+    return True
 
 
 __all__ = [
     "top_file_doc_summary",
     "cached_top_file_doc_summary",
+    "lookup_cached_top_file_doc_summary",
     "clear_doc_summary_cache",
+    "load_doc_summary_store",
+    "save_doc_summary_store",
 ]
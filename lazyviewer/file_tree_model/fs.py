@@ -2,27 +2,15 @@
 
 from __future__ import annotations
 
-import os
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import replace
 from pathlib import Path
 
 from ..gitignore import get_gitignore_matcher
 from .doc_summary import cached_top_file_doc_summary
-from .types import DirectoryEntry, FileEntry
-
-
-@dataclass(frozen=True)
-class DirectoryChild:
-    """One visible directory child row plus cached metadata."""
-
-    name: str
-    path: Path
-    is_dir: bool
-    file_size: int | None
-    mtime_ns: int | None
-    git_status_flags: int = 0
-    doc_summary: str | None = None
+from .listing import DirectoryListing, cached_directory_listing, cached_directory_listings
+from .paths import canonical_path
+from .types import DirectoryChild, DirectoryEntry, FileEntry
 
 
 def safe_file_size(path: Path, is_dir: bool) -> int | None:
@@ -50,105 +38,131 @@ def maybe_gitignore_matcher(root: Path, skip_gitignored: bool) -> object | None:
     return get_gitignore_matcher(root)
 
 
+def _visible_children(
+    directory: Path,
+    listing: DirectoryListing,
+    show_hidden: bool,
+    ignore_matcher: object | None,
+) -> list[DirectoryChild]:
+    """Return the children of a resolved ``directory`` listing that are shown."""
+    visible = [child for child in listing.children if show_hidden or not child.name.startswith(".")]
+    if ignore_matcher is not None and visible:
+        # One batch check per listing instead of resolving each child.
+        kept_names = set(
+            ignore_matcher.filter_children(
+                directory,
+                [child.name for child in visible],
+                {child.name for child in visible if child.is_dir},
+            )
+        )
+        visible = [child for child in visible if child.name in kept_names]
+    return visible
+
+
 def list_directory_children(
     directory: Path,
     show_hidden: bool,
     ignore_matcher: object | None = None,
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
     include_doc_summaries: bool = False,
+    refresh: bool = False,
+    listing: DirectoryListing | None = None,
 ) -> tuple[list[DirectoryChild], Exception | None, int | None]:
     """List visible children with stat/git/doc metadata and sorted order.
 
+    The scan itself comes from the shared listing cache, so it only hits
+    the filesystem when the directory mtime moved or ``refresh`` is set.
+    ``listing`` supplies a scan fetched earlier (see
+    ``prefetch_directory_listings``) and skips the cache lookup.
+
     Returns ``(children, scan_error, directory_mtime_ns)``. ``scan_error`` is
     set when the directory cannot be scanned.
     """
-    try:
-        resolved_directory = directory.resolve()
-    except Exception:
-        resolved_directory = directory
+    resolved_directory = canonical_path(directory)
+    if listing is None:
+        listing = cached_directory_listing(resolved_directory, refresh=refresh)
+    if listing.scan_error is not None:
+        return [], listing.scan_error, listing.mtime_ns
+
+    visible = _visible_children(resolved_directory, listing, show_hidden, ignore_matcher)
 
-    directory_mtime_ns = safe_mtime_ns(resolved_directory)
-    children: list[DirectoryChild] = []
     summary_provider = doc_summary_for_path
     if summary_provider is None and include_doc_summaries:
         summary_provider = cached_top_file_doc_summary
+    if not git_status_overlay and summary_provider is None:
+        return visible, None, listing.mtime_ns
 
-    try:
-        with os.scandir(directory) as entries:
-            for child in entries:
-                name = child.name
-                if not show_hidden and name.startswith("."):
-                    continue
-                child_path = Path(child.path)
-                if ignore_matcher is not None and ignore_matcher.is_ignored(child_path):
+    children: list[DirectoryChild] = []
+    for child in visible:
+        # Overlay keys are canonical paths and cached children already hang
+        # off the resolved directory.
+        git_status_flags = int(git_status_overlay.get(child.path, 0)) if git_status_overlay else 0
+        doc_summary: str | None = None
+        if not child.is_dir and summary_provider is not None:
+            try:
+                doc_summary = summary_provider(child.path, child.file_size)
+            except Exception:
+                doc_summary = None
+        if git_status_flags or doc_summary is not None:
+            child = replace(child, git_status_flags=git_status_flags, doc_summary=doc_summary)
+        children.append(child)
+    return children, None, listing.mtime_ns
+
+
+def prefetch_directory_listings(
+    root: Path,
+    show_hidden: bool,
+    expanded: Collection[Path] | None = None,
+    ignore_matcher: object | None = None,
+    max_depth: int | None = None,
+    max_entries: int | None = None,
+) -> dict[Path, DirectoryListing]:
+    """Fetch listings of a resolved ``root`` and the directories shown below it.
+
+    The tree is walked one level at a time and each level's directories are
+    listed concurrently, so callers can assemble output serially (and in a
+    deterministic order) from the returned map, keyed by resolved path.
+    Only directories in ``expanded`` (resolved paths) are descended into, or
+    every visible directory when ``expanded`` is ``None``. ``max_depth``
+    caps the level listed (``root`` is level 0) and descent stops once
+    ``max_entries`` visible entries have been seen.
+    """
+    listings: dict[Path, DirectoryListing] = {}
+    level = [root]
+    depth = 0
+    seen_entries = 0
+    while level:
+        listings.update(zip(level, cached_directory_listings(level)))
+        if max_depth is not None and depth >= max_depth:
+            break
+        next_level: list[Path] = []
+        for directory in level:
+            listing = listings[directory]
+            if listing.scan_error is not None:
+                continue
+            visible = _visible_children(directory, listing, show_hidden, ignore_matcher)
+            seen_entries += len(visible)
+            for child in visible:
+                if not child.is_dir:
                     continue
-
-                try:
-                    is_dir = child.is_dir(follow_symlinks=False)
-                except OSError:
-                    is_dir = False
-
-                file_size: int | None = None
-                mtime_ns: int | None = None
-                try:
-                    stat = child.stat(follow_symlinks=False)
-                    mtime_ns = int(stat.st_mtime_ns)
-                    if not is_dir:
-                        file_size = int(stat.st_size)
-                except OSError:
-                    pass
-
-                if git_status_overlay is not None:
-                    try:
-                        resolved_child = child_path.resolve()
-                    except Exception:
-                        resolved_child = child_path
-                    git_status_flags = int(
-                        git_status_overlay.get(
-                            resolved_child,
-                            git_status_overlay.get(child_path, 0),
-                        )
-                    )
-                else:
-                    git_status_flags = 0
-
-                doc_summary: str | None = None
-                if not is_dir and summary_provider is not None:
-                    try:
-                        doc_summary = summary_provider(child_path, file_size)
-                    except Exception:
-                        doc_summary = None
-
-                children.append(
-                    DirectoryChild(
-                        name=name,
-                        path=child_path,
-                        is_dir=is_dir,
-                        file_size=file_size,
-                        mtime_ns=mtime_ns,
-                        git_status_flags=git_status_flags,
-                        doc_summary=doc_summary,
-                    )
-                )
-    except (PermissionError, OSError) as exc:
-        return [], exc, directory_mtime_ns
-
-    children.sort(key=lambda item: (not item.is_dir, item.name.lower()))
-    return children, None, directory_mtime_ns
-
-
-def _normalize_expanded(root: Path, expanded: set[Path]) -> set[Path]:
-    """Normalize expanded paths and keep only entries under ``root``."""
+                child_path = child.path
+                if (expanded is None or child_path in expanded) and child_path not in listings:
+                    next_level.append(child_path)
+        if max_entries is not None and seen_entries >= max_entries:
+            break
+        level = next_level
+        depth += 1
+    return listings
+
+
+def normalize_expanded_paths(root: Path, expanded: Collection[Path]) -> set[Path]:
+    """Canonicalize expanded paths and keep only entries under ``root``."""
     normalized: set[Path] = set()
     for raw_path in expanded:
-        try:
-            resolved = raw_path.resolve()
-        except Exception:
-            continue
-        if not resolved.is_relative_to(root):
-            continue
-        normalized.add(resolved)
+        resolved = canonical_path(raw_path)
+        if resolved.is_relative_to(root):
+            normalized.add(resolved)
     return normalized
 
 
@@ -157,13 +171,13 @@ def build_file_tree(
     expanded: set[Path],
     show_hidden: bool,
     skip_gitignored: bool = False,
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
     include_doc_summaries: bool = False,
 ) -> DirectoryEntry:
     """Build a domain file-tree rooted at ``root`` honoring expansion state."""
-    root = root.resolve()
-    expanded_resolved = _normalize_expanded(root, expanded)
+    root = canonical_path(root)
+    expanded_resolved = normalize_expanded_paths(root, expanded)
     root_entry = DirectoryEntry(
         path=root,
         mtime_ns=safe_mtime_ns(root),
@@ -171,6 +185,14 @@ def build_file_tree(
         children=(),
     )
     ignore_matcher = maybe_gitignore_matcher(root, skip_gitignored)
+    listings: dict[Path, DirectoryListing] = {}
+    if root in expanded_resolved:
+        listings = prefetch_directory_listings(
+            root,
+            show_hidden,
+            expanded=expanded_resolved,
+            ignore_matcher=ignore_matcher,
+        )
 
     def build_children(directory: Path) -> tuple[DirectoryEntry | FileEntry, ...]:
         children, scan_error, _directory_mtime_ns = list_directory_children(
@@ -180,6 +202,7 @@ def build_file_tree(
             git_status_overlay=git_status_overlay,
             doc_summary_for_path=doc_summary_for_path,
             include_doc_summaries=include_doc_summaries,
+            listing=listings.get(directory),
         )
         if scan_error is not None:
             return ()
@@ -193,11 +216,9 @@ def build_file_tree(
                     git_status_flags=child.git_status_flags,
                     children=(),
                 )
-                try:
-                    resolved_child = child.path.resolve()
-                except Exception:
-                    resolved_child = child.path
-                if resolved_child in expanded_resolved:
+                # Children of a canonical directory that are not symlinks
+                # are canonical themselves.
+                if child.path in expanded_resolved:
                     child_entry = DirectoryEntry(
                         path=child.path,
                         mtime_ns=child.mtime_ns,
@@ -209,7 +230,8 @@ def build_file_tree(
 
             nodes.append(
                 FileEntry(
-                    path=child.path,
+                    parent=child.parent,
+                    name=child.name,
                     file_size=child.file_size,
                     mtime_ns=child.mtime_ns,
                     git_status_flags=child.git_status_flags,
@@ -228,11 +250,159 @@ def build_file_tree(
     return root_entry
 
 
+def _with_git_flags(
+    node: DirectoryEntry | FileEntry,
+    git_status_overlay: Mapping[Path, int] | None,
+) -> DirectoryEntry | FileEntry:
+    """Return ``node`` with overlay flags re-applied, reusing it when unchanged."""
+    flags = int(git_status_overlay.get(node.path, 0)) if git_status_overlay else 0
+    if isinstance(node, FileEntry):
+        if flags == node.git_status_flags:
+            return node
+        return replace(node, git_status_flags=flags)
+    children = tuple(_with_git_flags(child, git_status_overlay) for child in node.children)
+    if flags == node.git_status_flags and all(new is old for new, old in zip(children, node.children)):
+        return node
+    return DirectoryEntry(path=node.path, mtime_ns=node.mtime_ns, git_status_flags=flags, children=children)
+
+
+def refresh_file_tree(
+    previous: DirectoryEntry,
+    expanded: set[Path],
+    previous_expanded: Collection[Path],
+    show_hidden: bool,
+    skip_gitignored: bool = False,
+    git_status_overlay: Mapping[Path, int] | None = None,
+    doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
+    include_doc_summaries: bool = False,
+    changed_dirs: Collection[Path] = (),
+    reapply_git_flags: bool = False,
+    previous_ignore_matcher: object | None = None,
+) -> tuple[DirectoryEntry, frozenset[Path]]:
+    """Refresh a tree built by ``build_file_tree`` rescanning only changed dirs.
+
+    An expanded directory is listed again only when its mtime differs from
+    the one recorded in ``previous``, it was collapsed in
+    ``previous_expanded`` (resolved paths), or it is in ``changed_dirs``;
+    event watchers report in-place file writes there, which leave directory
+    mtimes alone. Unchanged subtrees are returned as the same
+    ``DirectoryEntry`` objects, so callers can skip them by identity.
+    ``reapply_git_flags`` re-reads overlay flags for reused entries without
+    touching the filesystem.
+
+    ``show_hidden`` and ``skip_gitignored`` must match the settings
+    ``previous`` was built with. Reused subtrees keep the ignore filtering
+    they were built with, so with ``skip_gitignored`` the tree is rebuilt
+    from scratch unless the current gitignore matcher is
+    ``previous_ignore_matcher`` (the one ``previous`` was built with, as
+    returned by ``maybe_gitignore_matcher`` before building). A new matcher
+    means some rule file or the index changed. Returns
+    ``(root_entry, rescanned_dirs)``.
+    """
+    root = previous.path
+    expanded_resolved = normalize_expanded_paths(root, expanded)
+    ignore_matcher = maybe_gitignore_matcher(root, skip_gitignored)
+    if ignore_matcher is not previous_ignore_matcher:
+        rebuilt = build_file_tree(
+            root,
+            expanded_resolved,
+            show_hidden,
+            skip_gitignored=skip_gitignored,
+            git_status_overlay=git_status_overlay,
+            doc_summary_for_path=doc_summary_for_path,
+            include_doc_summaries=include_doc_summaries,
+        )
+        return rebuilt, frozenset(expanded_resolved)
+    changed = {canonical_path(path) for path in changed_dirs}
+    rescanned: set[Path] = set()
+
+    def rescan(directory: Path, previous_children: tuple[DirectoryEntry | FileEntry, ...]) -> tuple:
+        rescanned.add(directory)
+        children, scan_error, _directory_mtime_ns = list_directory_children(
+            directory,
+            show_hidden,
+            ignore_matcher=ignore_matcher,
+            git_status_overlay=git_status_overlay,
+            doc_summary_for_path=doc_summary_for_path,
+            include_doc_summaries=include_doc_summaries,
+            refresh=directory in changed,
+        )
+        if scan_error is not None:
+            return ()
+        previous_dirs = {child.path: child for child in previous_children if isinstance(child, DirectoryEntry)}
+        nodes: list[DirectoryEntry | FileEntry] = []
+        for child in children:
+            if child.is_dir:
+                nodes.append(refresh_directory(child.path, child.mtime_ns, child.git_status_flags, previous_dirs.get(child.path)))
+                continue
+            nodes.append(
+                FileEntry(
+                    parent=child.parent,
+                    name=child.name,
+                    file_size=child.file_size,
+                    mtime_ns=child.mtime_ns,
+                    git_status_flags=child.git_status_flags,
+                    doc_summary=child.doc_summary,
+                )
+            )
+        return tuple(nodes)
+
+    def refresh_directory(
+        directory: Path,
+        mtime_ns: int | None,
+        git_status_flags: int,
+        previous_entry: DirectoryEntry | None,
+    ) -> DirectoryEntry:
+        if directory not in expanded_resolved:
+            children: tuple = ()
+        elif (
+            previous_entry is None
+            or directory not in previous_expanded
+            or directory in changed
+            or mtime_ns is None
+            or mtime_ns != previous_entry.mtime_ns
+        ):
+            previous_children = previous_entry.children if previous_entry is not None and directory in previous_expanded else ()
+            children = rescan(directory, previous_children)
+        else:
+            nodes: list[DirectoryEntry | FileEntry] = []
+            for child in previous_entry.children:
+                if isinstance(child, DirectoryEntry):
+                    child_flags = child.git_status_flags
+                    if reapply_git_flags:
+                        child_flags = int(git_status_overlay.get(child.path, 0)) if git_status_overlay else 0
+                    # Directory mtimes are only worth a stat when the child is expanded.
+                    child_mtime = safe_mtime_ns(child.path) if child.path in expanded_resolved else child.mtime_ns
+                    nodes.append(refresh_directory(child.path, child_mtime, child_flags, child))
+                elif reapply_git_flags:
+                    nodes.append(_with_git_flags(child, git_status_overlay))
+                else:
+                    nodes.append(child)
+            children = tuple(nodes)
+
+        if (
+            previous_entry is not None
+            and previous_entry.mtime_ns == mtime_ns
+            and previous_entry.git_status_flags == git_status_flags
+            and len(children) == len(previous_entry.children)
+            and all(new is old for new, old in zip(children, previous_entry.children))
+        ):
+            return previous_entry
+        return DirectoryEntry(path=directory, mtime_ns=mtime_ns, git_status_flags=git_status_flags, children=children)
+
+    root_flags = int(git_status_overlay.get(root, 0)) if git_status_overlay is not None else 0
+    root_entry = refresh_directory(root, safe_mtime_ns(root), root_flags, previous)
+    return root_entry, frozenset(rescanned)
+
+
 __all__ = [
     "DirectoryChild",
     "safe_file_size",
     "safe_mtime_ns",
     "maybe_gitignore_matcher",
     "list_directory_children",
+    "normalize_expanded_paths",
+    "prefetch_directory_listings",
     "build_file_tree",
+    "refresh_file_tree",
 ]
@@ -0,0 +1,209 @@
+"""Minimal Linux inotify binding via ``ctypes`` for event-driven watches.
+
+Only the handful of calls needed by the watch helpers are bound. Every entry
+point degrades to ``None``/``False`` on non-Linux platforms, missing libc
+symbols, or exhausted inotify limits so callers can fall back to stat polling.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import struct
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Mask used for directory watches whose entries we care about.
+DIRECTORY_ENTRY_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_CHUNK_BYTES = 64 * 1024
+
+_LIBC: ctypes.CDLL | None = None
+_LIBC_LOADED = False
+
+
+@dataclass(frozen=True)
+class InotifyEvent:
+    """One decoded ``struct inotify_event`` record."""
+
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    """Return libc handle exposing inotify symbols, or ``None``."""
+    global _LIBC, _LIBC_LOADED
+    if _LIBC_LOADED:
+        return _LIBC
+    _LIBC_LOADED = True
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        libc.inotify_rm_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    _LIBC = libc
+    return libc
+
+
+def inotify_available() -> bool:
+    """Return whether inotify can be used on this platform."""
+    return _load_libc() is not None
+
+
+def decode_events(buffer: bytes) -> list[InotifyEvent]:
+    """Decode a raw inotify read buffer into events."""
+    events: list[InotifyEvent] = []
+    offset = 0
+    header_size = _EVENT_HEADER.size
+    while offset + header_size <= len(buffer):
+        wd, mask, cookie, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+        offset += header_size
+        raw_name = buffer[offset : offset + name_len]
+        offset += name_len
+        name = os.fsdecode(raw_name.split(b"\0", 1)[0])
+        events.append(InotifyEvent(wd=wd, mask=mask, cookie=cookie, name=name))
+    return events
+
+
+class InotifyWatcher:
+    """Non-blocking inotify file descriptor with watch bookkeeping.
+
+    ``add_watch`` returns ``None`` instead of raising so callers can detect
+    ``ENOSPC`` (watch limit reached) and switch to polling.
+    """
+
+    def __init__(self, fd: int, libc: ctypes.CDLL) -> None:
+        self._fd = fd
+        self._libc = libc
+        self.paths_by_wd: dict[int, Path] = {}
+        self.last_error: int | None = None
+
+    @classmethod
+    def create(cls) -> InotifyWatcher | None:
+        """Open a new inotify instance, or return ``None`` when unsupported."""
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        return cls(fd, libc)
+
+    @property
+    def closed(self) -> bool:
+        return self._fd < 0
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def add_watch(self, path: Path, mask: int = DIRECTORY_ENTRY_MASK) -> int | None:
+        """Watch ``path`` and return its watch descriptor, or ``None`` on failure."""
+        if self._fd < 0:
+            return None
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            self.last_error = ctypes.get_errno()
+            return None
+        self.paths_by_wd[wd] = path
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        """Stop watching ``wd``; unknown descriptors are ignored."""
+        if self._fd < 0 or self.paths_by_wd.pop(wd, None) is None:
+            return
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def limit_reached(self) -> bool:
+        """Return whether the last ``add_watch`` failed on the watch limit."""
+        return self.last_error == errno.ENOSPC
+
+    def read_events(self) -> list[InotifyEvent]:
+        """Drain all queued events without blocking."""
+        if self._fd < 0:
+            return []
+        events: list[InotifyEvent] = []
+        while True:
+            try:
+                chunk = os.read(self._fd, _READ_CHUNK_BYTES)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not chunk:
+                break
+            events.extend(decode_events(chunk))
+        for event in events:
+            if event.mask & IN_IGNORED:
+                self.paths_by_wd.pop(event.wd, None)
+        return events
+
+    def close(self) -> None:
+        """Close the inotify descriptor and drop all watches."""
+        if self._fd < 0:
+            return
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+        self._fd = -1
+        self.paths_by_wd.clear()
+
+
+__all__ = [
+    "IN_ATTRIB",
+    "IN_CLOSE_WRITE",
+    "IN_CREATE",
+    "IN_DELETE",
+    "IN_DELETE_SELF",
+    "IN_IGNORED",
+    "IN_ISDIR",
+    "IN_MODIFY",
+    "IN_MOVED_FROM",
+    "IN_MOVED_TO",
+    "IN_MOVE_SELF",
+    "IN_Q_OVERFLOW",
+    "DIRECTORY_ENTRY_MASK",
+    "InotifyEvent",
+    "InotifyWatcher",
+    "decode_events",
+    "inotify_available",
+]
@@ -0,0 +1,268 @@
+"""Shared per-directory listing cache keyed by directory path and mtime.
+
+The tree builder, the directory preview, and the polling watch signature all
+need the same ``scandir`` + ``stat`` pass over a directory. This module keeps
+one raw listing per directory (every entry, hidden ones included, sorted,
+without git or doc metadata) and hands it to all three, so a directory is
+scanned once per change instead of once per consumer.
+
+Directory mtimes move when entries are added, removed, or renamed, but not
+when a file is rewritten in place. Consumers that learn about such writes
+either re-stat the cached files (``restat_directory_listing_files``) or drop
+the listing (``invalidate_directory_listing``).
+
+Directories with at least ``DIRECTORY_LISTING_LAZY_STAT_MIN_ENTRIES``
+entries are listed from ``scandir`` alone: file sizes and mtimes are left
+``None`` for consumers to fill with ``stat_file_metadata`` for the rows they
+actually show.
+
+``cached_directory_listings`` lists several directories at once on a small
+shared thread pool, which hides per-directory latency on slow (e.g.
+network) filesystems.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+import os
+from pathlib import Path
+import threading
+import time
+
+from .types import DirectoryChild
+
+DIRECTORY_LISTING_CACHE_MAX = 2_048
+DIRECTORY_LISTING_LAZY_STAT_MIN_ENTRIES = 5_000
+# A listing scanned within this window of the directory's mtime may have
+# missed a change landing in the same timestamp tick, so it is not reused.
+DIRECTORY_LISTING_RACY_WINDOW_NS = 1_000_000_000
+DIRECTORY_SCAN_MAX_WORKERS = 8
+_DIRECTORY_SCAN_THREAD_PREFIX = "lazyviewer-dir-scan"
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Raw scan of one directory as of ``mtime_ns``."""
+
+    mtime_ns: int | None
+    children: tuple[DirectoryChild, ...] = ()
+    scan_error: OSError | None = None
+    stable: bool = False
+    stats_deferred: bool = False
+
+
+_DIRECTORY_LISTING_CACHE: OrderedDict[Path, DirectoryListing] = OrderedDict()
+_DIRECTORY_LISTING_CACHE_LOCK = threading.RLock()
+_SCAN_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def stat_file_metadata(path: Path | str) -> tuple[int | None, int | None]:
+    """Return ``(size, mtime_ns)`` of ``path`` without following symlinks."""
+    try:
+        stat = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None, None
+    return int(stat.st_size), int(stat.st_mtime_ns)
+
+
+def _scan_directory(directory: Path, mtime_ns: int | None) -> DirectoryListing:
+    """List ``directory`` with one ``scandir`` pass and per-entry ``lstat``.
+
+    Files of very large directories are not stat'ed; see module docs.
+    """
+    children: list[DirectoryChild] = []
+    try:
+        with os.scandir(directory) as entries:
+            scanned = list(entries)
+    except OSError as exc:
+        return DirectoryListing(mtime_ns=mtime_ns, scan_error=exc)
+
+    stats_deferred = len(scanned) >= DIRECTORY_LISTING_LAZY_STAT_MIN_ENTRIES
+    for child in scanned:
+        try:
+            is_dir = child.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        file_size: int | None = None
+        child_mtime_ns: int | None = None
+        if is_dir or not stats_deferred:
+            try:
+                stat = child.stat(follow_symlinks=False)
+                child_mtime_ns = int(stat.st_mtime_ns)
+                if not is_dir:
+                    file_size = int(stat.st_size)
+            except OSError:
+                pass
+        children.append(
+            DirectoryChild(
+                parent=directory,
+                name=child.name,
+                is_dir=is_dir,
+                file_size=file_size,
+                mtime_ns=child_mtime_ns,
+            )
+        )
+
+    children.sort(key=lambda item: (not item.is_dir, item.name.lower()))
+    stable = mtime_ns is not None and time.time_ns() - mtime_ns >= DIRECTORY_LISTING_RACY_WINDOW_NS
+    return DirectoryListing(
+        mtime_ns=mtime_ns,
+        children=tuple(children),
+        stable=stable,
+        stats_deferred=stats_deferred,
+    )
+
+
+def _store(directory: Path, listing: DirectoryListing) -> None:
+    with _DIRECTORY_LISTING_CACHE_LOCK:
+        _DIRECTORY_LISTING_CACHE[directory] = listing
+        _DIRECTORY_LISTING_CACHE.move_to_end(directory)
+        while len(_DIRECTORY_LISTING_CACHE) > DIRECTORY_LISTING_CACHE_MAX:
+            _DIRECTORY_LISTING_CACHE.popitem(last=False)
+
+
+def cached_directory_listing(directory: Path, refresh: bool = False) -> DirectoryListing:
+    """Return the listing of ``directory``, rescanning only when its mtime moved.
+
+    ``refresh`` forces a rescan, for callers that know entries changed
+    without a directory mtime change (e.g. an inotify write event).
+    """
+    try:
+        mtime_ns: int | None = int(directory.stat().st_mtime_ns)
+    except OSError:
+        mtime_ns = None
+
+    if not refresh and mtime_ns is not None:
+        with _DIRECTORY_LISTING_CACHE_LOCK:
+            cached = _DIRECTORY_LISTING_CACHE.get(directory)
+            if cached is not None and cached.stable and cached.mtime_ns == mtime_ns:
+                _DIRECTORY_LISTING_CACHE.move_to_end(directory)
+                return cached
+
+    listing = _scan_directory(directory, mtime_ns)
+    if mtime_ns is None:
+        invalidate_directory_listing(directory)
+    else:
+        _store(directory, listing)
+    return listing
+
+
+def _scan_executor() -> ThreadPoolExecutor:
+    """Return the shared pool used for concurrent directory scans."""
+    global _SCAN_EXECUTOR
+    with _DIRECTORY_LISTING_CACHE_LOCK:
+        if _SCAN_EXECUTOR is None:
+            _SCAN_EXECUTOR = ThreadPoolExecutor(
+                max_workers=DIRECTORY_SCAN_MAX_WORKERS,
+                thread_name_prefix=_DIRECTORY_SCAN_THREAD_PREFIX,
+            )
+        return _SCAN_EXECUTOR
+
+
+def cached_directory_listings(directories: Sequence[Path], refresh: bool = False) -> list[DirectoryListing]:
+    """Return ``cached_directory_listing`` for each of ``directories``, in order.
+
+    Directories are scanned concurrently on the shared pool. Single
+    directories and calls made from a pool thread are scanned inline, so
+    nested use cannot exhaust the pool.
+    """
+    if len(directories) < 2 or threading.current_thread().name.startswith(_DIRECTORY_SCAN_THREAD_PREFIX):
+        return [cached_directory_listing(directory, refresh=refresh) for directory in directories]
+    executor = _scan_executor()
+    futures = [executor.submit(cached_directory_listing, directory, refresh) for directory in directories]
+    return [future.result() for future in futures]
+
+
+def restat_directory_listing_files(directory: Path, show_hidden: bool = True) -> DirectoryListing:
+    """Return the listing of ``directory`` with file stats re-read in place.
+
+    Catches in-place writes, which leave the directory mtime untouched,
+    without another ``scandir``. Hidden files are only re-stat'ed when
+    ``show_hidden`` is set, and listings with deferred stats are returned
+    as they are.
+    """
+    listing = cached_directory_listing(directory)
+    if listing.scan_error is not None or listing.stats_deferred:
+        return listing
+    refreshed: list[DirectoryChild] | None = None
+    prefix = os.fspath(directory)
+    for idx, child in enumerate(listing.children):
+        if child.is_dir or (not show_hidden and child.name.startswith(".")):
+            continue
+        file_size, mtime_ns = stat_file_metadata(os.path.join(prefix, child.name))
+        if file_size == child.file_size and mtime_ns == child.mtime_ns:
+            continue
+        if refreshed is None:
+            refreshed = list(listing.children)
+        refreshed[idx] = replace(child, file_size=file_size, mtime_ns=mtime_ns)
+    if refreshed is None:
+        return listing
+
+    listing = replace(listing, children=tuple(refreshed))
+    with _DIRECTORY_LISTING_CACHE_LOCK:
+        current = _DIRECTORY_LISTING_CACHE.get(directory)
+        if current is not None and current.mtime_ns == listing.mtime_ns:
+            _DIRECTORY_LISTING_CACHE[directory] = listing
+    return listing
+
+
+def restat_directory_listing_file(path: Path) -> tuple[int | None, int | None]:
+    """Return ``(size, mtime_ns)`` of a resolved file ``path`` and patch its cached row.
+
+    The single-file counterpart of ``restat_directory_listing_files`` for
+    files whose in-place writes should show up without re-stat'ing their
+    whole directory (e.g. the previewed file). Only an already cached
+    listing of the parent directory is touched; nothing is scanned.
+    """
+    file_size, mtime_ns = stat_file_metadata(path)
+    directory = path.parent
+    name = path.name
+    folded = name.lower()
+    with _DIRECTORY_LISTING_CACHE_LOCK:
+        listing = _DIRECTORY_LISTING_CACHE.get(directory)
+        if listing is None or listing.stats_deferred or mtime_ns is None:
+            return file_size, mtime_ns
+        children = listing.children
+        # Files follow directories, each group sorted by folded name.
+        pos = bisect_left(children, (True, folded), key=lambda child: (not child.is_dir, child.name.lower()))
+        while pos < len(children) and children[pos].name.lower() == folded:
+            child = children[pos]
+            if child.name == name:
+                if child.file_size != file_size or child.mtime_ns != mtime_ns:
+                    refreshed = list(children)
+                    refreshed[pos] = replace(child, file_size=file_size, mtime_ns=mtime_ns)
+                    _DIRECTORY_LISTING_CACHE[directory] = replace(listing, children=tuple(refreshed))
+                break
+            pos += 1
+    return file_size, mtime_ns
+
+
+def invalidate_directory_listing(directory: Path) -> None:
+    """Drop the cached listing of ``directory`` so the next read rescans it."""
+    with _DIRECTORY_LISTING_CACHE_LOCK:
+        _DIRECTORY_LISTING_CACHE.pop(directory, None)
+
+
+def clear_directory_listing_cache() -> None:
+    """Drop every cached directory listing."""
+    with _DIRECTORY_LISTING_CACHE_LOCK:
+        _DIRECTORY_LISTING_CACHE.clear()
+
+
+__all__ = [
+    "DIRECTORY_LISTING_CACHE_MAX",
+    "DIRECTORY_LISTING_LAZY_STAT_MIN_ENTRIES",
+    "DIRECTORY_SCAN_MAX_WORKERS",
+    "DirectoryListing",
+    "cached_directory_listing",
+    "cached_directory_listings",
+    "clear_directory_listing_cache",
+    "invalidate_directory_listing",
+    "restat_directory_listing_file",
+    "restat_directory_listing_files",
+    "stat_file_metadata",
+]
@@ -0,0 +1,97 @@
+"""Cached path canonicalization for tree, preview and render hot paths.
+
+``Path.resolve()`` walks every path component with ``lstat``/``readlink``.
+Tree rebuilds resolve the same expanded directories every time and
+renderers resolve rows every frame, so ``canonical_path`` caches results in
+buckets keyed by parent directory. One changed directory can then be
+dropped without losing the rest: the tree watcher invalidates the
+directories it reports (``invalidate_canonical_paths``) and full refreshes
+clear everything.
+
+Only absolute paths are cached, since relative ones depend on the working
+directory.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+import os
+from pathlib import Path
+import threading
+
+CANONICAL_PATH_CACHE_MAX_DIRS = 4_096
+
+_CANONICAL_PATH_CACHE: OrderedDict[Path, dict[str, Path]] = OrderedDict()
+_CANONICAL_PATH_CACHE_LOCK = threading.Lock()
+
+
+def canonical_path(path: Path) -> Path:
+    """Return ``path.resolve()`` from the cache, or ``path`` when it cannot be resolved."""
+    if not path.is_absolute():
+        try:
+            return path.resolve()
+        except (OSError, RuntimeError):
+            return path
+
+    parent = path.parent
+    name = path.name
+    with _CANONICAL_PATH_CACHE_LOCK:
+        bucket = _CANONICAL_PATH_CACHE.get(parent)
+        if bucket is not None:
+            resolved = bucket.get(name)
+            if resolved is not None:
+                _CANONICAL_PATH_CACHE.move_to_end(parent)
+                return resolved
+
+    try:
+        resolved = path.resolve()
+    except (OSError, RuntimeError):
+        return path
+
+    with _CANONICAL_PATH_CACHE_LOCK:
+        bucket = _CANONICAL_PATH_CACHE.get(parent)
+        if bucket is None:
+            bucket = _CANONICAL_PATH_CACHE[parent] = {}
+            while len(_CANONICAL_PATH_CACHE) > CANONICAL_PATH_CACHE_MAX_DIRS:
+                _CANONICAL_PATH_CACHE.popitem(last=False)
+        bucket[name] = resolved
+    return resolved
+
+
+def invalidate_canonical_paths(directories: Iterable[Path]) -> None:
+    """Forget resolutions inside ``directories`` and below them.
+
+    Each directory's own entry in its parent bucket is dropped too, in case
+    it was replaced by a symlink.
+    """
+    prefixes: list[str] = []
+    with _CANONICAL_PATH_CACHE_LOCK:
+        for directory in directories:
+            prefixes.append(str(directory).rstrip(os.sep) + os.sep)
+            parent_bucket = _CANONICAL_PATH_CACHE.get(directory.parent)
+            if parent_bucket is not None:
+                parent_bucket.pop(directory.name, None)
+        if not prefixes:
+            return
+        stale = [
+            key
+            for key in _CANONICAL_PATH_CACHE
+            if any((str(key) + os.sep).startswith(prefix) for prefix in prefixes)
+        ]
+        for key in stale:
+            del _CANONICAL_PATH_CACHE[key]
+
+
+def clear_canonical_path_cache() -> None:
+    """Drop every cached resolution."""
+    with _CANONICAL_PATH_CACHE_LOCK:
+        _CANONICAL_PATH_CACHE.clear()
+
+
+__all__ = [
+    "CANONICAL_PATH_CACHE_MAX_DIRS",
+    "canonical_path",
+    "clear_canonical_path_cache",
+    "invalidate_canonical_paths",
+]
@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Collection, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
-from .fs import build_file_tree
+from .fs import build_file_tree, maybe_gitignore_matcher, normalize_expanded_paths, refresh_file_tree
+from .paths import canonical_path
 from .types import DirectoryEntry
 from .watch import build_git_watch_signature, build_tree_watch_signature
 
 
 @dataclass(frozen=True)
 class FileTreeSnapshot:
-    """Snapshot of file-tree domain state plus last observed watch signatures."""
+    """Snapshot of file-tree domain state plus last observed watch signatures.
+
+    ``ignore_matcher`` is the gitignore matcher the tree was filtered with
+    (``None`` without ``skip_gitignored``); a different current matcher
+    forces a full rebuild on refresh.
+    """
 
     root_path: Path
     expanded: frozenset[Path]
@@ -21,22 +27,9 @@ class FileTreeSnapshot:
     skip_gitignored: bool
     tree_signature: str
     git_signature: str
-    git_status_overlay: dict[Path, int]
+    git_status_overlay: Mapping[Path, int]
     root_entry: DirectoryEntry
-
-
-def _normalize_expanded(root: Path, expanded: set[Path]) -> frozenset[Path]:
-    """Normalize expanded paths and keep only entries under ``root``."""
-    normalized: set[Path] = set()
-    for raw_path in expanded:
-        try:
-            resolved = raw_path.resolve()
-        except Exception:
-            continue
-        if not resolved.is_relative_to(root):
-            continue
-        normalized.add(resolved)
-    return frozenset(normalized)
+    ignore_matcher: object | None = None
 
 
 def build_file_tree_snapshot(
@@ -46,20 +39,21 @@ def build_file_tree_snapshot(
     *,
     skip_gitignored: bool = False,
     git_dir: Path | None = None,
-    git_status_overlay: dict[Path, int] | None = None,
-    collect_git_status_overlay: Callable[[Path], dict[Path, int]] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
+    collect_git_status_overlay: Callable[[Path], Mapping[Path, int]] | None = None,
     doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
     include_doc_summaries: bool = False,
 ) -> FileTreeSnapshot:
     """Build a fresh file-tree snapshot and capture fs/git signatures."""
-    root = root.resolve()
-    expanded_resolved = _normalize_expanded(root, expanded)
+    root = canonical_path(root)
+    expanded_resolved = frozenset(normalize_expanded_paths(root, expanded))
 
     if collect_git_status_overlay is not None:
         overlay = collect_git_status_overlay(root)
     else:
         overlay = git_status_overlay or {}
 
+    ignore_matcher = maybe_gitignore_matcher(root, skip_gitignored)
     root_entry = build_file_tree(
         root,
         set(expanded_resolved),
@@ -80,6 +74,7 @@ def build_file_tree_snapshot(
         git_signature=git_signature,
         git_status_overlay=overlay,
         root_entry=root_entry,
+        ignore_matcher=ignore_matcher,
     )
 
 
@@ -91,18 +86,23 @@ def refresh_file_tree_snapshot(
     show_hidden: bool | None = None,
     skip_gitignored: bool | None = None,
     git_dir: Path | None = None,
-    git_status_overlay: dict[Path, int] | None = None,
-    collect_git_status_overlay: Callable[[Path], dict[Path, int]] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
+    collect_git_status_overlay: Callable[[Path], Mapping[Path, int]] | None = None,
     doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
     include_doc_summaries: bool = False,
+    changed_dirs: Collection[Path] = (),
     force: bool = False,
 ) -> tuple[FileTreeSnapshot, bool, bool]:
     """Refresh snapshot when tree/git signatures or settings change.
 
+    Unless ``force`` is set or the root/visibility settings changed, only
+    directories whose mtime moved (or that are listed in ``changed_dirs``)
+    are rescanned; the rest of ``previous.root_entry`` is reused as-is.
+
     Returns ``(snapshot, tree_changed, git_changed)``.
     """
-    root_path = root.resolve() if root is not None else previous.root_path
-    expanded_resolved = _normalize_expanded(root_path, expanded if expanded is not None else set(previous.expanded))
+    root_path = canonical_path(root) if root is not None else previous.root_path
+    expanded_resolved = frozenset(normalize_expanded_paths(root_path, expanded if expanded is not None else previous.expanded))
     show_hidden_value = previous.show_hidden if show_hidden is None else show_hidden
     skip_gitignored_value = previous.skip_gitignored if skip_gitignored is None else skip_gitignored
 
@@ -115,7 +115,13 @@ def refresh_file_tree_snapshot(
         or show_hidden_value != previous.show_hidden
         or skip_gitignored_value != previous.skip_gitignored
     )
-    tree_changed = force or config_changed or tree_signature != previous.tree_signature
+    ignore_matcher = maybe_gitignore_matcher(root_path, skip_gitignored_value)
+    tree_changed = (
+        force
+        or config_changed
+        or tree_signature != previous.tree_signature
+        or ignore_matcher is not previous.ignore_matcher
+    )
     git_changed = force or config_changed or git_signature != previous.git_signature
 
     should_recompute_overlay = git_status_overlay is not None or collect_git_status_overlay is not None
@@ -132,15 +138,35 @@ def refresh_file_tree_snapshot(
     if not should_rebuild_tree:
         return previous, False, False
 
-    root_entry = build_file_tree(
-        root_path,
-        set(expanded_resolved),
-        show_hidden_value,
-        skip_gitignored=skip_gitignored_value,
-        git_status_overlay=overlay,
-        doc_summary_for_path=doc_summary_for_path,
-        include_doc_summaries=include_doc_summaries,
-    )
+    if (
+        force
+        or root_path != previous.root_path
+        or show_hidden_value != previous.show_hidden
+        or skip_gitignored_value != previous.skip_gitignored
+    ):
+        root_entry = build_file_tree(
+            root_path,
+            set(expanded_resolved),
+            show_hidden_value,
+            skip_gitignored=skip_gitignored_value,
+            git_status_overlay=overlay,
+            doc_summary_for_path=doc_summary_for_path,
+            include_doc_summaries=include_doc_summaries,
+        )
+    else:
+        root_entry, _rescanned = refresh_file_tree(
+            previous.root_entry,
+            set(expanded_resolved),
+            previous.expanded,
+            show_hidden_value,
+            skip_gitignored=skip_gitignored_value,
+            git_status_overlay=overlay,
+            doc_summary_for_path=doc_summary_for_path,
+            include_doc_summaries=include_doc_summaries,
+            changed_dirs=changed_dirs,
+            reapply_git_flags=overlay is not previous.git_status_overlay,
+            previous_ignore_matcher=previous.ignore_matcher,
+        )
     refreshed = FileTreeSnapshot(
         root_path=root_path,
         expanded=expanded_resolved,
@@ -150,6 +176,7 @@ def refresh_file_tree_snapshot(
         git_signature=git_signature,
         git_status_overlay=overlay,
         root_entry=root_entry,
+        ignore_matcher=ignore_matcher,
     )
     return refreshed, tree_changed, git_changed
 
@@ -1,4 +1,10 @@
-"""Domain datatypes for filesystem-backed file tree entries."""
+"""Domain datatypes for filesystem-backed file tree entries.
+
+Trees can hold hundreds of thousands of files, so the per-file types are
+slotted and keep their name relative to a parent ``Path`` shared by every
+sibling instead of a ``Path`` object of their own; ``path`` is derived on
+access. Callers holding a full path build them with ``from_path``.
+"""
 
 from __future__ import annotations
 
@@ -7,31 +13,86 @@ from pathlib import Path
 from typing import Union
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class DirectoryChild:
+    """One visible directory child row plus cached metadata."""
+
+    parent: Path
+    name: str
+    is_dir: bool
+    file_size: int | None
+    mtime_ns: int | None
+    git_status_flags: int = 0
+    doc_summary: str | None = None
+
+    @classmethod
+    def from_path(
+        cls,
+        path: Path,
+        is_dir: bool,
+        file_size: int | None,
+        mtime_ns: int | None,
+        git_status_flags: int = 0,
+        doc_summary: str | None = None,
+    ) -> DirectoryChild:
+        """Build a child from its full ``path``."""
+        return cls(path.parent, path.name, is_dir, file_size, mtime_ns, git_status_flags, doc_summary)
+
+    @property
+    def path(self) -> Path:
+        return self.parent / self.name
+
+
+@dataclass(frozen=True, slots=True)
 class FileEntry:
     """Domain file entry containing metadata observed from filesystem/git."""
 
-    path: Path
+    parent: Path
+    name: str
     file_size: int | None = None
     mtime_ns: int | None = None
     git_status_flags: int = 0
     doc_summary: str | None = None
 
+    @classmethod
+    def from_path(
+        cls,
+        path: Path,
+        file_size: int | None = None,
+        mtime_ns: int | None = None,
+        git_status_flags: int = 0,
+        doc_summary: str | None = None,
+    ) -> FileEntry:
+        """Build an entry from its full ``path``."""
+        return cls(path.parent, path.name, file_size, mtime_ns, git_status_flags, doc_summary)
+
+    @property
+    def path(self) -> Path:
+        return self.parent / self.name
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class DirectoryEntry:
-    """Domain directory entry with recursively nested children."""
+    """Domain directory entry with recursively nested children.
+
+    ``path`` doubles as the shared ``parent`` of its file children.
+    """
 
     path: Path
     mtime_ns: int | None = None
     git_status_flags: int = 0
     children: tuple["FileTreeEntry", ...] = ()
 
+    @property
+    def name(self) -> str:
+        return self.path.name
+
 
 FileTreeEntry = Union[DirectoryEntry, FileEntry]
 
 
 __all__ = [
+    "DirectoryChild",
     "FileEntry",
     "DirectoryEntry",
     "FileTreeEntry",
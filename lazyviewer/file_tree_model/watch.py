@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import errno
 import hashlib
-import os
+import stat
 import subprocess
+from collections.abc import Collection
 from pathlib import Path
 
+from .listing import restat_directory_listing_file, restat_directory_listing_files
+from .paths import canonical_path
+from .inotify import IN_DELETE_SELF, IN_IGNORED, IN_MOVE_SELF, IN_Q_OVERFLOW, InotifyWatcher
+
+GIT_CONTROL_FILE_NAMES = frozenset({"index", "HEAD", "MERGE_HEAD", "CHERRY_PICK_HEAD", "REBASE_HEAD"})
+
 
 def _update_digest(digest, token: str) -> None:
     """Append a token plus separator byte to a hash digest."""
@@ -54,18 +62,27 @@ def resolve_git_paths(tree_root: Path, timeout_seconds: float = 0.15) -> tuple[P
     return repo_root, git_dir.resolve()
 
 
-def build_tree_watch_signature(root: Path, expanded: set[Path], show_hidden: bool) -> str:
-    """Build a digest for visible tree structure under expanded directories."""
-    root = root.resolve()
+def build_tree_watch_signature(
+    root: Path,
+    expanded: set[Path],
+    show_hidden: bool,
+    directories_only: bool = False,
+) -> str:
+    """Build a digest for visible tree structure under expanded directories.
+
+    By default every visible child of every watched directory is hashed.
+    With ``directories_only`` watched directories contribute only their own
+    stat (their mtime moves when entries are added, removed, or renamed), so
+    the cost tracks the number of expanded directories rather than visible
+    files. Polling pairs that cheap digest with ``stat_tree_hot_paths`` for
+    recently previewed files and a periodic full digest for everything else.
+    """
+    root = canonical_path(root)
     watched_dirs: set[Path] = {root}
     for path in expanded:
-        try:
-            resolved = path.resolve()
-        except Exception:
-            continue
-        if not resolved.is_relative_to(root):
-            continue
-        watched_dirs.add(resolved)
+        resolved = canonical_path(path)
+        if resolved.is_relative_to(root):
+            watched_dirs.add(resolved)
 
     digest = hashlib.blake2b(digest_size=20)
     _update_digest(digest, f"root:{root}")
@@ -73,51 +90,59 @@ def build_tree_watch_signature(root: Path, expanded: set[Path], show_hidden: boo
 
     for directory in sorted(watched_dirs, key=lambda p: str(p)):
         _update_digest(digest, f"dir:{directory}")
-        stat_state, _stat_mtime, _stat_size, stat_mode = _path_stat_signature(directory)
+        stat_state, stat_mtime, _stat_size, stat_mode = _path_stat_signature(directory)
+        if directories_only:
+            _update_digest(digest, f"dir_stat:{stat_state}:{stat_mode}:{stat_mtime}")
+            continue
         _update_digest(digest, f"dir_stat:{stat_state}:{stat_mode}")
         if stat_state != "ok":
             continue
-        if not directory.is_dir():
+        if not stat.S_ISDIR(stat_mode):
             _update_digest(digest, "children:not_dir")
             continue
 
-        children: list[tuple[str, bool, int, int, int, str]] = []
-        try:
-            with os.scandir(directory) as entries:
-                for child in entries:
-                    name = child.name
-                    if not show_hidden and name.startswith("."):
-                        continue
-                    try:
-                        is_dir = child.is_dir(follow_symlinks=False)
-                    except OSError:
-                        is_dir = False
-                    try:
-                        st = child.stat(follow_symlinks=False)
-                        mtime_ns = st.st_mtime_ns
-                        size = st.st_size
-                        mode = st.st_mode
-                        state = "ok"
-                    except OSError:
-                        mtime_ns = 0
-                        size = 0
-                        mode = 0
-                        state = "error"
-                    children.append((name, is_dir, mtime_ns, size, mode, state))
-        except OSError:
+        # Reads the shared listing; in-place writes are caught by re-stat'ing
+        # its files, which also refreshes the listing for the tree/preview.
+        listing = restat_directory_listing_files(directory, show_hidden=show_hidden)
+        if listing.scan_error is not None:
             _update_digest(digest, "children:error")
             continue
-
-        children.sort(key=lambda item: (not item[1], item[0].casefold(), item[0]))
-        for name, is_dir, mtime_ns, size, mode, state in children:
+        for child in listing.children:
+            if not show_hidden and child.name.startswith("."):
+                continue
             _update_digest(
                 digest,
-                f"child:{name}:{1 if is_dir else 0}:{state}:{mtime_ns}:{size}:{mode}",
+                f"child:{child.name}:{1 if child.is_dir else 0}:{child.mtime_ns}:{child.file_size}",
             )
 
     return digest.hexdigest()
 
 
+def stat_tree_hot_paths(hot_paths: Collection[Path]) -> dict[Path, tuple[int | None, int | None]]:
+    """Return ``(size, mtime_ns)`` per hot file, keyed by canonical path.
+
+    Kept apart from ``build_tree_watch_signature`` so callers compare stats
+    per path: a file joining the hot set is a new baseline, not a change.
+    Also patches each file's cached listing row, so a refresh triggered by
+    an in-place write shows the new size.
+    """
+    return {
+        resolved: restat_directory_listing_file(resolved)
+        for resolved in (canonical_path(path) for path in hot_paths)
+    }
+
+
+def _read_head_ref_name(git_dir: Path) -> str:
+    """Return symbolic ref named by ``HEAD`` (for example ``refs/heads/main``)."""
+    try:
+        head_text = (git_dir / "HEAD").read_text(encoding="utf-8", errors="replace").strip()
+    except Exception:
+        return ""
+    if head_text.startswith("ref: "):
+        return head_text[5:].strip()
+    return ""
+
+
 def build_git_watch_signature(git_dir: Path | None) -> str:
     """Build a digest over git metadata that signals status-relevant changes."""
     digest = hashlib.blake2b(digest_size=20)
@@ -137,13 +162,7 @@ def build_git_watch_signature(git_dir: Path | None) -> str:
     head_path = git_dir / "HEAD"
     add_path_token("head", head_path)
 
-    ref_name = ""
-    try:
-        head_text = head_path.read_text(encoding="utf-8", errors="replace").strip()
-        if head_text.startswith("ref: "):
-            ref_name = head_text[5:].strip()
-    except Exception:
-        ref_name = ""
+    ref_name = _read_head_ref_name(git_dir)
     _update_digest(digest, f"head_ref:{ref_name}")
 
     if ref_name:
@@ -156,8 +175,201 @@ def build_git_watch_signature(git_dir: Path | None) -> str:
     return digest.hexdigest()
 
 
+class GitControlWatcher:
+    """Event-driven replacement for polling ``build_git_watch_signature``.
+
+    Watches the git-dir and the directory holding the current branch ref via
+    inotify, and reports whether any file covered by the git signature was
+    touched since the last ``poll_changed`` call. Git replaces control files
+    through ``*.lock`` renames, so directory entry events are used rather
+    than per-file watches.
+    """
+
+    def __init__(self, git_dir: Path, inotify: InotifyWatcher) -> None:
+        self.git_dir = git_dir
+        self.broken = False
+        self._inotify = inotify
+        self._git_dir_wd: int | None = None
+        self._ref_wd: int | None = None
+        self._ref_name = ""
+
+    @classmethod
+    def create(cls, git_dir: Path | None) -> GitControlWatcher | None:
+        """Return a watcher for ``git_dir``, or ``None`` when polling is required."""
+        if git_dir is None:
+            return None
+        inotify = InotifyWatcher.create()
+        if inotify is None:
+            return None
+        watcher = cls(git_dir.resolve(), inotify)
+        watcher._git_dir_wd = inotify.add_watch(watcher.git_dir)
+        if watcher._git_dir_wd is None or not watcher._watch_head_ref():
+            watcher.close()
+            return None
+        return watcher
+
+    def fileno(self) -> int:
+        return self._inotify.fileno()
+
+    def _watch_head_ref(self) -> bool:
+        """(Re)arm the watch on the directory containing ``HEAD``'s ref file."""
+        ref_name = _read_head_ref_name(self.git_dir)
+        if ref_name == self._ref_name and (self._ref_wd is not None or not ref_name):
+            return True
+        if self._ref_wd is not None and self._ref_wd != self._git_dir_wd:
+            self._inotify.remove_watch(self._ref_wd)
+        self._ref_wd = None
+        self._ref_name = ref_name
+        if not ref_name:
+            return True
+        ref_dir = (self.git_dir / ref_name).parent
+        self._ref_wd = self._inotify.add_watch(ref_dir)
+        return self._ref_wd is not None
+
+    def poll_changed(self) -> bool:
+        """Drain pending events and return whether git state may have changed.
+
+        Overflowed queues or lost watches mark the watcher ``broken`` and
+        report a change so the caller can recompute and fall back to polling.
+        """
+        if self.broken:
+            return True
+        events = self._inotify.read_events()
+        if not events:
+            return False
+
+        ref_file_name = self._ref_name.rsplit("/", 1)[-1] if self._ref_name else ""
+        changed = False
+        head_changed = False
+        for event in events:
+            if event.mask & IN_Q_OVERFLOW:
+                self.broken = True
+                return True
+            if event.mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                if event.wd in {self._git_dir_wd, self._ref_wd}:
+                    self.broken = True
+                    return True
+                continue
+            if event.wd == self._git_dir_wd and event.name in GIT_CONTROL_FILE_NAMES:
+                changed = True
+                head_changed = head_changed or event.name == "HEAD"
+            if event.wd == self._ref_wd and event.name == ref_file_name:
+                changed = True
+
+        if head_changed and not self._watch_head_ref():
+            self.broken = True
+        return changed
+
+    def close(self) -> None:
+        self._inotify.close()
+
+
+class TreeDirectoryWatcher:
+    """Event-driven replacement for polling ``build_tree_watch_signature``.
+
+    Holds one inotify watch per visible directory (tree roots, expanded
+    directories, and the previewed directory) and reports exactly which of
+    them had entries created, removed, renamed, rewritten, or re-stat'ed.
+    Hitting the inotify watch limit, or a queue overflow, marks the watcher
+    ``broken`` so the caller can fall back to signature polling.
+    """
+
+    def __init__(self, inotify: InotifyWatcher) -> None:
+        self.broken = False
+        self.show_hidden = False
+        self._inotify = inotify
+        self._wd_by_path: dict[Path, int] = {}
+        self._path_by_wd: dict[int, Path] = {}
+        self._desired: frozenset[Path] = frozenset()
+
+    @classmethod
+    def create(cls) -> TreeDirectoryWatcher | None:
+        """Return an idle watcher, or ``None`` when inotify is unavailable."""
+        inotify = InotifyWatcher.create()
+        if inotify is None:
+            return None
+        return cls(inotify)
+
+    def fileno(self) -> int:
+        return self._inotify.fileno()
+
+    @property
+    def watched_directories(self) -> frozenset[Path]:
+        return frozenset(self._wd_by_path)
+
+    def sync(self, directories: set[Path] | frozenset[Path], show_hidden: bool) -> bool:
+        """Watch exactly ``directories``; return ``False`` once the watcher is broken.
+
+        Directories that do not exist are skipped and retried on the next
+        ``sync``; any other ``inotify_add_watch`` failure (normally the
+        ``max_user_watches`` limit) breaks the watcher.
+        """
+        if self.broken:
+            return False
+        self.show_hidden = show_hidden
+        desired = frozenset(directories)
+        self._desired = desired
+        for path in [path for path in self._wd_by_path if path not in desired]:
+            wd = self._wd_by_path.pop(path)
+            self._path_by_wd.pop(wd, None)
+            self._inotify.remove_watch(wd)
+        for path in desired:
+            if path in self._wd_by_path:
+                continue
+            wd = self._inotify.add_watch(path)
+            if wd is None:
+                if self._inotify.last_error in {errno.ENOENT, errno.ENOTDIR}:
+                    continue
+                self.broken = True
+                return False
+            self._wd_by_path[path] = wd
+            self._path_by_wd[wd] = path
+        return True
+
+    def missing_directories(self) -> bool:
+        """Return whether some requested directory currently has no watch."""
+        return len(self._wd_by_path) != len(self._desired)
+
+    def poll_changed(self) -> set[Path]:
+        """Drain pending events and return watched directories that changed.
+
+        A watched directory that is itself deleted or moved is reported as
+        changed and loses its watch; the next ``sync`` re-arms it if it
+        comes back.
+        """
+        if self.broken:
+            return set()
+        changed: set[Path] = set()
+        for event in self._inotify.read_events():
+            if event.mask & IN_Q_OVERFLOW:
+                self.broken = True
+                return set(self._desired)
+            path = self._path_by_wd.get(event.wd)
+            if path is None:
+                continue
+            if event.mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                changed.add(path)
+                if event.mask & IN_IGNORED:
+                    self._path_by_wd.pop(event.wd, None)
+                    self._wd_by_path.pop(path, None)
+                continue
+            if not self.show_hidden and event.name.startswith("."):
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        self._inotify.close()
+        self._wd_by_path.clear()
+        self._path_by_wd.clear()
+
+
 __all__ = [
+    "GIT_CONTROL_FILE_NAMES",
+    "GitControlWatcher",
+    "TreeDirectoryWatcher",
     "build_tree_watch_signature",
+    "stat_tree_hot_paths",
     "build_git_watch_signature",
     "resolve_git_paths",
 ]
@@ -0,0 +1,263 @@
+"""Streaming ``git blame`` for the source pane.
+
+Blame runs ``git blame --incremental --porcelain`` on a daemon thread and
+publishes line groups into a ``BlameView`` as git emits them, so the UI can
+render partial annotations while the rest of a large file is still being
+blamed. Views are keyed by ``(blob id, path)`` of the working-tree contents;
+completed results are kept in a small LRU and reused while ``HEAD`` is
+unchanged, so revisiting a file never re-runs blame.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+import subprocess
+import threading
+
+from .git_revision import resolve_git_base_commit
+from .git_status import resolve_git_repo_context
+
+GIT_BLAME_CACHE_MAX_ENTRIES = 32
+GIT_BLAME_CONTEXT_TIMEOUT_SECONDS = 2.0
+
+
+@dataclass(frozen=True)
+class BlameCommit:
+    """Commit metadata attached to blamed lines."""
+
+    sha: str
+    author: str = ""
+    author_time: int = 0
+    summary: str = ""
+
+    @property
+    def is_uncommitted(self) -> bool:
+        return not self.sha.strip("0")
+
+
+def git_blob_id(data: bytes, *, object_format: str = "sha1") -> str:
+    """Return the git object id ``git hash-object`` would assign to ``data``."""
+    digest = hashlib.sha256() if object_format == "sha256" else hashlib.sha1()
+    digest.update(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def parse_incremental_blame(lines: Iterable[str]) -> Iterator[tuple[BlameCommit, int, int]]:
+    """Yield ``(commit, final_line, line_count)`` groups from incremental output.
+
+    Commit headers are only emitted the first time git reports a commit;
+    later groups for the same commit reuse the earlier metadata. Each group
+    is terminated by its ``filename`` line.
+    """
+    commits: dict[str, BlameCommit] = {}
+    sha = ""
+    final_line = 0
+    count = 0
+    headers: dict[str, str] = {}
+    for raw in lines:
+        line = raw.rstrip("\n")
+        if not sha:
+            parts = line.split(" ")
+            if len(parts) < 4 or len(parts[0]) < 40:
+                continue
+            try:
+                final_line = int(parts[2])
+                count = int(parts[3])
+            except ValueError:
+                continue
+            sha = parts[0]
+            headers = {}
+            continue
+        key, _, value = line.partition(" ")
+        if key != "filename":
+            headers.setdefault(key, value)
+            continue
+        commit = commits.get(sha)
+        if commit is None or (headers and not commit.author):
+            try:
+                author_time = int(headers.get("author-time", "0"))
+            except ValueError:
+                author_time = 0
+            commit = BlameCommit(
+                sha=sha,
+                author=headers.get("author", ""),
+                author_time=author_time,
+                summary=headers.get("summary", ""),
+            )
+            commits[sha] = commit
+        yield commit, final_line, count
+        sha = ""
+
+
+@dataclass
+class BlameView:
+    """Blame results for one file, filled in incrementally by a worker.
+
+    ``revision`` increases with every published group so pollers can tell
+    when a re-render is due without diffing ``lines``.
+    """
+
+    path: Path
+    lines: dict[int, BlameCommit] = field(default_factory=dict)
+    revision: int = 0
+    complete: bool = False
+    error: str | None = None
+    key: tuple[str, Path] | None = None
+    cancelled: bool = False
+
+    def commit_for_line(self, source_line: int) -> BlameCommit | None:
+        """Return blame commit for 1-based ``source_line`` if already known."""
+        return self.lines.get(source_line)
+
+
+@dataclass
+class _CachedBlame:
+    head: str | None
+    lines: dict[int, BlameCommit]
+
+
+class GitBlameService:
+    """Runs streaming blame jobs and caches completed results.
+
+    Only one job is live at a time: starting a view cancels the previous
+    one and kills its ``git blame`` process.
+    """
+
+    def __init__(self, max_entries: int = GIT_BLAME_CACHE_MAX_ENTRIES) -> None:
+        self._max_entries = max(1, max_entries)
+        self._cache: OrderedDict[tuple[str, Path], _CachedBlame] = OrderedDict()
+        self._lock = threading.Lock()
+        self._active: BlameView | None = None
+        self._active_proc: subprocess.Popen[str] | None = None
+
+    def start(self, path: Path) -> BlameView:
+        """Begin blaming ``path`` in the background and return its live view."""
+        view = BlameView(path=path.resolve())
+        with self._lock:
+            self._cancel_locked()
+            self._active = view
+        worker = threading.Thread(
+            target=self._run,
+            args=(view,),
+            name="lazyviewer-git-blame",
+            daemon=True,
+        )
+        worker.start()
+        return view
+
+    def cancel(self) -> None:
+        """Stop the live blame job, if any."""
+        with self._lock:
+            self._cancel_locked()
+
+    def _cancel_locked(self) -> None:
+        if self._active is not None and not self._active.complete:
+            self._active.cancelled = True
+        self._active = None
+        proc = self._active_proc
+        self._active_proc = None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, key: tuple[str, Path], head: str | None) -> dict[int, BlameCommit] | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry.head != head:
+                return None
+            self._cache.move_to_end(key)
+            return entry.lines
+
+    def _store(self, key: tuple[str, Path], head: str | None, lines: dict[int, BlameCommit]) -> None:
+        with self._lock:
+            self._cache[key] = _CachedBlame(head=head, lines=lines)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _finish(view: BlameView, error: str | None = None) -> None:
+        view.error = error
+        view.complete = True
+        view.revision += 1
+
+    def _run(self, view: BlameView) -> None:
+        path = view.path
+        repo_root, git_dir = resolve_git_repo_context(path.parent, GIT_BLAME_CONTEXT_TIMEOUT_SECONDS)
+        if repo_root is None:
+            self._finish(view, "not a git repository")
+            return
+        try:
+            data = path.read_bytes()
+        except OSError as exc:
+            self._finish(view, str(exc))
+            return
+        head = resolve_git_base_commit(repo_root, git_dir, "HEAD", GIT_BLAME_CONTEXT_TIMEOUT_SECONDS)
+        object_format = "sha256" if head is not None and len(head) == 64 else "sha1"
+        key = (git_blob_id(data, object_format=object_format), path)
+        view.key = key
+
+        cached = self._cached(key, head)
+        if cached is not None:
+            view.lines = cached
+            self._finish(view)
+            return
+
+        try:
+            proc = subprocess.Popen(
+                ["git", "-C", str(repo_root), "blame", "--incremental", "--porcelain", "--", str(path)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except OSError as exc:
+            self._finish(view, str(exc))
+            return
+        with self._lock:
+            if view.cancelled:
+                proc.kill()
+                proc.wait()
+                return
+            self._active_proc = proc
+
+        assert proc.stdout is not None
+        lines = view.lines
+        for commit, final_line, count in parse_incremental_blame(proc.stdout):
+            if view.cancelled:
+                break
+            # Readers only do single-key lookups, so filling in place is safe.
+            for offset in range(count):
+                lines[final_line + offset] = commit
+            view.revision += 1
+        proc.stdout.close()
+        returncode = proc.wait()
+        with self._lock:
+            if self._active_proc is proc:
+                self._active_proc = None
+        if view.cancelled:
+            return
+        if returncode != 0:
+            self._finish(view, "git blame failed")
+            return
+        self._store(key, head, lines)
+        self._finish(view)
+
+
+__all__ = [
+    "BlameCommit",
+    "BlameView",
+    "GIT_BLAME_CACHE_MAX_ENTRIES",
+    "GitBlameService",
+    "git_blob_id",
+    "parse_incremental_blame",
+]
@@ -0,0 +1,413 @@
+"""Configurable git diff bases and cached base-blob reads.
+
+A diff base is a revision spec: ``HEAD`` (the default), any branch or commit,
+or ``merge-base`` / ``merge-base:<branch>`` for the merge-base of ``HEAD`` with
+the main branch (``main``/``master`` when no branch is named).
+
+Base-blob contents come from persistent ``git cat-file`` processes, one pair
+per repository. Object ids for ``<commit>:<path>`` are memoized (a resolved
+commit never changes), and blob contents are cached by object id, so moving
+between files in a branch review never re-reads an unchanged blob.
+"""
+
+from __future__ import annotations
+
+import atexit
+from collections import OrderedDict
+import os
+from pathlib import Path
+import re
+import select
+import subprocess
+import threading
+import time
+
+from .file_tree_model.watch import build_git_watch_signature
+
+GIT_DIFF_BASE_HEAD = "HEAD"
+GIT_DIFF_BASE_MERGE_BASE = "merge-base"
+GIT_MAIN_BRANCH_CANDIDATES = ("main", "master")
+GIT_BLOB_CACHE_MAX_BYTES = 64 * 1024 * 1024
+GIT_OBJECT_ID_CACHE_MAX = 16_384
+GIT_BASE_COMMIT_CACHE_MAX = 64
+GIT_CAT_FILE_TIMEOUT_SECONDS = 2.0
+GIT_CAT_FILE_READ_CHUNK = 64 * 1024
+
+_REF_NAME_END_RE = re.compile(r"[~^@:]")
+_BASE_COMMIT_CACHE: OrderedDict[tuple[str, str, str, tuple[tuple[str, int, int], ...]], str | None] = OrderedDict()
+_OBJECT_ID_CACHE: OrderedDict[tuple[str, str, str], str | None] = OrderedDict()
+_REVISION_CACHE_LOCK = threading.Lock()
+_BLOB_CACHE: OrderedDict[str, bytes] = OrderedDict()
+_BLOB_CACHE_BYTES = 0
+_BLOB_CACHE_LOCK = threading.Lock()
+_READERS: dict[Path, GitBlobReader] = {}
+_READERS_LOCK = threading.Lock()
+
+
+def normalize_git_diff_base(base: str | None) -> str:
+    """Return stripped base spec, defaulting to ``HEAD``."""
+    stripped = (base or "").strip()
+    return stripped or GIT_DIFF_BASE_HEAD
+
+
+def is_head_diff_base(base: str | None) -> bool:
+    """Return whether ``base`` selects the default ``HEAD`` comparison."""
+    return normalize_git_diff_base(base) == GIT_DIFF_BASE_HEAD
+
+
+def _run_git(repo_root: Path, args: list[str], timeout_seconds: float) -> subprocess.CompletedProcess[str] | None:
+    """Execute a git subcommand with timeout and tolerant failure handling."""
+    try:
+        return subprocess.run(
+            ["git", "-C", str(repo_root), *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+            timeout=timeout_seconds,
+        )
+    except Exception:
+        return None
+
+
+def _rev_parse_commit(repo_root: Path, rev: str, timeout_seconds: float) -> str | None:
+    """Return full commit id for ``rev``, or ``None``."""
+    proc = _run_git(repo_root, ["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], timeout_seconds)
+    if proc is None or proc.returncode != 0:
+        return None
+    commit = proc.stdout.strip()
+    return commit or None
+
+
+def _merge_base_commit(repo_root: Path, branch: str | None, timeout_seconds: float) -> str | None:
+    """Return merge-base of ``HEAD`` with ``branch`` or the first main-branch candidate."""
+    candidates = (branch,) if branch else GIT_MAIN_BRANCH_CANDIDATES
+    for candidate in candidates:
+        if _rev_parse_commit(repo_root, candidate, timeout_seconds) is None:
+            continue
+        proc = _run_git(repo_root, ["merge-base", "HEAD", candidate], timeout_seconds)
+        if proc is None or proc.returncode != 0:
+            continue
+        commit = proc.stdout.strip()
+        if commit:
+            return commit
+    return None
+
+
+def _git_common_dir(git_dir: Path) -> Path:
+    """Return the directory holding refs, following a worktree ``commondir`` file."""
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    common_dir = Path(common)
+    return common_dir if common_dir.is_absolute() else (git_dir / common_dir)
+
+
+def _base_ref_names(spec: str) -> tuple[str, ...]:
+    """Return ref names whose movement can change what ``spec`` resolves to."""
+    if spec == GIT_DIFF_BASE_MERGE_BASE or spec.startswith(f"{GIT_DIFF_BASE_MERGE_BASE}:"):
+        branch = spec.partition(":")[2].strip()
+        return (branch,) if branch else GIT_MAIN_BRANCH_CANDIDATES
+    name = _REF_NAME_END_RE.split(spec, maxsplit=1)[0]
+    return (name,) if name and name != GIT_DIFF_BASE_HEAD else ()
+
+
+def _base_refs_signature(git_dir: Path | None, spec: str) -> tuple[tuple[str, int, int], ...]:
+    """Stat ``packed-refs`` and every loose ref file ``spec`` could resolve through.
+
+    ``build_git_watch_signature`` only follows ``HEAD``, so without this a
+    moved ``main`` or re-fetched remote would keep a stale base commit.
+    """
+    names = _base_ref_names(spec)
+    if git_dir is None or not names:
+        return ()
+    refs_dir = _git_common_dir(git_dir)
+    candidates = [refs_dir / "packed-refs"]
+    for name in names:
+        candidates.extend(
+            refs_dir / prefix / name for prefix in ("", "refs", "refs/tags", "refs/heads", "refs/remotes")
+        )
+    tokens: list[tuple[str, int, int]] = []
+    for path in candidates:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        tokens.append((str(path), int(stat.st_mtime_ns), int(stat.st_size)))
+    return tuple(tokens)
+
+
+def resolve_git_base_commit(
+    repo_root: Path,
+    git_dir: Path | None,
+    base: str | None,
+    timeout_seconds: float = 0.5,
+) -> str | None:
+    """Resolve a diff-base spec to a commit id.
+
+    Results are memoized per repository, git control-file signature, and the
+    stat of the refs ``base`` names, so branch moves and new commits
+    re-resolve while steady state costs nothing.
+    """
+    spec = normalize_git_diff_base(base)
+    cache_key = (str(repo_root), spec, build_git_watch_signature(git_dir), _base_refs_signature(git_dir, spec))
+    with _REVISION_CACHE_LOCK:
+        if cache_key in _BASE_COMMIT_CACHE:
+            _BASE_COMMIT_CACHE.move_to_end(cache_key)
+            return _BASE_COMMIT_CACHE[cache_key]
+
+    if spec == GIT_DIFF_BASE_MERGE_BASE or spec.startswith(f"{GIT_DIFF_BASE_MERGE_BASE}:"):
+        branch = spec.partition(":")[2].strip() or None
+        commit = _merge_base_commit(repo_root, branch, timeout_seconds)
+    else:
+        commit = _rev_parse_commit(repo_root, spec, timeout_seconds)
+
+    with _REVISION_CACHE_LOCK:
+        _BASE_COMMIT_CACHE[cache_key] = commit
+        while len(_BASE_COMMIT_CACHE) > GIT_BASE_COMMIT_CACHE_MAX:
+            _BASE_COMMIT_CACHE.popitem(last=False)
+    return commit
+
+
+class GitBlobReader:
+    """Persistent ``git cat-file --batch-check``/``--batch`` pair for one repo.
+
+    Requests are serialized with a lock and every read is bounded by a
+    deadline. Timeouts, process failures, and malformed responses raise
+    ``OSError`` and kill the process, since its output stream can no longer be
+    trusted to line up with the next request; the next request respawns it.
+    """
+
+    def __init__(self, repo_root: Path, timeout_seconds: float = GIT_CAT_FILE_TIMEOUT_SECONDS) -> None:
+        self.repo_root = repo_root
+        self.timeout_seconds = timeout_seconds
+        self._lock = threading.Lock()
+        self._procs: dict[str, subprocess.Popen[bytes]] = {}
+        self._buffers: dict[str, bytearray] = {}
+
+    def _spawn(self, mode: str) -> subprocess.Popen[bytes]:
+        return subprocess.Popen(
+            ["git", "-C", str(self.repo_root), "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+
+    def _live_process(self, mode: str) -> subprocess.Popen[bytes]:
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = self._spawn(mode)
+            self._procs[mode] = proc
+            self._buffers[mode] = bytearray()
+        return proc
+
+    def _reset(self, mode: str) -> None:
+        """Kill the ``mode`` process and drop any half-read output."""
+        proc = self._procs.pop(mode, None)
+        self._buffers.pop(mode, None)
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=0.5)
+        except Exception:
+            pass
+
+    def _fill(self, mode: str, proc: subprocess.Popen[bytes], deadline: float) -> None:
+        """Append at least one chunk of pending output to the ``mode`` buffer."""
+        assert proc.stdout is not None
+        fd = proc.stdout.fileno()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise OSError("git cat-file timed out")
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            raise OSError("git cat-file timed out")
+        chunk = os.read(fd, GIT_CAT_FILE_READ_CHUNK)
+        if not chunk:
+            raise OSError("git cat-file exited unexpectedly")
+        self._buffers[mode] += chunk
+
+    def _read_line(self, mode: str, proc: subprocess.Popen[bytes], deadline: float) -> bytes:
+        buffer = self._buffers[mode]
+        while (newline := buffer.find(b"\n")) < 0:
+            self._fill(mode, proc, deadline)
+        line = bytes(buffer[:newline])
+        del buffer[: newline + 1]
+        return line
+
+    def _read_exact(self, mode: str, proc: subprocess.Popen[bytes], size: int, deadline: float) -> bytes:
+        buffer = self._buffers[mode]
+        while len(buffer) < size:
+            self._fill(mode, proc, deadline)
+        data = bytes(buffer[:size])
+        del buffer[:size]
+        return data
+
+    def _request_header(self, mode: str, spec: str) -> tuple[subprocess.Popen[bytes], list[str], float]:
+        """Send one object request and return the process, split header, and deadline."""
+        proc = self._live_process(mode)
+        if proc.stdin is None or proc.stdout is None:
+            raise OSError("git cat-file pipes are unavailable")
+        deadline = time.monotonic() + self.timeout_seconds
+        proc.stdin.write(spec.encode("utf-8", errors="surrogateescape") + b"\n")
+        proc.stdin.flush()
+        header = self._read_line(mode, proc, deadline)
+        return proc, header.decode("utf-8", errors="replace").split(), deadline
+
+    def object_id(self, spec: str) -> str | None:
+        """Return blob id for ``spec`` (e.g. ``<commit>:<path>``), or ``None`` if absent."""
+        mode = "--batch-check"
+        with self._lock:
+            try:
+                _proc, header, _deadline = self._request_header(mode, spec)
+            except (OSError, ValueError):
+                self._reset(mode)
+                raise
+        if len(header) >= 2 and header[-1] == "missing":
+            return None
+        if len(header) < 3 or header[1] != "blob":
+            return None
+        return header[0]
+
+    def read_blob(self, object_id: str) -> bytes:
+        """Return raw contents of blob ``object_id``."""
+        mode = "--batch"
+        with self._lock:
+            try:
+                proc, header, deadline = self._request_header(mode, object_id)
+                missing = len(header) >= 2 and header[-1] == "missing"
+                if not missing:
+                    if len(header) < 3 or header[1] != "blob":
+                        raise ValueError(f"unexpected git cat-file header: {' '.join(header)!r}")
+                    size = int(header[2])
+                    if size < 0:
+                        raise ValueError(f"negative git cat-file blob size: {size}")
+                    data = self._read_exact(mode, proc, size + 1, deadline)
+                    if data[-1:] != b"\n":
+                        raise ValueError("git cat-file blob is missing its terminator")
+            except ValueError as exc:
+                self._reset(mode)
+                raise OSError(str(exc)) from exc
+            except OSError:
+                self._reset(mode)
+                raise
+        if missing:
+            raise OSError(f"git object {object_id} is missing")
+        return data[:-1]
+
+    def close(self) -> None:
+        """Terminate both cat-file processes."""
+        with self._lock:
+            procs = list(self._procs.values())
+            self._procs.clear()
+            self._buffers.clear()
+            for proc in procs:
+                try:
+                    if proc.stdin is not None:
+                        proc.stdin.close()
+                    proc.wait(timeout=0.5)
+                except Exception:
+                    proc.kill()
+
+
+def git_blob_reader_for(repo_root: Path) -> GitBlobReader:
+    """Return the shared persistent blob reader for ``repo_root``."""
+    with _READERS_LOCK:
+        reader = _READERS.get(repo_root)
+        if reader is None:
+            reader = GitBlobReader(repo_root)
+            _READERS[repo_root] = reader
+        return reader
+
+
+def close_git_blob_readers() -> None:
+    """Terminate every persistent blob reader."""
+    with _READERS_LOCK:
+        readers = list(_READERS.values())
+        _READERS.clear()
+    for reader in readers:
+        reader.close()
+
+
+atexit.register(close_git_blob_readers)
+
+
+def _cached_blob(object_id: str) -> bytes | None:
+    with _BLOB_CACHE_LOCK:
+        data = _BLOB_CACHE.get(object_id)
+        if data is not None:
+            _BLOB_CACHE.move_to_end(object_id)
+        return data
+
+
+def _store_blob(object_id: str, data: bytes) -> None:
+    global _BLOB_CACHE_BYTES
+    if len(data) > GIT_BLOB_CACHE_MAX_BYTES:
+        return
+    with _BLOB_CACHE_LOCK:
+        if object_id in _BLOB_CACHE:
+            return
+        _BLOB_CACHE[object_id] = data
+        _BLOB_CACHE_BYTES += len(data)
+        while _BLOB_CACHE_BYTES > GIT_BLOB_CACHE_MAX_BYTES and _BLOB_CACHE:
+            _evicted_id, evicted = _BLOB_CACHE.popitem(last=False)
+            _BLOB_CACHE_BYTES -= len(evicted)
+
+
+def clear_git_blob_cache() -> None:
+    """Drop cached object ids, blob contents, and resolved base commits."""
+    global _BLOB_CACHE_BYTES
+    with _BLOB_CACHE_LOCK:
+        _BLOB_CACHE.clear()
+        _BLOB_CACHE_BYTES = 0
+    with _REVISION_CACHE_LOCK:
+        _OBJECT_ID_CACHE.clear()
+        _BASE_COMMIT_CACHE.clear()
+
+
+def read_base_blob(repo_root: Path, commit: str, rel_path: str) -> bytes | None:
+    """Return contents of ``rel_path`` at ``commit``, or ``None`` when absent.
+
+    Raises ``OSError`` when the cat-file reader fails.
+    """
+    reader = git_blob_reader_for(repo_root)
+    id_key = (str(repo_root), commit, rel_path)
+    with _REVISION_CACHE_LOCK:
+        cached = id_key in _OBJECT_ID_CACHE
+        if cached:
+            _OBJECT_ID_CACHE.move_to_end(id_key)
+            object_id = _OBJECT_ID_CACHE[id_key]
+    if not cached:
+        object_id = reader.object_id(f"{commit}:{rel_path}")
+        with _REVISION_CACHE_LOCK:
+            _OBJECT_ID_CACHE[id_key] = object_id
+            while len(_OBJECT_ID_CACHE) > GIT_OBJECT_ID_CACHE_MAX:
+                _OBJECT_ID_CACHE.popitem(last=False)
+    if object_id is None:
+        return None
+
+    data = _cached_blob(object_id)
+    if data is None:
+        data = reader.read_blob(object_id)
+        _store_blob(object_id, data)
+    return data
+
+
+__all__ = [
+    "GIT_CAT_FILE_TIMEOUT_SECONDS",
+    "GIT_DIFF_BASE_HEAD",
+    "GIT_DIFF_BASE_MERGE_BASE",
+    "GitBlobReader",
+    "clear_git_blob_cache",
+    "close_git_blob_readers",
+    "git_blob_reader_for",
+    "is_head_diff_base",
+    "normalize_git_diff_base",
+    "read_base_blob",
+    "resolve_git_base_commit",
+]
@@ -1,44 +1,275 @@
 """Git status overlay collection and badge formatting helpers.
 
-This module translates porcelain git status output into compact per-path flags
-used by the tree UI. File flags are propagated to ancestor directories under
-the active tree root so collapsed folders still surface modified/untracked
-state in badge form.
+This module translates ``git status --porcelain=v2 -z`` output (plus the
+base-diff and submodule calls described below) into compact per-path flags
+used by the tree UI: staged, unstaged, renamed, conflicted and untracked, each
+with its own badge. Every tracked change also carries ``GIT_STATUS_CHANGED``
+for callers that only care whether a path differs. File flags are propagated
+to ancestor directories under the active tree root so collapsed folders still
+surface modified/untracked state in badge form.
+
+Overlays are stored as a path-component trie rooted at the tree root. Each
+node carries the OR of its own and all descendant flags, so lookups walk at
+most ``depth`` dict hops and never touch the filesystem.
+
+With a non-``HEAD`` diff base, tracked changes come from
+``git diff --name-only <base>`` (working tree against the base commit) while
+untracked files still come from ``git status``.
+
+Initialized submodules (read from ``.gitmodules``, recursively) get their own
+status call, run concurrently with the parent's, and their records are merged
+under the submodule path so badges and diffs work inside them. Repository
+contexts (``rev-parse`` results) are cached per directory, which gives each
+submodule its own cached context.
 """
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+import os
 from pathlib import Path
+import re
 import subprocess
+import sys
+import threading
 
+from .git_revision import GIT_DIFF_BASE_HEAD, is_head_diff_base, resolve_git_base_commit
 from .ui_theme import DEFAULT_THEME, UITheme
 
 GIT_STATUS_CHANGED = 1
 GIT_STATUS_UNTRACKED = 2
+GIT_STATUS_STAGED = 4
+GIT_STATUS_UNSTAGED = 8
+GIT_STATUS_RENAMED = 16
+GIT_STATUS_CONFLICTED = 32
+_GIT_STATUS_DETAIL_FLAGS = GIT_STATUS_STAGED | GIT_STATUS_UNSTAGED | GIT_STATUS_RENAMED | GIT_STATUS_CONFLICTED
+
+GIT_REPO_CONTEXT_CACHE_MAX = 1024
+GIT_STATUS_MAX_WORKERS = 4
+
+_GITMODULES_PATH_RE = re.compile(r"^\s*path\s*=\s*(.+?)\s*$")
+_REPO_CONTEXT_CACHE: OrderedDict[str, tuple[Path, Path]] = OrderedDict()
+_SUBMODULE_PATHS_CACHE: dict[str, tuple[tuple[int, int], tuple[str, ...]]] = {}
+_GIT_STATUS_CACHE_LOCK = threading.Lock()
+_STATUS_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+class _OverlayNode:
+    """One trie node holding aggregate flags and named child nodes."""
+
+    __slots__ = ("flags", "children", "signature")
+
+    def __init__(self) -> None:
+        self.flags = 0
+        self.children: dict[str, _OverlayNode] | None = None
+        self.signature: int | None = None
+
+    def child(self, name: str) -> _OverlayNode:
+        """Return child ``name``, creating it when missing."""
+        if self.children is None:
+            self.children = {}
+        node = self.children.get(name)
+        if node is None:
+            node = _OverlayNode()
+            self.children[sys.intern(name)] = node
+        return node
+
+
+class GitStatusOverlay(Mapping[Path, int]):
+    """Immutable ``Path -> flags`` mapping backed by a path-component trie.
+
+    Keys are expected to be canonical absolute paths (the tree pipeline only
+    produces paths derived from resolved roots). Paths outside ``root`` are
+    never present. ``repo_root`` is set only when the overlay came from a
+    successful status call, which makes absent paths known-clean.
+    ``authoritative_roots`` lists the subtrees that status was collected for
+    (``root`` itself for single-repo overlays; see ``merge``).
+    """
 
-
-def _merge_flags(overlay: dict[Path, int], target: Path, flags: int) -> None:
-    """OR git-status flags into ``overlay[target]``."""
-    overlay[target] = overlay.get(target, 0) | flags
-
-
-def format_git_status_badges(
-    path: Path,
-    git_status_overlay: dict[Path, int] | None,
-    *,
-    theme: UITheme | None = None,
-) -> str:
-    """Render ANSI-colored status badges for a tree entry path."""
-    active_theme = theme or DEFAULT_THEME
-    if not git_status_overlay:
-        return ""
-
-    flags = git_status_overlay.get(path.resolve(), 0)
+    __slots__ = ("root", "repo_root", "authoritative_roots", "_root_parts", "_node", "_size", "_records")
+
+    def __init__(
+        self,
+        root: Path,
+        records: Mapping[str, int] | None = None,
+        *,
+        repo_root: Path | None = None,
+        authoritative_roots: tuple[Path, ...] | None = None,
+    ) -> None:
+        self.root = root
+        self.repo_root = repo_root
+        if authoritative_roots is None:
+            authoritative_roots = (root,) if repo_root is not None else ()
+        self.authoritative_roots = authoritative_roots
+        self._root_parts = root.parts
+        self._node = _OverlayNode()
+        self._size = 0
+        recorded: dict[str, int] = {}
+        for rel_path, flags in (records or {}).items():
+            if flags:
+                recorded[rel_path] = recorded.get(rel_path, 0) | int(flags)
+        self._records = recorded
+        for rel_path, flags in recorded.items():
+            self._insert(rel_path, flags)
+
+    def _insert(self, rel_path: str, flags: int) -> None:
+        """OR ``flags`` into ``rel_path`` and every ancestor up to the root."""
+        node = self._node
+        if node.flags == 0:
+            self._size += 1
+        node.flags |= flags
+        for part in rel_path.split("/"):
+            if not part or part == ".":
+                continue
+            node = node.child(part)
+            if node.flags == 0:
+                self._size += 1
+            node.flags |= flags
+
+    def _find(self, path: Path) -> _OverlayNode | None:
+        """Return trie node for ``path`` or ``None`` when it has no flags."""
+        parts = path.parts
+        root_parts = self._root_parts
+        depth = len(root_parts)
+        if len(parts) < depth or parts[:depth] != root_parts:
+            return None
+        node = self._node
+        for part in parts[depth:]:
+            children = node.children
+            if children is None:
+                return None
+            node = children.get(part)
+            if node is None:
+                return None
+        return node if node.flags else None
+
+    def __getitem__(self, path: Path) -> int:
+        node = self._find(path)
+        if node is None:
+            raise KeyError(path)
+        return node.flags
+
+    def get(self, path: Path, default: int | None = None) -> int | None:  # type: ignore[override]
+        node = self._find(path)
+        return default if node is None else node.flags
+
+    def file_flags(self, path: Path) -> int | None:
+        """Return authoritative flags for ``path`` (``0`` when clean).
+
+        Returns ``None`` when the overlay cannot vouch for ``path``: it was not
+        collected from a repository or ``path`` lies outside the tree root.
+        """
+        if not any(path.is_relative_to(root) for root in self.authoritative_roots):
+            return None
+        node = self._find(path)
+        return 0 if node is None else node.flags
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, Path) and self._find(path) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Path]:
+        for path, _flags in self._walk(self._node, self.root):
+            yield path
+
+    def items(self):  # type: ignore[override]
+        return list(self._walk(self._node, self.root))
+
+    def _walk(self, node: _OverlayNode, path: Path) -> Iterator[tuple[Path, int]]:
+        """Yield ``(path, flags)`` for ``node`` and its flagged descendants."""
+        if node.flags:
+            yield path, node.flags
+        if node.children:
+            for name, child in node.children.items():
+                yield from self._walk(child, path / name)
+
+    @classmethod
+    def merge(cls, overlays: Sequence[GitStatusOverlay]) -> GitStatusOverlay:
+        """Combine per-root overlays into one trie rooted at their common ancestor.
+
+        Used for multi-root workspaces; each input stays authoritative only
+        for its own subtree.
+        """
+        if len(overlays) == 1:
+            return overlays[0]
+        if not overlays:
+            return cls(Path("/"))
+        common_root = Path(os.path.commonpath([str(overlay.root) for overlay in overlays]))
+        records: dict[str, int] = {}
+        authoritative: list[Path] = []
+        for overlay in overlays:
+            prefix = overlay.root.relative_to(common_root).as_posix()
+            prefix = "" if prefix == "." else prefix + "/"
+            for rel_path, flags in overlay._records.items():
+                key = (prefix + rel_path).rstrip("/")
+                records[key] = records.get(key, 0) | flags
+            authoritative.extend(overlay.authoritative_roots)
+        return cls(common_root, records, authoritative_roots=tuple(authoritative))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, GitStatusOverlay):
+            return (
+                self.root == other.root
+                and self._records == other._records
+                and self.authoritative_roots == other.authoritative_roots
+            )
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"GitStatusOverlay(root={self.root!r}, records={len(self._records)})"
+
+    def subtree_signature(self, path: Path) -> int:
+        """Return a stable hash of flags at and below ``path`` (``0`` when clean).
+
+        Signatures are memoized per node, so repeated directory-preview cache
+        probes cost one trie walk.
+        """
+        node = self._find(path)
+        if node is None:
+            return 0
+        if node.signature is None:
+            entries: list[tuple[str, int]] = []
+
+            def collect(current: _OverlayNode, rel: str) -> None:
+                entries.append((rel, current.flags))
+                if current.children:
+                    for name, child in current.children.items():
+                        collect(child, name if rel == "." else f"{rel}/{name}")
+
+            collect(node, ".")
+            entries.sort()
+            node.signature = hash(tuple(entries))
+        return node.signature
+
+
+def format_git_status_flags(flags: int, *, theme: UITheme | None = None) -> str:
+    """Render ANSI-colored status badges for precomputed overlay flags."""
     if flags == 0:
         return ""
+    active_theme = theme or DEFAULT_THEME
 
     badges: list[str] = []
-    if flags & GIT_STATUS_CHANGED:
+    if flags & GIT_STATUS_CONFLICTED:
+        badges.append(f"{active_theme.git_badge_conflicted}[U]{active_theme.reset}")
+    if flags & GIT_STATUS_RENAMED:
+        badges.append(f"{active_theme.git_badge_staged}[R]{active_theme.reset}")
+    if flags & GIT_STATUS_STAGED:
+        badges.append(f"{active_theme.git_badge_staged}[S]{active_theme.reset}")
+    # Changed flags without detail (e.g. diffs against a non-HEAD base) keep
+    # the generic modified badge.
+    if flags & GIT_STATUS_UNSTAGED or (flags & GIT_STATUS_CHANGED and not flags & _GIT_STATUS_DETAIL_FLAGS):
         badges.append(f"{active_theme.git_badge_changed}[M]{active_theme.reset}")
     if flags & GIT_STATUS_UNTRACKED:
         badges.append(f"{active_theme.git_badge_untracked}[?]{active_theme.reset}")
@@ -47,6 +278,21 @@ def format_git_status_badges(
     return " " + "".join(badges)
 
 
+def format_git_status_badges(
+    path: Path,
+    git_status_overlay: Mapping[Path, int] | None,
+    *,
+    theme: UITheme | None = None,
+) -> str:
+    """Render ANSI-colored status badges for a tree entry path.
+
+    ``path`` is looked up as given; tree rows already carry canonical paths.
+    """
+    if not git_status_overlay:
+        return ""
+    return format_git_status_flags(int(git_status_overlay.get(path, 0)), theme=theme)
+
+
 def _resolve_repo_and_git_dir(path: Path, timeout_seconds: float) -> tuple[Path | None, Path | None]:
     """Resolve repo root and git-dir for a filesystem path."""
     try:
@@ -75,11 +321,110 @@ def _resolve_repo_and_git_dir(path: Path, timeout_seconds: float) -> tuple[Path
     return repo_root, git_dir.resolve()
 
 
+def resolve_git_repo_context(path: Path, timeout_seconds: float) -> tuple[Path | None, Path | None]:
+    """Return ``(repo_root, git_dir)`` for directory ``path``, cached per directory.
+
+    Cached contexts are reused while their git-dir still exists; paths outside
+    any repository are not cached so a later ``git init`` is noticed.
+    """
+    key = str(path)
+    with _GIT_STATUS_CACHE_LOCK:
+        cached = _REPO_CONTEXT_CACHE.get(key)
+        if cached is not None:
+            _REPO_CONTEXT_CACHE.move_to_end(key)
+    if cached is not None and cached[1].exists():
+        return cached
+    repo_root, git_dir = _resolve_repo_and_git_dir(path, timeout_seconds)
+    with _GIT_STATUS_CACHE_LOCK:
+        if repo_root is None or git_dir is None:
+            _REPO_CONTEXT_CACHE.pop(key, None)
+            return None, None
+        _REPO_CONTEXT_CACHE[key] = (repo_root, git_dir)
+        _REPO_CONTEXT_CACHE.move_to_end(key)
+        while len(_REPO_CONTEXT_CACHE) > GIT_REPO_CONTEXT_CACHE_MAX:
+            _REPO_CONTEXT_CACHE.popitem(last=False)
+    return repo_root, git_dir
+
+
+def clear_git_repo_context_cache() -> None:
+    """Clear cached repository contexts and parsed ``.gitmodules`` files."""
+    with _GIT_STATUS_CACHE_LOCK:
+        _REPO_CONTEXT_CACHE.clear()
+        _SUBMODULE_PATHS_CACHE.clear()
+
+
+def _gitmodules_paths(repo_root: Path) -> tuple[str, ...]:
+    """Return submodule paths declared in ``repo_root/.gitmodules``, cached by mtime."""
+    gitmodules = repo_root / ".gitmodules"
+    try:
+        st = gitmodules.stat()
+    except OSError:
+        return ()
+    signature = (int(st.st_mtime_ns), int(st.st_size))
+    key = str(gitmodules)
+    with _GIT_STATUS_CACHE_LOCK:
+        cached = _SUBMODULE_PATHS_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        lines = gitmodules.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return ()
+    paths: list[str] = []
+    for line in lines:
+        matched = _GITMODULES_PATH_RE.match(line)
+        if matched is not None:
+            rel_path = matched.group(1).strip('"').strip("/")
+            if rel_path and not rel_path.startswith("../"):
+                paths.append(rel_path)
+    result = tuple(paths)
+    with _GIT_STATUS_CACHE_LOCK:
+        _SUBMODULE_PATHS_CACHE[key] = (signature, result)
+    return result
+
+
+def discover_git_submodules(repo_root: Path) -> tuple[str, ...]:
+    """Return initialized submodule paths under ``repo_root``, nested ones included.
+
+    Paths are posix strings relative to ``repo_root``, parents before children.
+    Only submodules whose worktree has a ``.git`` entry are returned.
+    """
+    found: list[str] = []
+    pending: list[tuple[Path, str]] = [(repo_root, "")]
+    while pending:
+        current_root, prefix = pending.pop(0)
+        for rel_path in _gitmodules_paths(current_root):
+            sub_root = current_root / rel_path
+            if not (sub_root / ".git").exists():
+                continue
+            full_rel = prefix + rel_path
+            found.append(full_rel)
+            pending.append((sub_root, full_rel + "/"))
+    return tuple(found)
+
+
+def _status_executor() -> ThreadPoolExecutor:
+    """Return the shared pool used for per-submodule status calls."""
+    global _STATUS_EXECUTOR
+    with _GIT_STATUS_CACHE_LOCK:
+        if _STATUS_EXECUTOR is None:
+            _STATUS_EXECUTOR = ThreadPoolExecutor(
+                max_workers=GIT_STATUS_MAX_WORKERS,
+                thread_name_prefix="lazyviewer-git-status",
+            )
+        return _STATUS_EXECUTOR
+
+
 def _run_git(repo_root: Path, args: list[str], timeout_seconds: float) -> subprocess.CompletedProcess[str] | None:
-    """Run a git command and return ``None`` on execution failure."""
+    """Run a git command and return ``None`` on execution failure.
+
+    Optional locks are disabled so ``git status`` never rewrites the index,
+    which the git watchers would report as a change.
+    """
     try:
         return subprocess.run(
             ["git", "-C", str(repo_root), *args],
+            env={**os.environ, "GIT_OPTIONAL_LOCKS": "0"},
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
             text=True,
@@ -92,74 +437,186 @@ def _run_git(repo_root: Path, args: list[str], timeout_seconds: float) -> subpro
         return None
 
 
-def _iter_porcelain_records(output: str) -> list[tuple[str, str]]:
-    """Parse ``git status --porcelain=v1 -z`` records.
+def _xy_flags(xy: str) -> int:
+    """Translate a porcelain v2 ``XY`` field into staged/unstaged flags."""
+    flags = GIT_STATUS_CHANGED
+    if len(xy) >= 1 and xy[0] != ".":
+        flags |= GIT_STATUS_STAGED
+    if len(xy) >= 2 and xy[1] != ".":
+        flags |= GIT_STATUS_UNSTAGED
+    return flags
+
 
-    Returns ``(status, path)`` pairs and skips malformed entries. For rename/copy
-    records, the extra source-path token is consumed.
+def _iter_porcelain_v2_records(output: str) -> list[tuple[str, int]]:
+    """Parse ``git status --porcelain=v2 -z`` records.
+
+    Returns ``(path, flags)`` pairs and skips headers, ignored entries, and
+    malformed records. For rename/copy records the trailing original-path token
+    is consumed; renames carry ``GIT_STATUS_RENAMED`` instead of the staged bit.
     """
-    records: list[tuple[str, str]] = []
+    records: list[tuple[str, int]] = []
     tokens = output.split("\0")
     index = 0
     while index < len(tokens):
         token = tokens[index]
         index += 1
-        if not token:
-            continue
-        if len(token) < 4 or token[2] != " ":
+        if len(token) < 3 or token[1] != " ":
             continue
 
-        status = token[:2]
-        path_text = token[3:]
-        records.append((status, path_text))
-
-        # For renamed/copied entries, porcelain -z appends an extra token
-        # containing the source path; the first path token is the destination.
-        if "R" in status or "C" in status:
+        kind = token[0]
+        if kind == "?":
+            records.append((token[2:], GIT_STATUS_UNTRACKED))
+        elif kind == "1":
+            fields = token.split(" ", 8)
+            if len(fields) == 9:
+                records.append((fields[8], _xy_flags(fields[1])))
+        elif kind == "2":
+            # The original path follows as its own NUL-terminated token.
             index += 1
+            fields = token.split(" ", 9)
+            if len(fields) == 10:
+                xy = fields[1]
+                flags = _xy_flags(xy)
+                if xy[:1] in {"R", "C"}:
+                    flags = (flags & ~GIT_STATUS_STAGED) | GIT_STATUS_RENAMED
+                records.append((fields[9], flags))
+        elif kind == "u":
+            fields = token.split(" ", 10)
+            if len(fields) == 11:
+                records.append((fields[10], GIT_STATUS_CHANGED | GIT_STATUS_CONFLICTED))
+    return records
+
+
+def _collect_repo_records(
+    repo_root: Path,
+    git_dir: Path | None,
+    base: str,
+    timeout_seconds: float,
+    *,
+    ignore_dirty_submodules: bool = False,
+) -> list[tuple[str, int]] | None:
+    """Return ``(repo-relative path, flags)`` records for one repository.
 
+    Returns ``None`` when ``git status`` fails. ``ignore_dirty_submodules``
+    skips git's own recursion into submodule worktrees when their status is
+    collected separately.
+    """
+    head_base = is_head_diff_base(base)
+    status_args = ["status", "--porcelain=v2", "-z", "--untracked-files=all"]
+    if ignore_dirty_submodules:
+        status_args.append("--ignore-submodules=dirty")
+    status_proc = _run_git(repo_root, status_args, timeout_seconds)
+    if status_proc is None or status_proc.returncode != 0:
+        return None
+
+    records = [
+        (rel_path, flags)
+        for rel_path, flags in _iter_porcelain_v2_records(status_proc.stdout)
+        if rel_path and (head_base or flags == GIT_STATUS_UNTRACKED)
+    ]
+    if not head_base:
+        if git_dir is None:
+            _sub_root, git_dir = resolve_git_repo_context(repo_root, timeout_seconds)
+        commit = (
+            resolve_git_base_commit(repo_root, git_dir, base, timeout_seconds)
+            if git_dir is not None
+            else None
+        )
+        diff_proc = (
+            _run_git(repo_root, ["diff", "--name-only", "-z", "--no-renames", commit, "--"], timeout_seconds)
+            if commit is not None
+            else None
+        )
+        if diff_proc is not None and diff_proc.returncode == 0:
+            records.extend((rel_path, GIT_STATUS_CHANGED) for rel_path in diff_proc.stdout.split("\0") if rel_path)
     return records
 
 
-def collect_git_status_overlay(tree_root: Path, timeout_seconds: float = 0.25) -> dict[Path, int]:
+def collect_git_status_overlay(
+    tree_root: Path,
+    timeout_seconds: float = 0.25,
+    base: str = GIT_DIFF_BASE_HEAD,
+) -> GitStatusOverlay:
     """Collect changed/untracked flags for paths under ``tree_root``.
 
     File-level flags are propagated upward to ancestor directories up to the
     requested ``tree_root`` so collapsed directories can still show status badges.
+    Porcelain paths are matched against the root prefix as strings, so no
+    per-record path resolution is needed. ``base`` selects the diff base that
+    changed flags are computed against; unresolvable bases yield no changed flags.
+    Initialized submodules under ``tree_root`` are collected concurrently with
+    the parent repository and merged under their paths.
     """
-    tree_root = tree_root.resolve()
-    repo_root, _git_dir = _resolve_repo_and_git_dir(tree_root, timeout_seconds)
-    if repo_root is None:
-        return {}
-
-    status_proc = _run_git(
-        repo_root,
-        ["status", "--porcelain=v1", "-z", "--untracked-files=all"],
-        timeout_seconds,
-    )
-    if status_proc is None or status_proc.returncode != 0:
-        return {}
+    return collect_git_status_overlays([tree_root], timeout_seconds, base)[0]
 
-    overlay: dict[Path, int] = {}
-    for status, rel_path in _iter_porcelain_records(status_proc.stdout):
-        if not rel_path or status == "!!":
-            continue
-
-        flags = GIT_STATUS_UNTRACKED if status == "??" else GIT_STATUS_CHANGED
-        target = (repo_root / rel_path).resolve()
-        if not target.is_relative_to(tree_root):
-            continue
-
-        _merge_flags(overlay, target, flags)
 
-        parent = target.parent
-        while parent.is_relative_to(tree_root):
-            _merge_flags(overlay, parent, flags)
-            if parent == tree_root:
-                break
-            next_parent = parent.parent.resolve()
-            if next_parent == parent:
-                break
-            parent = next_parent
+def collect_git_status_overlays(
+    tree_roots: Sequence[Path],
+    timeout_seconds: float = 0.25,
+    base: str = GIT_DIFF_BASE_HEAD,
+) -> list[GitStatusOverlay]:
+    """Collect one overlay per root of a single repository with one status call.
 
-    return overlay
+    Works like ``collect_git_status_overlay`` for each root, but the records
+    of the repository behind the first root are gathered once and split by
+    root prefix. Roots outside that repository get empty overlays.
+    """
+    tree_roots = [tree_root.resolve() for tree_root in tree_roots]
+    if not tree_roots:
+        return []
+    repo_root, git_dir = resolve_git_repo_context(tree_roots[0], timeout_seconds)
+    prefixes: dict[Path, str] = {}
+    if repo_root is not None:
+        for tree_root in tree_roots:
+            if tree_root.is_relative_to(repo_root):
+                root_prefix = tree_root.relative_to(repo_root).as_posix()
+                prefixes[tree_root] = "" if root_prefix == "." else root_prefix + "/"
+    if repo_root is None or not prefixes:
+        return [GitStatusOverlay(tree_root) for tree_root in tree_roots]
+
+    submodules = [
+        rel_path
+        for rel_path in discover_git_submodules(repo_root)
+        if any((rel_path + "/").startswith(root_prefix) for root_prefix in prefixes.values())
+    ]
+    if submodules:
+        futures = [
+            _status_executor().submit(
+                _collect_repo_records,
+                repo_root / rel_path,
+                None,
+                base,
+                timeout_seconds,
+                ignore_dirty_submodules=True,
+            )
+            for rel_path in submodules
+        ]
+        parent_records = _collect_repo_records(
+            repo_root, git_dir, base, timeout_seconds, ignore_dirty_submodules=True
+        )
+        submodule_records = [future.result() for future in futures]
+    else:
+        parent_records = _collect_repo_records(repo_root, git_dir, base, timeout_seconds)
+        submodule_records = []
+    if parent_records is None:
+        return [GitStatusOverlay(tree_root) for tree_root in tree_roots]
+
+    repo_records = list(parent_records)
+    for sub_path, sub_records in zip(submodules, submodule_records):
+        repo_records.extend((f"{sub_path}/{rel_path}", flags) for rel_path, flags in sub_records or ())
+
+    overlays: list[GitStatusOverlay] = []
+    for tree_root in tree_roots:
+        root_prefix = prefixes.get(tree_root)
+        if root_prefix is None:
+            overlays.append(GitStatusOverlay(tree_root))
+            continue
+        prefix_len = len(root_prefix)
+        records: dict[str, int] = {}
+        for rel_path, flags in repo_records:
+            if prefix_len and not rel_path.startswith(root_prefix):
+                continue
+            rel_to_root = rel_path[prefix_len:].rstrip("/")
+            records[rel_to_root] = records.get(rel_to_root, 0) | flags
+        overlays.append(GitStatusOverlay(tree_root, records, repo_root=repo_root))
+    return overlays
@@ -0,0 +1,175 @@
+"""Git status coordination across multi-root workspaces.
+
+A workspace can hold several tree roots that live in different repositories
+(or in none). ``WorkspaceGitCoordinator`` resolves the distinct repositories
+behind the roots once, keeps one git watch signature per repository, and
+collects status overlays for all repositories concurrently, with one status
+call per repository split across its roots. When only one
+repository's signature changes, only the roots in that repository are
+re-collected; cached overlays for the rest are merged back unchanged.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+import threading
+
+from .git_status import GitStatusOverlay
+
+GIT_WORKSPACE_MAX_WORKERS = 4
+
+
+@dataclass
+class WorkspaceRepo:
+    """One repository (or repo-less root) backing workspace roots."""
+
+    repo_root: Path | None
+    git_dir: Path | None
+    roots: list[Path] = field(default_factory=list)
+    signature: str | None = None
+
+
+class WorkspaceGitCoordinator:
+    """Concurrent, per-repository git status refresh for workspace roots.
+
+    ``collect_overlays`` gathers one overlay per root for the roots of one
+    repository (normally ``collect_git_status_overlays``); ``resolve_git_paths`` and
+    ``build_git_watch_signature`` come from ``file_tree_model.watch``.
+    """
+
+    def __init__(
+        self,
+        collect_overlays: Callable[[Sequence[Path]], Sequence[Mapping[Path, int]]],
+        *,
+        resolve_git_paths: Callable[[Path], tuple[Path | None, Path | None]],
+        build_git_watch_signature: Callable[[Path | None], str],
+        max_workers: int = GIT_WORKSPACE_MAX_WORKERS,
+    ) -> None:
+        self._collect_overlays = collect_overlays
+        self._resolve_git_paths = resolve_git_paths
+        self._build_git_watch_signature = build_git_watch_signature
+        self._max_workers = max(1, max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.roots: tuple[Path, ...] = ()
+        self.repos: list[WorkspaceRepo] = []
+        self._repo_by_root: dict[Path, WorkspaceRepo] = {}
+        self._overlays: dict[Path, Mapping[Path, int]] = {}
+
+    def _map(self, func: Callable, items: Sequence) -> list:
+        """Apply ``func`` to ``items``, concurrently when there is more than one."""
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="lazyviewer-git-workspace",
+            )
+        return list(self._executor.map(func, items))
+
+    def reset(self, roots: Iterable[Path]) -> None:
+        """Re-resolve repositories for ``roots`` and drop cached overlays."""
+        unique_roots = tuple(dict.fromkeys(root.resolve() for root in roots))
+        resolved = self._map(self._resolve_git_paths, unique_roots)
+        repos: dict[Path, WorkspaceRepo] = {}
+        repo_by_root: dict[Path, WorkspaceRepo] = {}
+        for root, (repo_root, git_dir) in zip(unique_roots, resolved):
+            # Repo-less roots get their own entry keyed by the root itself.
+            key = git_dir if git_dir is not None else root
+            repo = repos.get(key)
+            if repo is None:
+                repo = WorkspaceRepo(repo_root=repo_root, git_dir=git_dir)
+                if git_dir is not None:
+                    repo.signature = self._build_git_watch_signature(git_dir)
+                repos[key] = repo
+            repo.roots.append(root)
+            repo_by_root[root] = repo
+        with self._lock:
+            self.roots = unique_roots
+            self.repos = list(repos.values())
+            self._repo_by_root = repo_by_root
+            self._overlays = {}
+
+    def repo_for_root(self, root: Path) -> WorkspaceRepo | None:
+        """Return the repository entry tracking ``root``."""
+        return self._repo_by_root.get(root.resolve())
+
+    def poll_changed(self) -> list[WorkspaceRepo]:
+        """Recompute per-repo watch signatures and return repos that changed."""
+        changed: list[WorkspaceRepo] = []
+        for repo in self.repos:
+            if repo.git_dir is None:
+                continue
+            signature = self._build_git_watch_signature(repo.git_dir)
+            if signature != repo.signature:
+                repo.signature = signature
+                changed.append(repo)
+        return changed
+
+    def collect(
+        self,
+        roots: Sequence[Path],
+        repos: Sequence[WorkspaceRepo] | None = None,
+    ) -> Mapping[Path, int]:
+        """Return the merged overlay for ``roots``.
+
+        With ``repos``, only those repositories are re-collected and the
+        remaining roots reuse their cached overlays.
+        Roots not seen by ``reset`` trigger a fresh resolve first.
+        """
+        resolved_roots = tuple(dict.fromkeys(root.resolve() for root in roots))
+        if resolved_roots != self.roots:
+            self.reset(resolved_roots)
+            repos = None
+
+        if repos is None:
+            targets = list(self.repos)
+        else:
+            wanted = {id(repo) for repo in repos}
+            targets = [
+                repo
+                for repo in self.repos
+                if id(repo) in wanted or any(root not in self._overlays for root in repo.roots)
+            ]
+
+        # Baseline before collecting, so changes made while status runs still
+        # read as a change on the next poll.
+        for repo in targets:
+            if repo.git_dir is not None:
+                repo.signature = self._build_git_watch_signature(repo.git_dir)
+        collected = self._map(lambda repo: self._collect_overlays(repo.roots), targets)
+        with self._lock:
+            for repo, repo_overlays in zip(targets, collected):
+                self._overlays.update(zip(repo.roots, repo_overlays))
+            overlays = [self._overlays[root] for root in resolved_roots]
+        return merge_workspace_overlays(overlays)
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def merge_workspace_overlays(overlays: Sequence[Mapping[Path, int]]) -> Mapping[Path, int]:
+    """Merge per-root overlays, keeping trie overlays when every input is one."""
+    if len(overlays) == 1:
+        return overlays[0]
+    if all(isinstance(overlay, GitStatusOverlay) for overlay in overlays):
+        return GitStatusOverlay.merge(overlays)  # type: ignore[arg-type]
+    merged: dict[Path, int] = {}
+    for overlay in overlays:
+        for path, flags in overlay.items():
+            merged[path] = merged.get(path, 0) | int(flags)
+    return merged
+
+
+__all__ = [
+    "GIT_WORKSPACE_MAX_WORKERS",
+    "WorkspaceGitCoordinator",
+    "WorkspaceRepo",
+    "merge_workspace_overlays",
+]
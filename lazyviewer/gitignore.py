@@ -1,41 +1,56 @@
 """Gitignore-aware path filtering utilities.
 
-Builds a matcher by querying git for ignored files and directories.
+Ignore rules are evaluated in-process, without git subprocesses. Patterns come
+from ``core.excludesFile``, ``$GIT_DIR/info/exclude`` and every ``.gitignore``
+between the repository root and a path, with git's precedence (deeper files
+win, last matching pattern wins). Per-directory ``.gitignore`` files are loaded
+lazily as directories are scanned, compiled into combined regexes, and cached
+by file mtime. Tracked files listed in the git index are never ignored.
+Outside a repository the scan root's ``.gitignore`` files still apply.
+Directory scans should use ``GitIgnoreMatcher.filter_children``, which checks
+a whole listing on relative strings without per-child path resolution.
 Tree/index builders use this to optionally hide ignored content.
 """
 
 from __future__ import annotations
 
 from collections import OrderedDict
-import shutil
-import subprocess
+from collections.abc import Container, Iterable
+import os
+import re
+import struct
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-import threading
 
 
 GITIGNORE_MATCHER_CACHE_MAX = 64
-GITIGNORE_MATCHER_CACHE_TTL_SECONDS = 2.0
+GITIGNORE_RULES_CACHE_MAX = 4_096
+GITIGNORE_STALE_CHECK_SECONDS = 1.0
 
+_INDEX_HEADER = struct.Struct(">4sII")
+_INDEX_ENTRY_FIXED_BYTES = 40
+_INDEX_EXTENDED_FLAG = 0x4000
+_INDEX_NAME_MASK = 0x0FFF
 
-@dataclass(frozen=True)
-class _MatcherCacheEntry:
-    """Cached matcher plus root directory mtime and insertion timestamp."""
-
-    matcher: GitIgnoreMatcher | None
-    root_mtime_ns: int | None
-    loaded_at: float
 
-
-_GITIGNORE_MATCHER_CACHE: OrderedDict[str, _MatcherCacheEntry] = OrderedDict()
+_GITIGNORE_MATCHER_CACHE: OrderedDict[str, GitIgnoreMatcher | None] = OrderedDict()
 _GITIGNORE_MATCHER_CACHE_LOCK = threading.RLock()
+_GITIGNORE_REFRESH_THREADS: dict[str, threading.Thread] = {}
+_RULES_CACHE: OrderedDict[str, tuple[tuple[int, int], _IgnoreRules | None]] = OrderedDict()
+_TRACKED_CACHE: dict[str, tuple[tuple[int, int], frozenset[str], frozenset[str]]] = {}
+_STALE_CHECKED_AT: dict[str, float] = {}
 
 
 def clear_gitignore_cache() -> None:
-    """Clear cached gitignore matchers."""
+    """Clear cached gitignore matchers, compiled rule files, and index snapshots."""
     with _GITIGNORE_MATCHER_CACHE_LOCK:
         _GITIGNORE_MATCHER_CACHE.clear()
+        _GITIGNORE_REFRESH_THREADS.clear()
+        _RULES_CACHE.clear()
+        _TRACKED_CACHE.clear()
+        _STALE_CHECKED_AT.clear()
 
 
 def _is_within(path: Path, root: Path) -> bool:
@@ -47,145 +62,624 @@ def _is_within(path: Path, root: Path) -> bool:
         return False
 
 
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    """Return ``(mtime_ns, size)`` for ``path`` or ``None`` when missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return int(st.st_mtime_ns), int(st.st_size)
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate one gitignore glob (without anchoring) into regex source."""
+    out: list[str] = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        ch = pattern[index]
+        if ch == "*":
+            if pattern.startswith("**", index):
+                at_segment_start = index == 0 or pattern[index - 1] == "/"
+                after = index + 2
+                if at_segment_start and after == length:
+                    out.append(".*")
+                    index = after
+                    continue
+                if at_segment_start and pattern.startswith("/", after):
+                    out.append("(?:.*/)?")
+                    index = after + 1
+                    continue
+                while index < length and pattern[index] == "*":
+                    index += 1
+                out.append("[^/]*")
+                continue
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            end = index + 1
+            if end < length and pattern[end] in "!^":
+                end += 1
+            if end < length and pattern[end] == "]":
+                end += 1
+            while end < length and pattern[end] != "]":
+                end += 1
+            if end >= length:
+                out.append(re.escape(ch))
+            else:
+                body = pattern[index + 1 : end]
+                negate = body[:1] in ("!", "^")
+                if negate:
+                    body = body[1:]
+                body = body.replace("\\", "\\\\")
+                out.append(f"[^/{body}]" if negate else f"[{body}]")
+                index = end
+        elif ch == "\\" and index + 1 < length:
+            index += 1
+            out.append(re.escape(pattern[index]))
+        else:
+            out.append(re.escape(ch))
+        index += 1
+    return "".join(out)
+
+
 @dataclass(frozen=True)
-class GitIgnoreMatcher:
-    """Resolved gitignore snapshot for a project subtree.
+class _IgnorePattern:
+    """One parsed gitignore line."""
+
+    regex: str
+    negated: bool
+    dir_only: bool
+
 
-    ``ignored_dirs`` is stored as resolved directory paths so parent checks can
-    quickly reject whole subtrees.
+def _parse_pattern(line: str) -> _IgnorePattern | None:
+    """Parse one gitignore line, or return ``None`` for blanks/comments."""
+    line = line.rstrip("\r\n")
+    if not line or line.startswith("#"):
+        return None
+    # Trailing spaces are dropped unless escaped.
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negated = False
+    if line.startswith("!"):
+        negated = True
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+    body = _translate_glob(line)
+    regex = body if anchored else f"(?:.*/)?{body}"
+    return _IgnorePattern(regex=regex, negated=negated, dir_only=dir_only)
+
+
+@dataclass(frozen=True)
+class _IgnoreRules:
+    """Patterns from one source, compiled into combined regexes.
+
+    Alternatives are emitted in reverse file order so the first regex match is
+    the last matching pattern, which is the one git honors.
+    """
+
+    patterns: tuple[_IgnorePattern, ...]
+    file_regex: re.Pattern[str] | None
+    dir_regex: re.Pattern[str] | None
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> _IgnoreRules | None:
+        patterns = tuple(pattern for pattern in map(_parse_pattern, lines) if pattern is not None)
+        if not patterns:
+            return None
+
+        def combine(include_dir_only: bool) -> re.Pattern[str] | None:
+            alternatives = [
+                f"(?P<p{idx}>{pattern.regex})"
+                for idx, pattern in reversed(list(enumerate(patterns)))
+                if include_dir_only or not pattern.dir_only
+            ]
+            if not alternatives:
+                return None
+            try:
+                return re.compile("(?:" + "|".join(alternatives) + r")\Z", re.DOTALL)
+            except re.error:
+                return None
+
+        return cls(patterns=patterns, file_regex=combine(False), dir_regex=combine(True))
+
+    def match(self, rel_path: str, is_dir: bool) -> bool | None:
+        """Return ``True`` (ignored), ``False`` (re-included), or ``None`` (no match)."""
+        regex = self.dir_regex if is_dir else self.file_regex
+        if regex is None:
+            return None
+        matched = regex.match(rel_path)
+        if matched is None or matched.lastgroup is None:
+            return None
+        return not self.patterns[int(matched.lastgroup[1:])].negated
+
+
+def _load_rules_file(path: Path, signature: tuple[int, int] | None) -> _IgnoreRules | None:
+    """Return compiled rules for an ignore file with known ``_file_signature``.
+
+    Compiled rules are cached by path and reused while the signature matches.
+    """
+    if signature is None:
+        return None
+    key = str(path)
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        cached = _RULES_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            _RULES_CACHE.move_to_end(key)
+            return cached[1]
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    rules = _IgnoreRules.from_lines(text.splitlines())
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        _RULES_CACHE[key] = (signature, rules)
+        _RULES_CACHE.move_to_end(key)
+        while len(_RULES_CACHE) > GITIGNORE_RULES_CACHE_MAX:
+            _RULES_CACHE.popitem(last=False)
+    return rules
+
+
+def _find_repo(start: Path) -> tuple[Path | None, Path | None, Path | None]:
+    """Return ``(worktree_root, git_dir, common_dir)`` for ``start``, if any."""
+    for candidate in (start, *start.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8", errors="replace").strip()
+            except OSError:
+                continue
+            if not content.startswith("gitdir:"):
+                continue
+            git_dir_raw = Path(content[len("gitdir:") :].strip())
+            git_dir = git_dir_raw if git_dir_raw.is_absolute() else candidate / git_dir_raw
+        else:
+            continue
+        git_dir = git_dir.resolve()
+        common_dir = git_dir
+        try:
+            common_raw = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+        except OSError:
+            common_raw = ""
+        if common_raw:
+            common_path = Path(common_raw)
+            common_dir = (common_path if common_path.is_absolute() else git_dir / common_path).resolve()
+        return candidate, git_dir, common_dir
+    return None, None, None
+
+
+def _config_excludes_file(config_paths: list[Path]) -> Path | None:
+    """Return ``core.excludesFile`` from the last git config that sets it."""
+    found: str | None = None
+    for config_path in config_paths:
+        try:
+            lines = config_path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+        section = ""
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line or line[0] in "#;":
+                continue
+            if line.startswith("["):
+                section = line[1 : line.find("]")].strip().lower() if "]" in line else ""
+                continue
+            if section != "core" or "=" not in line:
+                continue
+            key, _sep, value = line.partition("=")
+            if key.strip().lower() != "excludesfile":
+                continue
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            found = value or None
+    if found is None:
+        return None
+    return Path(os.path.expanduser(found))
+
+
+def _global_excludes_file(common_dir: Path | None) -> Path:
+    """Resolve the user-level excludes file like git does."""
+    home = Path(os.path.expanduser("~"))
+    xdg_config = Path(os.environ.get("XDG_CONFIG_HOME") or home / ".config")
+    config_paths = [xdg_config / "git" / "config", home / ".gitconfig"]
+    if common_dir is not None:
+        config_paths.append(common_dir / "config")
+    configured = _config_excludes_file(config_paths)
+    return configured if configured is not None else xdg_config / "git" / "ignore"
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Decode git's offset varint used by index v4 path compression."""
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
+
+
+def _parse_index_paths(data: bytes, hash_bytes: int = 20) -> list[str]:
+    """Return entry paths from raw git index bytes (versions 2-4)."""
+    if len(data) < _INDEX_HEADER.size:
+        return []
+    signature, version, count = _INDEX_HEADER.unpack_from(data, 0)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        return []
+    paths: list[str] = []
+    offset = _INDEX_HEADER.size
+    fixed = _INDEX_ENTRY_FIXED_BYTES + hash_bytes
+    previous = b""
+    for _ in range(count):
+        entry_start = offset
+        flags_offset = entry_start + fixed
+        if flags_offset + 2 > len(data):
+            break
+        (flags,) = struct.unpack_from(">H", data, flags_offset)
+        path_offset = flags_offset + 2
+        if version >= 3 and flags & _INDEX_EXTENDED_FLAG:
+            path_offset += 2
+        if version == 4:
+            strip, path_offset = _read_varint(data, path_offset)
+            end = data.index(b"\x00", path_offset)
+            raw_path = previous[: len(previous) - strip] + data[path_offset:end]
+            offset = end + 1
+        else:
+            name_length = flags & _INDEX_NAME_MASK
+            end = path_offset + name_length if name_length < _INDEX_NAME_MASK else data.index(b"\x00", path_offset)
+            raw_path = data[path_offset:end]
+            entry_length = end - entry_start
+            offset = entry_start + ((entry_length + 8) & ~7)
+        previous = raw_path
+        paths.append(raw_path.decode("utf-8", errors="surrogateescape"))
+    return paths
+
+
+def _load_tracked_paths(git_dir: Path | None, common_dir: Path | None) -> tuple[frozenset[str], frozenset[str]]:
+    """Return ``(tracked_files, tracked_dirs)`` from the index, cached by mtime."""
+    if git_dir is None:
+        return frozenset(), frozenset()
+    index_path = git_dir / "index"
+    signature = _file_signature(index_path)
+    if signature is None:
+        return frozenset(), frozenset()
+    key = str(index_path)
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        cached = _TRACKED_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+    hash_bytes = 20
+    config_dir = common_dir or git_dir
+    try:
+        config_text = (config_dir / "config").read_text(encoding="utf-8", errors="replace").lower()
+    except OSError:
+        config_text = ""
+    if re.search(r"objectformat\s*=\s*sha256", config_text):
+        hash_bytes = 32
+    try:
+        data = index_path.read_bytes()
+        paths = _parse_index_paths(data, hash_bytes)
+    except (OSError, ValueError, struct.error):
+        paths = []
+    tracked_dirs: set[str] = set()
+    for rel_path in paths:
+        slash = rel_path.rfind("/")
+        while slash > 0:
+            parent = rel_path[:slash]
+            if parent in tracked_dirs:
+                break
+            tracked_dirs.add(parent)
+            slash = parent.rfind("/")
+    tracked = (frozenset(paths), frozenset(tracked_dirs))
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        _TRACKED_CACHE[key] = (signature, tracked[0], tracked[1])
+    return tracked
+
+
+@dataclass
+class GitIgnoreMatcher:
+    """In-process gitignore evaluator for a project subtree.
+
+    ``base`` is the repository worktree root (or ``root`` outside a repo);
+    rule files are resolved relative to it. Per-directory rules and ancestor
+    ignore decisions are memoized for the matcher's lifetime. ``sources``
+    records the stat signature of every rule file and index the matcher has
+    read (including probed-but-missing ``.gitignore`` files), so staleness is
+    detected without a time limit.
     """
 
     root: Path
-    ignored_files: frozenset[Path]
-    ignored_dirs: frozenset[Path]
+    base: Path
+    global_rules: tuple[_IgnoreRules, ...] = ()
+    tracked_files: frozenset[str] = frozenset()
+    tracked_dirs: frozenset[str] = frozenset()
+    sources: dict[Path, tuple[int, int] | None] = field(default_factory=dict, repr=False)
+    _dir_rules: dict[str, _IgnoreRules | None] = field(default_factory=dict, repr=False)
+    _excluded_dirs: dict[str, bool] = field(default_factory=dict, repr=False)
+    _relative_dirs: dict[str, str | None] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _rules_for_dir(self, rel_dir: str) -> _IgnoreRules | None:
+        """Return compiled ``.gitignore`` rules for ``rel_dir``, loading lazily."""
+        try:
+            return self._dir_rules[rel_dir]
+        except KeyError:
+            pass
+        directory = self.base / rel_dir if rel_dir else self.base
+        gitignore_path = directory / ".gitignore"
+        signature = _file_signature(gitignore_path)
+        rules = _load_rules_file(gitignore_path, signature)
+        self.sources[gitignore_path] = signature
+        self._dir_rules[rel_dir] = rules
+        return rules
+
+    def is_stale(self) -> bool:
+        """Return whether any rule file or the index changed since it was read."""
+        with self._lock:
+            sources = list(self.sources.items())
+        return any(_file_signature(path) != signature for path, signature in sources)
+
+    def _matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Return whether patterns exclude ``rel_path`` itself (ancestors aside)."""
+        slash = len(rel_path)
+        while True:
+            slash = rel_path.rfind("/", 0, slash)
+            rel_dir = rel_path[:slash] if slash > 0 else ""
+            rules = self._rules_for_dir(rel_dir)
+            if rules is not None:
+                verdict = rules.match(rel_path[slash + 1 :] if slash > 0 else rel_path, is_dir)
+                if verdict is not None:
+                    return verdict
+            if slash <= 0:
+                break
+        for rules in self.global_rules:
+            verdict = rules.match(rel_path, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
 
-    def is_ignored(self, path: Path) -> bool:
+    def _dir_excluded(self, rel_dir: str) -> bool:
+        """Return whether patterns exclude directory ``rel_dir`` or an ancestor."""
+        cached = self._excluded_dirs.get(rel_dir)
+        if cached is not None:
+            return cached
+        slash = rel_dir.rfind("/")
+        excluded = (slash > 0 and self._dir_excluded(rel_dir[:slash])) or self._matches(rel_dir, True)
+        self._excluded_dirs[rel_dir] = excluded
+        return excluded
+
+    def is_ignored_relative(self, rel_path: str, is_dir: bool) -> bool:
+        """Return whether ``rel_path`` (posix, relative to ``base``) is ignored."""
+        if not rel_path or rel_path == ".git" or rel_path.startswith(".git/"):
+            return False
+        with self._lock:
+            if is_dir:
+                # Directories holding tracked files stay visible, like ``git ls-files -o``.
+                return self._dir_excluded(rel_path) and rel_path not in self.tracked_dirs
+            if rel_path in self.tracked_files:
+                return False
+            slash = rel_path.rfind("/")
+            if slash > 0 and self._dir_excluded(rel_path[:slash]):
+                return True
+            return self._matches(rel_path, False)
+
+    def _relative_dir(self, directory: Path) -> str | None:
+        """Return ``directory`` relative to ``base`` as posix text, or ``None``.
+
+        Paths under ``base`` are recognized by string prefix; only other
+        spellings (symlinks, relative paths) pay for one ``resolve`` per
+        directory.
+        """
+        key = str(directory)
+        try:
+            return self._relative_dirs[key]
+        except KeyError:
+            pass
+        base_text = str(self.base)
+        if key == base_text:
+            rel_dir: str | None = ""
+        elif key.startswith(base_text.rstrip(os.sep) + os.sep):
+            rel_dir = directory.relative_to(self.base).as_posix()
+        else:
+            try:
+                rel_dir = directory.resolve().relative_to(self.base).as_posix()
+            except (OSError, ValueError):
+                rel_dir = None
+            if rel_dir == ".":
+                rel_dir = ""
+        self._relative_dirs[key] = rel_dir
+        return rel_dir
+
+    def filter_children(
+        self,
+        directory: Path,
+        names: Iterable[str],
+        dir_names: Container[str] = frozenset(),
+    ) -> list[str]:
+        """Return ``names`` in ``directory`` that are not ignored, in input order.
+
+        ``dir_names`` marks which names are directories. Checks run on relative
+        strings: the directory is located once, its own exclusion is decided
+        once, and excluded subdirectories are memoized for later scans, so no
+        per-child path resolution or stat happens.
+        """
+        rel_dir = self._relative_dir(directory)
+        if rel_dir is None:
+            return list(names)
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        kept: list[str] = []
+        with self._lock:
+            parent_excluded = bool(rel_dir) and self._dir_excluded(rel_dir)
+            for name in names:
+                rel_path = prefix + name
+                if rel_path == ".git":
+                    kept.append(name)
+                    continue
+                if name in dir_names:
+                    excluded = self._excluded_dirs.get(rel_path)
+                    if excluded is None:
+                        excluded = parent_excluded or self._matches(rel_path, True)
+                        self._excluded_dirs[rel_path] = excluded
+                    if excluded and rel_path not in self.tracked_dirs:
+                        continue
+                elif rel_path not in self.tracked_files and (
+                    parent_excluded or self._matches(rel_path, False)
+                ):
+                    continue
+                kept.append(name)
+        return kept
+
+    def is_ignored(self, path: Path, is_dir: bool | None = None) -> bool:
         """Return whether ``path`` is ignored under this matcher root."""
         resolved = path.resolve()
         if not _is_within(resolved, self.root):
             return False
-        if resolved in self.ignored_files:
-            return True
-        current = resolved
-        while True:
-            if current in self.ignored_dirs:
-                return True
-            if current == self.root:
-                break
-            parent = current.parent
-            if parent == current:
-                break
-            current = parent
-        return False
+        try:
+            rel_path = resolved.relative_to(self.base).as_posix()
+        except ValueError:
+            return False
+        if rel_path == ".":
+            return False
+        if is_dir is None:
+            is_dir = resolved.is_dir()
+        return self.is_ignored_relative(rel_path, is_dir)
 
 
 def _load_matcher(root: Path) -> GitIgnoreMatcher | None:
-    """Build a matcher by querying git for ignored files/directories.
+    """Build an in-process matcher for ``root``.
 
-    Returns ``None`` when git is unavailable, ``root`` is not inside a repo, or
-    any probing command fails. The matcher only tracks ignored paths within
-    ``root`` (even when the git repo root is higher).
+    Inside a repository, rules are evaluated relative to the worktree root and
+    include ``info/exclude``; outside one, ``root`` acts as the base. Returns
+    ``None`` when ``root`` is not a directory.
     """
-    if shutil.which("git") is None:
-        return None
-
     root = root.resolve()
-    try:
-        top_proc = subprocess.run(
-            ["git", "-C", str(root), "rev-parse", "--show-toplevel"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True,
-            check=True,
-        )
-    except Exception:
+    if not root.is_dir():
         return None
+    repo_root, git_dir, common_dir = _find_repo(root)
+    base = repo_root.resolve() if repo_root is not None else root
+
+    sources: dict[Path, tuple[int, int] | None] = {}
+    global_paths: list[Path] = []
+    if common_dir is not None:
+        global_paths.append(common_dir / "info" / "exclude")
+    global_paths.append(_global_excludes_file(common_dir))
+    global_rules: list[_IgnoreRules] = []
+    for path in global_paths:
+        signature = _file_signature(path)
+        sources[path] = signature
+        rules = _load_rules_file(path, signature)
+        if rules is not None:
+            global_rules.append(rules)
+
+    if git_dir is not None:
+        sources[git_dir / "index"] = _file_signature(git_dir / "index")
+    tracked_files, tracked_dirs = _load_tracked_paths(git_dir, common_dir)
+    return GitIgnoreMatcher(
+        root=root,
+        base=base,
+        global_rules=tuple(global_rules),
+        tracked_files=tracked_files,
+        tracked_dirs=tracked_dirs,
+        sources=sources,
+    )
 
-    top_level = top_proc.stdout.strip()
-    if not top_level:
-        return None
 
-    repo_root = Path(top_level).resolve()
-    if not _is_within(root, repo_root):
-        return None
+def _store_matcher(key: str, matcher: GitIgnoreMatcher | None) -> None:
+    """Insert ``matcher`` into the bounded LRU cache."""
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        _GITIGNORE_MATCHER_CACHE[key] = matcher
+        _GITIGNORE_MATCHER_CACHE.move_to_end(key)
+        while len(_GITIGNORE_MATCHER_CACHE) > GITIGNORE_MATCHER_CACHE_MAX:
+            _GITIGNORE_MATCHER_CACHE.popitem(last=False)
+
+
+def _stale_check_due(key: str) -> bool:
+    """Return whether the matcher under ``key`` may re-stat its sources now.
+
+    Matchers can hold hundreds of probed ``.gitignore`` paths and every
+    directory listing asks for one, so sources are checked at most once per
+    ``GITIGNORE_STALE_CHECK_SECONDS`` per root.
+    """
+    now = time.monotonic()
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        if now - _STALE_CHECKED_AT.get(key, float("-inf")) < GITIGNORE_STALE_CHECK_SECONDS:
+            return False
+        _STALE_CHECKED_AT[key] = now
+        return True
 
+
+def _refresh_matcher(key: str, root: Path) -> None:
+    """Background worker: rebuild one stale matcher and publish it."""
     try:
-        proc = subprocess.run(
-            [
-                "git",
-                "-C",
-                str(repo_root),
-                "ls-files",
-                "-z",
-                "--others",
-                "-i",
-                "--exclude-standard",
-                "--directory",
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            check=True,
-        )
+        matcher = _load_matcher(root)
     except Exception:
-        return None
+        matcher = None
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        if _GITIGNORE_REFRESH_THREADS.get(key) is not threading.current_thread():
+            return  # cache was cleared while loading
+        del _GITIGNORE_REFRESH_THREADS[key]
+        _store_matcher(key, matcher)
 
-    ignored_files: set[Path] = set()
-    ignored_dirs: set[Path] = set()
-    for raw in proc.stdout.split(b"\x00"):
-        if not raw:
-            continue
-        rel = raw.decode("utf-8", errors="replace")
-        is_dir = rel.endswith("/")
-        rel = rel.rstrip("/")
-        if not rel:
-            continue
-        abs_path = (repo_root / rel).resolve()
-        if not _is_within(abs_path, root):
-            continue
-        if is_dir:
-            ignored_dirs.add(abs_path)
-            continue
-        if abs_path.is_dir():
-            ignored_dirs.add(abs_path)
-        else:
-            ignored_files.add(abs_path)
 
-    return GitIgnoreMatcher(
-        root=root,
-        ignored_files=frozenset(ignored_files),
-        ignored_dirs=frozenset(ignored_dirs),
-    )
+def wait_for_gitignore_refresh(timeout: float | None = None) -> None:
+    """Block until in-flight background matcher refreshes finish."""
+    with _GITIGNORE_MATCHER_CACHE_LOCK:
+        threads = list(_GITIGNORE_REFRESH_THREADS.values())
+    for thread in threads:
+        thread.join(timeout)
 
 
 def get_gitignore_matcher(root: Path) -> GitIgnoreMatcher | None:
-    """Return cached matcher for ``root`` with bounded staleness."""
+    """Return the cached matcher for ``root``, refreshing it when sources change.
+
+    A matcher stays valid until one of its ``sources`` (rule files it read,
+    ``info/exclude``, the excludes file, the index) changes on disk; sources
+    are re-checked at most once per ``GITIGNORE_STALE_CHECK_SECONDS``. A stale
+    matcher keeps serving while a replacement is built on a background
+    thread; only the first request for a root loads synchronously.
+    """
     resolved_root = root.resolve()
     key = str(resolved_root)
-    try:
-        root_mtime_ns: int | None = int(resolved_root.stat().st_mtime_ns)
-    except Exception:
-        root_mtime_ns = None
-    now = time.monotonic()
 
     with _GITIGNORE_MATCHER_CACHE_LOCK:
+        cached_present = key in _GITIGNORE_MATCHER_CACHE
         cached = _GITIGNORE_MATCHER_CACHE.get(key)
-        if cached is not None:
-            cache_age = now - cached.loaded_at
-            if (
-                cached.root_mtime_ns == root_mtime_ns
-                and cache_age <= GITIGNORE_MATCHER_CACHE_TTL_SECONDS
-            ):
-                _GITIGNORE_MATCHER_CACHE.move_to_end(key)
-                return cached.matcher
+        if cached_present:
+            _GITIGNORE_MATCHER_CACHE.move_to_end(key)
+            refreshing = key in _GITIGNORE_REFRESH_THREADS
+
+    if cached_present and (cached is not None or not resolved_root.is_dir()):
+        if cached is not None and not refreshing and _stale_check_due(key) and cached.is_stale():
+            with _GITIGNORE_MATCHER_CACHE_LOCK:
+                if key not in _GITIGNORE_REFRESH_THREADS:
+                    thread = threading.Thread(
+                        target=_refresh_matcher,
+                        args=(key, resolved_root),
+                        name="lazyviewer-gitignore-refresh",
+                        daemon=True,
+                    )
+                    _GITIGNORE_REFRESH_THREADS[key] = thread
+                    thread.start()
+        return cached
 
     matcher = _load_matcher(resolved_root)
+    _store_matcher(key, matcher)
     with _GITIGNORE_MATCHER_CACHE_LOCK:
-        _GITIGNORE_MATCHER_CACHE[key] = _MatcherCacheEntry(
-            matcher=matcher,
-            root_mtime_ns=root_mtime_ns,
-            loaded_at=now,
-        )
-        _GITIGNORE_MATCHER_CACHE.move_to_end(key)
-        while len(_GITIGNORE_MATCHER_CACHE) > GITIGNORE_MATCHER_CACHE_MAX:
-            _GITIGNORE_MATCHER_CACHE.popitem(last=False)
-    return matcher
+        _STALE_CHECKED_AT[key] = time.monotonic()
+    return matcher
\ No newline at end of file
@@ -13,6 +13,8 @@ from ..tree_model import (
     next_directory_entry_index,
     next_index_after_directory_subtree,
     next_opened_directory_entry_index,
+    parent_directory_entry_index,
+    path_entry_index,
 )
 from ..tree_pane.workspace_roots import normalized_workspace_expanded_sections
 from .key_common import default_max_horizontal_text_offset, effective_max_start
@@ -50,6 +52,9 @@ class NormalKeyContext:
     launch_editor_for_path: Callable[[Path], str | None]
     jump_to_next_git_modified: Callable[[int], bool]
     max_horizontal_text_offset: Callable[[], int] = default_max_horizontal_text_offset
+    toggle_blame: Callable[[], None] | None = None
+    expand_subtree: Callable[..., None] | None = None
+    cancel_subtree_expand: Callable[[], bool] | None = None
 
 
 class _ContextHostAdapter:
@@ -68,6 +73,9 @@ class _ContextHostAdapter:
         self.mark_tree_watch_dirty = context.mark_tree_watch_dirty
         self.launch_editor_for_path = context.launch_editor_for_path
         self.jump_to_next_git_modified = context.jump_to_next_git_modified
+        self.toggle_blame = context.toggle_blame
+        self.expand_subtree = context.expand_subtree
+        self.cancel_subtree_expand = context.cancel_subtree_expand
         self.tree_pane = SimpleNamespace(
             picker_panel=SimpleNamespace(open_symbol_picker=context.open_symbol_picker),
             navigation=SimpleNamespace(
@@ -153,6 +161,9 @@ def _handle_normal_key(
     toggle_help_panel = navigation.toggle_help_panel
     toggle_git_features = host.toggle_git_features
     launch_lazygit = host.launch_lazygit
+    toggle_blame = getattr(host, "toggle_blame", None)
+    expand_subtree = getattr(host, "expand_subtree", None)
+    cancel_subtree_expand = getattr(host, "cancel_subtree_expand", None)
     handle_tree_mouse_wheel = getattr(host, "handle_tree_mouse_wheel", source_pane.handle_tree_mouse_wheel)
     handle_tree_mouse_click = getattr(host, "handle_tree_mouse_click", None)
     if handle_tree_mouse_click is None:
@@ -301,7 +312,14 @@ def _handle_normal_key(
         toggle_git_features()
         return False
 
+    def cancel_subtree_expand_action() -> bool | None:
+        """Stop a running recursive expansion instead of quitting."""
+        if cancel_subtree_expand is None or not cancel_subtree_expand():
+            return None
+        return False
+
     global_exact_bindings = KeyComboRegistry().register_bindings(
+        KeyComboBinding(("ESC",), cancel_subtree_expand_action),
         KeyComboBinding(("?", "CTRL_QUESTION"), toggle_help_panel_action),
         KeyComboBinding(("CTRL_G",), launch_lazygit_action),
         KeyComboBinding(("CTRL_O",), toggle_git_features_action),
@@ -315,17 +333,6 @@ def _handle_normal_key(
             direction = -1 if key == "CTRL_U" else 1
             jump_steps = 1 if count is None else max(1, min(10, count))
 
-            def parent_directory_index(from_idx: int) -> int | None:
-                """Return nearest ancestor directory index above ``from_idx``."""
-                current_depth = state.tree_entries[from_idx].depth
-                idx = from_idx - 1
-                while idx >= 0:
-                    candidate = state.tree_entries[idx]
-                    if candidate.is_dir and candidate.depth < current_depth:
-                        return idx
-                    idx -= 1
-                return None
-
             def smart_directory_jump(from_idx: int, jump_direction: int) -> int | None:
                 """Compute contextual ctrl-u/ctrl-d tree jump destination."""
                 if jump_direction < 0:
@@ -337,7 +344,7 @@ def _handle_normal_key(
                     )
                     if prev_opened is not None:
                         return prev_opened
-                    return parent_directory_index(from_idx)
+                    return parent_directory_entry_index(state.tree_entries, from_idx)
 
                 current_entry = state.tree_entries[from_idx]
                 if current_entry.is_dir and current_entry.path.resolve() in state.expanded:
@@ -421,6 +428,13 @@ def _handle_normal_key(
         toggle_tree_size_labels()
         return False
 
+    def toggle_blame_action() -> bool | None:
+        """Toggle streaming git blame gutter in the source pane."""
+        if toggle_blame is None:
+            return None
+        toggle_blame()
+        return False
+
     def edit_selected_target_action() -> bool:
         """Open selected path in editor and refresh preview/tree state."""
         edit_target: Path | None = None
@@ -469,6 +483,7 @@ def _handle_normal_key(
     mode_exact_bindings = KeyComboRegistry().register_bindings(
         KeyComboBinding(("R",), reroot_to_parent_action),
         KeyComboBinding(("S",), toggle_tree_size_labels_action),
+        KeyComboBinding(("b",), toggle_blame_action),
         KeyComboBinding(("a",), add_workspace_root_action),
         KeyComboBinding(("d",), remove_workspace_root_action),
         KeyComboBinding(("r",), reroot_to_selected_target_action),
@@ -556,13 +571,11 @@ def _handle_normal_key(
             )
             refresh_tree_after_directory_change(resolved)
         else:
-            parent = entry.path.parent.resolve()
-            for idx, candidate in enumerate(state.tree_entries):
-                if candidate.path.resolve() == parent:
-                    state.selected_idx = idx
-                    preview_selected_entry()
-                    state.dirty = True
-                    break
+            parent_idx = path_entry_index(state.tree_entries, entry.path.parent.resolve())
+            if parent_idx is not None:
+                state.selected_idx = parent_idx
+                preview_selected_entry()
+                state.dirty = True
         return False
 
     def toggle_directory_tree_entry_action() -> bool | None:
@@ -591,6 +604,25 @@ def _handle_normal_key(
         refresh_tree_after_directory_change(resolved)
         return False
 
+    def expand_subtree_action() -> bool | None:
+        """Expand selected directory recursively in the background."""
+        if expand_subtree is None or state.tree_filter_active:
+            return None
+        entry = state.tree_entries[state.selected_idx]
+        if not entry.is_dir:
+            return None
+        resolved = entry.path.resolve()
+        scope_section, scope_root = entry_workspace_scope(entry)
+        set_directory_expanded_state(
+            resolved,
+            True,
+            workspace_section=scope_section,
+            workspace_root=scope_root,
+        )
+        refresh_tree_after_directory_change(resolved)
+        expand_subtree(resolved, workspace_section=scope_section, workspace_root=scope_root)
+        return False
+
     if state.browser_visible:
         browser_lower_bindings = KeyComboRegistry(normalize=str.lower).register_bindings(
             KeyComboBinding(("j",), move_tree_down_action),
@@ -600,6 +632,7 @@ def _handle_normal_key(
         )
         browser_exact_bindings = KeyComboRegistry().register_bindings(
             KeyComboBinding(("ENTER",), toggle_directory_tree_entry_action),
+            KeyComboBinding(("O",), expand_subtree_action),
         )
         handled = browser_lower_bindings.dispatch(key)
         if handled is not None:
@@ -28,7 +28,7 @@ def _read_ready_byte(fd: int, timeout_ms: int) -> bytes | None:
     return ch
 
 
-def read_key(fd: int, timeout_ms: int | None = None) -> str:
+def read_key(fd: int, timeout_ms: int | None = None, wake_fds: tuple[int, ...] = ()) -> str:
     """Decode one terminal input event into a normalized key token.
 
     This function supports:
@@ -39,13 +39,16 @@ def read_key(fd: int, timeout_ms: int | None = None) -> str:
 
     Bytes that arrive after a lone ``ESC`` and are not part of ``ESC [`` are
     pushed into ``_PENDING_BYTES`` so the next ``read_key`` call receives them.
+
+    Readiness on any of ``wake_fds`` ends the wait early and returns ``""`` like
+    a timeout; callers are responsible for draining those descriptors.
     """
     if _PENDING_BYTES:
         ch = _PENDING_BYTES.pop(0)
     else:
         if timeout_ms is not None:
-            ready, _, _ = select.select([fd], [], [], max(0.0, timeout_ms / 1000.0))
-            if not ready:
+            ready, _, _ = select.select([fd, *wake_fds], [], [], max(0.0, timeout_ms / 1000.0))
+            if fd not in ready:
                 return ""
 
         ch = os.read(fd, 1)
@@ -7,12 +7,14 @@ and status bar text, then writes one atomic frame to stdout.
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 
 from .ansi import ANSI_ESCAPE_RE, char_display_width, clip_ansi_line
+from ..git_blame import BlameView
 from ..source_pane.renderer import SourcePaneRenderer
 from ..tree_pane.rendering import TreePaneRenderer
 from .help import (
@@ -30,7 +32,7 @@ class RenderContext:
 
     text_lines: list[str]
     text_start: int
-    tree_entries: list[TreeEntry]
+    tree_entries: Sequence[TreeEntry]
     tree_start: int
     tree_selected: int
     max_lines: int
@@ -68,14 +70,16 @@ class RenderContext:
     picker_focus: str = "query"
     picker_list_start: int = 0
     picker_message: str = ""
-    git_status_overlay: dict[Path, int] | None = None
+    git_status_overlay: Mapping[Path, int] | None = None
     tree_search_query: str = ""
     text_search_query: str = ""
     text_search_current_line: int = 0
     text_search_current_column: int = 0
     preview_is_git_diff: bool = False
+    preview_diff_folds: Mapping[int, tuple[int, int]] | None = None
     source_selection_anchor: tuple[int, int] | None = None
     source_selection_focus: tuple[int, int] | None = None
+    blame_view: BlameView | None = None
     theme: UITheme = DEFAULT_THEME
 
 
@@ -128,8 +132,10 @@ def render_dual_page_context(context: RenderContext) -> None:
         text_search_current_line=context.text_search_current_line,
         text_search_current_column=context.text_search_current_column,
         preview_is_git_diff=context.preview_is_git_diff,
+        preview_diff_folds=context.preview_diff_folds,
         source_selection_anchor=context.source_selection_anchor,
         source_selection_focus=context.source_selection_focus,
+        blame_view=context.blame_view,
         theme=context.theme,
     )
 
@@ -170,7 +176,7 @@ def _compose_status_left_text(
 def render_dual_page(
     text_lines: list[str],
     text_start: int,
-    tree_entries: list[TreeEntry],
+    tree_entries: Sequence[TreeEntry],
     tree_start: int,
     tree_selected: int,
     max_lines: int,
@@ -206,16 +212,18 @@ def render_dual_page(
     picker_focus: str = "query",
     picker_list_start: int = 0,
     picker_message: str = "",
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     tree_search_query: str = "",
     text_search_query: str = "",
     text_search_current_line: int = 0,
     text_search_current_column: int = 0,
     preview_is_git_diff: bool = False,
+    preview_diff_folds: Mapping[int, tuple[int, int]] | None = None,
     source_selection_anchor: tuple[int, int] | None = None,
     source_selection_focus: tuple[int, int] | None = None,
     tree_roots: list[Path] | None = None,
     workspace_expanded: list[set[Path]] | None = None,
+    blame_view: BlameView | None = None,
     theme: UITheme | None = None,
 ) -> None:
     """Render one full terminal frame for split or text-only mode."""
@@ -254,6 +262,8 @@ def render_dual_page(
             preview_is_git_diff=preview_is_git_diff,
             source_selection_anchor=source_selection_anchor,
             source_selection_focus=source_selection_focus,
+            blame_view=blame_view,
+            diff_folds=preview_diff_folds,
         )
         text_percent = source_renderer.text_percent
         status_start = source_renderer.status_start
@@ -303,6 +313,8 @@ def render_dual_page(
         preview_is_git_diff=preview_is_git_diff,
         source_selection_anchor=source_selection_anchor,
         source_selection_focus=source_selection_focus,
+        blame_view=blame_view,
+        diff_folds=preview_diff_folds,
     )
     text_percent = source_renderer.text_percent
     status_start = source_renderer.status_start
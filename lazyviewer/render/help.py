@@ -15,7 +15,7 @@ from ..ui_theme import DEFAULT_THEME, UITheme
 HELP_PANEL_TREE_LINES: tuple[str, ...] = (
     "\033[1;38;5;81mTREE\033[0m",
     "\033[38;5;229mh/j/k/l\033[0m move  \033[38;5;229mEnter\033[0m toggle dir",
-    "\033[38;5;229mCtrl+U/D\033[0m jump dirs",
+    "\033[38;5;229mCtrl+U/D\033[0m jump dirs  \033[38;5;229mO\033[0m expand all",
     "\033[38;5;229mr\033[0m set root to root selected",
     "\033[38;5;229mR\033[0m set root to parent",
     "\033[38;5;229ma\033[0m add selected dir as root",
@@ -32,7 +32,7 @@ HELP_PANEL_TEXT_LINES: tuple[str, ...] = (
     "\033[38;5;229mUp/Down\033[0m line  \033[38;5;229mu\033[0m half up",
     "\033[38;5;229mSpace/f/B\033[0m page  \033[38;5;229mg/G/10G\033[0m jump",
     "\033[38;5;229mLeft/Right\033[0m x-scroll  \033[38;5;229mwheel L/R\033[0m x-scroll",
-    "\033[38;5;229mw\033[0m wrap  \033[38;5;229me\033[0m edit",
+    "\033[38;5;229mw\033[0m wrap  \033[38;5;229me\033[0m edit  \033[38;5;229mb\033[0m blame",
     "\033[38;5;229m:\033[0m commands  \033[38;5;229ms\033[0m symbols",
     "\033[38;5;229mn/N/p\033[0m next/prev modification",
     "\033[38;5;229m.\033[0m show hidden+ignored  \033[38;5;229mAlt+Left/Right\033[0m history",
@@ -43,9 +43,9 @@ HELP_PANEL_TEXT_ONLY_LINES: tuple[str, ...] = (
     "\033[1;38;5;81mKEYS\033[0m",
     "\033[38;5;229mUp/Down\033[0m  \033[38;5;229md/u\033[0m  \033[38;5;229mSpace/f/B\033[0m  \033[38;5;229mg/G/10G\033[0m",
     "\033[38;5;229mLeft/Right\033[0m x-scroll  \033[38;5;229mwheel L/R\033[0m x-scroll  \033[38;5;229mw\033[0m wrap",
-    "\033[38;5;229mh/j/k/l\033[0m  \033[38;5;229mEnter\033[0m  \033[38;5;229mShift+Left/Right\033[0m",
+    "\033[38;5;229mh/j/k/l\033[0m  \033[38;5;229mEnter\033[0m  \033[38;5;229mO\033[0m  \033[38;5;229mShift+Left/Right\033[0m",
     "\033[38;5;229mCtrl+P\033[0m jump file  \033[38;5;229m/\033[0m search all files",
-    "\033[38;5;229me\033[0m edit  \033[38;5;229ms\033[0m symbols  \033[38;5;229m:\033[0m commands",
+    "\033[38;5;229me\033[0m edit  \033[38;5;229ms\033[0m symbols  \033[38;5;229mb\033[0m blame  \033[38;5;229m:\033[0m commands",
     "\033[38;5;229mn/N/p\033[0m mods  \033[38;5;229mCtrl+G\033[0m lazygit  \033[38;5;229mCtrl+O\033[0m git on/off",
     "\033[38;5;229mr/R\033[0m root  \033[38;5;229mm{key}/'{key}\033[0m marks",
     "\033[38;5;229m.\033[0m show hidden+ignored  \033[38;5;229mAlt+Left/Right\033[0m  \033[38;5;229m?\033[0m/\033[38;5;229mq\033[0m",
@@ -218,12 +218,15 @@ def render_help_page(width: int, height: int, theme: UITheme | None = None) -> N
         "\033[1;38;5;81mTree pane\033[0m",
         "  h/j/k/l move/select   l open/expand   h collapse/parent",
         "  Enter toggles selected directory",
+        "  O expand selected directory recursively (streams in, row budget; Esc stops)",
         "  mouse wheel scrolls tree (when pointer is on left pane)",
         "  click select + preview   double-click toggle dir/open file",
         "",
         "\033[1;38;5;81mSource pane\033[0m",
         "  \033[38;5;229mUp/Down\033[0m line   \033[38;5;229mu\033[0m half-page up   \033[38;5;229mSpace/f/B\033[0m page   \033[38;5;229mg/G\033[0m top/bottom   \033[38;5;229m10G\033[0m goto",
         "  \033[38;5;229mw\033[0m toggle wrap   \033[38;5;229mLeft/Right\033[0m horizontal scroll (wrap off)   \033[38;5;229me\033[0m edit in $EDITOR",
+        "  \033[38;5;229mb\033[0m toggle git blame gutter (streams in the background, cached per file version)",
+        "  click a \u22ef unchanged-lines fold row in a large diff to expand it (mouse only)",
         "  drag in source pane to copy selected text to clipboard",
         "  mouse wheel scrolls source (left/right wheel x-scrolls when content overflows)",
         "",
@@ -31,6 +31,7 @@ from .git_jumps import (
     GitModifiedJumpNavigator,
 )
 from ..source_pane import SourcePane
+from ..source_pane.blame import SourceBlameController
 from .application import App
 from .directory_prefetch import (
     DirectoryPreviewPrefetchResult,
@@ -40,6 +41,9 @@ from .index_warmup import TreeFilterIndexWarmupScheduler
 from .layout import PagerLayout
 from .config import (
     load_content_search_left_pane_percent,
+    load_diff_base,
+    load_diff_context_lines,
+    load_subtree_expand_max_entries,
     load_left_pane_percent,
     load_named_marks,
     load_theme_name,
@@ -48,9 +52,13 @@ from .config import (
     load_show_hidden,
 )
 from .editor import launch_editor
-from ..git_status import collect_git_status_overlay
+from ..git_blame import GitBlameService
+from ..git_revision import normalize_git_diff_base
+from ..git_status import collect_git_status_overlays
+from ..git_workspace import WorkspaceGitCoordinator
 from ..render import help_panel_row_count
 from .loop import RuntimeLoopTiming, run_main_loop
+from ..tree_pane.expand import SubtreeExpandController
 from ..tree_pane.pane import TreePane
 from ..search.fuzzy import collect_project_file_labels
 from .terminal import TerminalController
@@ -59,7 +67,15 @@ from ..tree_model import (
     clamp_left_width,
     compute_left_width,
 )
-from ..file_tree_model.watch import build_git_watch_signature, build_tree_watch_signature, resolve_git_paths
+from ..file_tree_model.doc_summary import load_doc_summary_store, save_doc_summary_store
+from ..file_tree_model.watch import (
+    GitControlWatcher,
+    TreeDirectoryWatcher,
+    build_git_watch_signature,
+    build_tree_watch_signature,
+    resolve_git_paths,
+    stat_tree_hot_paths,
+)
 from ..ui_theme import normalize_theme_name
 
 DOUBLE_CLICK_SECONDS = 0.35
@@ -67,6 +83,8 @@ FILTER_CURSOR_BLINK_SECONDS = 0.5
 TREE_FILTER_SPINNER_FRAME_SECONDS = 0.12
 GIT_STATUS_REFRESH_SECONDS = 2.0
 TREE_WATCH_POLL_SECONDS = 0.5
+TREE_WATCH_FULL_SIGNATURE_SECONDS = 30.0
+TREE_WATCH_QUIET_SECONDS = 0.1
 GIT_WATCH_POLL_SECONDS = 0.5
 GIT_FEATURES_DEFAULT_ENABLED = True
 TREE_SIZE_LABELS_DEFAULT_ENABLED = True
@@ -82,8 +100,12 @@ def run_pager(
     nopager: bool,
     theme_name: str | None = None,
     workspace_paths: list[Path] | None = None,
+    diff_base: str | None = None,
 ) -> None:
-    """Initialize pager runtime state, wire subsystems, and run event loop."""
+    """Initialize pager runtime state, wire subsystems, and run event loop.
+
+    ``diff_base`` overrides the configured git diff base (``HEAD`` by default).
+    """
     if nopager or not os.isatty(sys.stdin.fileno()):
         rendered = content
         if not no_color and os.isatty(sys.stdout.fileno()):
@@ -92,6 +114,7 @@ def run_pager(
         return
 
     selected_theme_name = normalize_theme_name(theme_name or load_theme_name())
+    load_doc_summary_store()
     state_bootstrap = AppStateBootstrap(
         skip_gitignored_for_hidden_mode=_skip_gitignored_for_hidden_mode,
         load_show_hidden=load_show_hidden,
@@ -105,6 +128,7 @@ def run_pager(
         tree_size_labels_default_enabled=TREE_SIZE_LABELS_DEFAULT_ENABLED,
         dir_preview_initial_max_entries=SourcePane.DIR_PREVIEW_INITIAL_MAX_ENTRIES,
         theme_name=selected_theme_name,
+        git_diff_base=normalize_git_diff_base(diff_base or load_diff_base()),
     )
     state = state_bootstrap.build_state(
         path=path,
@@ -112,6 +136,12 @@ def run_pager(
         no_color=no_color,
         workspace_paths=workspace_paths,
     )
+    saved_diff_context_lines = load_diff_context_lines()
+    if saved_diff_context_lines is not None:
+        state.diff_context_lines = saved_diff_context_lines
+    saved_subtree_expand_max_entries = load_subtree_expand_max_entries()
+    if saved_subtree_expand_max_entries is not None:
+        state.subtree_expand_max_entries = saved_subtree_expand_max_entries
 
     stdin_fd = sys.stdin.fileno()
     stdout_fd = sys.stdout.fileno()
@@ -142,7 +172,15 @@ def run_pager(
     save_left_pane_width_for_mode = layout.save_left_pane_width_for_mode
     rebuild_screen_lines = layout.rebuild_screen_lines
     show_inline_error = layout.show_inline_error
-    watch_refresh = TreePane.WatchRefreshContext()
+    git_workspace = WorkspaceGitCoordinator(
+        lambda tree_roots: collect_git_status_overlays(tree_roots, base=state.git_diff_base),
+        resolve_git_paths=resolve_git_paths,
+        build_git_watch_signature=build_git_watch_signature,
+    )
+    watch_refresh = TreePane.WatchRefreshContext(
+        git_workspace=git_workspace,
+        tree_watcher=TreeDirectoryWatcher.create(),
+    )
     mark_tree_watch_dirty = watch_refresh.mark_tree_dirty
     refresh_rendered_for_current_path = partial(
         SourcePane.refresh_rendered_for_current_path,
@@ -157,7 +195,7 @@ def run_pager(
         TreePane.refresh_git_status_overlay,
         state,
         refresh_rendered_for_current_path,
-        collect_git_status_overlay=collect_git_status_overlay,
+        collect_git_status_overlay=git_workspace.collect,
         monotonic=time.monotonic,
         status_refresh_seconds=GIT_STATUS_REFRESH_SECONDS,
     )
@@ -165,6 +203,7 @@ def run_pager(
         watch_refresh.reset_git_context,
         state,
         resolve_git_paths=resolve_git_paths,
+        create_git_watcher=GitControlWatcher.create,
     )
     maybe_refresh_tree_watch: Callable[[], None]
     maybe_refresh_git_watch = partial(
@@ -189,6 +228,11 @@ def run_pager(
         state,
         refresh_rendered_for_current_path,
     )
+    expand_diff_fold = partial(
+        SourcePane.expand_diff_fold,
+        state,
+        refresh_rendered_for_current_path_fn=refresh_rendered_for_current_path,
+    )
     preview_selected_entry: Callable[..., None]
 
     maybe_grow_directory_preview = partial(
@@ -204,6 +248,7 @@ def run_pager(
     prefetch_requested_entries = 0
     pending_async_preview_context: tuple[Path, bool, bool, bool] | None = None
     pending_async_preview_reset_scroll = False
+    doc_labels_applied: tuple[Path, int] | None = None
 
     def schedule_directory_preview_request(
         target: Path,
@@ -277,6 +322,7 @@ def run_pager(
         nonlocal prefetch_requested_entries
         nonlocal pending_async_preview_context
         nonlocal pending_async_preview_reset_scroll
+        nonlocal doc_labels_applied
         changed = False
         resolved_target = state.current_path.resolve()
         context = (
@@ -325,6 +371,16 @@ def run_pager(
             changed = True
             prefetch_requested_entries = max(prefetch_requested_entries, best_result.request.dir_max_entries)
 
+        if state.dir_preview_path == resolved_target:
+            # Doc labels land in the cached preview after it was shown.
+            generation = SourcePane.directory_preview_doc_label_generation(resolved_target)
+            applied = doc_labels_applied[1] if doc_labels_applied and doc_labels_applied[0] == resolved_target else 0
+            if generation != applied:
+                doc_labels_applied = (resolved_target, generation)
+                previous_rendered = state.rendered
+                refresh_rendered_for_current_path(reset_scroll=False)
+                changed = changed or state.rendered != previous_rendered
+
         return changed
 
     def maybe_prefetch_directory_preview() -> bool:
@@ -394,6 +450,7 @@ def run_pager(
         apply_tree_filter_query=tree_pane_runtime.filter.apply_tree_filter_query,
         jump_to_path=tree_pane_runtime.navigation.jump_to_path,
         get_terminal_size=shutil.get_terminal_size,
+        expand_diff_fold=expand_diff_fold,
     )
     tree_refresh_sync = TreePane.TreeRefreshSync(
         state=state,
@@ -408,8 +465,12 @@ def run_pager(
         state,
         sync_selected_target_after_tree_refresh,
         build_tree_watch_signature=build_tree_watch_signature,
+        stat_tree_hot_paths=stat_tree_hot_paths,
         monotonic=time.monotonic,
         tree_watch_poll_seconds=TREE_WATCH_POLL_SECONDS,
+        tree_watch_full_signature_seconds=TREE_WATCH_FULL_SIGNATURE_SECONDS,
+        tree_watch_quiet_seconds=TREE_WATCH_QUIET_SECONDS,
+        gitignore_matchers=TreePane.gitignore_matchers_by_root,
     )
 
     current_jump_location = tree_pane_runtime.navigation.current_jump_location
@@ -425,13 +486,29 @@ def run_pager(
         set_status_message=partial(_set_status_message, state),
     )
     jump_to_next_git_modified = git_modified_jump_navigator.jump_to_next_git_modified
+    blame_service = GitBlameService()
+    blame_controller = SourceBlameController(
+        state,
+        blame_service,
+        rebuild_screen_lines,
+        partial(_set_status_message, state),
+    )
+    subtree_expand_controller = SubtreeExpandController(
+        state,
+        tree_pane_runtime.filter.rebuild_tree_entries,
+        mark_tree_watch_dirty,
+        partial(_set_status_message, state),
+        _skip_gitignored_for_hidden_mode,
+    )
 
     schedule_tree_filter_index_warmup()
-    watch_refresh.tree_signature = build_tree_watch_signature(
-        state.tree_root,
-        state.expanded,
-        state.show_hidden,
-    )
+    if watch_refresh.tree_watcher is None:
+        watch_refresh.baseline_tree_signatures(
+            state,
+            build_tree_watch_signature=build_tree_watch_signature,
+            stat_tree_hot_paths=stat_tree_hot_paths,
+            now=time.monotonic(),
+        )
     watch_refresh.tree_last_poll = time.monotonic()
     reset_git_watch_context()
     watch_refresh.git_signature = build_git_watch_signature(watch_refresh.git_dir)
@@ -477,9 +554,21 @@ def run_pager(
         maybe_grow_directory_preview=maybe_grow_directory_preview,
         maybe_poll_directory_preview_results=maybe_poll_directory_preview_results,
         maybe_prefetch_directory_preview=maybe_prefetch_directory_preview,
+        toggle_blame=blame_controller.toggle,
+        maybe_poll_blame_updates=blame_controller.poll,
+        expand_subtree=subtree_expand_controller.start,
+        cancel_subtree_expand=subtree_expand_controller.cancel,
+        maybe_poll_subtree_expand=subtree_expand_controller.poll,
+        watch_wake_fds=partial(watch_refresh.wake_fds, state),
         launch_editor_for_path=launch_editor_for_path,
         jump_to_next_git_modified=jump_to_next_git_modified,
         save_left_pane_width=save_left_pane_width_for_mode,
         run_main_loop_fn=run_main_loop,
     )
-    app.run()
+    try:
+        app.run()
+    finally:
+        blame_service.cancel()
+        subtree_expand_controller.cancel()
+        save_doc_summary_store()
+        watch_refresh.close()
@@ -10,6 +10,7 @@ from pathlib import Path
 from ..render.ansi import build_screen_lines
 from .screen import _centered_scroll_start, _first_git_change_screen_line
 from .state import AppState
+from ..git_revision import GIT_DIFF_BASE_HEAD
 from ..ui_theme import resolve_theme
 
 
@@ -51,6 +52,7 @@ class AppStateBootstrap:
     tree_size_labels_default_enabled: bool
     dir_preview_initial_max_entries: int
     theme_name: str = "default"
+    git_diff_base: str = GIT_DIFF_BASE_HEAD
 
     def build_state(
         self,
@@ -125,6 +127,7 @@ class AppStateBootstrap:
             dir_skip_gitignored=self.skip_gitignored_for_hidden_mode(show_hidden),
             prefer_git_diff=self.git_features_default_enabled,
             dir_show_size_labels=self.tree_size_labels_default_enabled,
+            diff_base=self.git_diff_base,
         )
         rendered = initial_render.text
         lines = build_screen_lines(rendered, right_width, wrap=False)
@@ -165,7 +168,9 @@ class AppStateBootstrap:
             preview_image_path=initial_render.image_path,
             preview_image_format=initial_render.image_format,
             preview_is_git_diff=initial_render.is_git_diff_preview,
+            preview_diff_folds=initial_render.diff_folds,
             git_features_enabled=self.git_features_default_enabled,
+            git_diff_base=self.git_diff_base,
             named_marks=named_marks,
         )
 
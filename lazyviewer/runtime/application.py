@@ -39,6 +39,12 @@ class App:
         maybe_grow_directory_preview: Callable[[], bool],
         maybe_poll_directory_preview_results: Callable[[], bool] | None,
         maybe_prefetch_directory_preview: Callable[[], bool],
+        toggle_blame: Callable[[], None],
+        maybe_poll_blame_updates: Callable[[], bool] | None,
+        expand_subtree: Callable[..., None],
+        cancel_subtree_expand: Callable[[], bool],
+        maybe_poll_subtree_expand: Callable[[], bool] | None,
+        watch_wake_fds: Callable[[], tuple[int, ...]] | None,
         launch_editor_for_path: Callable[[Path], str | None],
         jump_to_next_git_modified: Callable[[int], bool],
         save_left_pane_width: Callable[[int, int], None],
@@ -63,6 +69,12 @@ class App:
         self.maybe_grow_directory_preview = maybe_grow_directory_preview
         self.maybe_poll_directory_preview_results = maybe_poll_directory_preview_results
         self.maybe_prefetch_directory_preview = maybe_prefetch_directory_preview
+        self.toggle_blame = toggle_blame
+        self.maybe_poll_blame_updates = maybe_poll_blame_updates
+        self.expand_subtree = expand_subtree
+        self.cancel_subtree_expand = cancel_subtree_expand
+        self.maybe_poll_subtree_expand = maybe_poll_subtree_expand
+        self.watch_wake_fds = watch_wake_fds
         self.launch_editor_for_path = launch_editor_for_path
         self.jump_to_next_git_modified = jump_to_next_git_modified
         self.save_left_pane_width = save_left_pane_width
@@ -137,6 +137,31 @@ def save_theme_name(theme_name: str) -> None:
     save_config(config)
 
 
+def load_diff_context_lines() -> int | None:
+    """Load hunks-only diff context line count, or ``None`` when unset/invalid."""
+    value = load_config().get("diff_context_lines")
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        return None
+    return value
+
+
+def load_subtree_expand_max_entries() -> int | None:
+    """Load the row budget of recursive subtree expansion, or ``None`` when unset/invalid."""
+    value = load_config().get("subtree_expand_max_entries")
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        return None
+    return value
+
+
+def load_diff_base() -> str | None:
+    """Load git diff base revision spec, or ``None`` when unset/invalid."""
+    value = load_config().get("diff_base")
+    if not isinstance(value, str):
+        return None
+    stripped = value.strip()
+    return stripped if stripped else None
+
+
 def _coerce_nonnegative_int(value: object) -> int:
     """Normalize JSON scalar values for scroll offsets.
 
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 from queue import Empty, Queue
 
+from ..git_status import GitStatusOverlay
+
 
 @dataclass(frozen=True)
 class DirectoryPreviewPrefetchRequest:
@@ -21,7 +23,7 @@ class DirectoryPreviewPrefetchRequest:
     dir_max_entries: int
     dir_skip_gitignored: bool
     prefer_git_diff: bool
-    dir_git_status_overlay: dict[Path, int] | None
+    dir_git_status_overlay: Mapping[Path, int] | None
     dir_show_size_labels: bool
 
 
@@ -84,11 +86,15 @@ class DirectoryPreviewPrefetchScheduler:
         dir_max_entries: int,
         dir_skip_gitignored: bool,
         prefer_git_diff: bool,
-        dir_git_status_overlay: dict[Path, int] | None,
+        dir_git_status_overlay: Mapping[Path, int] | None,
         dir_show_size_labels: bool,
     ) -> int:
         """Queue/replaces pending prefetch work and return request id."""
-        overlay_copy = dict(dir_git_status_overlay) if dir_git_status_overlay is not None else None
+        if dir_git_status_overlay is None or isinstance(dir_git_status_overlay, GitStatusOverlay):
+            # Trie overlays are immutable and safe to share with the worker.
+            overlay_copy = dir_git_status_overlay
+        else:
+            overlay_copy = dict(dir_git_status_overlay)
         with self._lock:
             request_id = self._next_request_id
             self._next_request_id += 1
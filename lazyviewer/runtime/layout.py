@@ -13,6 +13,7 @@ import os
 from collections.abc import Callable
 from pathlib import Path
 
+from ..source_pane.blame import blame_gutter_width
 from .state import AppState
 
 
@@ -53,12 +54,14 @@ class PagerLayout:
         self.content_mode_left_width_active = self.content_search_match_view_active()
 
     def effective_text_width(self, columns: int | None = None) -> int:
-        """Return preview-pane text width for current browser visibility."""
+        """Return preview-pane text width, excluding any blame gutter."""
         if columns is None:
             columns = self._get_terminal_size((80, 24)).columns
         if self.state.browser_visible:
-            return max(1, columns - self.state.left_width - 1)
-        return max(1, columns)
+            pane_width = max(1, columns - self.state.left_width - 1)
+        else:
+            pane_width = max(1, columns)
+        return pane_width - blame_gutter_width(pane_width, self.state.blame_view)
 
     def visible_content_rows(self) -> int:
         """Return number of content rows after reserving help panel rows."""
@@ -50,6 +50,9 @@ class RuntimeLoopCallbacks:
     tick_tree_filter_search: Callable[[float], bool] | None = None
     maybe_poll_directory_preview_results: Callable[[], bool] | None = None
     maybe_prefetch_directory_preview: Callable[[], bool] | None = None
+    maybe_poll_blame_updates: Callable[[], bool] | None = None
+    maybe_poll_subtree_expand: Callable[[], bool] | None = None
+    watch_wake_fds: Callable[[], tuple[int, ...]] | None = None
 
 
 def run_main_loop(
@@ -130,6 +133,9 @@ def run_main_loop(
     save_left_pane_width = callbacks.save_left_pane_width
     maybe_poll_directory_preview_results = getattr(callbacks, "maybe_poll_directory_preview_results", None)
     maybe_prefetch_directory_preview = getattr(callbacks, "maybe_prefetch_directory_preview", None)
+    maybe_poll_blame_updates = getattr(callbacks, "maybe_poll_blame_updates", None)
+    maybe_poll_subtree_expand = getattr(callbacks, "maybe_poll_subtree_expand", None)
+    watch_wake_fds = getattr(callbacks, "watch_wake_fds", None)
     kitty_image_state: tuple[str, int, int, int, int] | None = None
     tree_filter_cursor_visible = True
     tree_filter_spinner_frame = 0
@@ -155,6 +161,10 @@ def run_main_loop(
                 tick_tree_filter_search(0.0)
             if maybe_poll_directory_preview_results is not None and maybe_poll_directory_preview_results():
                 state.dirty = True
+            if maybe_poll_blame_updates is not None and maybe_poll_blame_updates():
+                state.dirty = True
+            if maybe_poll_subtree_expand is not None and maybe_poll_subtree_expand():
+                state.dirty = True
             term = shutil.get_terminal_size((80, 24))
             now = time.monotonic()
             terminal.set_mouse_reporting(True)
@@ -313,8 +323,10 @@ def run_main_loop(
                         else 0
                     ),
                     preview_is_git_diff=state.preview_is_git_diff,
+                    preview_diff_folds=state.preview_diff_folds,
                     source_selection_anchor=state.source_selection_anchor,
                     source_selection_focus=state.source_selection_focus,
+                    blame_view=state.blame_view,
                     theme=state.theme,
                 )
                 render_dual_page_context(render_context)
@@ -345,7 +357,10 @@ def run_main_loop(
                 state.dirty = False
 
             try:
-                key = read_key(stdin_fd, timeout_ms=120)
+                if watch_wake_fds is not None:
+                    key = read_key(stdin_fd, timeout_ms=120, wake_fds=watch_wake_fds())
+                else:
+                    key = read_key(stdin_fd, timeout_ms=120)
             except KeyboardInterrupt:
                 # Ignore SIGINT-style interrupts so terminal copy shortcuts do not exit the app.
                 continue
@@ -6,9 +6,11 @@ Most behavior in runtime modules mutates this dataclass in-place.
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from ..git_blame import BlameView
 from .navigation import JumpHistory, JumpLocation
 from ..tree_model import TreeEntry
 from ..ui_theme import DEFAULT_THEME, UITheme
@@ -26,7 +28,7 @@ class AppState:
     tree_root: Path
     expanded: set[Path]
     show_hidden: bool
-    tree_entries: list[TreeEntry]
+    tree_entries: Sequence[TreeEntry]
     selected_idx: int
     rendered: str
     lines: list[str]
@@ -94,10 +96,18 @@ class AppState:
     dir_preview_max_entries: int = 400
     dir_preview_truncated: bool = False
     dir_preview_path: Path | None = None
+    subtree_expand_max_entries: int = 2_000
     preview_image_path: Path | None = None
     preview_image_format: str | None = None
     preview_is_git_diff: bool = False
-    git_status_overlay: dict[Path, int] = field(default_factory=dict)
+    preview_diff_folds: Mapping[int, tuple[int, int]] = field(default_factory=dict)
+    blame_enabled: bool = False
+    blame_view: BlameView | None = None
+    diff_context_lines: int = 3
+    # Per file: ((mtime_ns, size) the folds were opened against, first lines of opened folds).
+    diff_expanded_folds: dict[Path, tuple[tuple[int, int], frozenset[int]]] = field(default_factory=dict)
+    git_diff_base: str = "HEAD"
+    git_status_overlay: Mapping[Path, int] = field(default_factory=dict)
     git_status_last_refresh: float = 0.0
     jump_history: JumpHistory = field(default_factory=JumpHistory)
     named_marks: dict[str, JumpLocation] = field(default_factory=dict)
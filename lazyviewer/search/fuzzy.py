@@ -36,12 +36,15 @@ def _collect_project_files_walk(root: Path, show_hidden: bool, skip_gitignored:
             dirnames[:] = [name for name in dirnames if not name.startswith(".")]
             filenames = [name for name in filenames if not name.startswith(".")]
         if ignore_matcher is not None:
-            dirnames[:] = [name for name in dirnames if not ignore_matcher.is_ignored(base / name)]
-            filenames = [name for name in filenames if not ignore_matcher.is_ignored(base / name)]
+            dirnames[:] = ignore_matcher.filter_children(base, dirnames, set(dirnames))
+            filenames = ignore_matcher.filter_children(base, filenames)
         dirnames.sort(key=str.lower)
         filenames.sort(key=str.lower)
         for filename in filenames:
-            path = (base / filename).resolve()
+            # ``base`` is already canonical; only symlinks need resolving.
+            path = base / filename
+            if path.is_symlink():
+                path = path.resolve()
             if path.is_file():
                 files.append(path)
     return files
@@ -0,0 +1,228 @@
+"""Blame gutter rendering and polling for the source pane.
+
+``git_blame.GitBlameService`` streams blame results on a worker thread; this
+module decides which file should be blamed, notices new chunks from the
+event loop, and formats the gutter. Annotations are computed only for the
+rows in the viewport, so the cost of a frame does not grow with file size.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+import os
+from pathlib import Path
+import stat
+import time
+
+from ..git_blame import BlameCommit, BlameView, GitBlameService
+from .diffmap import (
+    diff_preview_fold_span,
+    diff_preview_logical_line_is_removed,
+    diff_preview_uses_plain_markers,
+    iter_diff_logical_line_ranges,
+)
+from .text import line_has_newline_terminator
+
+BLAME_GUTTER_WIDTH = 28
+BLAME_MIN_TEXT_WIDTH = 20
+BLAME_AUTHOR_WIDTH = 8
+_BLAME_SHA_SGR = "\033[38;5;179m"
+_BLAME_META_SGR = "\033[2;38;5;250m"
+_BLAME_RESET = "\033[0m"
+
+
+def blame_gutter_width(pane_width: int, blame_view: BlameView | None) -> int:
+    """Return gutter columns reserved for blame in a pane of ``pane_width``."""
+    if blame_view is None or pane_width < BLAME_GUTTER_WIDTH + BLAME_MIN_TEXT_WIDTH:
+        return 0
+    return BLAME_GUTTER_WIDTH
+
+
+@lru_cache(maxsize=1024)
+def _format_commit_gutter(commit: BlameCommit) -> str:
+    if commit.is_uncommitted:
+        meta = f"{'uncommitted':<{BLAME_GUTTER_WIDTH - 9}}"
+        return f"{_BLAME_META_SGR}{'·' * 7} {meta} {_BLAME_RESET}"
+    author = f"{commit.author[:BLAME_AUTHOR_WIDTH]:<{BLAME_AUTHOR_WIDTH}}"
+    date = time.strftime("%Y-%m-%d", time.localtime(commit.author_time))
+    return f"{_BLAME_SHA_SGR}{commit.sha[:7]}{_BLAME_RESET} {_BLAME_META_SGR}{author} {date}{_BLAME_RESET} "
+
+
+def format_blame_gutter(blame_view: BlameView, source_line: int | None) -> str:
+    """Return the ``BLAME_GUTTER_WIDTH``-column gutter for one display row."""
+    if source_line is None:
+        return " " * BLAME_GUTTER_WIDTH
+    commit = blame_view.commit_for_line(source_line)
+    if commit is not None:
+        return _format_commit_gutter(commit)
+    if blame_view.complete:
+        return " " * BLAME_GUTTER_WIDTH
+    return f"{_BLAME_META_SGR}{'…':<{BLAME_GUTTER_WIDTH}}{_BLAME_RESET}"
+
+
+def _document_source_lines(
+    text_lines: list[str],
+    wrap_text: bool,
+    preview_is_git_diff: bool,
+    diff_folds: Mapping[int, tuple[int, int]] | None,
+) -> list[int | None]:
+    """Return the source line each display row of ``text_lines`` starts."""
+    out: list[int | None] = []
+    source_line = 1
+    if preview_is_git_diff:
+        use_plain_markers = diff_preview_uses_plain_markers(text_lines, wrap_text)
+        for logical_idx, (start_idx, end_idx) in enumerate(iter_diff_logical_line_ranges(text_lines, wrap_text)):
+            is_removed = diff_preview_logical_line_is_removed(
+                text_lines[start_idx],
+                use_plain_markers=use_plain_markers,
+            )
+            fold_span = None if is_removed else diff_preview_fold_span(diff_folds, logical_idx)
+            out.append(None if is_removed or fold_span is not None else source_line)
+            out.extend([None] * (end_idx - start_idx))
+            if fold_span is not None:
+                source_line = fold_span[1] + 1
+            elif not is_removed:
+                source_line += 1
+        return out
+
+    at_line_start = True
+    for line in text_lines:
+        out.append(source_line if at_line_start else None)
+        at_line_start = line_has_newline_terminator(line)
+        if at_line_start:
+            source_line += 1
+    return out
+
+
+_DOCUMENT_SOURCE_LINES: tuple[list[str], bool, bool, dict[int, tuple[int, int]], list[int | None]] | None = None
+
+
+def visible_source_lines(
+    text_lines: list[str],
+    text_start: int,
+    rows: int,
+    wrap_text: bool,
+    preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
+) -> list[int | None]:
+    """Map each viewport row to the 1-based source line it starts, if any.
+
+    Wrapped continuation rows, removed diff lines, and fold rows map to
+    ``None`` so the gutter is only drawn once per blamed line. The
+    whole-document map is built once per rendered document and reused while
+    scrolling, so a frame only slices the viewport rows.
+    """
+    global _DOCUMENT_SOURCE_LINES
+    end = min(len(text_lines), text_start + max(0, rows))
+    if text_start >= end:
+        return []
+    if not wrap_text and not preview_is_git_diff:
+        return list(range(text_start + 1, end + 1))
+
+    folds = dict(diff_folds or {})
+    cached = _DOCUMENT_SOURCE_LINES
+    if (
+        cached is not None
+        and cached[0] is text_lines
+        and cached[1] == wrap_text
+        and cached[2] == preview_is_git_diff
+        and cached[3] == folds
+    ):
+        source_lines = cached[4]
+    else:
+        source_lines = _document_source_lines(text_lines, wrap_text, preview_is_git_diff, folds)
+        _DOCUMENT_SOURCE_LINES = (text_lines, wrap_text, preview_is_git_diff, folds, source_lines)
+    return source_lines[text_start:end]
+
+
+class SourceBlameController:
+    """Keeps ``state.blame_view`` in sync with the previewed file.
+
+    ``poll`` runs every loop iteration: it starts a new streaming job when
+    the previewed file (or its on-disk contents) changes and reports whether
+    new chunks arrived since the last frame.
+    """
+
+    def __init__(
+        self,
+        state,
+        service: GitBlameService,
+        rebuild_screen_lines: Callable[..., None],
+        set_status_message: Callable[[str], None],
+    ) -> None:
+        self.state = state
+        self.service = service
+        self._rebuild_screen_lines = rebuild_screen_lines
+        self._set_status_message = set_status_message
+        self._current_path: Path | None = None
+        self._resolved_path: Path | None = None
+        self._signature: tuple[int, int] | None = None
+        self._seen_revision = -1
+        self._reported_error = False
+
+    def toggle(self) -> None:
+        """Turn blame mode on or off."""
+        self.state.blame_enabled = not self.state.blame_enabled
+        self._set_status_message("blame: on" if self.state.blame_enabled else "blame: off")
+        self.poll()
+        self.state.dirty = True
+
+    def _blame_target(self) -> tuple[Path, tuple[int, int]] | None:
+        state = self.state
+        if state.dir_preview_path is not None or state.preview_image_path is not None:
+            return None
+        if state.current_path != self._current_path:
+            self._current_path = state.current_path
+            self._resolved_path = state.current_path.resolve()
+        assert self._resolved_path is not None
+        try:
+            st = os.stat(self._resolved_path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return self._resolved_path, (st.st_mtime_ns, st.st_size)
+
+    def _set_view(self, view: BlameView | None) -> None:
+        had_gutter = self.state.blame_view is not None
+        self.state.blame_view = view
+        self._seen_revision = -1
+        self._reported_error = False
+        if had_gutter != (view is not None):
+            self._rebuild_screen_lines()
+
+    def poll(self) -> bool:
+        """Start/stop blame jobs as needed; return ``True`` when a redraw is due."""
+        target = self._blame_target() if self.state.blame_enabled else None
+        view = self.state.blame_view
+        if target is None:
+            if view is None:
+                return False
+            self.service.cancel()
+            self._signature = None
+            self._set_view(None)
+            return True
+
+        path, signature = target
+        if view is None or view.path != path or signature != self._signature:
+            self._signature = signature
+            self._set_view(self.service.start(path))
+            return True
+
+        if view.revision == self._seen_revision:
+            return False
+        self._seen_revision = view.revision
+        if view.complete and view.error and not self._reported_error:
+            self._reported_error = True
+            self._set_status_message(f"blame unavailable: {view.error}")
+        return True
+
+
+__all__ = [
+    "BLAME_GUTTER_WIDTH",
+    "SourceBlameController",
+    "blame_gutter_width",
+    "format_blame_gutter",
+    "visible_source_lines",
+]
@@ -2,29 +2,118 @@
 
 The generated preview keeps full-file context, marks added/removed lines, and
 optionally preserves syntax coloring while applying readable diff backgrounds.
+Very large files switch to a hunks-only layout: unchanged runs outside the
+configured context collapse into fold rows that can be expanded on demand, and
+only displayed source lines are syntax-highlighted. Fold rows are reported
+next to the text (``DiffPreview.folds``) rather than parsed back out of it.
+Contrast repairs (foreground boosts and trailing-edge fixes) are applied here,
+so the cached text renders per frame with plain ANSI slicing.
+Previews compare against ``HEAD`` by default; any other diff base (branch,
+commit, merge-base) is diffed in-process against base blobs served by the
+persistent ``git cat-file`` reader in ``git_revision``.
 Results are memoized with a git-signature-aware cache key.
 """
 
 from __future__ import annotations
 
 from collections import OrderedDict
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import difflib
+from functools import lru_cache
 from pathlib import Path
 import re
 import subprocess
 
-from .syntax import colorize_source, read_text, sanitize_terminal_text
+from ..render.ansi import ANSI_ESCAPE_RE
+from .diffmap import format_diff_fold_label
+from .syntax import colorize_source, decode_text, read_text, sanitize_terminal_text
 from ..file_tree_model.watch import build_git_watch_signature
+from ..git_status import (
+    GIT_STATUS_CHANGED,
+    GIT_STATUS_CONFLICTED,
+    GIT_STATUS_RENAMED,
+    GIT_STATUS_STAGED,
+    GIT_STATUS_UNSTAGED,
+    resolve_git_repo_context,
+)
+from ..git_revision import (
+    GIT_DIFF_BASE_HEAD,
+    is_head_diff_base,
+    normalize_git_diff_base,
+    read_base_blob,
+    resolve_git_base_commit,
+)
 
 GIT_DIFF_PREVIEW_CACHE_MAX = 128
+GIT_DIFF_HUNKS_ONLY_MIN_LINES = 20_000
+GIT_DIFF_HUNK_CONTEXT_LINES = 3
 
-_DIFF_PREVIEW_CACHE: OrderedDict[tuple[str, int, int, str, bool, str], str | None] = OrderedDict()
+
+@dataclass(frozen=True)
+class DiffPreview:
+    """Rendered diff preview text plus the fold rows it contains.
+
+    ``folds`` maps the index of each fold row in ``text.splitlines()`` to the
+    ``(start_line, end_line)`` source lines it hides.
+    """
+
+    text: str
+    folds: Mapping[int, tuple[int, int]] = field(default_factory=dict)
+
+
+_DiffPreviewCacheKey = tuple[str, int, int, str, str, int | None, bool, str, bool, int, tuple[int, ...]]
+_DiffHunksCacheKey = tuple[str, int, int, str, str, int | None]
+
+_DIFF_PREVIEW_CACHE: OrderedDict[_DiffPreviewCacheKey, DiffPreview | None] = OrderedDict()
 _HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
 _SGR_RE = re.compile(r"\x1b\[([0-9;]*)m")
 _ADDED_BG_SGR = "48;2;36;74;52"
 _REMOVED_BG_SGR = "48;2;92;43;49"
 _DIFF_CONTRAST_8BIT = "246"
 _DIFF_CONTRAST_TRUECOLOR = ("170", "170", "170")
+_FOLD_SGR = "38;5;244"
+_DIFF_CONTRAST_FG_SGR = "38;5;246"
+_DIFF_TRUECOLOR_CONTRAST_FG_SGR = "38;2;220;220;220"
+_DIFF_ADDED_BG_RGB = (36, 74, 52)
+_DIFF_REMOVED_BG_RGB = (92, 43, 49)
+_DIFF_MIN_CONTRAST_RATIO = 3.0
+_DIFF_EDGE_CONTRAST_CHAR_COUNT = 2
+_XTERM_16_RGB: tuple[tuple[int, int, int], ...] = (
+    (0, 0, 0),
+    (128, 0, 0),
+    (0, 128, 0),
+    (128, 128, 0),
+    (0, 0, 128),
+    (128, 0, 128),
+    (0, 128, 128),
+    (192, 192, 192),
+    (128, 128, 128),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (0, 0, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+_DIFF_STANDARD_FG_BOOST_MAP: dict[str, str] = {
+    "30": "38;5;246",
+    "31": "38;5;210",
+    "32": "38;5;120",
+    "33": "38;5;229",
+    "34": "38;5;117",
+    "35": "38;5;183",
+    "36": "38;5;159",
+    "90": "38;5;246",
+    "91": "38;5;210",
+    "92": "38;5;120",
+    "93": "38;5;229",
+    "94": "38;5;117",
+    "95": "38;5;183",
+    "96": "38;5;159",
+    "default": "38;5;246",
+}
 
 
 @dataclass
@@ -38,54 +127,30 @@ class DiffHunk:
     removed_lines: list[str]
 
 
-def _cache_get(key: tuple[str, int, int, str, bool, str]) -> tuple[bool, str | None]:
-    """Lookup diff preview cache entry and refresh LRU order."""
-    if key not in _DIFF_PREVIEW_CACHE:
+_DIFF_HUNKS_CACHE: OrderedDict[_DiffHunksCacheKey, list[DiffHunk] | None] = OrderedDict()
+
+
+def _cache_get(key: tuple, cache: OrderedDict = _DIFF_PREVIEW_CACHE) -> tuple[bool, object]:
+    """Lookup diff cache entry and refresh LRU order."""
+    if key not in cache:
         return False, None
-    cached = _DIFF_PREVIEW_CACHE[key]
-    _DIFF_PREVIEW_CACHE.move_to_end(key)
+    cached = cache[key]
+    cache.move_to_end(key)
     return True, cached
 
 
-def _cache_put(key: tuple[str, int, int, str, bool, str], value: str | None) -> None:
-    """Insert diff preview cache entry and evict oldest overflow entries."""
-    _DIFF_PREVIEW_CACHE[key] = value
-    _DIFF_PREVIEW_CACHE.move_to_end(key)
-    while len(_DIFF_PREVIEW_CACHE) > GIT_DIFF_PREVIEW_CACHE_MAX:
-        _DIFF_PREVIEW_CACHE.popitem(last=False)
+def _cache_put(key: tuple, value: object, cache: OrderedDict = _DIFF_PREVIEW_CACHE) -> None:
+    """Insert diff cache entry and evict oldest overflow entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > GIT_DIFF_PREVIEW_CACHE_MAX:
+        cache.popitem(last=False)
 
 
 def clear_diff_preview_cache() -> None:
-    """Clear in-memory diff preview cache."""
+    """Clear in-memory diff preview and parsed-hunk caches."""
     _DIFF_PREVIEW_CACHE.clear()
-
-
-def _resolve_repo_and_git_dir(path: Path, timeout_seconds: float) -> tuple[Path | None, Path | None]:
-    """Resolve repository root and git-dir for a path."""
-    try:
-        proc = subprocess.run(
-            ["git", "-C", str(path), "rev-parse", "--show-toplevel", "--git-dir"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            check=False,
-            timeout=timeout_seconds,
-        )
-    except Exception:
-        return None, None
-    if proc.returncode != 0:
-        return None, None
-
-    lines = [line.strip() for line in proc.stdout.splitlines() if line.strip()]
-    if len(lines) < 2:
-        return None, None
-
-    repo_root = Path(lines[0]).resolve()
-    git_dir_raw = Path(lines[1])
-    git_dir = git_dir_raw if git_dir_raw.is_absolute() else (repo_root / git_dir_raw)
-    return repo_root, git_dir.resolve()
+    _DIFF_HUNKS_CACHE.clear()
 
 
 def _run_git(repo_root: Path, args: list[str], timeout_seconds: float) -> subprocess.CompletedProcess[str] | None:
@@ -142,12 +207,13 @@ def _format_marked_line(marker: str, code_line: str, colorize: bool) -> str:
         return f"{marker} {code_line}"
 
     if marker == "+":
-        return _apply_line_background(code_line, _ADDED_BG_SGR)
+        return _ensure_diff_trailing_char_contrast(_apply_line_background(code_line, _ADDED_BG_SGR))
     if marker == "-":
-        return _apply_line_background(code_line, _REMOVED_BG_SGR)
+        return _ensure_diff_trailing_char_contrast(_apply_line_background(code_line, _REMOVED_BG_SGR))
     return code_line
 
 
+@lru_cache(maxsize=1024)
 def _boost_foreground_contrast_for_diff(params: str) -> str:
     """Adjust low-contrast foreground SGR params for diff background readability."""
     parts = [part for part in params.split(";") if part]
@@ -246,14 +312,239 @@ def _boost_foreground_contrast_for_diff(params: str) -> str:
     return ";".join(boosted)
 
 
+def _is_low_contrast_diff_fg(foreground: str) -> bool:
+    def _srgb_to_linear(channel: int) -> float:
+        value = max(0, min(channel, 255)) / 255.0
+        if value <= 0.04045:
+            return value / 12.92
+        return ((value + 0.055) / 1.055) ** 2.4
+
+    def _relative_luminance(rgb: tuple[int, int, int]) -> float:
+        red, green, blue = rgb
+        return (
+            0.2126 * _srgb_to_linear(red)
+            + 0.7152 * _srgb_to_linear(green)
+            + 0.0722 * _srgb_to_linear(blue)
+        )
+
+    def _contrast_ratio(a: tuple[int, int, int], b: tuple[int, int, int]) -> float:
+        a_lum = _relative_luminance(a)
+        b_lum = _relative_luminance(b)
+        light = max(a_lum, b_lum)
+        dark = min(a_lum, b_lum)
+        return (light + 0.05) / (dark + 0.05)
+
+    def _xterm_256_rgb(color_index: int) -> tuple[int, int, int] | None:
+        if color_index < 0 or color_index > 255:
+            return None
+        if color_index <= 15:
+            return _XTERM_16_RGB[color_index]
+        if 16 <= color_index <= 231:
+            cube = color_index - 16
+            red_idx = cube // 36
+            green_idx = (cube % 36) // 6
+            blue_idx = cube % 6
+            steps = (0, 95, 135, 175, 215, 255)
+            return (steps[red_idx], steps[green_idx], steps[blue_idx])
+        gray = 8 + (color_index - 232) * 10
+        return (gray, gray, gray)
+
+    foreground_rgb: tuple[int, int, int] | None = None
+    if foreground == "default":
+        foreground_rgb = (0, 0, 0)
+    elif foreground.isdigit():
+        token = int(foreground)
+        if 30 <= token <= 37:
+            foreground_rgb = _XTERM_16_RGB[token - 30]
+        elif 90 <= token <= 97:
+            foreground_rgb = _XTERM_16_RGB[token - 90 + 8]
+    if foreground.startswith("38;5;"):
+        try:
+            color_index = int(foreground.split(";")[2])
+        except (IndexError, ValueError):
+            return False
+        foreground_rgb = _xterm_256_rgb(color_index)
+    elif foreground.startswith("38;2;"):
+        parts = foreground.split(";")
+        if len(parts) != 5:
+            return False
+        try:
+            red = int(parts[2])
+            green = int(parts[3])
+            blue = int(parts[4])
+        except ValueError:
+            return False
+        foreground_rgb = (red, green, blue)
+
+    if foreground_rgb is None:
+        return False
+    ratio = min(
+        _contrast_ratio(foreground_rgb, _DIFF_ADDED_BG_RGB),
+        _contrast_ratio(foreground_rgb, _DIFF_REMOVED_BG_RGB),
+    )
+    return ratio < _DIFF_MIN_CONTRAST_RATIO
+
+
+def _requires_diff_edge_boost(foreground: str) -> bool:
+    """Return whether foreground is likely a reset/dim color requiring edge repair."""
+    if foreground in {"default", "30", "90"}:
+        return True
+
+    if foreground.startswith("38;5;"):
+        try:
+            color_index = int(foreground.split(";")[2])
+        except (IndexError, ValueError):
+            return False
+        return 232 <= color_index <= 245
+
+    if foreground.startswith("38;2;"):
+        parts = foreground.split(";")
+        if len(parts) != 5:
+            return False
+        try:
+            red = int(parts[2])
+            green = int(parts[3])
+            blue = int(parts[4])
+        except ValueError:
+            return False
+        return (
+            abs(red - green) <= 12
+            and abs(green - blue) <= 12
+            and max(red, green, blue) < 150
+        )
+
+    return False
+
+
+def _ensure_diff_trailing_char_contrast(text: str) -> str:
+    """Ensure trailing visible diff characters keep readable foreground contrast."""
+    if not text:
+        return text
+    if _ADDED_BG_SGR not in text and _REMOVED_BG_SGR not in text:
+        return text
+
+    foreground = "default"
+    background = "default"
+    idx = 0
+    visible_nonspace_chars: list[tuple[int, str, str]] = []
+    while idx < len(text):
+        if text[idx] == "\x1b":
+            match = ANSI_ESCAPE_RE.match(text, idx)
+            if match:
+                seq = match.group(0)
+                if seq.endswith("m"):
+                    params = seq[2:-1]
+                    parts = [part for part in params.split(";") if part]
+                    if not parts:
+                        parts = ["0"]
+                    part_idx = 0
+                    while part_idx < len(parts):
+                        part = parts[part_idx]
+                        try:
+                            token = int(part)
+                        except ValueError:
+                            part_idx += 1
+                            continue
+                        if token == 0:
+                            foreground = "default"
+                            background = "default"
+                        elif token == 39:
+                            foreground = "default"
+                        elif token == 49:
+                            background = "default"
+                        elif 30 <= token <= 37 or 90 <= token <= 97:
+                            foreground = str(token)
+                        elif 40 <= token <= 47 or 100 <= token <= 107:
+                            background = str(token)
+                        elif token in {38, 48} and part_idx + 1 < len(parts):
+                            mode = parts[part_idx + 1]
+                            if mode == "5" and part_idx + 2 < len(parts):
+                                if token == 38:
+                                    foreground = f"38;5;{parts[part_idx + 2]}"
+                                else:
+                                    background = f"48;5;{parts[part_idx + 2]}"
+                                part_idx += 2
+                            elif mode == "2" and part_idx + 4 < len(parts):
+                                if token == 38:
+                                    foreground = ";".join(["38", "2", *parts[part_idx + 2 : part_idx + 5]])
+                                else:
+                                    background = ";".join(["48", "2", *parts[part_idx + 2 : part_idx + 5]])
+                                part_idx += 4
+                        part_idx += 1
+                idx = match.end()
+                continue
+
+        char = text[idx]
+        if char not in "\r\n" and not char.isspace():
+            visible_nonspace_chars.append((idx, foreground, background))
+        idx += 1
+
+    if not visible_nonspace_chars:
+        return text
+
+    candidates: list[tuple[int, str, str]] = []
+    for char_index, char_fg, char_bg in reversed(visible_nonspace_chars):
+        if char_bg not in {_ADDED_BG_SGR, _REMOVED_BG_SGR}:
+            break
+        candidates.append((char_index, char_fg, char_bg))
+        if len(candidates) >= _DIFF_EDGE_CONTRAST_CHAR_COUNT:
+            break
+
+    if not candidates:
+        return text
+
+    candidates.reverse()
+
+    insertion_specs: list[tuple[int, str, str, str]] = []
+    for char_index, char_fg, char_bg in candidates:
+        if not _requires_diff_edge_boost(char_fg):
+            continue
+        if not _is_low_contrast_diff_fg(char_fg):
+            continue
+        boosted_fg = _DIFF_STANDARD_FG_BOOST_MAP.get(char_fg, _DIFF_CONTRAST_FG_SGR)
+        if char_fg.startswith("38;2;"):
+            boosted_fg = _DIFF_TRUECOLOR_CONTRAST_FG_SGR
+        insertion_specs.append((char_index, boosted_fg, char_bg, char_fg))
+
+    if not insertion_specs:
+        return text
+
+    # If the edge run shares the same foreground/background, one insertion
+    # before the first edge character preserves contiguous token coloring.
+    if len(insertion_specs) > 1:
+        same_bg = all(spec[2] == insertion_specs[0][2] for spec in insertion_specs)
+        same_fg = all(spec[3] == insertion_specs[0][3] for spec in insertion_specs)
+        same_boosted_fg = all(spec[1] == insertion_specs[0][1] for spec in insertion_specs)
+        first_index = insertion_specs[0][0]
+        last_index = insertion_specs[-1][0]
+        has_intervening_escape = "\x1b" in text[first_index:last_index]
+        if same_bg and same_fg and same_boosted_fg and not has_intervening_escape:
+            return (
+                text[:first_index]
+                + f"\033[{insertion_specs[0][1]};{insertion_specs[0][2]}m"
+                + text[first_index:]
+            )
+
+    out = text
+    for char_index, boosted_fg, char_bg, _char_fg in sorted(insertion_specs, key=lambda item: item[0], reverse=True):
+        out = out[:char_index] + f"\033[{boosted_fg};{char_bg}m" + out[char_index:]
+    return out
+
+
+@lru_cache(maxsize=2048)
+def _diff_sgr_with_background(params: str, bg_sgr: str) -> str:
+    """Return one SGR sequence with boosted foreground and persistent background."""
+    boosted = _boost_foreground_contrast_for_diff(params)
+    if boosted:
+        return f"\033[{boosted};{bg_sgr}m"
+    return f"\033[{bg_sgr}m"
+
+
 def _apply_line_background(code_line: str, bg_sgr: str) -> str:
     """Apply persistent background SGR to an ANSI-coded source line."""
     def _inject_bg(match: re.Match[str]) -> str:
         """Inject background into each SGR sequence while preserving contrast."""
-        params = _boost_foreground_contrast_for_diff(match.group(1))
-        if params:
-            return f"\033[{params};{bg_sgr}m"
-        return f"\033[{bg_sgr}m"
+        return _diff_sgr_with_background(match.group(1), bg_sgr)
 
     line_with_persistent_bg = _SGR_RE.sub(_inject_bg, code_line)
     # Set a readable baseline fg so plain/uncolored source text remains visible.
@@ -271,6 +562,106 @@ def _colorize_lines(lines: list[str], target: Path, style: str, colorize: bool)
     return rendered_lines
 
 
+def _colorize_removed_insertions(
+    removed_insertions: dict[int, list[str]],
+    target: Path,
+    style: str,
+    colorize: bool,
+) -> dict[int, list[str]]:
+    """Colorize all removed-line chunks in one lexer pass, keyed like the input.
+
+    Chunks are concatenated in insertion order and sliced back by line count.
+    If the batched pass cannot preserve line count, each chunk falls back to
+    its own pass so one odd chunk does not drop coloring for the whole diff.
+    """
+    if not colorize or not removed_insertions:
+        return removed_insertions
+
+    ordered_points = sorted(removed_insertions)
+    batched_lines = [line for insert_at in ordered_points for line in removed_insertions[insert_at]]
+    rendered_lines = _colorize_lines(batched_lines, target, style, colorize)
+    # ``_colorize_lines`` hands back its input when line counts diverge.
+    if rendered_lines is batched_lines:
+        return {
+            insert_at: _colorize_lines(removed_insertions[insert_at], target, style, colorize)
+            for insert_at in ordered_points
+        }
+
+    display_insertions: dict[int, list[str]] = {}
+    offset = 0
+    for insert_at in ordered_points:
+        count = len(removed_insertions[insert_at])
+        display_insertions[insert_at] = rendered_lines[offset : offset + count]
+        offset += count
+    return display_insertions
+
+
+def _hunk_display_ranges(
+    hunks: list[DiffHunk],
+    total_lines: int,
+    context_lines: int,
+) -> list[tuple[int, int]]:
+    """Return merged 1-based inclusive source ranges shown around hunks.
+
+    Gaps of a single line are merged into neighbours because a fold row would
+    not save any space.
+    """
+    if total_lines <= 0:
+        return []
+    context = max(0, context_lines)
+    spans: list[tuple[int, int]] = []
+    for hunk in hunks:
+        anchor = max(1, min(hunk.new_start, total_lines))
+        last = max(anchor, min(hunk.new_start + hunk.new_count - 1, total_lines))
+        spans.append((max(1, anchor - context), min(total_lines, last + context)))
+    spans.sort()
+
+    merged: list[tuple[int, int]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1] + 2:
+            previous_start, previous_end = merged[-1]
+            merged[-1] = (previous_start, max(previous_end, end))
+            continue
+        merged.append((start, end))
+    return merged
+
+
+def _expand_display_ranges(
+    ranges: list[tuple[int, int]],
+    total_lines: int,
+    expanded_folds: frozenset[int],
+) -> list[tuple[int, int]]:
+    """Merge gaps whose first hidden line is in ``expanded_folds`` into ranges."""
+    if not expanded_folds or not ranges:
+        return ranges
+
+    gaps: list[tuple[int, int]] = []
+    cursor = 1
+    for start, end in ranges:
+        if start > cursor:
+            gaps.append((cursor, start - 1))
+        cursor = end + 1
+    if cursor <= total_lines:
+        gaps.append((cursor, total_lines))
+
+    combined = sorted([*ranges, *(gap for gap in gaps if gap[0] in expanded_folds)])
+    merged: list[tuple[int, int]] = []
+    for start, end in combined:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            continue
+        merged.append((start, end))
+    return merged
+
+
+def _format_fold_line(start_line: int, end_line: int, colorize: bool) -> str:
+    """Format one collapsed-fold row covering ``start_line..end_line``."""
+    label = format_diff_fold_label(start_line, end_line)
+    if not colorize:
+        return f"  {label}"
+    return f"\033[{_FOLD_SGR}m{label}\033[0m"
+
+
 def _build_annotated_source_preview(
     source_lines: list[str],
     source_display_lines: list[str],
@@ -278,8 +669,13 @@ def _build_annotated_source_preview(
     target: Path,
     style: str,
     colorize: bool,
-) -> str:
-    """Build combined source+diff view with inline added/removed markers."""
+    display_ranges: list[tuple[int, int]] | None = None,
+) -> DiffPreview:
+    """Build combined source+diff view with inline added/removed markers.
+
+    When ``display_ranges`` is given, only those 1-based inclusive source ranges
+    are emitted and every hidden run collapses into one fold row.
+    """
     total_lines = len(source_lines)
     added_line_numbers: set[int] = set()
     removed_insertions: dict[int, list[str]] = {}
@@ -292,69 +688,95 @@ def _build_annotated_source_preview(
             insert_at = max(1, min(hunk.new_start, total_lines + 1))
             removed_insertions.setdefault(insert_at, []).extend(hunk.removed_lines)
 
-    removed_display_insertions: dict[int, list[str]] = {}
-    for insert_at, removed_lines in removed_insertions.items():
-        removed_display_insertions[insert_at] = _colorize_lines(
-            removed_lines,
-            target,
-            style,
-            colorize,
-        )
+    removed_display_insertions = _colorize_removed_insertions(
+        removed_insertions,
+        target,
+        style,
+        colorize,
+    )
+
+    if display_ranges is None:
+        display_ranges = [(1, total_lines)] if total_lines else []
 
     output_lines: list[str] = []
-    for line_no in range(1, total_lines + 1):
-        for removed_line in removed_display_insertions.get(line_no, []):
-            output_lines.append(_format_marked_line("-", removed_line, colorize))
-
-        marker = "+" if line_no in added_line_numbers else " "
-        display_line = (
-            source_display_lines[line_no - 1]
-            if line_no - 1 < len(source_display_lines)
-            else source_lines[line_no - 1]
-        )
-        output_lines.append(_format_marked_line(marker, display_line, colorize))
+    folds: dict[int, tuple[int, int]] = {}
+    # Row index in ``splitlines()`` terms; one source line may split into several.
+    row_count = 0
+
+    def emit(line: str) -> None:
+        nonlocal row_count
+        output_lines.append(line)
+        row_count += max(1, len(line.splitlines()))
+
+    def emit_fold(start_line: int, end_line: int) -> None:
+        folds[row_count] = (start_line, end_line)
+        emit(_format_fold_line(start_line, end_line, colorize))
+
+    cursor = 1
+    for range_start, range_end in display_ranges:
+        if range_start > cursor:
+            emit_fold(cursor, range_start - 1)
+        for line_no in range(range_start, range_end + 1):
+            for removed_line in removed_display_insertions.get(line_no, []):
+                emit(_format_marked_line("-", removed_line, colorize))
+
+            marker = "+" if line_no in added_line_numbers else " "
+            display_line = (
+                source_display_lines[line_no - 1]
+                if line_no - 1 < len(source_display_lines)
+                else source_lines[line_no - 1]
+            )
+            emit(_format_marked_line(marker, display_line, colorize))
+        cursor = range_end + 1
+    if cursor <= total_lines:
+        emit_fold(cursor, total_lines)
 
     for removed_line in removed_display_insertions.get(total_lines + 1, []):
-        output_lines.append(_format_marked_line("-", removed_line, colorize))
+        emit(_format_marked_line("-", removed_line, colorize))
 
-    return "\n".join(output_lines)
+    return DiffPreview("\n".join(output_lines), folds)
 
 
-def build_unified_diff_preview_for_path(
-    target: Path,
-    timeout_seconds: float = 0.2,
-    colorize: bool = True,
-    style: str = "monokai",
-) -> str | None:
-    """Return annotated git diff preview for a tracked modified file.
+def _diff_args_for_status_flags(status_flags: int) -> list[str] | None:
+    """Pick the one ``git diff`` invocation matching overlay status flags.
 
-    Returns ``None`` when target is outside a repo, unmodified/untracked, or no
-    hunk data can be derived.
+    Returns ``None`` for clean or untracked paths. Staged-only and
+    unstaged-only changes use the index comparison that also works before the
+    first commit; mixed, renamed, and conflicted paths diff against ``HEAD``.
     """
-    target = target.resolve()
-    if not target.is_file():
-        return None
-
-    repo_root, git_dir = _resolve_repo_and_git_dir(target.parent, timeout_seconds)
-    if repo_root is None or git_dir is None:
+    if not status_flags & GIT_STATUS_CHANGED:
         return None
-    if not target.is_relative_to(repo_root):
-        return None
-
-    rel_path = target.relative_to(repo_root)
-    try:
-        st = target.stat()
-        mtime_ns = int(st.st_mtime_ns)
-        size = int(st.st_size)
-    except Exception:
-        mtime_ns = 0
-        size = 0
-
-    git_signature = build_git_watch_signature(git_dir)
-    cache_key = (str(target), mtime_ns, size, git_signature, bool(colorize), style)
-    found, cached = _cache_get(cache_key)
-    if found:
-        return cached
+    staged = bool(status_flags & GIT_STATUS_STAGED)
+    unstaged = bool(status_flags & GIT_STATUS_UNSTAGED)
+    if status_flags & (GIT_STATUS_RENAMED | GIT_STATUS_CONFLICTED) or staged == unstaged:
+        return ["diff", "--no-color", "-U0", "HEAD"]
+    if staged:
+        return ["diff", "--cached", "--no-color", "-U0"]
+    return ["diff", "--no-color", "-U0"]
+
+
+def _collect_diff_hunks(
+    repo_root: Path,
+    rel_path: Path,
+    timeout_seconds: float,
+    status_flags: int | None = None,
+) -> list[DiffHunk] | None:
+    """Run git for ``rel_path`` and return parsed hunks, or ``None``.
+
+    Known ``status_flags`` (from the git status overlay) select the diff
+    directly; without them the path's status is probed first.
+    """
+    if status_flags is not None:
+        diff_args = _diff_args_for_status_flags(status_flags)
+        if diff_args is None:
+            return None
+        diff_proc = _run_git(repo_root, [*diff_args, "--", str(rel_path)], timeout_seconds)
+        if diff_proc is not None and diff_proc.returncode == 0 and diff_proc.stdout:
+            hunks = _parse_diff_hunks(sanitize_terminal_text(diff_proc.stdout))
+            return hunks or None
+        if diff_args[-1] != "HEAD":
+            return None
+        # ``HEAD`` may not exist yet; fall through to the probing path.
 
     status_proc = _run_git(
         repo_root,
@@ -362,12 +784,10 @@ def build_unified_diff_preview_for_path(
         timeout_seconds,
     )
     if status_proc is None or status_proc.returncode != 0:
-        _cache_put(cache_key, None)
         return None
 
     status_line = next((line for line in status_proc.stdout.splitlines() if line), "")
     if not status_line or status_line.startswith("??"):
-        _cache_put(cache_key, None)
         return None
 
     diff_proc = _run_git(
@@ -391,15 +811,168 @@ def build_unified_diff_preview_for_path(
         unstaged_text = unstaged_proc.stdout if unstaged_proc is not None and unstaged_proc.returncode == 0 else ""
         diff_text = staged_text or unstaged_text
 
-    diff_text = sanitize_terminal_text(diff_text)
-    hunks = _parse_diff_hunks(diff_text)
+    hunks = _parse_diff_hunks(sanitize_terminal_text(diff_text))
+    return hunks or None
+
+
+def _diff_hunks_between(base_lines: list[str], source_lines: list[str]) -> list[DiffHunk]:
+    """Return zero-context hunks turning ``base_lines`` into ``source_lines``.
+
+    Line numbers follow ``git diff -U0``: an empty side starts at the line
+    before the change.
+    """
+    matcher = difflib.SequenceMatcher(None, base_lines, source_lines)
+    hunks: list[DiffHunk] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        old_count = i2 - i1
+        new_count = j2 - j1
+        hunks.append(
+            DiffHunk(
+                old_start=i1 + 1 if old_count else i1,
+                old_count=old_count,
+                new_start=j1 + 1 if new_count else j1,
+                new_count=new_count,
+                removed_lines=base_lines[i1:i2],
+            )
+        )
+    return hunks
+
+
+def _collect_base_diff_hunks(
+    repo_root: Path,
+    git_dir: Path,
+    rel_path: Path,
+    base: str,
+    source_lines: list[str],
+    timeout_seconds: float,
+) -> list[DiffHunk] | None:
+    """Diff ``source_lines`` against ``rel_path`` at diff base ``base``.
+
+    Files absent from the base show as fully added. Returns ``None`` when the
+    base cannot be resolved or read.
+    """
+    commit = resolve_git_base_commit(repo_root, git_dir, base, timeout_seconds)
+    if commit is None:
+        return None
+    try:
+        base_blob = read_base_blob(repo_root, commit, rel_path.as_posix())
+    except OSError:
+        return None
+    if base_blob is None:
+        if not source_lines:
+            return None
+        return [DiffHunk(old_start=0, old_count=0, new_start=1, new_count=len(source_lines), removed_lines=[])]
+    base_lines = sanitize_terminal_text(decode_text(base_blob)).splitlines()
+    hunks = _diff_hunks_between(base_lines, source_lines)
+    return hunks or None
+
+
+def build_unified_diff_preview(
+    target: Path,
+    timeout_seconds: float = 0.2,
+    colorize: bool = True,
+    style: str = "monokai",
+    hunks_only: bool | None = None,
+    context_lines: int = GIT_DIFF_HUNK_CONTEXT_LINES,
+    expanded_folds: frozenset[int] = frozenset(),
+    base: str = GIT_DIFF_BASE_HEAD,
+    status_flags: int | None = None,
+) -> DiffPreview | None:
+    """Return annotated git diff preview for a tracked modified file.
+
+    ``base`` is a diff-base spec (see ``git_revision``); ``HEAD`` uses git's own
+    diff, anything else diffs against the base blob in-process.
+    ``status_flags`` are the path's git status overlay flags when known; they
+    let a ``HEAD`` diff skip the status probe (``0`` means known-clean).
+
+    ``hunks_only`` selects the folded layout; ``None`` enables it automatically
+    for files with at least ``GIT_DIFF_HUNKS_ONLY_MIN_LINES`` lines. Folds whose
+    first hidden line is listed in ``expanded_folds`` are shown in full.
+
+    Returns ``None`` when target is outside a repo, unmodified/untracked, or no
+    hunk data can be derived.
+    """
+    target = target.resolve()
+    if not target.is_file():
+        return None
+
+    repo_root, git_dir = resolve_git_repo_context(target.parent, timeout_seconds)
+    if repo_root is None or git_dir is None:
+        return None
+    if not target.is_relative_to(repo_root):
+        return None
+
+    rel_path = target.relative_to(repo_root)
+    try:
+        st = target.stat()
+        mtime_ns = int(st.st_mtime_ns)
+        size = int(st.st_size)
+    except Exception:
+        mtime_ns = 0
+        size = 0
+
+    context_lines = max(0, int(context_lines))
+    base = normalize_git_diff_base(base)
+    git_signature = build_git_watch_signature(git_dir)
+    cache_key = (
+        str(target),
+        mtime_ns,
+        size,
+        git_signature,
+        base,
+        status_flags,
+        bool(colorize),
+        style,
+        hunks_only,
+        context_lines,
+        tuple(sorted(expanded_folds)),
+    )
+    found, cached = _cache_get(cache_key)
+    if found:
+        return cached
+
+    # Parsed hunks are shared by every layout of the same revision, so
+    # expanding a fold only re-renders instead of re-running git.
+    hunks_key = (str(target), mtime_ns, size, git_signature, base, status_flags)
+    found, hunks = _cache_get(hunks_key, _DIFF_HUNKS_CACHE)
+    source_lines: list[str] | None = None
+    if not found:
+        if is_head_diff_base(base):
+            hunks = _collect_diff_hunks(repo_root, rel_path, timeout_seconds, status_flags)
+        else:
+            source_lines = sanitize_terminal_text(read_text(target)).splitlines()
+            hunks = _collect_base_diff_hunks(repo_root, git_dir, rel_path, base, source_lines, timeout_seconds)
+        _cache_put(hunks_key, hunks, _DIFF_HUNKS_CACHE)
     if not hunks:
         _cache_put(cache_key, None)
         return None
 
-    source = sanitize_terminal_text(read_text(target))
-    source_lines = source.splitlines()
-    source_display_lines = _colorize_lines(source_lines, target, style, colorize)
+    if source_lines is None:
+        source_lines = sanitize_terminal_text(read_text(target)).splitlines()
+    use_hunks_only = (
+        len(source_lines) >= GIT_DIFF_HUNKS_ONLY_MIN_LINES if hunks_only is None else hunks_only
+    )
+    display_ranges: list[tuple[int, int]] | None = None
+    if use_hunks_only:
+        display_ranges = _expand_display_ranges(
+            _hunk_display_ranges(hunks, len(source_lines), context_lines),
+            len(source_lines),
+            expanded_folds,
+        )
+        # Highlight only the displayed regions, one lexer pass each, so an
+        # open string or comment never carries across a fold.
+        source_display_lines = list(source_lines)
+        for range_start, range_end in display_ranges:
+            source_display_lines[range_start - 1 : range_end] = _colorize_lines(
+                source_lines[range_start - 1 : range_end],
+                target,
+                style,
+                colorize,
+            )
+    else:
+        source_display_lines = _colorize_lines(source_lines, target, style, colorize)
     rendered = _build_annotated_source_preview(
         source_lines,
         source_display_lines,
@@ -407,6 +980,33 @@ def build_unified_diff_preview_for_path(
         target,
         style,
         colorize,
+        display_ranges=display_ranges,
     )
     _cache_put(cache_key, rendered)
     return rendered
+
+
+def build_unified_diff_preview_for_path(
+    target: Path,
+    timeout_seconds: float = 0.2,
+    colorize: bool = True,
+    style: str = "monokai",
+    hunks_only: bool | None = None,
+    context_lines: int = GIT_DIFF_HUNK_CONTEXT_LINES,
+    expanded_folds: frozenset[int] = frozenset(),
+    base: str = GIT_DIFF_BASE_HEAD,
+    status_flags: int | None = None,
+) -> str | None:
+    """Return only the text of ``build_unified_diff_preview``."""
+    preview = build_unified_diff_preview(
+        target,
+        timeout_seconds=timeout_seconds,
+        colorize=colorize,
+        style=style,
+        hunks_only=hunks_only,
+        context_lines=context_lines,
+        expanded_folds=expanded_folds,
+        base=base,
+        status_flags=status_flags,
+    )
+    return preview.text if preview is not None else None
@@ -1,15 +1,25 @@
 """Map rendered diff rows back to source-line positions.
 
 These helpers let sticky-header and status logic operate on semantic source
-lines even when rendered diff previews include removed-line-only rows.
+lines even when rendered diff previews include removed-line-only rows or
+hunks-only fold rows that stand in for a run of unchanged source lines.
+
+Fold rows are identified structurally: the diff builder reports a
+``diff_folds`` mapping from logical-line index to the hidden
+``(start_line, end_line)`` range, so source text that merely looks like a
+fold label is never mistaken for one.
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from ..render.ansi import ANSI_ESCAPE_RE
 from .text import line_has_newline_terminator
 
+DIFF_ADDED_BG_SGR = "48;2;36;74;52"
 DIFF_REMOVED_BG_SGR = "48;2;92;43;49"
+DIFF_FOLD_MARKER = "\u22ef"
 
 
 def iter_diff_logical_line_ranges(
@@ -58,6 +68,23 @@ def diff_preview_uses_plain_markers(
     )
 
 
+def format_diff_fold_label(start_line: int, end_line: int) -> str:
+    """Return plain fold-row label for hidden source lines ``start..end``."""
+    count = end_line - start_line + 1
+    noun = "line" if count == 1 else "lines"
+    return f"{DIFF_FOLD_MARKER} {count} unchanged {noun} ({start_line}-{end_line}) {DIFF_FOLD_MARKER}"
+
+
+def diff_preview_fold_span(
+    diff_folds: Mapping[int, tuple[int, int]] | None,
+    logical_index: int,
+) -> tuple[int, int] | None:
+    """Return hidden ``(start_line, end_line)`` when logical line ``logical_index`` is a fold row."""
+    if not diff_folds:
+        return None
+    return diff_folds.get(logical_index)
+
+
 def diff_preview_logical_line_is_removed(
     first_chunk: str,
     use_plain_markers: bool,
@@ -73,10 +100,12 @@ def diff_source_line_for_display_index(
     text_lines: list[str],
     display_index: int,
     wrap_text: bool,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> int:
     """Map rendered display index to corresponding 1-based source line number.
 
-    Removed lines do not advance the source-line counter.
+    Removed lines do not advance the source-line counter; fold rows map to the
+    first line they hide and skip the counter past the whole run.
     """
     if not text_lines:
         return 1
@@ -84,14 +113,19 @@ def diff_source_line_for_display_index(
     clamped = max(0, min(display_index, len(text_lines) - 1))
     source_line = 1
     use_plain_markers = diff_preview_uses_plain_markers(text_lines, wrap_text)
-    for start_idx, end_idx in iter_diff_logical_line_ranges(text_lines, wrap_text):
+    for logical_idx, (start_idx, end_idx) in enumerate(iter_diff_logical_line_ranges(text_lines, wrap_text)):
         is_removed = diff_preview_logical_line_is_removed(
             text_lines[start_idx],
             use_plain_markers=use_plain_markers,
         )
+        fold_span = None if is_removed else diff_preview_fold_span(diff_folds, logical_idx)
+        if fold_span is not None:
+            source_line = fold_span[0]
         if start_idx <= clamped <= end_idx:
             return source_line
-        if not is_removed:
+        if fold_span is not None:
+            source_line = fold_span[1] + 1
+        elif not is_removed:
             source_line += 1
 
     return source_line
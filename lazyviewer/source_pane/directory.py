@@ -3,18 +3,37 @@
 Preview output is ANSI-formatted tree text used by the source pane when the
 selected path is a directory. Results are memoized with keys that include root
 mtime and git-overlay signature, then validated against scanned metadata.
+
+Top-of-file doc labels never block a preview: rows whose summary is not
+cached yet are emitted without a label, and the summaries are read on a small
+shared thread pool. Finished batches patch the cached preview in place and
+bump ``directory_preview_doc_label_generation`` for its root, which the
+runtime polls to re-render the visible preview from the cache.
 """
 
 from __future__ import annotations
 
 from collections import OrderedDict
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+import itertools
 from pathlib import Path
 import threading
 
-from ..file_tree_model.doc_summary import cached_top_file_doc_summary, clear_doc_summary_cache
-from ..file_tree_model.fs import list_directory_children, maybe_gitignore_matcher
-from ..git_status import format_git_status_badges
+from ..file_tree_model.doc_summary import (
+    cached_top_file_doc_summary,
+    clear_doc_summary_cache,
+    lookup_cached_top_file_doc_summary,
+)
+from ..file_tree_model.fs import list_directory_children, maybe_gitignore_matcher, prefetch_directory_listings
+from ..file_tree_model.listing import (
+    clear_directory_listing_cache,
+    invalidate_directory_listing,
+    stat_file_metadata,
+)
+from ..file_tree_model.paths import canonical_path
+from ..git_status import GitStatusOverlay, format_git_status_badges, format_git_status_flags
 from ..tree_model.rendering import TREE_SIZE_LABEL_MIN_BYTES
 
 DIR_PREVIEW_DEFAULT_DEPTH = 32
@@ -22,6 +41,10 @@ DIR_PREVIEW_INITIAL_MAX_ENTRIES = 1_000
 DIR_PREVIEW_GROWTH_STEP = 500
 DIR_PREVIEW_HARD_MAX_ENTRIES = 20_000
 DIR_PREVIEW_CACHE_MAX = 128
+DIR_PREVIEW_DOC_SUMMARY_WORKERS = 4
+DIR_PREVIEW_DOC_SUMMARY_BATCH = 128
+_DOC_LABEL_COLOR = "\033[2;38;5;244m"
+_RESET = "\033[0m"
 
 
 @dataclass(frozen=True)
@@ -38,6 +61,25 @@ _DIR_PREVIEW_CACHE: OrderedDict[tuple[str, bool, int, int, bool, bool, int, int]
     OrderedDict()
 )
 _DIR_PREVIEW_CACHE_LOCK = threading.RLock()
+_DOC_SUMMARY_EXECUTOR: ThreadPoolExecutor | None = None
+_DOC_SUMMARY_FUTURES: set[Future[None]] = set()
+# Generations come from one global counter, so a root whose entry was
+# evicted or cleared never reports a value a caller already applied.
+_DOC_LABEL_GENERATIONS: OrderedDict[str, int] = OrderedDict()
+_DOC_LABEL_GENERATION_COUNTER = itertools.count(1)
+
+
+@dataclass
+class _PendingDocLabels:
+    """Rows of one cached preview still waiting for their doc summaries.
+
+    ``entry`` is the cache entry the rows were emitted into; patches are
+    dropped once the cache holds anything else under ``key``.
+    """
+
+    key: tuple[str, bool, int, int, bool, bool, int, int]
+    entry: _DirectoryPreviewCacheEntry
+    lines: list[str]
 
 
 def _cache_key_for_directory(
@@ -50,8 +92,8 @@ def _cache_key_for_directory(
     git_overlay_signature: int,
 ) -> tuple[str, bool, int, int, bool, bool, int, int] | None:
     """Build cache key for a directory preview request."""
+    resolved = canonical_path(root_dir)
     try:
-        resolved = root_dir.resolve()
         mtime_ns = resolved.stat().st_mtime_ns
     except Exception:
         return None
@@ -80,17 +122,23 @@ def _watched_directory_mtimes_match(watched_directory_mtimes: tuple[tuple[str, i
 
 
 def _watched_file_signatures_match(watched_file_signatures: tuple[tuple[str, int, int], ...]) -> bool:
-    """Return whether file mtime/size signatures captured for a cache entry are unchanged."""
+    """Return whether file mtime/size signatures captured for a cache entry are unchanged.
+
+    Files rewritten in place leave their directory mtime alone, so the
+    shared listings of their directories are dropped as well.
+    """
+    stale_directories: set[Path] = set()
     for path_text, cached_mtime_ns, cached_size in watched_file_signatures:
         try:
             stat = Path(path_text).stat()
         except Exception:
-            return False
-        if int(stat.st_mtime_ns) != int(cached_mtime_ns):
-            return False
-        if int(stat.st_size) != int(cached_size):
-            return False
-    return True
+            stale_directories.add(Path(path_text).parent)
+            continue
+        if int(stat.st_mtime_ns) != int(cached_mtime_ns) or int(stat.st_size) != int(cached_size):
+            stale_directories.add(Path(path_text).parent)
+    for directory in stale_directories:
+        invalidate_directory_listing(directory)
+    return not stale_directories
 
 
 def _cache_get(key: tuple[str, bool, int, int, bool, bool, int, int] | None) -> tuple[str, bool] | None:
@@ -123,47 +171,128 @@ def _cache_put(
     truncated: bool,
     watched_directory_mtimes: tuple[tuple[str, int], ...],
     watched_file_signatures: tuple[tuple[str, int, int], ...],
-) -> None:
-    """Insert preview result into LRU cache with bounded size."""
+) -> _DirectoryPreviewCacheEntry | None:
+    """Insert preview result into LRU cache with bounded size and return the entry."""
     if key is None:
-        return
+        return None
+    entry = _DirectoryPreviewCacheEntry(
+        preview=preview,
+        truncated=truncated,
+        watched_directory_mtimes=watched_directory_mtimes,
+        watched_file_signatures=watched_file_signatures,
+    )
     with _DIR_PREVIEW_CACHE_LOCK:
-        _DIR_PREVIEW_CACHE[key] = _DirectoryPreviewCacheEntry(
-            preview=preview,
-            truncated=truncated,
-            watched_directory_mtimes=watched_directory_mtimes,
-            watched_file_signatures=watched_file_signatures,
-        )
+        _DIR_PREVIEW_CACHE[key] = entry
         _DIR_PREVIEW_CACHE.move_to_end(key)
         while len(_DIR_PREVIEW_CACHE) > DIR_PREVIEW_CACHE_MAX:
             _DIR_PREVIEW_CACHE.popitem(last=False)
+    return entry
+
+
+def _doc_label(summary: str) -> str:
+    return f"{_DOC_LABEL_COLOR}  -- {summary}{_RESET}"
+
+
+def _doc_summary_executor() -> ThreadPoolExecutor:
+    """Return the shared pool that reads doc summaries for preview rows."""
+    global _DOC_SUMMARY_EXECUTOR
+    with _DIR_PREVIEW_CACHE_LOCK:
+        if _DOC_SUMMARY_EXECUTOR is None:
+            _DOC_SUMMARY_EXECUTOR = ThreadPoolExecutor(
+                max_workers=DIR_PREVIEW_DOC_SUMMARY_WORKERS,
+                thread_name_prefix="lazyviewer-doc-summary",
+            )
+        return _DOC_SUMMARY_EXECUTOR
+
+
+def _fill_doc_labels(job: _PendingDocLabels, rows: Sequence[tuple[int, Path, int | None]]) -> None:
+    """Read summaries for ``rows`` and patch their labels into the cached preview."""
+    with _DIR_PREVIEW_CACHE_LOCK:
+        if _DIR_PREVIEW_CACHE.get(job.key) is not job.entry:
+            # Evicted, invalidated, or rebuilt: nobody will show these rows.
+            return
+    labels: list[tuple[int, str]] = []
+    for line_idx, path, file_size in rows:
+        try:
+            summary = cached_top_file_doc_summary(path, file_size)
+        except Exception:
+            summary = None
+        if summary:
+            labels.append((line_idx, _doc_label(summary)))
+    if not labels:
+        return
+    with _DIR_PREVIEW_CACHE_LOCK:
+        if _DIR_PREVIEW_CACHE.get(job.key) is not job.entry:
+            return
+        for line_idx, label in labels:
+            job.lines[line_idx] += label
+        job.entry = replace(job.entry, preview="\n".join(job.lines))
+        # Plain assignment keeps the entry's LRU position.
+        _DIR_PREVIEW_CACHE[job.key] = job.entry
+        root_text = job.key[0]
+        _DOC_LABEL_GENERATIONS[root_text] = next(_DOC_LABEL_GENERATION_COUNTER)
+        _DOC_LABEL_GENERATIONS.move_to_end(root_text)
+        while len(_DOC_LABEL_GENERATIONS) > DIR_PREVIEW_CACHE_MAX:
+            _DOC_LABEL_GENERATIONS.popitem(last=False)
+
+
+def _schedule_doc_labels(job: _PendingDocLabels, rows: Sequence[tuple[int, Path, int | None]]) -> None:
+    """Queue background summary reads for ``rows`` in batches."""
+    executor = _doc_summary_executor()
+    for start in range(0, len(rows), DIR_PREVIEW_DOC_SUMMARY_BATCH):
+        future = executor.submit(_fill_doc_labels, job, rows[start : start + DIR_PREVIEW_DOC_SUMMARY_BATCH])
+        with _DIR_PREVIEW_CACHE_LOCK:
+            _DOC_SUMMARY_FUTURES.add(future)
+        future.add_done_callback(_forget_doc_summary_future)
+
+
+def _forget_doc_summary_future(future: Future[None]) -> None:
+    with _DIR_PREVIEW_CACHE_LOCK:
+        _DOC_SUMMARY_FUTURES.discard(future)
+
+
+def directory_preview_doc_label_generation(root_dir: Path) -> int:
+    """Return a token that changes whenever background doc labels land for ``root_dir``.
+
+    ``0`` means no patch is recorded (none landed, or the record was evicted
+    or cleared).
+    """
+    with _DIR_PREVIEW_CACHE_LOCK:
+        return _DOC_LABEL_GENERATIONS.get(str(canonical_path(root_dir)), 0)
+
+
+def wait_for_directory_preview_doc_summaries(timeout: float | None = None) -> bool:
+    """Block until queued doc-label reads finish; return ``False`` on timeout."""
+    with _DIR_PREVIEW_CACHE_LOCK:
+        futures = list(_DOC_SUMMARY_FUTURES)
+    _done, not_done = wait(futures, timeout=timeout)
+    return not not_done
 
 
 def clear_directory_preview_cache() -> None:
-    """Clear in-memory directory preview cache and doc-summary metadata cache."""
+    """Clear in-memory directory preview cache plus doc-summary and listing caches."""
     with _DIR_PREVIEW_CACHE_LOCK:
         _DIR_PREVIEW_CACHE.clear()
+        _DOC_LABEL_GENERATIONS.clear()
     clear_doc_summary_cache()
+    clear_directory_listing_cache()
 
 
-def _directory_overlay_signature(root_dir: Path, git_status_overlay: dict[Path, int] | None) -> int:
+def _directory_overlay_signature(root_dir: Path, git_status_overlay: Mapping[Path, int] | None) -> int:
     """Compute stable hash of overlay entries that affect directory preview rows."""
     if not git_status_overlay:
         return 0
 
-    try:
-        root = root_dir.resolve()
-    except Exception:
-        root = root_dir
+    root = canonical_path(root_dir)
+
+    if isinstance(git_status_overlay, GitStatusOverlay):
+        return git_status_overlay.subtree_signature(root)
 
     entries: list[tuple[str, int]] = []
     for raw_path, flags in git_status_overlay.items():
         if flags == 0:
             continue
-        try:
-            path = raw_path.resolve()
-        except Exception:
-            path = raw_path
+        path = canonical_path(raw_path)
 
         if path == root:
             entries.append((".", int(flags)))
@@ -188,10 +317,14 @@ def build_directory_preview(
     max_depth: int = DIR_PREVIEW_DEFAULT_DEPTH,
     max_entries: int = DIR_PREVIEW_INITIAL_MAX_ENTRIES,
     skip_gitignored: bool = False,
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     show_size_labels: bool = True,
 ) -> tuple[str, bool]:
-    """Render directory tree preview and return ``(text, truncated)``."""
+    """Render directory tree preview and return ``(text, truncated)``.
+
+    Doc labels missing from the summary cache are filled in later; see the
+    module docs. Previews that cannot be cached read them inline instead.
+    """
     overlay_signature = _directory_overlay_signature(root_dir, git_status_overlay)
     cache_key = _cache_key_for_directory(
         root_dir,
@@ -212,19 +345,24 @@ def build_directory_preview(
     file_color = "\033[38;5;252m"
     branch_color = "\033[2;38;5;245m"
     note_color = "\033[2;38;5;250m"
-    doc_color = "\033[2;38;5;244m"
     size_color = "\033[38;5;109m"
-    reset = "\033[0m"
+    reset = _RESET
 
-    try:
-        root_label = f"{root_dir.resolve()}/"
-    except Exception:
-        root_label = f"{root_dir}/"
-    root_badges = format_git_status_badges(root_dir, git_status_overlay)
+    resolved_root = canonical_path(root_dir)
+    root_label = f"{resolved_root}/"
+    root_badges = format_git_status_badges(resolved_root, git_status_overlay)
     lines_out: list[str] = [f"{dir_color}{root_label}{reset}{root_badges}", ""]
+    listings = prefetch_directory_listings(
+        resolved_root,
+        show_hidden,
+        ignore_matcher=ignore_matcher,
+        max_depth=max_depth - 1,
+        max_entries=max_entries,
+    )
     emitted = 0
     watched_directory_mtimes: dict[str, int] = {}
     watched_file_signatures: dict[str, tuple[int, int]] = {}
+    pending_doc_rows: list[tuple[int, Path, int | None]] = []
 
     def walk(directory: Path, prefix: str, depth: int) -> None:
         """Emit preview rows depth-first until depth/entry limits are reached."""
@@ -238,13 +376,11 @@ def build_directory_preview(
             ignore_matcher=ignore_matcher,
             git_status_overlay=git_status_overlay,
             include_doc_summaries=False,
+            listing=listings.get(directory),
         )
         if directory_mtime_ns is not None:
-            try:
-                resolved_directory = directory.resolve()
-            except Exception:
-                resolved_directory = directory
-            watched_directory_mtimes[str(resolved_directory)] = int(directory_mtime_ns)
+            # ``directory`` is the canonical root or a non-symlink child of it.
+            watched_directory_mtimes[str(directory)] = int(directory_mtime_ns)
         if scan_error is not None:
             lines_out.append(f"{branch_color}{prefix}└─{reset} {note_color}<error: {scan_error}>{reset}")
             return
@@ -258,30 +394,35 @@ def build_directory_preview(
             name_color = dir_color if child.is_dir else file_color
             size_label = ""
             doc_label = ""
+            file_size, mtime_ns = child.file_size, child.mtime_ns
+            if not child.is_dir and mtime_ns is None:
+                # Huge directories are listed without stats; only shown rows pay for one.
+                file_size, mtime_ns = stat_file_metadata(child.path)
             if (
                 show_size_labels
                 and (not child.is_dir)
-                and child.file_size is not None
-                and child.file_size >= TREE_SIZE_LABEL_MIN_BYTES
+                and file_size is not None
+                and file_size >= TREE_SIZE_LABEL_MIN_BYTES
             ):
-                size_kb = child.file_size // 1024
+                size_kb = file_size // 1024
                 size_label = f"{size_color} [{size_kb} KB]{reset}"
             if not child.is_dir:
-                if child.mtime_ns is not None and child.file_size is not None:
-                    try:
-                        resolved_file = child.path.resolve()
-                    except Exception:
-                        resolved_file = child.path
-                    watched_file_signatures[str(resolved_file)] = (child.mtime_ns, child.file_size)
+                if mtime_ns is not None and file_size is not None:
+                    watched_file_signatures[str(canonical_path(child.path))] = (mtime_ns, file_size)
                 doc_summary: str | None = None
                 try:
-                    doc_summary = cached_top_file_doc_summary(child.path, child.file_size)
+                    if cache_key is None:
+                        doc_summary = cached_top_file_doc_summary(child.path, file_size)
+                    else:
+                        known, doc_summary = lookup_cached_top_file_doc_summary(child.path, file_size)
+                        if not known:
+                            pending_doc_rows.append((len(lines_out), child.path, file_size))
                 except Exception:
                     doc_summary = None
                 if doc_summary:
-                    doc_label = f"{doc_color}  -- {doc_summary}{reset}"
+                    doc_label = _doc_label(doc_summary)
 
-            badges = format_git_status_badges(child.path, git_status_overlay)
+            badges = format_git_status_flags(child.git_status_flags)
             lines_out.append(
                 f"{branch_color}{prefix}{branch}{reset}{name_color}{child.name}{suffix}{reset}{size_label}{badges}{doc_label}"
             )
@@ -289,14 +430,14 @@ def build_directory_preview(
             if child.is_dir:
                 walk(child.path, prefix + ("   " if last else "│  "), depth + 1)
 
-    walk(root_dir, "", 1)
+    walk(resolved_root, "", 1)
     truncated = emitted >= max_entries
     if truncated:
         lines_out.append("")
         lines_out.append(f"{note_color}... truncated after {max_entries} entries ...{reset}")
 
     preview = "\n".join(lines_out)
-    _cache_put(
+    entry = _cache_put(
         cache_key,
         preview,
         truncated,
@@ -306,6 +447,8 @@ def build_directory_preview(
             for path_text, signature in watched_file_signatures.items()
         ),
     )
+    if entry is not None and cache_key is not None and pending_doc_rows:
+        _schedule_doc_labels(_PendingDocLabels(cache_key, entry, lines_out), pending_doc_rows)
     return preview, truncated
 
 
@@ -317,6 +460,7 @@ class DirectoryPreview:
     DIR_PREVIEW_GROWTH_STEP = DIR_PREVIEW_GROWTH_STEP
     DIR_PREVIEW_HARD_MAX_ENTRIES = DIR_PREVIEW_HARD_MAX_ENTRIES
     DIR_PREVIEW_CACHE_MAX = DIR_PREVIEW_CACHE_MAX
+    DIR_PREVIEW_DOC_SUMMARY_WORKERS = DIR_PREVIEW_DOC_SUMMARY_WORKERS
     TREE_SIZE_LABEL_MIN_BYTES = TREE_SIZE_LABEL_MIN_BYTES
     _DIR_PREVIEW_CACHE = _DIR_PREVIEW_CACHE
 
@@ -327,7 +471,7 @@ class DirectoryPreview:
         max_depth: int = DIR_PREVIEW_DEFAULT_DEPTH,
         max_entries: int = DIR_PREVIEW_INITIAL_MAX_ENTRIES,
         skip_gitignored: bool = False,
-        git_status_overlay: dict[Path, int] | None = None,
+        git_status_overlay: Mapping[Path, int] | None = None,
         show_size_labels: bool = True,
     ) -> tuple[str, bool]:
         return build_directory_preview(
@@ -343,3 +487,11 @@ class DirectoryPreview:
     @staticmethod
     def clear_directory_preview_cache() -> None:
         clear_directory_preview_cache()
+
+    @staticmethod
+    def directory_preview_doc_label_generation(root_dir: Path) -> int:
+        return directory_preview_doc_label_generation(root_dir)
+
+    @staticmethod
+    def wait_for_directory_preview_doc_summaries(timeout: float | None = None) -> bool:
+        return wait_for_directory_preview_doc_summaries(timeout)
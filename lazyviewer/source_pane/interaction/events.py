@@ -1,9 +1,10 @@
 """Interpret clicks inside the source preview pane.
 
-This module resolves three click intents in order:
+This module resolves four click intents in order:
 1. navigate directory preview rows
-2. jump to import targets
-3. run content search for clicked token
+2. expand collapsed hunks-only diff folds
+3. jump to import targets
+4. run content search for clicked token
 """
 
 from __future__ import annotations
@@ -17,6 +18,7 @@ from ...render.help import help_panel_row_count
 from ...runtime.state import AppState
 from ...tree_model import find_content_hit_index
 from ..diffmap import (
+    diff_preview_fold_span,
     diff_preview_logical_line_is_removed,
     diff_preview_uses_plain_markers,
     diff_source_line_for_display_index,
@@ -220,6 +222,7 @@ def _clicked_preview_hit_anchor(
             state.lines,
             line_idx,
             state.wrap_text,
+            diff_folds=state.preview_diff_folds,
         )
         if state.wrap_text:
             start_idx = 0
@@ -410,6 +413,17 @@ def _open_content_search_for_token(
     return True
 
 
+def clicked_diff_fold_start(state: AppState, display_idx: int) -> int | None:
+    """Return first hidden source line when a diff fold row is clicked."""
+    if not state.preview_is_git_diff or display_idx < 0 or display_idx >= len(state.lines):
+        return None
+    for logical_idx, (start_idx, end_idx) in enumerate(iter_diff_logical_line_ranges(state.lines, state.wrap_text)):
+        if start_idx <= display_idx <= end_idx:
+            fold_span = diff_preview_fold_span(state.preview_diff_folds, logical_idx)
+            return fold_span[0] if fold_span is not None else None
+    return None
+
+
 def handle_preview_click(
     state: AppState,
     selection_pos: tuple[int, int],
@@ -420,6 +434,7 @@ def handle_preview_click(
     jump_to_path: Callable[[Path], None],
     open_tree_filter: Callable[[str], None],
     apply_tree_filter_query: Callable[..., None],
+    expand_diff_fold: Callable[[int], bool] | None = None,
 ) -> bool:
     """Handle a click in source pane and execute highest-priority matching action."""
     if state.dir_preview_path is not None:
@@ -431,6 +446,15 @@ def handle_preview_click(
             state.dirty = True
             return True
 
+    if expand_diff_fold is not None:
+        fold_start = clicked_diff_fold_start(state, selection_pos[0])
+        if fold_start is not None:
+            clear_source_selection()
+            reset_source_selection_drag_state()
+            expand_diff_fold(fold_start)
+            state.dirty = True
+            return True
+
     import_target = clicked_preview_import_target(state, state.lines, selection_pos)
     if import_target is not None:
         clear_source_selection()
@@ -12,6 +12,7 @@ from collections.abc import Callable
 
 from ...render.ansi import ANSI_ESCAPE_RE, char_display_width
 from ...runtime.state import AppState
+from ..blame import blame_gutter_width
 
 
 def _rendered_line_display_width(line: str) -> int:
@@ -50,7 +51,8 @@ class SourcePaneGeometry:
         """Return max valid horizontal scroll offset for current rendered lines."""
         if self.state.wrap_text or not self.state.lines:
             return 0
-        viewport_width = self.preview_pane_width()
+        pane_width = self.preview_pane_width()
+        viewport_width = pane_width - blame_gutter_width(pane_width, self.state.blame_view)
         cache_key = (id(self.state.lines), viewport_width)
         if self._max_text_offset_cache_key == cache_key:
             return self._max_text_offset_cache_value
@@ -81,14 +83,12 @@ class SourcePaneGeometry:
 
         if self.state.browser_visible:
             right_start_col = self.state.left_width + 2
-            if col < right_start_col:
-                return None
-            text_col = max(0, col - right_start_col + self.state.text_x)
         else:
             right_start_col = 1
-            if col < right_start_col:
-                return None
-            text_col = max(0, col - right_start_col + self.state.text_x)
+        if col < right_start_col:
+            return None
+        gutter = blame_gutter_width(self.preview_pane_width(), self.state.blame_view)
+        text_col = max(0, col - right_start_col - gutter + self.state.text_x)
 
         if not self.state.lines:
             return None
@@ -76,6 +76,7 @@ class SourcePaneMouseHandlers:
         open_tree_filter: Callable[[str], None],
         apply_tree_filter_query: Callable[..., None],
         jump_to_path: Callable[[Path], None],
+        expand_diff_fold: Callable[[int], bool] | None = None,
     ) -> None:
         """Bind source-pane mouse handlers to app state and pane operations."""
         self._state = state
@@ -90,6 +91,7 @@ class SourcePaneMouseHandlers:
         self._open_tree_filter = open_tree_filter
         self._apply_tree_filter_query = apply_tree_filter_query
         self._jump_to_path = jump_to_path
+        self._expand_diff_fold = expand_diff_fold
         self._drag = SourceSelectionDragState()
 
     def reset_source_selection_drag_state(self) -> None:
@@ -236,6 +238,7 @@ class SourcePaneMouseHandlers:
                     jump_to_path=self._jump_to_path,
                     open_tree_filter=self._open_tree_filter,
                     apply_tree_filter_query=self._apply_tree_filter_query,
+                    expand_diff_fold=self._expand_diff_fold,
                 )
                 if handled:
                     return SourcePaneClickResult(handled=True)
@@ -9,14 +9,15 @@ This module decides how a selected path should be rendered in the source pane:
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 import os
 import sys
 from pathlib import Path
 
 from .syntax import colorize_source, read_text, sanitize_terminal_text
-from .diff import build_unified_diff_preview_for_path
+from .diff import GIT_DIFF_HUNK_CONTEXT_LINES, DiffPreview, build_unified_diff_preview
+from ..git_revision import GIT_DIFF_BASE_HEAD
 from .directory import (
     DIR_PREVIEW_DEFAULT_DEPTH,
     DIR_PREVIEW_INITIAL_MAX_ENTRIES,
@@ -38,6 +39,7 @@ class RenderedPath:
     image_path: Path | None = None
     image_format: str | None = None
     is_git_diff_preview: bool = False
+    diff_folds: Mapping[int, tuple[int, int]] = field(default_factory=dict)
 
     @classmethod
     def directory(cls, preview: str, *, truncated: bool) -> RenderedPath:
@@ -65,13 +67,14 @@ class RenderedPath:
         return cls(text=message, is_directory=False, truncated=False)
 
     @classmethod
-    def git_diff_preview(cls, diff_preview: str) -> RenderedPath:
+    def git_diff_preview(cls, diff_preview: DiffPreview) -> RenderedPath:
         """Construct a rendered git-diff preview payload."""
         return cls(
-            text=diff_preview,
+            text=diff_preview.text,
             is_directory=False,
             truncated=False,
             is_git_diff_preview=True,
+            diff_folds=diff_preview.folds,
         )
 
     @classmethod
@@ -99,8 +102,12 @@ class RenderedPath:
         dir_max_entries: int = DIR_PREVIEW_INITIAL_MAX_ENTRIES,
         dir_skip_gitignored: bool = False,
         prefer_git_diff: bool = True,
-        dir_git_status_overlay: dict[Path, int] | None = None,
+        dir_git_status_overlay: Mapping[Path, int] | None = None,
         dir_show_size_labels: bool = True,
+        diff_context_lines: int = GIT_DIFF_HUNK_CONTEXT_LINES,
+        diff_expanded_folds: frozenset[int] = frozenset(),
+        diff_base: str = GIT_DIFF_BASE_HEAD,
+        diff_status_flags: int | None = None,
         colorize_source_fn: Callable[[str, Path, str], str] | None = None,
     ) -> RenderedPath:
         """Build preview content for a file or directory target.
@@ -108,7 +115,10 @@ class RenderedPath:
         Resolution order for files:
         1. PNG signature -> kitty-image metadata preview
         2. NUL-byte probe -> binary placeholder text
-        3. optional git-diff preview (when enabled and available)
+        3. optional git-diff preview (when enabled and available); large files
+           use the hunks-only layout with ``diff_context_lines`` of context and
+           ``diff_expanded_folds`` opened; changes are shown against ``diff_base``,
+           and known ``diff_status_flags`` skip the git status probe
         4. sanitized source text, optionally syntax-colored on TTY
 
         Directory targets delegate to ``build_directory_preview`` and report whether
@@ -146,10 +156,14 @@ class RenderedPath:
             return cls.binary_file(target, file_size)
 
         if prefer_git_diff:
-            diff_preview = build_unified_diff_preview_for_path(
+            diff_preview = build_unified_diff_preview(
                 target,
                 colorize=not no_color and os.isatty(sys.stdout.fileno()),
                 style=style,
+                context_lines=diff_context_lines,
+                expanded_folds=diff_expanded_folds,
+                base=diff_base,
+                status_flags=diff_status_flags,
             )
             if diff_preview:
                 return cls.git_diff_preview(diff_preview)
@@ -191,8 +205,12 @@ class RenderedPathPreview:
         dir_max_entries: int = DIR_PREVIEW_INITIAL_MAX_ENTRIES,
         dir_skip_gitignored: bool = False,
         prefer_git_diff: bool = True,
-        dir_git_status_overlay: dict[Path, int] | None = None,
+        dir_git_status_overlay: Mapping[Path, int] | None = None,
         dir_show_size_labels: bool = True,
+        diff_context_lines: int = GIT_DIFF_HUNK_CONTEXT_LINES,
+        diff_expanded_folds: frozenset[int] = frozenset(),
+        diff_base: str = GIT_DIFF_BASE_HEAD,
+        diff_status_flags: int | None = None,
     ) -> RenderedPath:
         return RenderedPath.from_path(
             target,
@@ -205,5 +223,9 @@ class RenderedPathPreview:
             prefer_git_diff=prefer_git_diff,
             dir_git_status_overlay=dir_git_status_overlay,
             dir_show_size_labels=dir_show_size_labels,
+            diff_context_lines=diff_context_lines,
+            diff_expanded_folds=diff_expanded_folds,
+            diff_base=diff_base,
+            diff_status_flags=diff_status_flags,
             colorize_source_fn=RenderedPathPreview.colorize_source,
         )
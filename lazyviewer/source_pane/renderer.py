@@ -2,14 +2,18 @@
 
 ``SourcePaneRenderer`` computes sticky headers and scroll/status metadata once
 per frame, then provides row-level rendering methods used by the top-level page
-renderer.
+renderer. With a blame view, a gutter is prepended to each row and only the
+viewport's rows are mapped to source lines and annotated.
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from pathlib import Path
 
+from ..git_blame import BlameView
 from . import rendering as preview_rendering
+from .blame import blame_gutter_width, format_blame_gutter, visible_source_lines
 
 
 class SourcePaneRenderer:
@@ -30,8 +34,13 @@ class SourcePaneRenderer:
         preview_is_git_diff: bool,
         source_selection_anchor: tuple[int, int] | None,
         source_selection_focus: tuple[int, int] | None,
+        blame_view: BlameView | None = None,
+        diff_folds: Mapping[int, tuple[int, int]] | None = None,
     ) -> None:
         """Initialize renderer state and sticky-header metadata."""
+        self.blame_view = blame_view
+        self.blame_gutter_width = blame_gutter_width(line_width, blame_view)
+        line_width = max(1, line_width - self.blame_gutter_width)
         self.text_lines = text_lines
         self.text_start = text_start
         self.line_width = line_width
@@ -54,6 +63,7 @@ class SourcePaneRenderer:
             current_path=current_path,
             wrap_text=wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         )
         self.sticky_headers = preview_rendering.formatted_sticky_headers(
             text_lines,
@@ -62,6 +72,7 @@ class SourcePaneRenderer:
             wrap_text,
             text_x,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         )
         self.sticky_header_rows = len(self.sticky_headers)
         self.text_content_rows = max(1, content_rows - self.sticky_header_rows)
@@ -72,9 +83,30 @@ class SourcePaneRenderer:
             self.text_content_rows,
             wrap_text,
         )
+        self._blame_source_lines: list[int | None] = []
+        if self.blame_gutter_width:
+            self._blame_source_lines = visible_source_lines(
+                text_lines,
+                text_start,
+                content_rows,
+                wrap_text,
+                preview_is_git_diff=preview_is_git_diff,
+                diff_folds=diff_folds,
+            )
 
     def render_row(self, row: int) -> str:
         """Render one visible source-pane row, including sticky-header rows."""
+        if not self.blame_gutter_width:
+            return self._render_text_row(row)
+        assert self.blame_view is not None
+        if row < self.sticky_header_rows or row >= len(self._blame_source_lines):
+            gutter = " " * self.blame_gutter_width
+        else:
+            gutter = format_blame_gutter(self.blame_view, self._blame_source_lines[row])
+        return gutter + self._render_text_row(row)
+
+    def _render_text_row(self, row: int) -> str:
+        """Render one row of source text without the blame gutter."""
         if row < self.sticky_header_rows:
             return self.sticky_headers[row]
 
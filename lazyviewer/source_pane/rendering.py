@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from .diffmap import (
     DIFF_REMOVED_BG_SGR,
+    diff_preview_fold_span,
     diff_preview_logical_line_is_removed,
     diff_preview_uses_plain_markers,
     diff_source_line_for_display_index,
@@ -59,6 +60,7 @@ __all__ = [
     "iter_diff_logical_line_ranges",
     "diff_preview_uses_plain_markers",
     "diff_preview_logical_line_is_removed",
+    "diff_preview_fold_span",
     "diff_source_line_for_display_index",
     "source_line_display_index",
     "source_line_raw_text",
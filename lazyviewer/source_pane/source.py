@@ -7,9 +7,12 @@ appear visually but do not consume source line numbers.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from ..render.ansi import ANSI_ESCAPE_RE, clip_ansi_line, slice_ansi_line
 from ..source_pane.symbols import SymbolEntry
 from .diffmap import (
+    diff_preview_fold_span,
     diff_preview_logical_line_is_removed,
     diff_preview_uses_plain_markers,
     iter_diff_logical_line_ranges,
@@ -22,6 +25,7 @@ def source_line_display_index(
     source_line: int,
     wrap_text: bool,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> int | None:
     """Return display index of the first chunk for a 1-based source line."""
     if not text_lines:
@@ -31,13 +35,19 @@ def source_line_display_index(
     if preview_is_git_diff:
         source_idx = 1
         use_plain_markers = diff_preview_uses_plain_markers(text_lines, wrap_text)
-        for start_idx, _end_idx in iter_diff_logical_line_ranges(text_lines, wrap_text):
+        for logical_idx, (start_idx, _end_idx) in enumerate(iter_diff_logical_line_ranges(text_lines, wrap_text)):
             is_removed = diff_preview_logical_line_is_removed(
                 text_lines[start_idx],
                 use_plain_markers=use_plain_markers,
             )
             if is_removed:
                 continue
+            fold_span = diff_preview_fold_span(diff_folds, logical_idx)
+            if fold_span is not None:
+                if target <= fold_span[1]:
+                    return start_idx
+                source_idx = fold_span[1] + 1
+                continue
             if source_idx >= target:
                 return start_idx
             source_idx += 1
@@ -63,6 +73,7 @@ def source_line_raw_text(
     source_line: int,
     wrap_text: bool,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> str:
     """Return raw text for one logical source line without newline terminator."""
     start_idx = source_line_display_index(
@@ -70,6 +81,7 @@ def source_line_raw_text(
         source_line,
         wrap_text,
         preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
     )
     if start_idx is None:
         return ""
@@ -92,6 +104,7 @@ def source_line_is_blank(
     source_line: int,
     wrap_text: bool,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> bool:
     """Return whether a logical source line is empty/whitespace only."""
     source_text = source_line_raw_text(
@@ -99,6 +112,7 @@ def source_line_is_blank(
         source_line,
         wrap_text,
         preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
     )
     plain_text = ANSI_ESCAPE_RE.sub("", source_text)
     return plain_text.strip() == ""
@@ -108,6 +122,7 @@ def source_line_count(
     text_lines: list[str],
     wrap_text: bool,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> int:
     """Count logical source lines represented by rendered text lines."""
     if not text_lines:
@@ -116,12 +131,16 @@ def source_line_count(
     if preview_is_git_diff:
         use_plain_markers = diff_preview_uses_plain_markers(text_lines, wrap_text)
         source_count = 0
-        for start_idx, _end_idx in iter_diff_logical_line_ranges(text_lines, wrap_text):
+        for logical_idx, (start_idx, _end_idx) in enumerate(iter_diff_logical_line_ranges(text_lines, wrap_text)):
             if diff_preview_logical_line_is_removed(
                 text_lines[start_idx],
                 use_plain_markers=use_plain_markers,
             ):
                 continue
+            fold_span = diff_preview_fold_span(diff_folds, logical_idx)
+            if fold_span is not None:
+                source_count += fold_span[1] - fold_span[0] + 1
+                continue
             source_count += 1
         return source_count
 
@@ -142,12 +161,14 @@ def next_nonblank_source_line(
     start_line: int,
     wrap_text: bool,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> int | None:
     """Return first nonblank source line number at/after ``start_line``."""
     total_lines = source_line_count(
         text_lines,
         wrap_text,
         preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
     )
     for source_line in range(max(1, start_line), total_lines + 1):
         if not source_line_is_blank(
@@ -155,6 +176,7 @@ def next_nonblank_source_line(
             source_line,
             wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
         ):
             return source_line
     return None
@@ -202,6 +224,7 @@ def extract_source_line_text(
     wrap_text: bool,
     text_x: int,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> str:
     """Extract one source line as display text for the current horizontal view."""
     source_text = source_line_raw_text(
@@ -209,6 +232,7 @@ def extract_source_line_text(
         source_line,
         wrap_text,
         preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
     )
     if not source_text:
         return ""
@@ -226,6 +250,7 @@ def sticky_source_lines(
     wrap_text: bool,
     text_x: int,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> list[str]:
     """Return rendered source text for each sticky symbol header line."""
     out: list[str] = []
@@ -238,6 +263,7 @@ def sticky_source_lines(
             wrap_text,
             text_x,
             preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
         )
         out.append(sticky_text)
     return out
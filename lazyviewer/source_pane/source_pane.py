@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 import os
 import shutil
 from pathlib import Path
 
 from ..runtime.screen import _centered_scroll_start, _first_git_change_screen_line
 from ..runtime.state import AppState
-from .diff import clear_diff_preview_cache
+from .diff import GIT_DIFF_HUNK_CONTEXT_LINES, clear_diff_preview_cache
+from ..git_revision import GIT_DIFF_BASE_HEAD, is_head_diff_base
+from ..git_status import GitStatusOverlay
 from .directory import DirectoryPreview
 from .interaction.events import (
     directory_preview_target_for_display_line as _directory_preview_target_for_display_line,
@@ -56,8 +58,12 @@ class SourcePane:
         dir_max_entries: int = DIR_PREVIEW_INITIAL_MAX_ENTRIES,
         dir_skip_gitignored: bool = False,
         prefer_git_diff: bool = True,
-        dir_git_status_overlay: dict[Path, int] | None = None,
+        dir_git_status_overlay: Mapping[Path, int] | None = None,
         dir_show_size_labels: bool = True,
+        diff_context_lines: int = GIT_DIFF_HUNK_CONTEXT_LINES,
+        diff_expanded_folds: frozenset[int] = frozenset(),
+        diff_base: str = GIT_DIFF_BASE_HEAD,
+        diff_status_flags: int | None = None,
     ) -> RenderedPath:
         return RenderedPathPreview.build_rendered_for_path(
             target,
@@ -70,6 +76,10 @@ class SourcePane:
             prefer_git_diff=prefer_git_diff,
             dir_git_status_overlay=dir_git_status_overlay,
             dir_show_size_labels=dir_show_size_labels,
+            diff_context_lines=diff_context_lines,
+            diff_expanded_folds=diff_expanded_folds,
+            diff_base=diff_base,
+            diff_status_flags=diff_status_flags,
         )
 
     @staticmethod
@@ -79,7 +89,7 @@ class SourcePane:
         max_depth: int = DIR_PREVIEW_DEFAULT_DEPTH,
         max_entries: int = DIR_PREVIEW_INITIAL_MAX_ENTRIES,
         skip_gitignored: bool = False,
-        git_status_overlay: dict[Path, int] | None = None,
+        git_status_overlay: Mapping[Path, int] | None = None,
         show_size_labels: bool = True,
     ) -> tuple[str, bool]:
         return DirectoryPreview.build_directory_preview(
@@ -96,6 +106,10 @@ class SourcePane:
     def clear_directory_preview_cache() -> None:
         DirectoryPreview.clear_directory_preview_cache()
 
+    @staticmethod
+    def directory_preview_doc_label_generation(root_dir: Path) -> int:
+        return DirectoryPreview.directory_preview_doc_label_generation(root_dir)
+
     @staticmethod
     def clear_diff_preview_cache() -> None:
         clear_diff_preview_cache()
@@ -121,6 +135,16 @@ class SourcePane:
     ) -> Path | None:
         return _directory_preview_target_for_display_line(state, display_line)
 
+    @staticmethod
+    def diff_status_flags_for(state: AppState, target: Path) -> int | None:
+        """Return overlay status flags usable by the diff builder, or ``None``."""
+        overlay = state.git_status_overlay
+        if not state.git_features_enabled or not is_head_diff_base(state.git_diff_base):
+            return None
+        if not isinstance(overlay, GitStatusOverlay):
+            return None
+        return overlay.file_flags(target)
+
     @staticmethod
     def refresh_rendered_for_current_path(
         state: AppState,
@@ -162,6 +186,10 @@ class SourcePane:
             prefer_git_diff=prefer_git_diff,
             dir_git_status_overlay=(state.git_status_overlay if state.git_features_enabled else None),
             dir_show_size_labels=state.show_tree_sizes,
+            diff_context_lines=state.diff_context_lines,
+            diff_expanded_folds=SourcePane.expanded_diff_folds(state, resolved_target),
+            diff_base=state.git_diff_base,
+            diff_status_flags=SourcePane.diff_status_flags_for(state, resolved_target),
         )
         SourcePane.apply_rendered_for_path(
             state,
@@ -200,6 +228,7 @@ class SourcePane:
         state.preview_image_path = rendered_for_path.image_path
         state.preview_image_format = rendered_for_path.image_format
         state.preview_is_git_diff = rendered_for_path.is_git_diff_preview
+        state.preview_diff_folds = rendered_for_path.diff_folds
         if reset_scroll:
             state.text_x = 0
 
@@ -306,6 +335,51 @@ class SourcePane:
             return None
         return next_max_entries
 
+    @staticmethod
+    def _diff_fold_signature(target: Path) -> tuple[int, int] | None:
+        try:
+            stat = target.stat()
+        except OSError:
+            return None
+        return int(stat.st_mtime_ns), int(stat.st_size)
+
+    @staticmethod
+    def expanded_diff_folds(state: AppState, resolved_target: Path) -> frozenset[int]:
+        """Return opened diff folds of ``resolved_target``, dropping them once the file changed.
+
+        Folds are keyed by source line numbers, which stop meaning the same
+        lines after an edit.
+        """
+        entry = state.diff_expanded_folds.get(resolved_target)
+        if entry is None:
+            return frozenset()
+        signature, expanded = entry
+        if SourcePane._diff_fold_signature(resolved_target) != signature:
+            del state.diff_expanded_folds[resolved_target]
+            return frozenset()
+        return expanded
+
+    @staticmethod
+    def expand_diff_fold(
+        state: AppState,
+        fold_start_line: int,
+        refresh_rendered_for_current_path_fn: Callable[..., None],
+    ) -> bool:
+        """Expand one hunks-only diff fold for the current file and re-render."""
+        if not state.preview_is_git_diff:
+            return False
+        resolved_target = state.current_path.resolve()
+        expanded = SourcePane.expanded_diff_folds(state, resolved_target)
+        if fold_start_line in expanded:
+            return False
+        signature = SourcePane._diff_fold_signature(resolved_target)
+        if signature is None:
+            return False
+        state.diff_expanded_folds[resolved_target] = (signature, expanded | {fold_start_line})
+        refresh_rendered_for_current_path_fn(reset_scroll=False, reset_dir_budget=False)
+        state.dirty = True
+        return True
+
     @staticmethod
     def toggle_tree_size_labels(
         state: AppState,
@@ -331,6 +405,7 @@ class SourcePane:
         apply_tree_filter_query: Callable[..., None],
         jump_to_path: Callable[[Path], None],
         get_terminal_size: Callable[[tuple[int, int]], os.terminal_size] = shutil.get_terminal_size,
+        expand_diff_fold: Callable[[int], bool] | None = None,
     ) -> None:
         self.state = state
         self._move_tree_selection = move_tree_selection
@@ -353,6 +428,7 @@ class SourcePane:
             open_tree_filter=open_tree_filter,
             apply_tree_filter_query=apply_tree_filter_query,
             jump_to_path=jump_to_path,
+            expand_diff_fold=expand_diff_fold,
         )
 
     @staticmethod
@@ -8,6 +8,7 @@ set shown for both normal source views and git-diff previews.
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from pathlib import Path
 
 from ..render.ansi import ANSI_ESCAPE_RE
@@ -44,6 +45,7 @@ def blank_line_exits_symbol_scope(
     current_path: Path,
     sticky_symbol: SymbolEntry,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> bool:
     """Decide whether a blank line terminates the current sticky symbol scope.
 
@@ -56,6 +58,7 @@ def blank_line_exits_symbol_scope(
         source_line + 1,
         wrap_text,
         preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
     )
     if next_nonblank is None:
         return True
@@ -71,6 +74,7 @@ def blank_line_exits_symbol_scope(
             next_nonblank,
             wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         ),
     ).lstrip()
     if next_text.startswith("}"):
@@ -83,6 +87,7 @@ def blank_line_exits_symbol_scope(
             sticky_symbol.line + 1,
             wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         ),
     )
     next_plain = ANSI_ESCAPE_RE.sub(
@@ -92,6 +97,7 @@ def blank_line_exits_symbol_scope(
             next_nonblank,
             wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         ),
     )
     if leading_indent_columns(next_plain) <= leading_indent_columns(header_plain):
@@ -107,6 +113,7 @@ def source_line_exits_symbol_scope(
     current_path: Path,
     sticky_symbol: SymbolEntry,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> bool:
     """Return whether ``source_line`` lies outside ``sticky_symbol`` scope."""
     if source_line <= (sticky_symbol.line + 1):
@@ -117,6 +124,7 @@ def source_line_exits_symbol_scope(
         source_line,
         wrap_text,
         preview_is_git_diff=preview_is_git_diff,
+        diff_folds=diff_folds,
     ):
         return blank_line_exits_symbol_scope(
             text_lines,
@@ -125,6 +133,7 @@ def source_line_exits_symbol_scope(
             current_path,
             sticky_symbol,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         )
 
     header_plain = ANSI_ESCAPE_RE.sub(
@@ -134,6 +143,7 @@ def source_line_exits_symbol_scope(
             sticky_symbol.line + 1,
             wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         ),
     )
     header_indent = leading_indent_columns(header_plain)
@@ -144,6 +154,7 @@ def source_line_exits_symbol_scope(
             candidate_line,
             wrap_text,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         ):
             continue
         candidate_plain = ANSI_ESCAPE_RE.sub(
@@ -153,6 +164,7 @@ def source_line_exits_symbol_scope(
                 candidate_line,
                 wrap_text,
                 preview_is_git_diff=preview_is_git_diff,
+                diff_folds=diff_folds,
             ),
         )
         candidate_text = candidate_plain.lstrip()
@@ -171,6 +183,7 @@ def sticky_symbol_headers_for_position(
     current_path: Path,
     wrap_text: bool,
     preview_is_git_diff: bool,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> list[SymbolEntry]:
     """Compute sticky symbol chain for the current viewport top.
 
@@ -183,6 +196,7 @@ def sticky_symbol_headers_for_position(
     scope_text_lines = text_lines
     scope_wrap_text = wrap_text
     scope_preview_is_git_diff = preview_is_git_diff
+    scope_diff_folds = diff_folds
     if preview_is_git_diff:
         # Diff previews inject removed lines, so scope checks should run against
         # the real source file to avoid expensive remapping while scrolling.
@@ -190,6 +204,7 @@ def sticky_symbol_headers_for_position(
             scope_text_lines = read_text(current_path).splitlines()
             scope_wrap_text = False
             scope_preview_is_git_diff = False
+            scope_diff_folds = None
         except Exception:
             # Fall back to diff-rendered lines if source read fails.
             pass
@@ -205,13 +220,14 @@ def sticky_symbol_headers_for_position(
                 current_path,
                 symbol,
                 preview_is_git_diff=scope_preview_is_git_diff,
+                diff_folds=scope_diff_folds,
             ):
                 continue
             visible.append(symbol)
         return visible
 
     if preview_is_git_diff:
-        start_source = diff_source_line_for_display_index(text_lines, text_start, wrap_text)
+        start_source = diff_source_line_for_display_index(text_lines, text_start, wrap_text, diff_folds=diff_folds)
     else:
         start_source, _, _ = status_line_range(text_lines, text_start, 1, wrap_text)
     max_headers = max(1, content_rows - 1)
@@ -255,6 +271,7 @@ def formatted_sticky_headers(
     wrap_text: bool,
     text_x: int,
     preview_is_git_diff: bool = False,
+    diff_folds: Mapping[int, tuple[int, int]] | None = None,
 ) -> list[str]:
     """Render sticky symbol source lines into formatted header rows."""
     return [
@@ -266,5 +283,6 @@ def formatted_sticky_headers(
             wrap_text,
             text_x,
             preview_is_git_diff=preview_is_git_diff,
+            diff_folds=diff_folds,
         )
     ]
@@ -26,15 +26,23 @@ _PYGMENTS_INVALID_STYLES: set[str] = set()
 def read_text(path: Path) -> str:
     """Read text using tolerant encoding fallback order.
 
-    Attempts UTF-8, UTF-8 with BOM, then latin-1; as a final fallback decodes
-    raw bytes with UTF-8 replacement semantics.
+    Decodes with ``decode_text`` and translates ``\r\n``/``\r`` newlines the
+    way text-mode reads do.
+    """
+    return decode_text(path.read_bytes()).replace("\r\n", "\n").replace("\r", "\n")
+
+
+def decode_text(data: bytes) -> str:
+    """Decode raw bytes, trying UTF-8, UTF-8 with BOM, then latin-1.
+
+    As a final fallback decodes with UTF-8 replacement semantics.
     """
     for encoding in ("utf-8", "utf-8-sig", "latin-1"):
         try:
-            return path.read_text(encoding=encoding)
+            return data.decode(encoding)
         except UnicodeDecodeError:
             continue
-    return path.read_bytes().decode("utf-8", errors="replace")
+    return data.decode("utf-8", errors="replace")
 
 
 def sanitize_terminal_text(source: str) -> str:
@@ -0,0 +1,304 @@
+"""Lazy intra-line word diff for modified lines in git-diff previews.
+
+Within each hunk the annotated preview lists removed lines directly before the
+added lines that replaced them. Rows are paired positionally inside that block
+and changed tokens get a stronger background. Work happens only for rows the
+renderer asks about; block pairings are memoized per preview and token diffs
+per line pair, so large diffs never pay for off-screen lines. Applying the
+emphasis is left to ``highlighting.rendered_preview_row``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import difflib
+import re
+
+from ..render.ansi import ANSI_ESCAPE_RE
+from .diffmap import DIFF_ADDED_BG_SGR, DIFF_REMOVED_BG_SGR, diff_preview_logical_line_is_removed
+from .text import line_has_newline_terminator
+
+WORD_DIFF_ADDED_BG_SGR = "48;2;46;120;78"
+WORD_DIFF_REMOVED_BG_SGR = "48;2;150;58;70"
+WORD_DIFF_CACHE_MAX = 4_096
+WORD_DIFF_MAX_BLOCK_LINES = 512
+WORD_DIFF_MAX_LINE_CHARS = 2_000
+WORD_DIFF_MIN_SIMILARITY = 0.35
+
+_TOKEN_RE = re.compile(r"\w+|\s+|[^\w\s]")
+_SPAN_CACHE: OrderedDict[tuple[str, str], tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]]] = (
+    OrderedDict()
+)
+_ROW_CACHE: OrderedDict[tuple[str, str, int, bool], tuple[tuple[int, int], ...]] = OrderedDict()
+_PAIRING: dict[int, int | None] = {}
+_PAIRING_LINES: list[str] | None = None
+_PAIRING_WRAP = False
+
+
+def clear_word_diff_cache() -> None:
+    """Clear memoized token diffs, per-row spans, and block pairings."""
+    global _PAIRING_LINES
+    _SPAN_CACHE.clear()
+    _ROW_CACHE.clear()
+    _PAIRING.clear()
+    _PAIRING_LINES = None
+
+
+def _lru_get(cache: OrderedDict, key: tuple) -> object | None:
+    """Return cached value and refresh LRU order, or ``None``."""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: OrderedDict, key: tuple, value: object) -> None:
+    """Store value and evict oldest overflow entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > WORD_DIFF_CACHE_MAX:
+        cache.popitem(last=False)
+
+
+def _row_is_added(first_chunk: str) -> bool:
+    """Return whether a colorized logical diff line carries the added background."""
+    return (f"\033[{DIFF_ADDED_BG_SGR}m" in first_chunk) or (f";{DIFF_ADDED_BG_SGR}m" in first_chunk)
+
+
+def _row_kind(first_chunk: str) -> str:
+    """Classify a colorized logical diff line as ``"-"``, ``"+"``, or ``" "``."""
+    if diff_preview_logical_line_is_removed(first_chunk, use_plain_markers=False):
+        return "-"
+    if _row_is_added(first_chunk):
+        return "+"
+    return " "
+
+
+def _logical_start(text_lines: list[str], idx: int, wrap_text: bool) -> int:
+    """Return first row of the logical line containing ``idx``."""
+    if not wrap_text:
+        return idx
+    while idx > 0 and not line_has_newline_terminator(text_lines[idx - 1]):
+        idx -= 1
+    return idx
+
+
+def _logical_end(text_lines: list[str], idx: int, wrap_text: bool) -> int:
+    """Return last row of the logical line starting at ``idx``."""
+    if not wrap_text:
+        return idx
+    last = len(text_lines) - 1
+    while idx < last and not line_has_newline_terminator(text_lines[idx]):
+        idx += 1
+    return idx
+
+
+def _previous_logical_start(text_lines: list[str], start: int, wrap_text: bool) -> int | None:
+    """Return start row of the logical line before the one at ``start``."""
+    if start <= 0:
+        return None
+    return _logical_start(text_lines, start - 1, wrap_text)
+
+
+def _next_logical_start(text_lines: list[str], start: int, wrap_text: bool) -> int | None:
+    """Return start row of the logical line after the one at ``start``."""
+    following = _logical_end(text_lines, start, wrap_text) + 1
+    return following if following < len(text_lines) else None
+
+
+def _walk_run(
+    text_lines: list[str],
+    start: int,
+    kind: str,
+    wrap_text: bool,
+    *,
+    forward: bool,
+) -> list[int] | None:
+    """Collect logical-line starts of the same ``kind`` next to ``start``.
+
+    Returns ``None`` when the run exceeds ``WORD_DIFF_MAX_BLOCK_LINES``.
+    """
+    starts: list[int] = []
+    step = _next_logical_start if forward else _previous_logical_start
+    cursor = step(text_lines, start, wrap_text)
+    while cursor is not None and _row_kind(text_lines[cursor]) == kind:
+        starts.append(cursor)
+        if len(starts) > WORD_DIFF_MAX_BLOCK_LINES:
+            return None
+        cursor = step(text_lines, cursor, wrap_text)
+    return starts
+
+
+def _block_pairing(text_lines: list[str], start: int, kind: str, wrap_text: bool) -> dict[int, int | None]:
+    """Pair every removed/added logical line in the block containing ``start``.
+
+    Returns partner starts keyed by logical-line start; rows without a partner
+    map to ``None``. Oversized runs only record ``start`` itself.
+    """
+    before = _walk_run(text_lines, start, kind, wrap_text, forward=False)
+    after = _walk_run(text_lines, start, kind, wrap_text, forward=True)
+    if before is None or after is None:
+        return {start: None}
+    own_run = [*reversed(before), start, *after]
+
+    if kind == "-":
+        removed = own_run
+        first_added = _next_logical_start(text_lines, removed[-1], wrap_text)
+        if first_added is None or _row_kind(text_lines[first_added]) != "+":
+            return dict.fromkeys(removed)
+        following = _walk_run(text_lines, first_added, "+", wrap_text, forward=True)
+        if following is None:
+            return dict.fromkeys(removed)
+        added = [first_added, *following]
+    else:
+        added = own_run
+        last_removed = _previous_logical_start(text_lines, added[0], wrap_text)
+        if last_removed is None or _row_kind(text_lines[last_removed]) != "-":
+            return dict.fromkeys(added)
+        preceding = _walk_run(text_lines, last_removed, "-", wrap_text, forward=False)
+        if preceding is None:
+            return dict.fromkeys(added)
+        removed = [*reversed(preceding), last_removed]
+
+    pairing: dict[int, int | None] = dict.fromkeys([*removed, *added])
+    for removed_start, added_start in zip(removed, added):
+        pairing[removed_start] = added_start
+        pairing[added_start] = removed_start
+    return pairing
+
+
+def _partner_logical_start(text_lines: list[str], start: int, kind: str, wrap_text: bool) -> int | None:
+    """Return start row of the paired removed/added logical line, if any.
+
+    Pairings are cached per block for the current ``text_lines`` object, so
+    revisiting any row of a block skips walking its runs again.
+    """
+    global _PAIRING_LINES, _PAIRING_WRAP
+    if text_lines is not _PAIRING_LINES or wrap_text != _PAIRING_WRAP:
+        _PAIRING_LINES = text_lines
+        _PAIRING_WRAP = wrap_text
+        _PAIRING.clear()
+    if start not in _PAIRING:
+        _PAIRING.update(_block_pairing(text_lines, start, kind, wrap_text))
+    return _PAIRING[start]
+
+
+def _logical_plain_text(text_lines: list[str], start: int, wrap_text: bool) -> str:
+    """Return ANSI-stripped text of the logical line starting at ``start``."""
+    end = _logical_end(text_lines, start, wrap_text)
+    joined = "".join(text_lines[start : end + 1])
+    return ANSI_ESCAPE_RE.sub("", joined).rstrip("\r\n")
+
+
+def _token_spans(text: str) -> list[tuple[int, int]]:
+    """Split text into word, whitespace, and punctuation token spans."""
+    return [match.span() for match in _TOKEN_RE.finditer(text)]
+
+
+def _merge_spans(spans: list[tuple[int, int]]) -> tuple[tuple[int, int], ...]:
+    """Merge touching column spans."""
+    merged: list[tuple[int, int]] = []
+    for start, end in spans:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            continue
+        merged.append((start, end))
+    return tuple(merged)
+
+
+def word_diff_spans(
+    removed_text: str,
+    added_text: str,
+) -> tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]]:
+    """Return changed character spans in ``removed_text`` and ``added_text``.
+
+    Lines that share too little (below ``WORD_DIFF_MIN_SIMILARITY``) or are too
+    long get no spans, since emphasizing nearly everything only adds noise.
+    """
+    key = (removed_text, added_text)
+    cached = _lru_get(_SPAN_CACHE, key)
+    if cached is not None:
+        return cached
+
+    spans: tuple[tuple[tuple[int, int], ...], tuple[tuple[int, int], ...]] = ((), ())
+    if (
+        removed_text != added_text
+        and len(removed_text) <= WORD_DIFF_MAX_LINE_CHARS
+        and len(added_text) <= WORD_DIFF_MAX_LINE_CHARS
+    ):
+        removed_tokens = _token_spans(removed_text)
+        added_tokens = _token_spans(added_text)
+        matcher = difflib.SequenceMatcher(
+            None,
+            [removed_text[start:end] for start, end in removed_tokens],
+            [added_text[start:end] for start, end in added_tokens],
+            autojunk=False,
+        )
+        if matcher.ratio() >= WORD_DIFF_MIN_SIMILARITY:
+            removed_changed: list[tuple[int, int]] = []
+            added_changed: list[tuple[int, int]] = []
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == "equal":
+                    continue
+                if i2 > i1:
+                    removed_changed.append((removed_tokens[i1][0], removed_tokens[i2 - 1][1]))
+                if j2 > j1:
+                    added_changed.append((added_tokens[j1][0], added_tokens[j2 - 1][1]))
+            spans = (_merge_spans(removed_changed), _merge_spans(added_changed))
+
+    _lru_put(_SPAN_CACHE, key, spans)
+    return spans
+
+
+def word_diff_row_spans(
+    text_lines: list[str],
+    text_idx: int,
+    wrap_text: bool,
+) -> tuple[tuple[tuple[int, int], ...], str, str] | None:
+    """Return ``(spans, line_bg, word_bg)`` for changed words in one row.
+
+    Spans are column ranges local to ``text_lines[text_idx]``. Rows outside a
+    removed/added pair return ``None``. Only colorized previews are handled;
+    plain-marker previews have no backgrounds to layer on.
+    """
+    row = text_lines[text_idx]
+    start = _logical_start(text_lines, text_idx, wrap_text)
+    first_chunk = text_lines[start]
+    if DIFF_REMOVED_BG_SGR not in first_chunk and DIFF_ADDED_BG_SGR not in first_chunk:
+        return None
+
+    kind = _row_kind(first_chunk)
+    if kind == " ":
+        return None
+    if kind == "-":
+        line_bg, word_bg = DIFF_REMOVED_BG_SGR, WORD_DIFF_REMOVED_BG_SGR
+    else:
+        line_bg, word_bg = DIFF_ADDED_BG_SGR, WORD_DIFF_ADDED_BG_SGR
+
+    partner_start = _partner_logical_start(text_lines, start, kind, wrap_text)
+    if partner_start is None:
+        return None
+    partner_text = _logical_plain_text(text_lines, partner_start, wrap_text)
+    chunk_offset = sum(
+        len(ANSI_ESCAPE_RE.sub("", text_lines[idx]).rstrip("\r\n")) for idx in range(start, text_idx)
+    )
+    row_key = (row, partner_text, chunk_offset, kind == "-")
+    cached = _lru_get(_ROW_CACHE, row_key)
+    if cached is not None:
+        return cached, line_bg, word_bg
+
+    own_text = _logical_plain_text(text_lines, start, wrap_text)
+    if kind == "-":
+        spans = word_diff_spans(own_text, partner_text)[0]
+    else:
+        spans = word_diff_spans(partner_text, own_text)[1]
+    chunk_length = len(ANSI_ESCAPE_RE.sub("", row).rstrip("\r\n"))
+    row_spans = tuple(
+        (max(0, span_start - chunk_offset), min(chunk_length, span_end - chunk_offset))
+        for span_start, span_end in spans
+        if span_end > chunk_offset and span_start < chunk_offset + chunk_length
+    )
+    _lru_put(_ROW_CACHE, row_key, row_spans)
+    return row_spans, line_bg, word_bg
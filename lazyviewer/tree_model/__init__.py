@@ -7,13 +7,8 @@ entries now live in ``lazyviewer.file_tree_model`` and are flattened into
 
 from __future__ import annotations
 
-from .build import (
-    DirectoryChild,
-    build_tree_entries,
-    build_workspace_tree_entries,
-    list_directory_children,
-    maybe_gitignore_matcher,
-)
+from ..file_tree_model.fs import DirectoryChild, list_directory_children, maybe_gitignore_matcher
+from .build import WorkspaceTreeRows, build_tree_entries, build_workspace_tree_entries
 from .doc_summary import clear_doc_summary_cache
 from .filtering import (
     filter_tree_entries_for_content_matches,
@@ -26,15 +21,21 @@ from .navigation import (
     next_file_entry_index,
     next_index_after_directory_subtree,
     next_opened_directory_entry_index,
+    parent_directory_entry_index,
+    path_entry_index,
 )
 from .rendering import file_color_for, format_tree_entry
 from .types import TreeEntry
+from .virtual import VirtualTreeRows, VirtualTreeSection
 
 __all__ = [
     "TreeEntry",
+    "VirtualTreeRows",
+    "VirtualTreeSection",
     "DirectoryChild",
     "build_tree_entries",
     "build_workspace_tree_entries",
+    "WorkspaceTreeRows",
     "list_directory_children",
     "maybe_gitignore_matcher",
     "clear_doc_summary_cache",
@@ -45,6 +46,8 @@ __all__ = [
     "next_directory_entry_index",
     "next_opened_directory_entry_index",
     "next_index_after_directory_subtree",
+    "parent_directory_entry_index",
+    "path_entry_index",
     "format_tree_entry",
     "file_color_for",
     "compute_left_width",
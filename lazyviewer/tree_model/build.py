@@ -2,26 +2,21 @@
 
 from __future__ import annotations
 
-import os
-from collections.abc import Callable
+from collections.abc import Callable, Collection, Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from ..file_tree_model.fs import (
-    DirectoryChild,
-    build_file_tree,
-    list_directory_children,
-    maybe_gitignore_matcher,
-    safe_file_size,
-    safe_mtime_ns,
-)
+from ..file_tree_model.fs import build_file_tree, maybe_gitignore_matcher, normalize_expanded_paths, refresh_file_tree
+from ..file_tree_model.paths import canonical_path
 from ..file_tree_model.types import DirectoryEntry, FileEntry
 from .types import TreeEntry
+from .virtual import VirtualTreeRows, VirtualTreeSection
 
 
 def normalized_tree_roots(tree_roots: list[Path], active_root: Path) -> list[Path]:
     """Return resolved workspace roots preserving duplicates; include active if absent."""
-    normalized = [raw_root.resolve() for raw_root in tree_roots]
-    resolved_active = active_root.resolve()
+    normalized = [canonical_path(raw_root) for raw_root in tree_roots]
+    resolved_active = canonical_path(active_root)
     if not any(root == resolved_active for root in normalized):
         normalized.append(resolved_active)
     return normalized
@@ -32,7 +27,7 @@ def build_tree_entries(
     expanded: set[Path],
     show_hidden: bool,
     skip_gitignored: bool = False,
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
     include_doc_summaries: bool = False,
     workspace_root: Path | None = None,
@@ -50,42 +45,63 @@ def build_tree_entries(
     )
 
     entries: list[TreeEntry] = []
-    section_root = (workspace_root or root).resolve()
-
-    def append_rows(node: DirectoryEntry | FileEntry, depth: int) -> None:
-        """Append one domain node and any nested children as flat tree rows."""
-        if isinstance(node, DirectoryEntry):
-            entries.append(
-                TreeEntry(
-                    node.path,
-                    depth,
-                    True,
-                    mtime_ns=node.mtime_ns,
-                    git_status_flags=node.git_status_flags,
-                    workspace_root=section_root,
-                    workspace_section=workspace_section,
-                )
-            )
-            for child in node.children:
-                append_rows(child, depth + 1)
-            return
-
-        entries.append(
-            TreeEntry(
-                node.path,
-                depth,
-                False,
-                file_size=node.file_size,
-                mtime_ns=node.mtime_ns,
-                git_status_flags=node.git_status_flags,
-                doc_summary=node.doc_summary,
-                workspace_root=section_root,
-                workspace_section=workspace_section,
-            )
+    _append_tree_rows(entries, domain_root, 0, canonical_path(workspace_root or root), workspace_section)
+    return entries
+
+
+def _tree_row(
+    node: DirectoryEntry | FileEntry,
+    depth: int,
+    section_root: Path,
+    workspace_section: int | None,
+) -> TreeEntry:
+    """Project one domain node onto its flat tree row."""
+    if isinstance(node, DirectoryEntry):
+        return TreeEntry(
+            node.path,
+            depth,
+            True,
+            mtime_ns=node.mtime_ns,
+            git_status_flags=node.git_status_flags,
+            workspace_root=section_root,
+            workspace_section=workspace_section,
         )
+    return TreeEntry(
+        node.path,
+        depth,
+        False,
+        file_size=node.file_size,
+        mtime_ns=node.mtime_ns,
+        git_status_flags=node.git_status_flags,
+        doc_summary=node.doc_summary,
+        workspace_root=section_root,
+        workspace_section=workspace_section,
+    )
 
-    append_rows(domain_root, 0)
-    return entries
+
+def _append_tree_rows(
+    entries: list[TreeEntry],
+    node: DirectoryEntry | FileEntry,
+    depth: int,
+    section_root: Path,
+    workspace_section: int | None,
+) -> None:
+    """Append one domain node and any nested children as flat tree rows."""
+    entries.append(_tree_row(node, depth, section_root, workspace_section))
+    if isinstance(node, DirectoryEntry):
+        for child in node.children:
+            _append_tree_rows(entries, child, depth + 1, section_root, workspace_section)
+
+
+def _section_expanded(
+    expanded: set[Path],
+    expanded_by_root: list[set[Path]] | None,
+    section_idx: int,
+) -> set[Path]:
+    """Return the expansion set for one workspace section."""
+    if expanded_by_root is not None and section_idx < len(expanded_by_root):
+        return set(expanded_by_root[section_idx])
+    return set(expanded)
 
 
 def build_workspace_tree_entries(
@@ -95,7 +111,7 @@ def build_workspace_tree_entries(
     expanded_by_root: list[set[Path]] | None,
     show_hidden: bool,
     skip_gitignored: bool = False,
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     doc_summary_for_path: Callable[[Path, int | None], str | None] | None = None,
     include_doc_summaries: bool = False,
 ) -> list[TreeEntry]:
@@ -103,11 +119,7 @@ def build_workspace_tree_entries(
     roots = normalized_tree_roots(tree_roots, active_root)
     entries: list[TreeEntry] = []
     for section_idx, root in enumerate(roots):
-        expanded_for_root = (
-            set(expanded_by_root[section_idx])
-            if expanded_by_root is not None and section_idx < len(expanded_by_root)
-            else set(expanded)
-        )
+        expanded_for_root = _section_expanded(expanded, expanded_by_root, section_idx)
         section_entries = build_tree_entries(
             root,
             expanded_for_root,
@@ -121,3 +133,105 @@ def build_workspace_tree_entries(
         )
         entries.extend(section_entries)
     return entries
+
+
+@dataclass
+class _TreeSection:
+    """Settings a workspace section of ``WorkspaceTreeRows`` was built with."""
+
+    root: Path
+    expanded: frozenset[Path]
+    ignore_matcher: object | None = None
+
+
+@dataclass
+class WorkspaceTreeRows:
+    """Virtualized workspace tree rows kept alongside their domain trees.
+
+    ``build`` produces the rows of ``build_workspace_tree_entries`` as a
+    ``VirtualTreeRows`` view. ``refresh`` then rescans only directories whose
+    mtime changed (or that are listed in ``changed_dirs``) and swaps the
+    refreshed domain trees into the same view, so one saved file costs one
+    directory scan and no row is rebuilt until it is shown.
+    """
+
+    entries: VirtualTreeRows = field(default_factory=VirtualTreeRows)
+    show_hidden: bool = False
+    skip_gitignored: bool = False
+    _sections: list[_TreeSection] = field(default_factory=list, repr=False)
+
+    def build(
+        self,
+        tree_roots: list[Path],
+        active_root: Path,
+        expanded: set[Path],
+        expanded_by_root: list[set[Path]] | None,
+        show_hidden: bool,
+        skip_gitignored: bool = False,
+    ) -> VirtualTreeRows:
+        """Build all sections from scratch and return the new ``entries`` view."""
+        self._sections = []
+        self.show_hidden = show_hidden
+        self.skip_gitignored = skip_gitignored
+        sections: list[VirtualTreeSection] = []
+        for section_idx, root in enumerate(normalized_tree_roots(tree_roots, active_root)):
+            expanded_for_root = _section_expanded(expanded, expanded_by_root, section_idx)
+            ignore_matcher = maybe_gitignore_matcher(root, skip_gitignored)
+            domain_root = build_file_tree(root, expanded_for_root, show_hidden, skip_gitignored=skip_gitignored)
+            sections.append(VirtualTreeSection(domain_root, root, section_idx))
+            self._sections.append(
+                _TreeSection(
+                    root=root,
+                    expanded=frozenset(normalize_expanded_paths(root, expanded_for_root)),
+                    ignore_matcher=ignore_matcher,
+                )
+            )
+        self.entries = VirtualTreeRows(sections)
+        return self.entries
+
+    def refresh(
+        self,
+        tree_roots: list[Path],
+        active_root: Path,
+        expanded: set[Path],
+        expanded_by_root: list[set[Path]] | None,
+        show_hidden: bool,
+        skip_gitignored: bool = False,
+        changed_dirs: Collection[Path] = (),
+    ) -> bool:
+        """Refresh ``entries`` in place; return ``False`` when a full ``build`` is needed.
+
+        Roots or visibility settings that differ from the last build cannot
+        be patched. A section whose gitignore matcher changed (a rule file or
+        the index moved) is rebuilt from scratch by ``refresh_file_tree``.
+        """
+        roots = normalized_tree_roots(tree_roots, active_root)
+        if (
+            not self._sections
+            or show_hidden != self.show_hidden
+            or skip_gitignored != self.skip_gitignored
+            or [section.root for section in self._sections] != roots
+        ):
+            return False
+
+        changed = frozenset(canonical_path(path) for path in changed_dirs)
+        previous_sections = self.entries.sections
+        sections: list[VirtualTreeSection] = []
+        for section_idx, section in enumerate(self._sections):
+            expanded_for_root = _section_expanded(expanded, expanded_by_root, section_idx)
+            ignore_matcher = maybe_gitignore_matcher(section.root, skip_gitignored)
+            domain_root, _rescanned = refresh_file_tree(
+                previous_sections[section_idx].root_entry,
+                expanded_for_root,
+                section.expanded,
+                show_hidden,
+                skip_gitignored=skip_gitignored,
+                changed_dirs=changed,
+                previous_ignore_matcher=section.ignore_matcher,
+            )
+            section.ignore_matcher = ignore_matcher
+            sections.append(VirtualTreeSection(domain_root, section.root, section_idx))
+            section.expanded = frozenset(normalize_expanded_paths(section.root, expanded_for_root))
+        if any(new.root_entry is not old.root_entry for new, old in zip(sections, previous_sections)):
+            self.entries.replace_sections(sections)
+        return True
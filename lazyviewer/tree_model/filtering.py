@@ -5,8 +5,9 @@ from __future__ import annotations
 from collections.abc import Iterable
 from pathlib import Path
 
+from ..file_tree_model.fs import safe_file_size
+from ..file_tree_model.paths import canonical_path
 from ..search.content import ContentMatch
-from .build import safe_file_size
 from .types import TreeEntry
 
 
@@ -20,8 +21,8 @@ def filter_tree_entries_for_files(
     workspace_section: int | None = None,
 ) -> tuple[list[TreeEntry], set[Path]]:
     """Build filtered tree for matched files and their ancestor directories."""
-    root = root.resolve()
-    section_root = (workspace_root or root).resolve()
+    root = canonical_path(root)
+    section_root = canonical_path(workspace_root or root)
     visible_dirs: set[Path] = {root}
     visible_files: set[Path] = set()
     forced_expanded: set[Path] = {root}
@@ -30,7 +31,7 @@ def filter_tree_entries_for_files(
         # matched_files comes from the cached project index and is already absolute.
         file_path = raw_path if raw_path.is_absolute() else (root / raw_path)
         if not file_path.is_relative_to(root):
-            file_path = file_path.resolve()
+            file_path = canonical_path(file_path)
             if not file_path.is_relative_to(root):
                 continue
 
@@ -113,22 +114,22 @@ def filter_tree_entries_for_content_matches(
     workspace_section: int | None = None,
 ) -> tuple[list[TreeEntry], set[Path]]:
     """Build content-search tree including synthetic hit rows under files."""
-    root = root.resolve()
-    section_root = (workspace_root or root).resolve()
+    root = canonical_path(root)
+    section_root = canonical_path(workspace_root or root)
     visible_dirs: set[Path] = {root}
     visible_files: set[Path] = set()
     normalized_matches: dict[Path, list[ContentMatch]] = {}
     forced_expanded: set[Path] = {root}
     collapsed = {
-        path.resolve()
+        canonical_path(path)
         for path in (collapsed_dirs or set())
-        if path.resolve().is_relative_to(root)
+        if canonical_path(path).is_relative_to(root)
     }
 
     for raw_path, matches in matches_by_file.items():
         file_path = raw_path if raw_path.is_absolute() else (root / raw_path)
         if not file_path.is_relative_to(root):
-            file_path = file_path.resolve()
+            file_path = canonical_path(file_path)
             if not file_path.is_relative_to(root):
                 continue
         if not matches:
@@ -231,14 +232,14 @@ def find_content_hit_index(
     preferred_workspace_section: int | None = None,
 ) -> int | None:
     """Find best hit index for a file, preferring exact line/column when given."""
-    preferred_resolved = preferred_path.resolve()
+    preferred_resolved = canonical_path(preferred_path)
     first_hit_in_file: int | None = None
     first_hit_in_section: int | None = None
     exact_hit_in_section: int | None = None
     for idx, entry in enumerate(entries):
         if entry.kind != "search_hit":
             continue
-        if entry.path.resolve() != preferred_resolved:
+        if canonical_path(entry.path) != preferred_resolved:
             continue
         if first_hit_in_file is None:
             first_hit_in_file = idx
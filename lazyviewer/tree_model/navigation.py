@@ -1,37 +1,53 @@
-"""Tree-entry index navigation helpers."""
+"""Tree-entry index navigation helpers.
+
+Helpers accept a plain ``list[TreeEntry]`` or a ``VirtualTreeRows`` view;
+for the latter they use its row accessors so walking past rows never
+materializes (or stats) them.
+"""
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 from pathlib import Path
 
 from .types import TreeEntry
+from .virtual import VirtualTreeRows
+
+
+def _is_dir_accessor(entries: Sequence[TreeEntry]) -> Callable[[int], bool]:
+    if isinstance(entries, VirtualTreeRows):
+        return entries.is_dir_at
+    return lambda idx: entries[idx].is_dir
 
 
 def next_file_entry_index(
-    entries: list[TreeEntry],
+    entries: Sequence[TreeEntry],
     selected_idx: int,
     direction: int,
 ) -> int | None:
     """Return next non-directory entry index in the requested direction."""
     if not entries or direction == 0:
         return None
+    is_dir_at = _is_dir_accessor(entries)
     step = 1 if direction > 0 else -1
     idx = selected_idx + step
     while 0 <= idx < len(entries):
-        if not entries[idx].is_dir:
+        if not is_dir_at(idx):
             return idx
         idx += step
     return None
 
 
 def next_directory_entry_index(
-    entries: list[TreeEntry],
+    entries: Sequence[TreeEntry],
     selected_idx: int,
     direction: int,
 ) -> int | None:
     """Return next directory entry index in the requested direction."""
     if not entries or direction == 0:
         return None
+    if isinstance(entries, VirtualTreeRows):
+        return entries.next_directory_index(selected_idx, direction)
     step = 1 if direction > 0 else -1
     idx = selected_idx + step
     while 0 <= idx < len(entries):
@@ -42,7 +58,7 @@ def next_directory_entry_index(
 
 
 def next_opened_directory_entry_index(
-    entries: list[TreeEntry],
+    entries: Sequence[TreeEntry],
     selected_idx: int,
     direction: int,
     expanded: set[Path],
@@ -50,20 +66,24 @@ def next_opened_directory_entry_index(
     """Return next expanded-directory entry index in the requested direction."""
     if not entries or direction == 0:
         return None
-    step = 1 if direction > 0 else -1
-    idx = selected_idx + step
-    while 0 <= idx < len(entries):
-        entry = entries[idx]
-        if entry.is_dir and entry.path.resolve() in expanded:
+    idx = next_directory_entry_index(entries, selected_idx, direction)
+    while idx is not None:
+        path = entries.path_at(idx) if isinstance(entries, VirtualTreeRows) else entries[idx].path
+        if path.resolve() in expanded:
             return idx
-        idx += step
+        idx = next_directory_entry_index(entries, idx, direction)
     return None
 
 
-def next_index_after_directory_subtree(entries: list[TreeEntry], directory_idx: int) -> int | None:
+def next_index_after_directory_subtree(entries: Sequence[TreeEntry], directory_idx: int) -> int | None:
     """Return first index after the subtree rooted at ``directory_idx``."""
     if not entries or directory_idx < 0 or directory_idx >= len(entries):
         return None
+    if isinstance(entries, VirtualTreeRows):
+        if not entries.is_dir_at(directory_idx):
+            return None
+        idx = entries.subtree_end(directory_idx)
+        return idx if idx < len(entries) else None
     directory_entry = entries[directory_idx]
     if not directory_entry.is_dir:
         return None
@@ -74,3 +94,29 @@ def next_index_after_directory_subtree(entries: list[TreeEntry], directory_idx:
     if idx >= len(entries):
         return None
     return idx
+
+
+def parent_directory_entry_index(entries: Sequence[TreeEntry], selected_idx: int) -> int | None:
+    """Return the nearest directory row above ``selected_idx`` with a smaller depth."""
+    if not entries or not 0 <= selected_idx < len(entries):
+        return None
+    if isinstance(entries, VirtualTreeRows):
+        return entries.parent_index(selected_idx)
+    current_depth = entries[selected_idx].depth
+    idx = selected_idx - 1
+    while idx >= 0:
+        candidate = entries[idx]
+        if candidate.is_dir and candidate.depth < current_depth:
+            return idx
+        idx -= 1
+    return None
+
+
+def path_entry_index(entries: Sequence[TreeEntry], path: Path) -> int | None:
+    """Return the first row whose resolved path is ``path`` (a resolved path)."""
+    if isinstance(entries, VirtualTreeRows):
+        return entries.index_of(path)
+    for idx, entry in enumerate(entries):
+        if entry.path.resolve() == path:
+            return idx
+    return None
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from pathlib import Path
 
+from ..file_tree_model.paths import canonical_path
 from ..git_status import format_git_status_badges
 from ..ui_theme import DEFAULT_THEME, UITheme
 from .types import TreeEntry
@@ -37,7 +39,7 @@ def format_tree_entry(
     entry: TreeEntry,
     root: Path,
     expanded: set[Path],
-    git_status_overlay: dict[Path, int] | None = None,
+    git_status_overlay: Mapping[Path, int] | None = None,
     search_query: str = "",
     show_size_labels: bool = True,
     theme: UITheme | None = None,
@@ -64,7 +66,7 @@ def format_tree_entry(
     reset = active_theme.reset
     badges = format_git_status_badges(entry.path, git_status_overlay, theme=active_theme)
     if entry.is_dir:
-        marker = "▾ " if entry.path.resolve() in expanded else "▸ "
+        marker = "▾ " if canonical_path(entry.path) in expanded else "▸ "
         return f"{indent}{marker_color}{marker}{reset}{dir_color}{name}{reset}{badges}"
 
     # Align file names under the parent directory arrow column.
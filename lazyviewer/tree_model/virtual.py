@@ -0,0 +1,303 @@
+"""Virtualized tree rows backed by ``file_tree_model`` domain trees.
+
+``VirtualTreeRows`` stands in for the fully flattened ``list[TreeEntry]`` of
+the unfiltered tree. Rows are located by descending the domain tree with
+per-directory prefix sums, so index→path and path→index lookups cost
+``O(depth · log fanout)``, and ``TreeEntry`` objects are only materialized
+for rows that are actually read (normally the viewport) and kept in a small
+window cache. Files from listings with deferred stats get their size and
+mtime when their row is first materialized.
+
+Directory children are sorted directories-first (see
+``list_directory_children``); the index relies on that to store prefix
+sums for directory children only and address files arithmetically.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import overload
+
+from ..file_tree_model.listing import stat_file_metadata
+from ..file_tree_model.types import DirectoryEntry, FileEntry
+from .types import TreeEntry
+
+VIRTUAL_TREE_WINDOW_ROWS = 1_024
+
+
+@dataclass(frozen=True)
+class VirtualTreeSection:
+    """One workspace root shown as a top-level section of the tree."""
+
+    root_entry: DirectoryEntry
+    workspace_root: Path
+    workspace_section: int | None = None
+
+
+class _DirectoryIndex:
+    """Row offsets of one expanded directory's children."""
+
+    __slots__ = ("node", "dir_count", "dir_ends", "dir_rows", "size", "_dir_positions")
+
+    def __init__(self, node: DirectoryEntry, dir_count: int, dir_ends: list[int]) -> None:
+        self.node = node
+        self.dir_count = dir_count
+        # dir_ends[k]: rows taken by the subtrees of directory children 0..k.
+        self.dir_ends = dir_ends
+        self.dir_rows = dir_ends[-1] if dir_ends else 0
+        self.size = 1 + self.dir_rows + len(node.children) - dir_count
+        self._dir_positions: dict[str, int] | None = None
+
+    def child_position(self, name: str) -> int | None:
+        """Return the child position of ``name`` or ``None`` when absent."""
+        if self._dir_positions is None:
+            self._dir_positions = {
+                child.name: pos for pos, child in enumerate(self.node.children[: self.dir_count])
+            }
+        pos = self._dir_positions.get(name)
+        if pos is not None:
+            return pos
+        children = self.node.children
+        folded = name.lower()
+        pos = bisect_left(children, folded, lo=self.dir_count, key=lambda child: child.name.lower())
+        while pos < len(children) and children[pos].name.lower() == folded:
+            if children[pos].name == name:
+                return pos
+            pos += 1
+        return None
+
+    def child_offset(self, pos: int) -> int:
+        """Return the row offset of child ``pos`` relative to the first child row."""
+        if pos < self.dir_count:
+            return self.dir_ends[pos - 1] if pos else 0
+        return self.dir_rows + pos - self.dir_count
+
+
+class VirtualTreeRows(Sequence[TreeEntry]):
+    """Read-only ``TreeEntry`` sequence over workspace domain trees."""
+
+    def __init__(
+        self,
+        sections: Sequence[VirtualTreeSection] = (),
+        window_rows: int = VIRTUAL_TREE_WINDOW_ROWS,
+    ) -> None:
+        self._window_rows = max(1, window_rows)
+        self._window: OrderedDict[int, TreeEntry] = OrderedDict()
+        self._index: dict[int, _DirectoryIndex] = {}
+        self._previous_index: dict[int, _DirectoryIndex] = {}
+        self._sections: list[VirtualTreeSection] = []
+        self._section_starts: list[int] = []
+        self._length = 0
+        self.replace_sections(sections)
+
+    @property
+    def sections(self) -> tuple[VirtualTreeSection, ...]:
+        return tuple(self._sections)
+
+    def replace_sections(self, sections: Sequence[VirtualTreeSection]) -> None:
+        """Swap in refreshed domain trees, keeping offsets of reused subtrees.
+
+        Directory indexes are keyed by node identity, so subtrees that
+        ``refresh_file_tree`` returned unchanged keep their prefix sums.
+        """
+        self._previous_index = self._index
+        self._index = {}
+        self._window.clear()
+        self._sections = list(sections)
+        self._section_starts = []
+        total = 0
+        for section in self._sections:
+            self._section_starts.append(total)
+            total += self._subtree_size(section.root_entry)
+        self._length = total
+        self._previous_index = {}
+
+    def _directory_index(self, node: DirectoryEntry) -> _DirectoryIndex:
+        key = id(node)
+        index = self._index.get(key)
+        if index is not None and index.node is node:
+            return index
+        index = self._previous_index.get(key)
+        if index is None or index.node is not node:
+            children = node.children
+            dir_count = 0
+            while dir_count < len(children) and isinstance(children[dir_count], DirectoryEntry):
+                dir_count += 1
+            dir_ends = list(accumulate(self._subtree_size(child) for child in children[:dir_count]))
+            index = _DirectoryIndex(node, dir_count, dir_ends)
+        self._index[key] = index
+        return index
+
+    def _subtree_size(self, node: DirectoryEntry | FileEntry) -> int:
+        if isinstance(node, FileEntry) or not node.children:
+            return 1
+        return self._directory_index(node).size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _locate(self, idx: int) -> tuple[DirectoryEntry | FileEntry, int, int, int | None]:
+        """Return ``(node, depth, section_idx, parent_row)`` for row ``idx``."""
+        section_idx = bisect_right(self._section_starts, idx) - 1
+        row = self._section_starts[section_idx]
+        node: DirectoryEntry | FileEntry = self._sections[section_idx].root_entry
+        parent_row: int | None = None
+        depth = 0
+        rel = idx - row
+        while rel:
+            assert isinstance(node, DirectoryEntry)
+            index = self._directory_index(node)
+            parent_row = row
+            rel -= 1
+            row += 1
+            if rel < index.dir_rows:
+                pos = bisect_right(index.dir_ends, rel)
+                offset = index.dir_ends[pos - 1] if pos else 0
+            else:
+                pos = index.dir_count + rel - index.dir_rows
+                offset = rel
+            node = node.children[pos]
+            row += offset
+            rel -= offset
+            depth += 1
+        return node, depth, section_idx, parent_row
+
+    def _check_index(self, idx: int) -> int:
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError("tree row index out of range")
+        return idx
+
+    def _materialize(self, node: DirectoryEntry | FileEntry, depth: int, section_idx: int) -> TreeEntry:
+        section = self._sections[section_idx]
+        if isinstance(node, DirectoryEntry):
+            return TreeEntry(
+                node.path,
+                depth,
+                True,
+                mtime_ns=node.mtime_ns,
+                git_status_flags=node.git_status_flags,
+                workspace_root=section.workspace_root,
+                workspace_section=section.workspace_section,
+            )
+        file_size, mtime_ns = node.file_size, node.mtime_ns
+        if mtime_ns is None:
+            file_size, mtime_ns = stat_file_metadata(node.path)
+        return TreeEntry(
+            node.path,
+            depth,
+            False,
+            file_size=file_size,
+            mtime_ns=mtime_ns,
+            git_status_flags=node.git_status_flags,
+            doc_summary=node.doc_summary,
+            workspace_root=section.workspace_root,
+            workspace_section=section.workspace_section,
+        )
+
+    @overload
+    def __getitem__(self, idx: int) -> TreeEntry: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> list[TreeEntry]: ...
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._length))]
+        idx = self._check_index(idx)
+        entry = self._window.get(idx)
+        if entry is not None:
+            self._window.move_to_end(idx)
+            return entry
+        node, depth, section_idx, _parent_row = self._locate(idx)
+        entry = self._materialize(node, depth, section_idx)
+        self._window[idx] = entry
+        while len(self._window) > self._window_rows:
+            self._window.popitem(last=False)
+        return entry
+
+    def __iter__(self) -> Iterator[TreeEntry]:
+        for section_idx, section in enumerate(self._sections):
+            stack: list[tuple[DirectoryEntry | FileEntry, int]] = [(section.root_entry, 0)]
+            while stack:
+                node, depth = stack.pop()
+                yield self._materialize(node, depth, section_idx)
+                if isinstance(node, DirectoryEntry):
+                    stack.extend((child, depth + 1) for child in reversed(node.children))
+
+    def path_at(self, idx: int) -> Path:
+        """Return the path of row ``idx`` without materializing it."""
+        return self._locate(self._check_index(idx))[0].path
+
+    def is_dir_at(self, idx: int) -> bool:
+        return isinstance(self._locate(self._check_index(idx))[0], DirectoryEntry)
+
+    def depth_at(self, idx: int) -> int:
+        return self._locate(self._check_index(idx))[1]
+
+    def parent_index(self, idx: int) -> int | None:
+        """Return the row of the directory containing row ``idx``."""
+        return self._locate(self._check_index(idx))[3]
+
+    def subtree_end(self, idx: int) -> int:
+        """Return the first row after the subtree rooted at row ``idx``."""
+        idx = self._check_index(idx)
+        return idx + self._subtree_size(self._locate(idx)[0])
+
+    def next_directory_index(self, idx: int, direction: int) -> int | None:
+        """Return the next directory row from ``idx``, skipping file runs in one step."""
+        step = 1 if direction > 0 else -1
+        row = idx + step
+        while 0 <= row < self._length:
+            node, _depth, _section_idx, parent_row = self._locate(row)
+            if isinstance(node, DirectoryEntry) or parent_row is None:
+                return row
+            parent = self._locate(parent_row)[0]
+            assert isinstance(parent, DirectoryEntry)
+            index = self._directory_index(parent)
+            # Files are the tail of their directory's block.
+            row = parent_row + index.size if step > 0 else parent_row + index.dir_rows
+        return None
+
+    def index_of(self, path: Path, workspace_section: int | None = None) -> int | None:
+        """Return the row showing ``path`` (a resolved path), or ``None``.
+
+        With ``workspace_section`` only that section is searched; otherwise
+        the first section containing the path wins.
+        """
+        for section_idx, section in enumerate(self._sections):
+            if workspace_section is not None and section.workspace_section != workspace_section:
+                continue
+            node: DirectoryEntry | FileEntry = section.root_entry
+            root_path = node.path
+            if path != root_path and not path.is_relative_to(root_path):
+                continue
+            row = self._section_starts[section_idx]
+            found = True
+            for name in path.relative_to(root_path).parts:
+                if not isinstance(node, DirectoryEntry) or not node.children:
+                    found = False
+                    break
+                index = self._directory_index(node)
+                pos = index.child_position(name)
+                if pos is None:
+                    found = False
+                    break
+                row += 1 + index.child_offset(pos)
+                node = node.children[pos]
+            if found:
+                return row
+        return None
+
+
+__all__ = [
+    "VIRTUAL_TREE_WINDOW_ROWS",
+    "VirtualTreeRows",
+    "VirtualTreeSection",
+]
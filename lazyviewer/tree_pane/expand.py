@@ -0,0 +1,240 @@
+"""Background recursive expansion of one tree directory ("expand subtree").
+
+The walk lists the subtree one level at a time on a worker thread, using the
+shared listing cache, and hands back batches of directories whose listings
+are ready. ``SubtreeExpandController.poll`` runs every loop iteration and
+adds finished directories to the expanded state, so rows stream into
+``state.tree_entries`` through the incremental tree refresh instead of one
+blocking rebuild. The walk stops once ``state.subtree_expand_max_entries``
+rows would be shown below the directory, or when ``cancel`` is called.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from queue import Empty, Queue
+
+from ..file_tree_model import (
+    cached_directory_listings,
+    canonical_path,
+    list_directory_children,
+    maybe_gitignore_matcher,
+)
+from .workspace_roots import normalized_workspace_expanded_sections
+
+SUBTREE_EXPAND_MAX_ENTRIES = 2_000
+SUBTREE_EXPAND_BATCH_DIRECTORIES = 64
+
+
+@dataclass(frozen=True)
+class SubtreeExpandBatch:
+    """Directories whose listings are ready to be shown expanded."""
+
+    directories: tuple[Path, ...]
+    entries: int
+    truncated: bool = False
+    done: bool = False
+
+
+def walk_subtree_levels(
+    root: Path,
+    show_hidden: bool,
+    ignore_matcher: object | None = None,
+    max_entries: int = SUBTREE_EXPAND_MAX_ENTRIES,
+    cancelled: threading.Event | None = None,
+    batch_directories: int = SUBTREE_EXPAND_BATCH_DIRECTORIES,
+) -> Iterator[SubtreeExpandBatch]:
+    """Yield breadth-first batches of directories to expand below ``root``.
+
+    ``entries`` counts the visible rows below ``root`` once the batch is
+    expanded. A directory whose children would push that past
+    ``max_entries`` is left collapsed and ends the walk as truncated;
+    ``root`` itself is always expanded. The last batch has ``done`` set.
+    """
+    seen_entries = 0
+    level = [canonical_path(root)]
+    while level:
+        next_level: list[Path] = []
+        for start in range(0, len(level), max(1, batch_directories)):
+            if cancelled is not None and cancelled.is_set():
+                return
+            chunk = level[start : start + max(1, batch_directories)]
+            expanded: list[Path] = []
+            truncated = False
+            for directory, listing in zip(chunk, cached_directory_listings(chunk)):
+                children, scan_error, _mtime_ns = list_directory_children(
+                    directory,
+                    show_hidden,
+                    ignore_matcher=ignore_matcher,
+                    listing=listing,
+                )
+                if scan_error is not None:
+                    continue
+                if seen_entries + len(children) > max_entries and (seen_entries or expanded):
+                    truncated = True
+                    break
+                seen_entries += len(children)
+                expanded.append(directory)
+                next_level.extend(child.path for child in children if child.is_dir)
+            done = truncated or (start + len(chunk) >= len(level) and not next_level)
+            yield SubtreeExpandBatch(tuple(expanded), seen_entries, truncated=truncated, done=done)
+            if done:
+                return
+        level = next_level
+
+
+@dataclass
+class _SubtreeExpandJob:
+    root: Path
+    workspace_section: int | None
+    workspace_root: Path | None
+    cancelled: threading.Event
+    results: Queue[SubtreeExpandBatch]
+    entries: int = 0
+
+
+class SubtreeExpandController:
+    """Runs one subtree expansion at a time and streams it into the tree."""
+
+    def __init__(
+        self,
+        state,
+        rebuild_tree_entries: Callable[..., None],
+        mark_tree_watch_dirty: Callable[[], None],
+        set_status_message: Callable[[str], None],
+        skip_gitignored_for_hidden_mode: Callable[[bool], bool],
+    ) -> None:
+        self.state = state
+        self._rebuild_tree_entries = rebuild_tree_entries
+        self._mark_tree_watch_dirty = mark_tree_watch_dirty
+        self._set_status_message = set_status_message
+        self._skip_gitignored_for_hidden_mode = skip_gitignored_for_hidden_mode
+        self._job: _SubtreeExpandJob | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._job is not None
+
+    def start(
+        self,
+        directory: Path,
+        workspace_section: int | None = None,
+        workspace_root: Path | None = None,
+    ) -> None:
+        """Start expanding ``directory`` recursively, replacing any running job."""
+        self._stop_job()
+        root = canonical_path(directory)
+        scope_root = canonical_path(workspace_root) if workspace_root is not None else root
+        show_hidden = self.state.show_hidden
+        ignore_matcher = maybe_gitignore_matcher(scope_root, self._skip_gitignored_for_hidden_mode(show_hidden))
+        job = _SubtreeExpandJob(
+            root=root,
+            workspace_section=workspace_section,
+            workspace_root=workspace_root,
+            cancelled=threading.Event(),
+            results=Queue(),
+        )
+        max_entries = max(1, int(self.state.subtree_expand_max_entries))
+
+        def worker() -> None:
+            try:
+                for batch in walk_subtree_levels(
+                    root,
+                    show_hidden,
+                    ignore_matcher=ignore_matcher,
+                    max_entries=max_entries,
+                    cancelled=job.cancelled,
+                    batch_directories=SUBTREE_EXPAND_BATCH_DIRECTORIES,
+                ):
+                    job.results.put(batch)
+            except Exception:
+                job.results.put(SubtreeExpandBatch((), job.entries, done=True))
+
+        self._job = job
+        self._set_status_message(f"expanding {root.name or root}/ (esc to stop)")
+        threading.Thread(target=worker, name="lazyviewer-subtree-expand", daemon=True).start()
+
+    def cancel(self) -> bool:
+        """Stop the running expansion, keeping rows already shown."""
+        job = self._stop_job()
+        if job is None:
+            return False
+        self._set_status_message(f"expand stopped: {job.entries} entries")
+        self.state.dirty = True
+        return True
+
+    def _stop_job(self) -> _SubtreeExpandJob | None:
+        job = self._job
+        if job is not None:
+            job.cancelled.set()
+            self._job = None
+        return job
+
+    def _scoped_sections(self, job: _SubtreeExpandJob) -> tuple[list[Path], list[set[Path]], int] | None:
+        state = self.state
+        roots, sections, _union = normalized_workspace_expanded_sections(
+            state.tree_roots,
+            state.tree_root,
+            state.workspace_expanded,
+            state.expanded,
+        )
+        section_idx = job.workspace_section
+        if section_idx is None or not 0 <= section_idx < len(roots):
+            scope = canonical_path(job.workspace_root or state.tree_root)
+            section_idx = next((idx for idx, root in enumerate(roots) if root == scope), None)
+        if section_idx is None or not job.root.is_relative_to(roots[section_idx]):
+            return None
+        return roots, sections, section_idx
+
+    def poll(self) -> bool:
+        """Apply finished batches; return ``True`` when the tree changed."""
+        job = self._job
+        if job is None:
+            return False
+        batches: list[SubtreeExpandBatch] = []
+        while True:
+            try:
+                batches.append(job.results.get_nowait())
+            except Empty:
+                break
+        if not batches:
+            return False
+
+        scope = self._scoped_sections(job)
+        if scope is None or job.root not in scope[1][scope[2]] or self.state.tree_filter_active:
+            # Rerooted, collapsed, or filtered while the walk was running.
+            self._stop_job()
+            return False
+        roots, sections, section_idx = scope
+        sections[section_idx] = sections[section_idx].union(
+            directory for batch in batches for directory in batch.directories
+        )
+        self.state.tree_roots = roots
+        self.state.workspace_expanded = sections
+        self.state.expanded = set().union(*sections)
+        job.entries = batches[-1].entries
+
+        self._rebuild_tree_entries(changed_dirs=frozenset())
+        self._mark_tree_watch_dirty()
+        last = batches[-1]
+        if last.done:
+            self._job = None
+            if last.truncated:
+                self._set_status_message(f"expand stopped at {job.entries} entries (limit)")
+            else:
+                self._set_status_message(f"expanded {job.entries} entries")
+        else:
+            self._set_status_message(f"expanding… {job.entries} entries (esc to stop)")
+        return True
+
+
+__all__ = [
+    "SUBTREE_EXPAND_BATCH_DIRECTORIES",
+    "SUBTREE_EXPAND_MAX_ENTRIES",
+    "SubtreeExpandBatch",
+    "SubtreeExpandController",
+    "walk_subtree_levels",
+]
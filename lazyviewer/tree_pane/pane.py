@@ -10,7 +10,7 @@ from .events import TreePaneMouseHandlers
 from .panels.filter import TreeFilterController
 from .panels.picker import NavigationController
 from .sync import PreviewSelection, TreeRefreshSync
-from .watch import WatchRefreshContext, refresh_git_status_overlay
+from .watch import WatchRefreshContext, gitignore_matchers_by_root, refresh_git_status_overlay
 
 
 class TreePane:
@@ -20,6 +20,7 @@ class TreePane:
     PreviewSelection = PreviewSelection
     TreeRefreshSync = TreeRefreshSync
     refresh_git_status_overlay = staticmethod(refresh_git_status_overlay)
+    gitignore_matchers_by_root = staticmethod(gitignore_matchers_by_root)
 
     def __init__(
         self,
@@ -10,6 +10,7 @@ from collections import OrderedDict
 from pathlib import Path
 from queue import Empty, Queue
 
+from ....file_tree_model.paths import canonical_path
 from ....runtime.navigation import JumpLocation
 from ....runtime.state import AppState
 from ....search.fuzzy import (
@@ -18,8 +19,9 @@ from ....search.fuzzy import (
     fuzzy_match_label_index,
 )
 from ....tree_model import (
+    VirtualTreeRows,
+    WorkspaceTreeRows,
     build_tree_entries,
-    build_workspace_tree_entries,
     filter_tree_entries_for_content_matches,
     filter_tree_entries_for_files,
     find_content_hit_index,
@@ -87,6 +89,7 @@ class TreeFilterController:
         self._streaming_last_match_at = 0.0
         self._content_search_prompt_reveal_at = 0.0
         self._streaming_initial_rebuild_pending = False
+        self.tree_rows = WorkspaceTreeRows()
         self.panel = FilterPanel(self)
 
     # lifecycle
@@ -483,7 +486,7 @@ class TreeFilterController:
     @staticmethod
     def _workspace_roots_signature(roots: list[Path]) -> tuple[str, ...]:
         """Build cache signature preserving root order and duplicate sections."""
-        return tuple(str(root.resolve()) for root in roots)
+        return tuple(str(canonical_path(root)) for root in roots)
 
     def _collect_workspace_file_labels_parallel(
         self,
@@ -537,7 +540,7 @@ class TreeFilterController:
         should_cancel: Callable[[], bool] | None = None,
     ) -> tuple[dict[Path, list[filter_matching.ContentMatch]], bool, str | None]:
         """Search content across all workspace roots and merge deduplicated hits."""
-        normalized_roots = [root.resolve() for root in roots]
+        normalized_roots = [canonical_path(root) for root in roots]
         if not normalized_roots:
             return {}, False, None
 
@@ -554,7 +557,7 @@ class TreeFilterController:
 
         def emit_unique_match(path: Path, match: filter_matching.ContentMatch) -> None:
             nonlocal streamed_matches
-            match_path = path.resolve()
+            match_path = canonical_path(path)
             event_key = (str(match_path), match.line, match.column, match.preview)
             with seen_lock:
                 if event_key in seen_event_keys:
@@ -661,7 +664,7 @@ class TreeFilterController:
                 truncated = True
 
             for match_path in sorted(matches_by_file, key=lambda item: str(item).casefold()):
-                resolved_path = match_path.resolve()
+                resolved_path = canonical_path(match_path)
                 for match in matches_by_file[match_path]:
                     match_key = (str(resolved_path), match.line, match.column, match.preview)
                     if match_key in seen_match_keys:
@@ -736,7 +739,7 @@ class TreeFilterController:
         self.state.picker_file_paths = file_paths
         self.state.picker_file_workspace_sections = file_sections
         self.state.picker_file_labels_folded = []
-        self.state.picker_files_root = roots[0] if roots else self.state.tree_root.resolve()
+        self.state.picker_files_root = roots[0] if roots else canonical_path(self.state.tree_root)
         self.state.picker_files_roots_signature = roots_signature
         self.state.picker_files_show_hidden = self.state.show_hidden
 
@@ -745,9 +748,9 @@ class TreeFilterController:
         if not self.state.tree_entries:
             return 0
         if prefer_files:
-            for idx, entry in enumerate(self.state.tree_entries):
-                if not entry.is_dir:
-                    return idx
+            first_file_idx = next_file_entry_index(self.state.tree_entries, -1, 1)
+            if first_file_idx is not None:
+                return first_file_idx
         if len(self.state.tree_entries) > 1:
             return 1
         return 0
@@ -797,6 +800,34 @@ class TreeFilterController:
         self._store_content_search_cache(key, result)
         return result
 
+    @staticmethod
+    def _virtual_preferred_index(
+        rows: VirtualTreeRows,
+        target: Path,
+        scope_root: Path | None,
+        scope_section: int | None,
+    ) -> int | None:
+        """Find the preferred row with path lookups instead of a row scan.
+
+        Mirrors the list search: scoped section, then scoped root, then a
+        workspace root row for ``target``, then the first row showing it.
+        """
+        if scope_section is not None:
+            idx = rows.index_of(target, workspace_section=scope_section)
+            if idx is not None:
+                return idx
+        sections = rows.sections
+        if scope_root is not None:
+            for section in sections:
+                if section.workspace_root == scope_root:
+                    idx = rows.index_of(target, workspace_section=section.workspace_section)
+                    if idx is not None:
+                        return idx
+        for section in reversed(sections):
+            if section.workspace_root == target:
+                return rows.index_of(target, workspace_section=section.workspace_section)
+        return rows.index_of(target)
+
     def rebuild_tree_entries(
         self,
         preferred_path: Path | None = None,
@@ -806,8 +837,14 @@ class TreeFilterController:
         preferred_workspace_section: int | None = None,
         content_matches_override: dict[Path, list[filter_matching.ContentMatch]] | None = None,
         content_truncated_override: bool | None = None,
+        changed_dirs: frozenset[Path] | None = None,
     ) -> None:
-        """Rebuild tree entries for current filter state and preserve intent."""
+        """Rebuild tree entries for current filter state and preserve intent.
+
+        ``changed_dirs`` comes from the directory watcher: when the unfiltered
+        tree is on screen, only those directories (plus any whose mtime moved)
+        are rescanned and their rows patched into ``state.tree_entries``.
+        """
         previous_selected_hit_path: Path | None = None
         previous_selected_hit_line: int | None = None
         previous_selected_hit_column: int | None = None
@@ -816,23 +853,23 @@ class TreeFilterController:
         previous_selected_workspace_section: int | None = None
         if self.state.tree_entries and 0 <= self.state.selected_idx < len(self.state.tree_entries):
             previous_entry = self.state.tree_entries[self.state.selected_idx]
-            previous_selected_path = previous_entry.path.resolve()
+            previous_selected_path = canonical_path(previous_entry.path)
             if previous_entry.workspace_root is not None:
-                previous_selected_workspace_root = previous_entry.workspace_root.resolve()
+                previous_selected_workspace_root = canonical_path(previous_entry.workspace_root)
             previous_selected_workspace_section = previous_entry.workspace_section
             if previous_entry.kind == "search_hit":
-                previous_selected_hit_path = previous_entry.path.resolve()
+                previous_selected_hit_path = canonical_path(previous_entry.path)
                 previous_selected_hit_line = previous_entry.line
                 previous_selected_hit_column = previous_entry.column
 
         if preferred_path is None:
             if self.state.tree_entries and 0 <= self.state.selected_idx < len(self.state.tree_entries):
-                preferred_path = self.state.tree_entries[self.state.selected_idx].path.resolve()
+                preferred_path = canonical_path(self.state.tree_entries[self.state.selected_idx].path)
             else:
-                preferred_path = self.state.current_path.resolve()
+                preferred_path = canonical_path(self.state.current_path)
 
-        preferred_target = preferred_path.resolve()
-        preferred_workspace_scope = preferred_workspace_root.resolve() if preferred_workspace_root is not None else None
+        preferred_target = canonical_path(preferred_path)
+        preferred_workspace_scope = canonical_path(preferred_workspace_root) if preferred_workspace_root is not None else None
         preferred_workspace_scope_section = preferred_workspace_section
         if (
             preferred_workspace_scope is None
@@ -939,14 +976,29 @@ class TreeFilterController:
             self.state.tree_filter_truncated = False
             workspace_expanded = self.normalized_workspace_expanded()
             self.state.tree_render_expanded = set(self.state.expanded)
-            self.state.tree_entries = build_workspace_tree_entries(
-                self.state.tree_roots,
-                self.state.tree_root,
-                self.state.expanded,
-                workspace_expanded,
-                self.state.show_hidden,
-                skip_gitignored=skip_gitignored_for_hidden_mode(self.state.show_hidden),
+            skip_gitignored = skip_gitignored_for_hidden_mode(self.state.show_hidden)
+            patched = (
+                changed_dirs is not None
+                and self.state.tree_entries is self.tree_rows.entries
+                and self.tree_rows.refresh(
+                    self.state.tree_roots,
+                    self.state.tree_root,
+                    self.state.expanded,
+                    workspace_expanded,
+                    self.state.show_hidden,
+                    skip_gitignored=skip_gitignored,
+                    changed_dirs=changed_dirs,
+                )
             )
+            if not patched:
+                self.state.tree_entries = self.tree_rows.build(
+                    self.state.tree_roots,
+                    self.state.tree_root,
+                    self.state.expanded,
+                    workspace_expanded,
+                    self.state.show_hidden,
+                    skip_gitignored=skip_gitignored,
+                )
 
         if force_first_file:
             first_idx = self.next_tree_filter_result_entry_index(-1, 1)
@@ -971,7 +1023,17 @@ class TreeFilterController:
                     self.state.selected_idx = preserved_hit_idx
                     matched_preferred = True
 
-            if not matched_preferred:
+            if not matched_preferred and isinstance(self.state.tree_entries, VirtualTreeRows):
+                virtual_idx = self._virtual_preferred_index(
+                    self.state.tree_entries,
+                    preferred_target,
+                    preferred_workspace_scope,
+                    preferred_workspace_scope_section,
+                )
+                if virtual_idx is not None:
+                    self.state.selected_idx = virtual_idx
+                    matched_preferred = True
+            elif not matched_preferred:
                 first_match_idx: int | None = None
                 root_match_idx: int | None = None
                 scoped_section_match_idx: int | None = None
@@ -979,11 +1041,11 @@ class TreeFilterController:
                 for idx, entry in enumerate(self.state.tree_entries):
                     if entry.kind == "search_hit":
                         continue
-                    if entry.path.resolve() != preferred_target:
+                    if canonical_path(entry.path) != preferred_target:
                         continue
                     if first_match_idx is None:
                         first_match_idx = idx
-                    entry_root = entry.workspace_root.resolve() if entry.workspace_root is not None else None
+                    entry_root = canonical_path(entry.workspace_root) if entry.workspace_root is not None else None
                     entry_section = entry.workspace_section
                     if (
                         preferred_workspace_scope_section is not None
@@ -1044,7 +1106,7 @@ class TreeFilterController:
         """Apply query text, rebuild results, and update loading indicator timing."""
         self.state.tree_filter_query = query
         force_first_file = select_first_file and bool(query)
-        preferred_path = None if force_first_file else self.state.current_path.resolve()
+        preferred_path = None if force_first_file else canonical_path(self.state.current_path)
         suppress_prompt_row = bool(
             debounce_prompt_row
             and bool(query)
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 
+from ..file_tree_model.paths import canonical_path
 from ..render.ansi import ANSI_ESCAPE_RE, char_display_width, clip_ansi_line
 from ..tree_model import TreeEntry, format_tree_entry
 from ..ui_theme import DEFAULT_THEME, UITheme
@@ -78,7 +80,7 @@ class TreePaneRenderer:
         self,
         left_width: int,
         content_rows: int,
-        tree_entries: list[TreeEntry],
+        tree_entries: Sequence[TreeEntry],
         tree_start: int,
         tree_selected: int,
         tree_root: Path,
@@ -86,7 +88,7 @@ class TreePaneRenderer:
         workspace_expanded: list[set[Path]] | None,
         expanded: set[Path],
         show_tree_sizes: bool,
-        git_status_overlay: dict[Path, int] | None,
+        git_status_overlay: Mapping[Path, int] | None,
         tree_search_query: str,
         tree_filter_active: bool,
         tree_filter_row_visible: bool,
@@ -118,13 +120,13 @@ class TreePaneRenderer:
         self.tree_entries = tree_entries
         self.tree_start = tree_start
         self.tree_selected = tree_selected
-        self.tree_root = tree_root.resolve()
+        self.tree_root = canonical_path(tree_root)
         self.tree_roots = normalized_workspace_roots(
             tree_roots or [self.tree_root],
             self.tree_root,
         )
         self.workspace_expanded = [
-            {path.resolve() for path in paths}
+            {canonical_path(path) for path in paths}
             for paths in (workspace_expanded or [])
         ]
         self.expanded = expanded
@@ -258,7 +260,7 @@ class TreePaneRenderer:
 
         entry = self.tree_entries[tree_idx]
         entry_root = (
-            entry.workspace_root.resolve()
+            canonical_path(entry.workspace_root)
             if entry.workspace_root is not None
             else self.tree_root
         )
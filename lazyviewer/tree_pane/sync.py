@@ -10,6 +10,8 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
+from ..file_tree_model.listing import clear_directory_listing_cache
+from ..file_tree_model.paths import canonical_path, clear_canonical_path_cache
 from ..runtime.state import AppState
 
 
@@ -36,17 +38,17 @@ class PreviewSelection:
         if not state.tree_entries:
             return
         entry = state.tree_entries[state.selected_idx]
-        selected_target = entry.path.resolve()
+        selected_target = canonical_path(entry.path)
         if self.clear_source_selection():
             state.dirty = True
         if entry.kind == "search_hit":
-            if force or selected_target != state.current_path.resolve():
+            if force or selected_target != canonical_path(state.current_path):
                 state.current_path = selected_target
                 self.refresh_rendered_for_current_path(reset_scroll=True, reset_dir_budget=True)
             if entry.line is not None and self.jump_to_line is not None:
                 self.jump_to_line(max(0, entry.line - 1))
             return
-        if not force and selected_target == state.current_path.resolve():
+        if not force and selected_target == canonical_path(state.current_path):
             return
         state.current_path = selected_target
         if (
@@ -77,24 +79,36 @@ class TreeRefreshSync:
         self,
         preferred_path: Path,
         force_rebuild: bool = False,
+        changed_dirs: frozenset[Path] | None = None,
     ) -> None:
-        """Rebuild tree, refresh preview, and run follow-up side effects."""
+        """Rebuild tree, refresh preview, and run follow-up side effects.
+
+        ``changed_dirs`` (from the directory watcher) lets the rebuild patch
+        only the affected rows instead of rescanning the whole tree. Only a
+        forced rebuild forces a git status refresh; watch-driven refreshes
+        leave it to the git watcher and the status refresh interval.
+        """
         state = self.state
-        previous_current_path = state.current_path.resolve()
-        self.rebuild_tree_entries(preferred_path=preferred_path)
+        previous_current_path = canonical_path(state.current_path)
+        if force_rebuild:
+            clear_directory_listing_cache()
+            clear_canonical_path_cache()
+        self.rebuild_tree_entries(preferred_path=preferred_path, changed_dirs=changed_dirs)
         if state.tree_entries and 0 <= state.selected_idx < len(state.tree_entries):
-            selected_target = state.tree_entries[state.selected_idx].path.resolve()
+            selected_target = canonical_path(state.tree_entries[state.selected_idx].path)
         else:
-            selected_target = state.tree_root.resolve()
+            selected_target = canonical_path(state.tree_root)
 
         changed_target = selected_target != previous_current_path
         if changed_target:
             state.current_path = selected_target
+        # Previews pick their diff from overlay flags, so refresh the overlay
+        # first and render once with current flags.
+        self.refresh_git_status_overlay(force=force_rebuild, rerender=False)
         self.refresh_rendered_for_current_path(
             reset_scroll=changed_target,
             reset_dir_budget=changed_target,
             force_rebuild=force_rebuild,
         )
         self.schedule_tree_filter_index_warmup()
-        self.refresh_git_status_overlay(force=True)
         state.dirty = True
@@ -2,72 +2,348 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Protocol
 
+from ..file_tree_model.fs import maybe_gitignore_matcher
+from ..file_tree_model.paths import canonical_path, clear_canonical_path_cache, invalidate_canonical_paths
+from ..git_workspace import WorkspaceGitCoordinator, WorkspaceRepo
 from ..runtime.state import AppState
+from .panels.filter.helpers import skip_gitignored_for_hidden_mode
+
+TREE_WATCH_HOT_PATHS_MAX = 8
+TREE_WATCH_MAX_DEFER_POLLS = 4
+
+
+class GitWatcher(Protocol):
+    """Event source that reports git control-file changes without polling."""
+
+    broken: bool
+
+    def fileno(self) -> int: ...
+
+    def poll_changed(self) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+class TreeWatcher(Protocol):
+    """Event source that reports which watched directories changed."""
+
+    broken: bool
+
+    def fileno(self) -> int: ...
+
+    def sync(self, directories: set[Path], show_hidden: bool) -> bool: ...
+
+    def missing_directories(self) -> bool: ...
+
+    def poll_changed(self) -> set[Path]: ...
+
+    def close(self) -> None: ...
 
 
 @dataclass
 class WatchRefreshContext:
-    """Polling state for tree and git watch signatures."""
+    """Polling state for tree and git watch signatures.
+
+    With a ``tree_watcher`` the tree side is event-driven: watches follow the
+    visible directories, reported directories accumulate until events go
+    quiet, and ``tree_changed_dirs`` records which directories triggered the
+    latest refresh (``None`` when a signature poll did, since polling cannot
+    tell). Polling is tiered: every poll compares a
+    directories-only signature plus per-file stats of the previewed file and
+    the last few previewed files (``hot_tree_paths``); a file only counts as
+    changed when it was already hot on the previous poll, so previewing a new
+    file is not a tree change. A full per-child signature runs every
+    ``tree_watch_full_signature_seconds`` to catch in-place writes to other
+    files. Gitignore matchers are compared by identity on the poll interval
+    in both modes, since dot-file events and signatures are filtered out
+    while hidden files are off.
+    """
 
     tree_last_poll: float = 0.0
     tree_signature: str | None = None
+    tree_watcher: TreeWatcher | None = None
+    tree_changed_dirs: frozenset[Path] | None = None
+    tree_hot_stats: dict[Path, tuple[int | None, int | None]] = field(default_factory=dict)
+    tree_full_signature: str | None = None
+    tree_full_last_poll: float = 0.0
+    _tree_watch_inputs: tuple | None = field(default=None, init=False, repr=False)
+    _tree_watch_expanded: set[Path] = field(default_factory=set, init=False, repr=False)
+    _tree_hot_paths: OrderedDict[Path, None] = field(default_factory=OrderedDict, init=False, repr=False)
+    _gitignore_matchers: Mapping[Path, object | None] | None = field(default=None, init=False, repr=False)
+    _gitignore_last_poll: float = field(default=0.0, init=False, repr=False)
+    _tree_pending_dirs: set[Path] = field(default_factory=set, init=False, repr=False)
+    _tree_pending_since: float = field(default=0.0, init=False, repr=False)
+    _tree_last_event: float = field(default=0.0, init=False, repr=False)
     git_last_poll: float = 0.0
     git_signature: str | None = None
     git_repo_root: Path | None = None
     git_dir: Path | None = None
+    git_watcher: GitWatcher | None = None
+    git_workspace: WorkspaceGitCoordinator | None = None
 
     def mark_tree_dirty(self) -> None:
         """Force next tree poll to treat signature as unknown."""
         self.tree_signature = None
+        self.tree_hot_stats = {}
+        self.tree_full_signature = None
+        self._tree_watch_inputs = None
+
+    def hot_tree_paths(self, state: AppState) -> tuple[Path, ...]:
+        """Return files stat'ed by the polled signature, most recent last.
+
+        The previewed file joins a small LRU of recently previewed files,
+        so switching back and forth keeps both fresh.
+        """
+        if state.dir_preview_path is None:
+            current = canonical_path(state.current_path)
+            self._tree_hot_paths[current] = None
+            self._tree_hot_paths.move_to_end(current)
+            while len(self._tree_hot_paths) > TREE_WATCH_HOT_PATHS_MAX:
+                self._tree_hot_paths.popitem(last=False)
+        return tuple(self._tree_hot_paths)
+
+    def baseline_tree_signatures(
+        self,
+        state: AppState,
+        *,
+        build_tree_watch_signature: Callable[..., str],
+        stat_tree_hot_paths: Callable[[Sequence[Path]], dict[Path, tuple[int | None, int | None]]],
+        now: float,
+    ) -> None:
+        """Record every polling baseline, including the full signature, without refreshing."""
+        self.tree_signature = build_tree_watch_signature(
+            state.tree_root, state.expanded, state.show_hidden, directories_only=True
+        )
+        self.tree_hot_stats = stat_tree_hot_paths(self.hot_tree_paths(state))
+        self.tree_full_signature = build_tree_watch_signature(state.tree_root, state.expanded, state.show_hidden)
+        self.tree_full_last_poll = now
+
+    def _close_tree_watcher(self) -> None:
+        if self.tree_watcher is not None:
+            self.tree_watcher.close()
+            self.tree_watcher = None
+
+    def _close_git_watcher(self) -> None:
+        if self.git_watcher is not None:
+            self.git_watcher.close()
+            self.git_watcher = None
 
     def reset_git_context(
         self,
         state: AppState,
         *,
         resolve_git_paths: Callable[[Path], tuple[Path | None, Path | None]],
+        create_git_watcher: Callable[[Path | None], GitWatcher | None] | None = None,
     ) -> None:
-        """Re-resolve repository context after tree-root changes."""
-        self.git_repo_root, self.git_dir = resolve_git_paths(state.tree_root)
+        """Re-resolve repository context after tree-root changes.
+
+        When ``create_git_watcher`` yields an event watcher for the active
+        root's repository, git polling is skipped until it reports activity;
+        otherwise stat polling is used. With a workspace coordinator, every
+        root's repository is resolved (concurrently) and the active root's
+        context is read back from it.
+        """
+        if self.git_workspace is not None:
+            self.git_workspace.reset(workspace_git_roots(state))
+            repo = self.git_workspace.repo_for_root(state.tree_root)
+            self.git_repo_root, self.git_dir = (repo.repo_root, repo.git_dir) if repo else (None, None)
+        else:
+            self.git_repo_root, self.git_dir = resolve_git_paths(state.tree_root)
         self.git_last_poll = 0.0
         self.git_signature = None
+        self._close_git_watcher()
+        if create_git_watcher is not None and self.git_dir is not None:
+            self.git_watcher = create_git_watcher(self.git_dir)
+
+    def close(self) -> None:
+        """Release event-watch resources."""
+        self._close_tree_watcher()
+        self._close_git_watcher()
+        if self.git_workspace is not None:
+            self.git_workspace.close()
+
+    def _watches_every_repo(self) -> bool:
+        """Return whether the event watcher covers all workspace repositories."""
+        if self.git_workspace is None:
+            return True
+        return all(repo.git_dir in {None, self.git_dir} for repo in self.git_workspace.repos)
+
+    def wake_fds(self, state: AppState) -> tuple[int, ...]:
+        """Return descriptors that should wake the idle loop on fs/git activity."""
+        fds: tuple[int, ...] = ()
+        if self.tree_watcher is not None:
+            fds += (self.tree_watcher.fileno(),)
+        if self.git_watcher is not None and state.git_features_enabled:
+            fds += (self.git_watcher.fileno(),)
+        return fds
+
+    def _poll_tree_watcher(self, state: AppState) -> set[Path] | None:
+        """Re-arm watches for the visible directories and drain changes.
+
+        Returns ``None`` once the watcher breaks (after closing it) so the
+        caller falls back to signature polling.
+        """
+        watcher = self.tree_watcher
+        assert watcher is not None
+        changed = watcher.poll_changed()
+        # Cheap identity/equality checks first; the watched set is only
+        # recomputed when roots, expansion, or the previewed dir change.
+        inputs = (tuple(state.tree_roots), state.tree_root, state.dir_preview_path, state.show_hidden)
+        inputs_changed = inputs != self._tree_watch_inputs or state.expanded != self._tree_watch_expanded
+        if not watcher.broken and (inputs_changed or (changed and watcher.missing_directories())):
+            self._tree_watch_inputs = inputs
+            self._tree_watch_expanded = set(state.expanded)
+            watcher.sync(set(tree_watch_directories(state)), state.show_hidden)
+        if watcher.broken:
+            self._close_tree_watcher()
+            return None
+        return changed
 
     def maybe_refresh_tree(
         self,
         state: AppState,
         sync_selected_target_after_tree_refresh: Callable[..., None],
         *,
-        build_tree_watch_signature: Callable[[Path, set[Path], bool], str],
+        build_tree_watch_signature: Callable[..., str],
+        stat_tree_hot_paths: Callable[[Sequence[Path]], dict[Path, tuple[int | None, int | None]]],
         monotonic: Callable[[], float],
         tree_watch_poll_seconds: float,
+        tree_watch_full_signature_seconds: float,
+        tree_watch_quiet_seconds: float = 0.0,
+        gitignore_matchers: Callable[[AppState], Mapping[Path, object | None]] | None = None,
     ) -> None:
-        """Poll tree signature and rebuild selection target when it changes."""
+        """Poll tree changes and rebuild selection target when they happen.
+
+        The event watcher is drained on every call (no stat calls), and the
+        directories it reports are coalesced into one refresh once no event
+        arrived for ``tree_watch_quiet_seconds``, at most once per
+        ``tree_watch_poll_seconds`` (a steady stream of events still
+        refreshes after ``TREE_WATCH_MAX_DEFER_POLLS`` intervals). Without a
+        watcher, or after it breaks on inotify limits, the tiered signatures
+        are rebuilt every ``tree_watch_poll_seconds`` and the full one every
+        ``tree_watch_full_signature_seconds``. A changed
+        ``gitignore_matchers`` entry rebuilds the whole tree, since subtrees
+        reused by a partial refresh keep their old filtering.
+        """
         now = monotonic()
-        if (now - self.tree_last_poll) < tree_watch_poll_seconds:
+        if gitignore_matchers is not None and self._gitignore_rules_changed(
+            state, gitignore_matchers, now, tree_watch_poll_seconds
+        ):
+            self._tree_pending_dirs.clear()
+            self.tree_changed_dirs = None
+            self._sync_after_tree_change(state, sync_selected_target_after_tree_refresh)
+            return
+
+        if self.tree_watcher is not None:
+            changed_dirs = self._poll_tree_watcher(state)
+            if changed_dirs is not None:
+                if changed_dirs:
+                    if not self._tree_pending_dirs:
+                        self._tree_pending_since = now
+                    self._tree_pending_dirs.update(changed_dirs)
+                    self._tree_last_event = now
+                if not self._tree_pending_dirs or not self._tree_refresh_due(
+                    now, tree_watch_poll_seconds, tree_watch_quiet_seconds
+                ):
+                    return
+                self.tree_last_poll = now
+                self.tree_changed_dirs = frozenset(self._tree_pending_dirs)
+                self._tree_pending_dirs.clear()
+                self._sync_after_tree_change(
+                    state,
+                    sync_selected_target_after_tree_refresh,
+                    changed_dirs=self.tree_changed_dirs,
+                )
+                return
+            # Watcher just broke: events may have been lost, so refresh once
+            # and re-baseline the polling signature.
+            self._tree_pending_dirs.clear()
+            self.tree_signature = None
+            self.tree_changed_dirs = None
+            self._sync_after_tree_change(state, sync_selected_target_after_tree_refresh)
+
+        if self.tree_signature is not None and (now - self.tree_last_poll) < tree_watch_poll_seconds:
             return
         self.tree_last_poll = now
 
         signature = build_tree_watch_signature(
-            state.tree_root,
-            state.expanded,
-            state.show_hidden,
+            state.tree_root, state.expanded, state.show_hidden, directories_only=True
         )
-        if self.tree_signature is None:
-            self.tree_signature = signature
-            return
-        if signature == self.tree_signature:
-            return
+        hot_stats = stat_tree_hot_paths(self.hot_tree_paths(state))
+        full_signature: str | None = None
+        if (now - self.tree_full_last_poll) >= tree_watch_full_signature_seconds:
+            self.tree_full_last_poll = now
+            full_signature = build_tree_watch_signature(state.tree_root, state.expanded, state.show_hidden)
 
+        changed = self.tree_signature is not None and (
+            signature != self.tree_signature
+            or any(self.tree_hot_stats.get(path, stats) != stats for path, stats in hot_stats.items())
+            or (self.tree_full_signature is not None and full_signature not in {None, self.tree_full_signature})
+        )
         self.tree_signature = signature
+        self.tree_hot_stats = hot_stats
+        if full_signature is not None:
+            self.tree_full_signature = full_signature
+        if not changed:
+            return
+
+        if full_signature is None:
+            # Structure changed since the full baseline; re-baseline on the
+            # next full pass rather than report the same change twice.
+            self.tree_full_signature = None
+        self.tree_changed_dirs = None
+        self._sync_after_tree_change(state, sync_selected_target_after_tree_refresh)
+
+    def _tree_refresh_due(self, now: float, poll_seconds: float, quiet_seconds: float) -> bool:
+        """Return whether pending watcher directories should be refreshed now."""
+        if (now - self.tree_last_poll) < poll_seconds:
+            return False
+        return (now - self._tree_last_event) >= quiet_seconds or (
+            now - self._tree_pending_since
+        ) >= poll_seconds * TREE_WATCH_MAX_DEFER_POLLS
+
+    def _gitignore_rules_changed(
+        self,
+        state: AppState,
+        gitignore_matchers: Callable[[AppState], Mapping[Path, object | None]],
+        now: float,
+        poll_seconds: float,
+    ) -> bool:
+        """Return whether a root's gitignore matcher was replaced since the last check."""
+        if self._gitignore_matchers is not None and (now - self._gitignore_last_poll) < poll_seconds:
+            return False
+        self._gitignore_last_poll = now
+        previous = self._gitignore_matchers
+        current = gitignore_matchers(state)
+        self._gitignore_matchers = current
+        if previous is None:
+            return False
+        return any(root in previous and previous[root] is not matcher for root, matcher in current.items())
+
+    @staticmethod
+    def _sync_after_tree_change(
+        state: AppState,
+        sync_selected_target_after_tree_refresh: Callable[..., None],
+        changed_dirs: frozenset[Path] | None = None,
+    ) -> None:
+        # Entries or symlinks in changed directories may now resolve elsewhere;
+        # a polled change does not say which directories moved.
+        if changed_dirs is None:
+            clear_canonical_path_cache()
+        else:
+            invalidate_canonical_paths(changed_dirs)
         preferred_path = (
-            state.tree_entries[state.selected_idx].path.resolve()
+            canonical_path(state.tree_entries[state.selected_idx].path)
             if state.tree_entries and 0 <= state.selected_idx < len(state.tree_entries)
-            else state.current_path.resolve()
+            else canonical_path(state.current_path)
         )
-        sync_selected_target_after_tree_refresh(preferred_path=preferred_path)
+        sync_selected_target_after_tree_refresh(preferred_path=preferred_path, changed_dirs=changed_dirs)
 
     def maybe_refresh_git(
         self,
@@ -83,7 +359,17 @@ class WatchRefreshContext:
         if not state.git_features_enabled:
             return
         now = monotonic()
-        if (now - self.git_last_poll) < git_watch_poll_seconds:
+        watcher = self.git_watcher
+        if watcher is not None and self.git_signature is not None:
+            # Event-driven path: no stat calls until inotify reports activity,
+            # and no poll-interval delay once it does. Repositories of other
+            # workspace roots are still polled on the interval.
+            fired = watcher.poll_changed()
+            if watcher.broken:
+                self._close_git_watcher()
+            if not fired and (self._watches_every_repo() or (now - self.git_last_poll) < git_watch_poll_seconds):
+                return
+        elif (now - self.git_last_poll) < git_watch_poll_seconds:
             return
         self.git_last_poll = now
 
@@ -91,11 +377,19 @@ class WatchRefreshContext:
         if self.git_signature is None:
             self.git_signature = signature
             return
-        if signature == self.git_signature:
+        changed_repos: list[WorkspaceRepo] | None = None
+        if self.git_workspace is not None:
+            changed_repos = self.git_workspace.poll_changed()
+            if signature == self.git_signature and not changed_repos:
+                return
+        elif signature == self.git_signature:
             return
 
         self.git_signature = signature
-        refresh_git_status_overlay(force=True)
+        if changed_repos:
+            refresh_git_status_overlay(force=True, repos=changed_repos)
+        else:
+            refresh_git_status_overlay(force=True)
         previous_rendered = state.rendered
         previous_start = state.start
         previous_max_start = state.max_start
@@ -108,16 +402,50 @@ class WatchRefreshContext:
             state.dirty = True
 
 
+def tree_watch_directories(state: AppState) -> frozenset[Path]:
+    """Return directories whose entries are visible: roots, expanded dirs, preview dir."""
+    roots = [canonical_path(root) for root in workspace_git_roots(state)]
+    directories = set(roots)
+    candidates = list(state.expanded)
+    if state.dir_preview_path is not None:
+        candidates.append(state.dir_preview_path)
+    for path in candidates:
+        if any(path == root or path.is_relative_to(root) for root in roots):
+            directories.add(path)
+    return frozenset(directories)
+
+
+def gitignore_matchers_by_root(state: AppState) -> dict[Path, object | None]:
+    """Return the gitignore matcher each tree root is currently filtered with."""
+    skip_gitignored = skip_gitignored_for_hidden_mode(state.show_hidden)
+    return {root: maybe_gitignore_matcher(root, skip_gitignored) for root in workspace_git_roots(state)}
+
+
+def workspace_git_roots(state: AppState) -> list[Path]:
+    """Return tree roots whose git status feeds the overlay."""
+    roots = list(state.tree_roots)
+    if state.tree_root not in roots:
+        roots.append(state.tree_root)
+    return roots
+
+
 def refresh_git_status_overlay(
     state: AppState,
     refresh_rendered_for_current_path: Callable[..., None],
     *,
-    collect_git_status_overlay: Callable[[Path], dict[Path, int]],
+    collect_git_status_overlay: Callable[[Sequence[Path], Sequence[WorkspaceRepo] | None], Mapping[Path, int]],
     monotonic: Callable[[], float],
     status_refresh_seconds: float,
     force: bool = False,
+    repos: Sequence[WorkspaceRepo] | None = None,
+    rerender: bool = True,
 ) -> None:
-    """Refresh ``state.git_status_overlay`` on interval or when forced."""
+    """Refresh ``state.git_status_overlay`` on interval or when forced.
+
+    ``collect_git_status_overlay`` receives every workspace root; ``repos``
+    limits re-collection to roots in those repositories. ``rerender=False``
+    skips the preview refresh for callers that render right afterwards.
+    """
     if not state.git_features_enabled:
         if state.git_status_overlay:
             state.git_status_overlay = {}
@@ -130,10 +458,15 @@ def refresh_git_status_overlay(
         return
 
     previous = state.git_status_overlay
-    state.git_status_overlay = collect_git_status_overlay(state.tree_root)
+    state.git_status_overlay = collect_git_status_overlay(workspace_git_roots(state), repos)
     state.git_status_last_refresh = monotonic()
     if state.git_status_overlay != previous:
-        if state.current_path.resolve().is_dir():
+        current_path = canonical_path(state.current_path)
+        # File previews pick their diff from overlay flags, so re-render when
+        # the current file's status moved.
+        if rerender and (
+            current_path.is_dir() or previous.get(current_path) != state.git_status_overlay.get(current_path)
+        ):
             refresh_rendered_for_current_path(reset_scroll=False, reset_dir_budget=False)
         state.dirty = True
 
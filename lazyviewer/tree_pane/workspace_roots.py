@@ -4,11 +4,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from ..file_tree_model.paths import canonical_path
+
 
 def normalized_workspace_roots(tree_roots: list[Path], active_root: Path) -> list[Path]:
     """Return resolved roots preserving order/duplicates; append active if missing."""
-    normalized = [raw_root.resolve() for raw_root in tree_roots]
-    resolved_active = active_root.resolve()
+    normalized = [canonical_path(raw_root) for raw_root in tree_roots]
+    resolved_active = canonical_path(active_root)
     if not any(root == resolved_active for root in normalized):
         normalized.append(resolved_active)
     return normalized
@@ -26,15 +28,15 @@ def normalized_workspace_expanded_sections(
     if include_active:
         roots = normalized_workspace_roots(tree_roots, active_root)
     else:
-        roots = [raw_root.resolve() for raw_root in tree_roots]
+        roots = [canonical_path(raw_root) for raw_root in tree_roots]
     sections: list[set[Path]] = []
     union: set[Path] = set()
     for idx, root in enumerate(roots):
         source = workspace_expanded[idx] if idx < len(workspace_expanded) else expanded_fallback
         normalized = {
-            candidate.resolve()
+            canonical_path(candidate)
             for candidate in source
-            if candidate.resolve().is_relative_to(root)
+            if canonical_path(candidate).is_relative_to(root)
         }
         sections.append(normalized)
         union.update(normalized)
@@ -30,6 +30,8 @@ class UITheme:
     tree_workspace_inactive: str
     git_badge_changed: str
     git_badge_untracked: str
+    git_badge_staged: str
+    git_badge_conflicted: str
     help_heading: str
     help_key: str
     help_dim: str
@@ -56,6 +58,8 @@ DEFAULT_THEME = UITheme(
     tree_workspace_inactive="\033[2;38;5;250m",
     git_badge_changed="\033[38;5;214m",
     git_badge_untracked="\033[38;5;42m",
+    git_badge_staged="\033[38;5;77m",
+    git_badge_conflicted="\033[1;38;5;203m",
     help_heading="\033[1;38;5;81m",
     help_key="\033[38;5;229m",
     help_dim="\033[2;38;5;250m",
@@ -82,6 +86,8 @@ OCEAN_THEME = UITheme(
     tree_workspace_inactive="\033[2;38;5;110m",
     git_badge_changed="\033[38;5;215m",
     git_badge_untracked="\033[38;5;84m",
+    git_badge_staged="\033[38;5;79m",
+    git_badge_conflicted="\033[1;38;5;209m",
     help_heading="\033[1;38;5;45m",
     help_key="\033[38;5;153m",
     help_dim="\033[2;38;5;110m",
@@ -108,6 +114,8 @@ PLAIN_THEME = UITheme(
     tree_workspace_inactive="",
     git_badge_changed="",
     git_badge_untracked="",
+    git_badge_staged="",
+    git_badge_conflicted="",
     help_heading="",
     help_key="",
     help_dim="",
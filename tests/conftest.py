@@ -1,13 +1,17 @@
 """Pytest bootstrap for local source imports.
 
 The ``pytest`` console script can run with a sys.path that excludes the
-repository root. Ensure ``import lazyviewer`` resolves to the local package.
+repository root. Ensure ``import lazyviewer`` resolves to the local package,
+and point the persistent doc-summary store at a temporary directory.
 """
 
 from __future__ import annotations
 
 import sys
 from pathlib import Path
+from unittest import mock
+
+import pytest
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -15,3 +19,13 @@ PROJECT_ROOT_STR = str(PROJECT_ROOT)
 
 if PROJECT_ROOT_STR not in sys.path:
     sys.path.insert(0, PROJECT_ROOT_STR)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_doc_summary_store(tmp_path_factory):
+    """Keep app runs under test from reading or writing the user's cache dir."""
+    from lazyviewer.file_tree_model import doc_summary
+
+    store_path = tmp_path_factory.mktemp("doc-summary-store") / "doc_summaries.json"
+    with mock.patch.object(doc_summary, "DOC_SUMMARY_STORE_PATH", store_path):
+        yield
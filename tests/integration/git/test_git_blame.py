@@ -0,0 +1,203 @@
+"""Tests for streaming git blame and the source-pane blame gutter.
+
+Covers incremental porcelain parsing, background streaming into a live view,
+reuse of cached results by ``(blob id, path)``, re-blaming after edits, and
+gutter rendering restricted to the visible rows.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from lazyviewer import git_blame as git_blame_module
+from lazyviewer.git_blame import BlameCommit, BlameView, GitBlameService, git_blob_id, parse_incremental_blame
+from lazyviewer.git_status import clear_git_repo_context_cache
+from lazyviewer.source_pane import blame as blame_module
+from lazyviewer.source_pane.blame import (
+    BLAME_GUTTER_WIDTH,
+    SourceBlameController,
+    visible_source_lines,
+)
+from lazyviewer.source_pane.renderer import SourcePaneRenderer
+
+INCREMENTAL_OUTPUT = """\
+0000000000000000000000000000000000000000 2 2 1
+author Not Committed Yet
+author-time 1700000100
+summary Version of f from f
+filename f
+eb3772c725a8104f363f5fd4e40543927abd2bf2 1 1 1
+author Alice
+author-time 1700000000
+summary one
+boundary
+filename f
+eb3772c725a8104f363f5fd4e40543927abd2bf2 3 3 2
+filename f
+"""
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=root, check=True, stdout=subprocess.DEVNULL)
+
+
+def _wait_complete(view: BlameView, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not view.complete and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class ParseIncrementalBlameTests(unittest.TestCase):
+    def test_groups_reuse_commit_headers_seen_earlier(self) -> None:
+        groups = list(parse_incremental_blame(INCREMENTAL_OUTPUT.splitlines(keepends=True)))
+
+        self.assertEqual([(final, count) for _commit, final, count in groups], [(2, 1), (1, 1), (3, 2)])
+        self.assertTrue(groups[0][0].is_uncommitted)
+        self.assertEqual(groups[1][0].author, "Alice")
+        self.assertIs(groups[1][0], groups[2][0])
+
+    def test_blob_id_matches_git_hash_object_format(self) -> None:
+        self.assertEqual(git_blob_id(b""), "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+
+
+class VisibleSourceLinesTests(unittest.TestCase):
+    def test_wrapped_continuation_rows_have_no_source_line(self) -> None:
+        lines = ["aaaa", "aa\n", "b\n", "cccc", "c\n"]
+
+        self.assertEqual(visible_source_lines(lines, 1, 4, wrap_text=True), [None, 2, 3, None])
+
+    def test_removed_diff_lines_are_skipped(self) -> None:
+        lines = ["  keep\n", "- old\n", "+ new\n", "  tail\n"]
+
+        self.assertEqual(
+            visible_source_lines(lines, 0, 4, wrap_text=False, preview_is_git_diff=True),
+            [1, None, 2, 3],
+        )
+
+    def test_scrolling_reuses_document_map_until_lines_change(self) -> None:
+        lines = ["  keep\n", "- old\n", "+ new\n", *[f"  line {n}\n" for n in range(200)]]
+
+        with mock.patch.object(
+            blame_module, "_document_source_lines", wraps=blame_module._document_source_lines
+        ) as build:
+            first = visible_source_lines(lines, 0, 3, wrap_text=False, preview_is_git_diff=True)
+            scrolled = visible_source_lines(lines, 150, 3, wrap_text=False, preview_is_git_diff=True)
+            self.assertEqual(build.call_count, 1)
+            visible_source_lines(list(lines), 150, 3, wrap_text=False, preview_is_git_diff=True)
+
+        self.assertEqual(first, [1, None, 2])
+        self.assertEqual(scrolled, [150, 151, 152])
+        self.assertEqual(build.call_count, 2)
+
+    def test_renderer_only_annotates_viewport_rows(self) -> None:
+        commit = BlameCommit(sha="a" * 40, author="Alice", author_time=1700000000)
+        view = BlameView(path=Path("/tmp/f.py"), lines={line: commit for line in range(1, 1001)})
+        text_lines = [f"x = {n}\n" for n in range(1000)]
+        looked_up: list[int] = []
+        original = view.commit_for_line
+
+        def recording_lookup(source_line: int):
+            looked_up.append(source_line)
+            return original(source_line)
+
+        view.commit_for_line = recording_lookup  # type: ignore[method-assign]
+        renderer = SourcePaneRenderer(
+            text_lines, 500, 5, 80, Path("/tmp/f.txt"), False, 0, "", 0, 0,
+            preview_is_git_diff=False,
+            source_selection_anchor=None,
+            source_selection_focus=None,
+            blame_view=view,
+        )
+        rows = [renderer.render_row(row) for row in range(5)]
+
+        self.assertEqual(looked_up, [501, 502, 503, 504, 505])
+        self.assertIn("aaaaaaa", rows[0])
+        self.assertIn("x = 500", rows[0])
+        self.assertEqual(renderer.blame_gutter_width, BLAME_GUTTER_WIDTH)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is required")
+class GitBlameServiceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_git_repo_context_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        _git(self.root, "init", "-q")
+        _git(self.root, "config", "user.email", "tests@example.com")
+        _git(self.root, "config", "user.name", "Tests")
+        self.path = self.root / "f.py"
+        self.path.write_text("a = 1\nb = 2\nc = 3\n", encoding="utf-8")
+        _git(self.root, "add", "-A")
+        _git(self.root, "commit", "-q", "-m", "initial")
+        self.path.write_text("a = 1\nb = 20\nc = 3\n", encoding="utf-8")
+        self.service = GitBlameService()
+
+    def tearDown(self) -> None:
+        self.service.cancel()
+        clear_git_repo_context_cache()
+        self._tmp.cleanup()
+
+    def test_streams_worktree_blame_in_background(self) -> None:
+        view = self.service.start(self.path)
+        _wait_complete(view)
+
+        self.assertIsNone(view.error)
+        self.assertEqual(view.commit_for_line(1).author, "Tests")
+        self.assertTrue(view.commit_for_line(2).is_uncommitted)
+        self.assertEqual(view.key, (git_blob_id(self.path.read_bytes()), self.path))
+
+    def test_cached_by_blob_and_path_until_contents_change(self) -> None:
+        _wait_complete(self.service.start(self.path))
+
+        with mock.patch.object(git_blame_module.subprocess, "Popen") as popen:
+            cached = self.service.start(self.path)
+            _wait_complete(cached)
+        popen.assert_not_called()
+        self.assertTrue(cached.commit_for_line(2).is_uncommitted)
+
+        self.path.write_text("a = 1\nb = 2\nc = 3\n", encoding="utf-8")
+        fresh = self.service.start(self.path)
+        _wait_complete(fresh)
+        self.assertFalse(fresh.commit_for_line(2).is_uncommitted)
+
+    def test_controller_follows_previewed_file_and_reports_updates(self) -> None:
+        state = SimpleNamespace(
+            current_path=self.path,
+            dir_preview_path=None,
+            preview_image_path=None,
+            blame_enabled=False,
+            blame_view=None,
+            dirty=False,
+        )
+        rebuilds: list[int] = []
+        messages: list[str] = []
+        controller = SourceBlameController(
+            state,
+            self.service,
+            lambda: rebuilds.append(1),
+            messages.append,
+        )
+
+        controller.toggle()
+        view = state.blame_view
+        self.assertIsNotNone(view)
+        self.assertEqual(rebuilds, [1])
+        _wait_complete(view)
+        self.assertTrue(controller.poll())
+        self.assertFalse(controller.poll())
+
+        state.dir_preview_path = self.root
+        self.assertTrue(controller.poll())
+        self.assertIsNone(state.blame_view)
+        self.assertEqual(messages, ["blame: on"])
+
+
+if __name__ == "__main__":
+    unittest.main()
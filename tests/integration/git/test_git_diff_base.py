@@ -0,0 +1,173 @@
+"""Tests for diffing previews and overlays against a configurable base.
+
+Covers branch and merge-base resolution, in-process hunks against base blobs,
+overlay flags for files committed since the base, base re-resolution after a
+branch moves, and blob-reader caching, timeouts, and protocol-error recovery.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from lazyviewer import git_revision
+from lazyviewer.git_revision import (
+    GitBlobReader,
+    clear_git_blob_cache,
+    close_git_blob_readers,
+    git_blob_reader_for,
+    read_base_blob,
+    resolve_git_base_commit,
+)
+from lazyviewer.git_status import GIT_STATUS_CHANGED, GIT_STATUS_UNTRACKED, collect_git_status_overlay
+from lazyviewer.source_pane.diff import (
+    _diff_hunks_between,
+    build_unified_diff_preview_for_path,
+    clear_diff_preview_cache,
+)
+
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=root, check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is required")
+class GitDiffBaseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_diff_preview_cache()
+        clear_git_blob_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        _git(self.root, "init", "-q", "-b", "main")
+        _git(self.root, "config", "user.email", "tests@example.com")
+        _git(self.root, "config", "user.name", "Tests")
+        self.target = self.root / "app.py"
+        self.target.write_text("alpha = 1\nbeta = 2\ngamma = 3\n", encoding="utf-8")
+        _git(self.root, "add", "-A")
+        _git(self.root, "commit", "-q", "-m", "initial")
+        self.main_commit = _git(self.root, "rev-parse", "HEAD")
+
+        _git(self.root, "checkout", "-q", "-b", "feature")
+        self.target.write_text("alpha = 1\nbeta = 20\ngamma = 3\n", encoding="utf-8")
+        (self.root / "added.py").write_text("new = True\n", encoding="utf-8")
+        _git(self.root, "add", "-A")
+        _git(self.root, "commit", "-q", "-m", "feature work")
+
+    def tearDown(self) -> None:
+        clear_diff_preview_cache()
+        clear_git_blob_cache()
+        close_git_blob_readers()
+        self._tmp.cleanup()
+
+    def test_committed_branch_changes_only_show_against_non_head_base(self) -> None:
+        self.assertIsNone(build_unified_diff_preview_for_path(self.target, colorize=False))
+
+        rendered = build_unified_diff_preview_for_path(self.target, colorize=False, base="main")
+
+        self.assertEqual(
+            rendered,
+            "\n".join(["  alpha = 1", "- beta = 2", "+ beta = 20", "  gamma = 3"]),
+        )
+
+    def test_merge_base_spec_defaults_to_main_branch(self) -> None:
+        git_dir = self.root / ".git"
+        self.assertEqual(resolve_git_base_commit(self.root, git_dir, "merge-base"), self.main_commit)
+        self.assertEqual(resolve_git_base_commit(self.root, git_dir, "merge-base:main"), self.main_commit)
+        self.assertIsNone(resolve_git_base_commit(self.root, git_dir, "no-such-branch"))
+
+    def test_file_missing_from_base_renders_as_fully_added(self) -> None:
+        rendered = build_unified_diff_preview_for_path(self.root / "added.py", colorize=False, base="merge-base")
+
+        self.assertEqual(rendered, "+ new = True")
+
+    def test_overlay_flags_files_changed_since_base(self) -> None:
+        (self.root / "scratch.txt").write_text("tmp\n", encoding="utf-8")
+
+        head_overlay = collect_git_status_overlay(self.root)
+        base_overlay = collect_git_status_overlay(self.root, base="main")
+
+        self.assertNotIn(self.target, head_overlay)
+        self.assertEqual(base_overlay.get(self.target), GIT_STATUS_CHANGED)
+        self.assertEqual(base_overlay.get(self.root / "added.py"), GIT_STATUS_CHANGED)
+        self.assertEqual(base_overlay.get(self.root / "scratch.txt"), GIT_STATUS_UNTRACKED)
+
+    def test_blob_contents_are_cached_by_object_id_across_commits(self) -> None:
+        reader = git_blob_reader_for(self.root)
+        calls: list[str] = []
+        original_read_blob = reader.read_blob
+
+        def counting_read_blob(object_id: str) -> bytes:
+            calls.append(object_id)
+            return original_read_blob(object_id)
+
+        reader.read_blob = counting_read_blob  # type: ignore[method-assign]
+        (self.root / "other.txt").write_text("x\n", encoding="utf-8")
+        _git(self.root, "add", "-A")
+        _git(self.root, "commit", "-q", "-m", "unrelated")
+        head_commit = _git(self.root, "rev-parse", "HEAD")
+
+        first = read_base_blob(self.root, self.main_commit, "app.py")
+        second = read_base_blob(self.root, self.main_commit, "app.py")
+        feature = read_base_blob(self.root, head_commit, "app.py")
+        feature_again = read_base_blob(self.root, head_commit + "~1", "app.py")
+
+        self.assertEqual(first, b"alpha = 1\nbeta = 2\ngamma = 3\n")
+        self.assertEqual(first, second)
+        self.assertEqual(feature, feature_again)
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(read_base_blob(self.root, self.main_commit, "added.py"))
+        self.assertIs(git_blob_reader_for(self.root), reader)
+        self.assertLessEqual(git_revision._BLOB_CACHE_BYTES, git_revision.GIT_BLOB_CACHE_MAX_BYTES)
+
+    def test_branch_base_re_resolves_after_branch_moves(self) -> None:
+        git_dir = self.root / ".git"
+        feature_commit = _git(self.root, "rev-parse", "HEAD")
+        self.assertEqual(resolve_git_base_commit(self.root, git_dir, "main"), self.main_commit)
+
+        _git(self.root, "branch", "-f", "main", feature_commit)
+
+        self.assertEqual(resolve_git_base_commit(self.root, git_dir, "main"), feature_commit)
+        self.assertEqual(resolve_git_base_commit(self.root, git_dir, "merge-base"), feature_commit)
+
+    def test_stalled_reader_times_out_and_respawns(self) -> None:
+        reader = GitBlobReader(self.root, timeout_seconds=0.1)
+        object_id = _git(self.root, "rev-parse", f"{self.main_commit}:app.py")
+        real_spawn = reader._spawn
+        reader._spawn = lambda _mode: subprocess.Popen(  # type: ignore[method-assign]
+            ["sleep", "5"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0
+        )
+        with self.assertRaisesRegex(OSError, "timed out"):
+            reader.read_blob(object_id)
+        self.assertEqual(reader._procs, {})
+
+        reader._spawn = real_spawn  # type: ignore[method-assign]
+        self.assertEqual(reader.read_blob(object_id), b"alpha = 1\nbeta = 2\ngamma = 3\n")
+        reader.close()
+
+    def test_malformed_header_resets_reader(self) -> None:
+        reader = GitBlobReader(self.root, timeout_seconds=1.0)
+        reader._spawn = lambda _mode: subprocess.Popen(  # type: ignore[method-assign]
+            ["cat"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0
+        )
+        with self.assertRaises(OSError):
+            reader.read_blob("deadbeef blob not-a-size")
+        self.assertEqual(reader._procs, {})
+        self.assertEqual(reader._buffers, {})
+        reader.close()
+
+
+class DiffHunksBetweenTests(unittest.TestCase):
+    def test_hunk_line_numbers_follow_zero_context_git_semantics(self) -> None:
+        hunks = _diff_hunks_between(["a", "b", "c"], ["a", "c", "d"])
+
+        self.assertEqual(
+            [(h.old_start, h.old_count, h.new_start, h.new_count, h.removed_lines) for h in hunks],
+            [(2, 1, 1, 0, ["b"]), (3, 0, 3, 1, [])],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
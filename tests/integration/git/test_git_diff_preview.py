@@ -0,0 +1,201 @@
+"""Tests for hunks-only git diff previews of large files.
+
+Covers fold-row layout, lazy fold expansion, source-line mapping across
+fold rows, and fold rows being recognised structurally rather than by their
+text, in a real repository.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from lazyviewer.runtime.state import AppState
+from lazyviewer.source_pane.diff import (
+    build_unified_diff_preview,
+    build_unified_diff_preview_for_path,
+    clear_diff_preview_cache,
+)
+from lazyviewer.source_pane.diffmap import diff_source_line_for_display_index
+from lazyviewer.source_pane.interaction.events import clicked_diff_fold_start, handle_preview_click
+from lazyviewer.source_pane.source import source_line_count, source_line_display_index
+from lazyviewer.source_pane.source_pane import SourcePane
+from lazyviewer.source_pane.syntax import colorize_source
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is required")
+class HunksOnlyDiffPreviewTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_diff_preview_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+        subprocess.run(["git", "config", "user.email", "tests@example.com"], cwd=self.root, check=True)
+        subprocess.run(["git", "config", "user.name", "Tests"], cwd=self.root, check=True)
+        self.target = self.root / "big.py"
+        self.original = [f"value_{idx} = {idx}" for idx in range(1, 101)]
+        self.target.write_text("\n".join(self.original) + "\n", encoding="utf-8")
+        subprocess.run(["git", "add", "-A"], cwd=self.root, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "initial"], cwd=self.root, check=True)
+
+        modified = list(self.original)
+        modified[49] = "value_50 = 'changed'"
+        self.target.write_text("\n".join(modified) + "\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        clear_diff_preview_cache()
+        self._tmp.cleanup()
+
+    def _build(self, **kwargs) -> list[str]:
+        rendered = build_unified_diff_preview_for_path(
+            self.target,
+            colorize=False,
+            hunks_only=True,
+            context_lines=2,
+            **kwargs,
+        )
+        self.assertIsNotNone(rendered)
+        assert rendered is not None
+        return rendered.split("\n")
+
+    def _folds(self) -> dict[int, tuple[int, int]]:
+        preview = build_unified_diff_preview(self.target, colorize=False, hunks_only=True, context_lines=2)
+        assert preview is not None
+        return dict(preview.folds)
+
+    def _state(self, lines: list[str], folds: dict[int, tuple[int, int]]) -> AppState:
+        return AppState(
+            current_path=self.target,
+            tree_root=self.root,
+            expanded={self.root},
+            show_hidden=False,
+            tree_entries=[],
+            selected_idx=0,
+            rendered="\n".join(lines),
+            lines=lines,
+            start=0,
+            tree_start=0,
+            text_x=0,
+            wrap_text=False,
+            left_width=20,
+            right_width=80,
+            usable=20,
+            max_start=0,
+            last_right_width=80,
+            preview_is_git_diff=True,
+            preview_diff_folds=folds,
+        )
+
+    def test_hunks_only_collapses_unchanged_runs_into_fold_rows(self) -> None:
+        lines = self._build()
+
+        self.assertEqual(lines[0], "  ⋯ 47 unchanged lines (1-47) ⋯")
+        self.assertEqual(lines[1:3], ["  value_48 = 48", "  value_49 = 49"])
+        self.assertEqual(lines[3], "- value_50 = 50")
+        self.assertEqual(lines[4], "+ value_50 = 'changed'")
+        self.assertEqual(lines[5:7], ["  value_51 = 51", "  value_52 = 52"])
+        self.assertEqual(lines[7], "  ⋯ 48 unchanged lines (53-100) ⋯")
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(self._folds(), {0: (1, 47), 7: (53, 100)})
+
+    def test_each_shown_region_is_lexed_on_its_own(self) -> None:
+        committed = list(self.original)
+        committed[9] = 'DOC = """'
+        committed[29] = '"""'
+        self.target.write_text("\n".join(committed) + "\n", encoding="utf-8")
+        subprocess.run(["git", "commit", "-q", "-am", "docstring"], cwd=self.root, check=True)
+        modified = list(committed)
+        modified[10] = "edited inside the string"
+        modified[80] = "value_81 = 'changed'"
+        self.target.write_text("\n".join(modified) + "\n", encoding="utf-8")
+
+        rendered = build_unified_diff_preview_for_path(self.target, hunks_only=True, context_lines=2)
+        assert rendered is not None
+        row = next(line for line in rendered.split("\n") if "value_79" in line)
+
+        self.assertEqual(row, colorize_source("value_79 = 79", self.target, "monokai").splitlines()[0])
+
+    def test_full_layout_is_kept_below_auto_threshold(self) -> None:
+        rendered = build_unified_diff_preview_for_path(self.target, colorize=False)
+        assert rendered is not None
+        self.assertNotIn("⋯", rendered)
+        self.assertEqual(len(rendered.split("\n")), 101)
+
+    def test_expanded_fold_is_rendered_in_full(self) -> None:
+        lines = self._build(expanded_folds=frozenset({53}))
+
+        self.assertEqual(lines[-1], "  value_100 = 100")
+        self.assertEqual(lines[0], "  ⋯ 47 unchanged lines (1-47) ⋯")
+        self.assertEqual(len(lines), 1 + 2 + 2 + 50)
+
+    def test_source_line_mapping_skips_over_fold_rows(self) -> None:
+        lines = self._build()
+        folds = self._folds()
+
+        self.assertEqual(source_line_count(lines, False, preview_is_git_diff=True, diff_folds=folds), 100)
+        self.assertEqual(diff_source_line_for_display_index(lines, 0, False, diff_folds=folds), 1)
+        self.assertEqual(diff_source_line_for_display_index(lines, 1, False, diff_folds=folds), 48)
+        self.assertEqual(diff_source_line_for_display_index(lines, 4, False, diff_folds=folds), 50)
+        self.assertEqual(diff_source_line_for_display_index(lines, 7, False, diff_folds=folds), 53)
+        self.assertEqual(source_line_display_index(lines, 10, False, preview_is_git_diff=True, diff_folds=folds), 0)
+        self.assertEqual(source_line_display_index(lines, 51, False, preview_is_git_diff=True, diff_folds=folds), 5)
+        self.assertEqual(source_line_display_index(lines, 90, False, preview_is_git_diff=True, diff_folds=folds), 7)
+
+    def test_source_text_shaped_like_a_fold_label_is_not_a_fold(self) -> None:
+        modified = self.target.read_text(encoding="utf-8").splitlines()
+        modified[50] = "⋯ 3 unchanged lines (1-3) ⋯"
+        self.target.write_text("\n".join(modified) + "\n", encoding="utf-8")
+        lines = self._build()
+        folds = self._folds()
+        forged_idx = lines.index("+ ⋯ 3 unchanged lines (1-3) ⋯")
+        state = self._state(lines, folds)
+
+        self.assertNotIn(forged_idx, folds)
+        self.assertIsNone(clicked_diff_fold_start(state, forged_idx))
+        self.assertEqual(source_line_count(lines, False, preview_is_git_diff=True, diff_folds=folds), 100)
+
+    def test_clicking_fold_row_requests_expansion(self) -> None:
+        lines = self._build()
+        state = self._state(lines, self._folds())
+        self.assertIsNone(clicked_diff_fold_start(state, 1))
+        requested: list[int] = []
+
+        handled = handle_preview_click(
+            state,
+            (7, 4),
+            directory_preview_target_for_display_line=lambda _idx: None,
+            clear_source_selection=lambda: False,
+            reset_source_selection_drag_state=lambda: None,
+            jump_to_path=lambda _path: None,
+            open_tree_filter=lambda _mode: None,
+            apply_tree_filter_query=lambda *_args, **_kwargs: None,
+            expand_diff_fold=lambda start: requested.append(start) or True,
+        )
+
+        self.assertTrue(handled)
+        self.assertEqual(requested, [53])
+
+
+    def test_expanded_folds_reset_after_file_changes(self) -> None:
+        lines = self._build()
+        state = self._state(lines, self._folds())
+        refreshes: list[bool] = []
+
+        self.assertTrue(
+            SourcePane.expand_diff_fold(state, 53, lambda **_kwargs: refreshes.append(True))
+        )
+        resolved = self.target.resolve()
+        self.assertEqual(SourcePane.expanded_diff_folds(state, resolved), frozenset({53}))
+
+        self.target.write_text(self.target.read_text(encoding="utf-8") + "appended\n", encoding="utf-8")
+
+        self.assertEqual(SourcePane.expanded_diff_folds(state, resolved), frozenset())
+        self.assertNotIn(resolved, state.diff_expanded_folds)
+        self.assertEqual(refreshes, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 """Tests for git overlay flags and diff-contrast rendering.
 
-Includes real-repo scenarios for changed/untracked propagation.
+Includes real-repo scenarios for changed/untracked propagation, porcelain v2
+status kinds, and probe-free diff selection from overlay flags.
 Also validates readable foreground contrast on colored diff backgrounds.
 """
 
@@ -11,6 +12,7 @@ import subprocess
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from lazyviewer.render.ansi import ANSI_ESCAPE_RE
 from lazyviewer.source_pane.diff import (
@@ -18,11 +20,22 @@ from lazyviewer.source_pane.diff import (
     _apply_line_background,
     _boost_foreground_contrast_for_diff,
 )
+from lazyviewer import git_status as git_status_module
 from lazyviewer.git_status import (
     GIT_STATUS_CHANGED,
+    GIT_STATUS_CONFLICTED,
+    GIT_STATUS_RENAMED,
+    GIT_STATUS_STAGED,
+    GIT_STATUS_UNSTAGED,
     GIT_STATUS_UNTRACKED,
+    GitStatusOverlay,
+    _iter_porcelain_v2_records,
     collect_git_status_overlay,
+    format_git_status_badges,
+    format_git_status_flags,
 )
+from lazyviewer.source_pane import diff as diff_module
+from lazyviewer.source_pane.diff import build_unified_diff_preview_for_path, clear_diff_preview_cache
 from lazyviewer.tree_model import TreeEntry, format_tree_entry
 
 
@@ -53,6 +66,110 @@ class GitDiffPreviewColorContrastTests(unittest.TestCase):
         self.assertNotIn("\033[38;220;180;120;48;2;36;74;52m", rendered)
 
 
+class GitStatusOverlayTrieTests(unittest.TestCase):
+    def test_lookup_aggregates_flags_for_ancestor_directories(self) -> None:
+        root = Path("/tmp/qbrowser-overlay-trie")
+        overlay = GitStatusOverlay(
+            root,
+            {
+                "src/pkg/a.py": GIT_STATUS_CHANGED,
+                "src/new.py": GIT_STATUS_UNTRACKED,
+                "docs/readme.md": GIT_STATUS_CHANGED,
+            },
+        )
+
+        self.assertEqual(overlay[root / "src" / "pkg" / "a.py"], GIT_STATUS_CHANGED)
+        self.assertEqual(overlay[root / "src" / "pkg"], GIT_STATUS_CHANGED)
+        self.assertEqual(overlay[root / "src"], GIT_STATUS_CHANGED | GIT_STATUS_UNTRACKED)
+        self.assertEqual(overlay[root], GIT_STATUS_CHANGED | GIT_STATUS_UNTRACKED)
+        self.assertEqual(len(overlay), 7)
+        self.assertNotIn(root / "src" / "clean.py", overlay)
+        self.assertNotIn(root.parent, overlay)
+        self.assertEqual(overlay.get(Path("/elsewhere/src"), 0), 0)
+
+    def test_equality_and_items_match_plain_mapping(self) -> None:
+        root = Path("/tmp/qbrowser-overlay-trie")
+        overlay = GitStatusOverlay(root, {"a/b.txt": GIT_STATUS_CHANGED})
+        expected = {
+            root: GIT_STATUS_CHANGED,
+            root / "a": GIT_STATUS_CHANGED,
+            root / "a" / "b.txt": GIT_STATUS_CHANGED,
+        }
+
+        self.assertEqual(dict(overlay.items()), expected)
+        self.assertEqual(overlay, expected)
+        self.assertEqual(overlay, GitStatusOverlay(root, {"a/b.txt": GIT_STATUS_CHANGED}))
+        self.assertNotEqual(overlay, GitStatusOverlay(root, {"a/b.txt": GIT_STATUS_UNTRACKED}))
+        self.assertFalse(GitStatusOverlay(root))
+
+    def test_subtree_signature_ignores_changes_outside_subtree(self) -> None:
+        root = Path("/tmp/qbrowser-overlay-trie")
+        first = GitStatusOverlay(root, {"src/a.py": GIT_STATUS_CHANGED, "docs/x.md": GIT_STATUS_CHANGED})
+        second = GitStatusOverlay(root, {"src/a.py": GIT_STATUS_CHANGED, "docs/y.md": GIT_STATUS_UNTRACKED})
+
+        self.assertEqual(first.subtree_signature(root / "src"), second.subtree_signature(root / "src"))
+        self.assertNotEqual(first.subtree_signature(root), second.subtree_signature(root))
+        self.assertEqual(first.subtree_signature(root / "tests"), 0)
+
+    def test_format_badges_uses_trie_lookup(self) -> None:
+        root = Path("/tmp/qbrowser-overlay-trie")
+        overlay = GitStatusOverlay(root, {"src/a.py": GIT_STATUS_UNTRACKED})
+
+        plain = ANSI_ESCAPE_RE.sub("", format_git_status_badges(root / "src", overlay))
+        self.assertEqual(plain, " [?]")
+        self.assertEqual(format_git_status_badges(root / "docs", overlay), "")
+
+
+class PorcelainV2ParsingTests(unittest.TestCase):
+    def test_records_carry_staged_unstaged_renamed_and_conflicted_flags(self) -> None:
+        sha = "0" * 40
+        output = "\0".join(
+            [
+                f"1 M. N... 100644 100644 100644 {sha} {sha} staged.py",
+                f"1 .M N... 100644 100644 100644 {sha} {sha} dir/unstaged file.py",
+                f"1 MM N... 100644 100644 100644 {sha} {sha} both.py",
+                f"2 R. N... 100644 100644 100644 {sha} {sha} R100 new_name.py",
+                "old_name.py",
+                f"u UU N... 100644 100644 100644 100644 {sha} {sha} {sha} conflict.py",
+                "? scratch.txt",
+                "! ignored.log",
+                "",
+            ]
+        )
+
+        self.assertEqual(
+            _iter_porcelain_v2_records(output),
+            [
+                ("staged.py", GIT_STATUS_CHANGED | GIT_STATUS_STAGED),
+                ("dir/unstaged file.py", GIT_STATUS_CHANGED | GIT_STATUS_UNSTAGED),
+                ("both.py", GIT_STATUS_CHANGED | GIT_STATUS_STAGED | GIT_STATUS_UNSTAGED),
+                ("new_name.py", GIT_STATUS_CHANGED | GIT_STATUS_RENAMED),
+                ("conflict.py", GIT_STATUS_CHANGED | GIT_STATUS_CONFLICTED),
+                ("scratch.txt", GIT_STATUS_UNTRACKED),
+            ],
+        )
+
+    def test_badges_distinguish_status_kinds(self) -> None:
+        def plain(flags: int) -> str:
+            return ANSI_ESCAPE_RE.sub("", format_git_status_flags(flags))
+
+        self.assertEqual(plain(GIT_STATUS_CHANGED), " [M]")
+        self.assertEqual(plain(GIT_STATUS_CHANGED | GIT_STATUS_UNSTAGED), " [M]")
+        self.assertEqual(plain(GIT_STATUS_CHANGED | GIT_STATUS_STAGED), " [S]")
+        self.assertEqual(plain(GIT_STATUS_CHANGED | GIT_STATUS_STAGED | GIT_STATUS_UNSTAGED), " [S][M]")
+        self.assertEqual(plain(GIT_STATUS_CHANGED | GIT_STATUS_RENAMED), " [R]")
+        self.assertEqual(plain(GIT_STATUS_CHANGED | GIT_STATUS_CONFLICTED), " [U]")
+
+    def test_file_flags_are_authoritative_only_for_collected_overlays(self) -> None:
+        root = Path("/tmp/qbrowser-overlay-trie")
+        collected = GitStatusOverlay(root, {"a.py": GIT_STATUS_CHANGED}, repo_root=root)
+
+        self.assertEqual(collected.file_flags(root / "a.py"), GIT_STATUS_CHANGED)
+        self.assertEqual(collected.file_flags(root / "clean.py"), 0)
+        self.assertIsNone(collected.file_flags(Path("/elsewhere/a.py")))
+        self.assertIsNone(GitStatusOverlay(root, {"a.py": GIT_STATUS_CHANGED}).file_flags(root / "a.py"))
+
+
 @unittest.skipIf(shutil.which("git") is None, "git is required for git overlay tests")
 class GitStatusOverlayTests(unittest.TestCase):
     def _init_repo(self, root: Path) -> None:
@@ -87,6 +204,64 @@ class GitStatusOverlayTests(unittest.TestCase):
             self.assertTrue(overlay[root] & GIT_STATUS_CHANGED)
             self.assertTrue(overlay[root] & GIT_STATUS_UNTRACKED)
 
+    def test_collect_overlay_uses_one_status_call_and_feeds_diff_without_probing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            self._init_repo(root)
+            staged = root / "staged.py"
+            unstaged = root / "unstaged.py"
+            staged.write_text("a = 1\n", encoding="utf-8")
+            unstaged.write_text("b = 1\n", encoding="utf-8")
+            self._commit_all(root, "initial")
+            staged.write_text("a = 2\n", encoding="utf-8")
+            subprocess.run(["git", "add", "staged.py"], cwd=root, check=True)
+            unstaged.write_text("b = 2\n", encoding="utf-8")
+
+            status_calls: list[list[str]] = []
+            original_status_run_git = git_status_module._run_git
+
+            def recording_status_run_git(repo_root, args, timeout_seconds):
+                status_calls.append(list(args))
+                return original_status_run_git(repo_root, args, timeout_seconds)
+
+            with mock.patch.object(git_status_module, "_run_git", side_effect=recording_status_run_git):
+                overlay = collect_git_status_overlay(root)
+
+            self.assertEqual([call[0] for call in status_calls], ["status"])
+            self.assertIn("--porcelain=v2", status_calls[0])
+            self.assertEqual(overlay[staged], GIT_STATUS_CHANGED | GIT_STATUS_STAGED)
+            self.assertEqual(overlay[unstaged], GIT_STATUS_CHANGED | GIT_STATUS_UNSTAGED)
+
+            diff_calls: list[list[str]] = []
+            original_diff_run_git = diff_module._run_git
+
+            def recording_diff_run_git(repo_root, args, timeout_seconds):
+                diff_calls.append(list(args))
+                return original_diff_run_git(repo_root, args, timeout_seconds)
+
+            clear_diff_preview_cache()
+            with mock.patch.object(diff_module, "_run_git", side_effect=recording_diff_run_git):
+                staged_preview = build_unified_diff_preview_for_path(
+                    staged, colorize=False, status_flags=overlay.file_flags(staged)
+                )
+                unstaged_preview = build_unified_diff_preview_for_path(
+                    unstaged, colorize=False, status_flags=overlay.file_flags(unstaged)
+                )
+                clean_preview = build_unified_diff_preview_for_path(
+                    root / "missing.py", colorize=False, status_flags=0
+                )
+
+            self.assertEqual(staged_preview, "- a = 1\n+ a = 2")
+            self.assertEqual(unstaged_preview, "- b = 1\n+ b = 2")
+            self.assertIsNone(clean_preview)
+            self.assertEqual(
+                diff_calls,
+                [
+                    ["diff", "--cached", "--no-color", "-U0", "--", "staged.py"],
+                    ["diff", "--no-color", "-U0", "--", "unstaged.py"],
+                ],
+            )
+
     def test_collect_overlay_marks_files_inside_untracked_directory(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp).resolve()
@@ -0,0 +1,124 @@
+"""Tests for submodule-aware git status overlays and diffs.
+
+Covers ``.gitmodules`` discovery (including nested submodules), concurrent
+per-submodule status merged under the submodule path, and diff previews for
+files inside submodules using overlay flags.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from lazyviewer import git_status as git_status_module
+from lazyviewer.git_status import (
+    GIT_STATUS_CHANGED,
+    GIT_STATUS_UNSTAGED,
+    GIT_STATUS_UNTRACKED,
+    clear_git_repo_context_cache,
+    collect_git_status_overlay,
+    discover_git_submodules,
+    resolve_git_repo_context,
+)
+from lazyviewer.source_pane.diff import build_unified_diff_preview_for_path, clear_diff_preview_cache
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "protocol.file.allow=always", *args],
+        cwd=root,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _init_repo(root: Path, files: dict[str, str]) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "tests@example.com")
+    _git(root, "config", "user.name", "Tests")
+    for rel_path, text in files.items():
+        (root / rel_path).write_text(text, encoding="utf-8")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "initial")
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is required")
+class GitSubmoduleOverlayTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_git_repo_context_cache()
+        clear_diff_preview_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name).resolve()
+        inner = base / "inner_src"
+        lib = base / "lib_src"
+        _init_repo(inner, {"inner.py": "x = 1\n"})
+        _init_repo(lib, {"lib.py": "a = 1\nb = 2\n"})
+        _git(lib, "submodule", "add", "-q", str(inner), "vendor/inner")
+        _git(lib, "commit", "-q", "-m", "add inner")
+        self.root = base / "app"
+        _init_repo(self.root, {"main.py": "print('hi')\n"})
+        _git(self.root, "submodule", "add", "-q", str(lib), "lib")
+        _git(self.root, "submodule", "update", "-q", "--init", "--recursive")
+        _git(self.root, "commit", "-q", "-m", "add lib")
+
+    def tearDown(self) -> None:
+        clear_git_repo_context_cache()
+        clear_diff_preview_cache()
+        self._tmp.cleanup()
+
+    def test_discovers_initialized_submodules_recursively(self) -> None:
+        self.assertEqual(discover_git_submodules(self.root), ("lib", "lib/vendor/inner"))
+
+    def test_overlay_drills_into_submodules_with_one_status_per_repo(self) -> None:
+        (self.root / "lib" / "lib.py").write_text("a = 1\nb = 3\n", encoding="utf-8")
+        (self.root / "lib" / "vendor" / "inner" / "scratch.txt").write_text("tmp\n", encoding="utf-8")
+        status_roots: list[Path] = []
+        original_run_git = git_status_module._run_git
+
+        def recording_run_git(repo_root, args, timeout_seconds):
+            if args[0] == "status":
+                status_roots.append(repo_root)
+            return original_run_git(repo_root, args, timeout_seconds)
+
+        with mock.patch.object(git_status_module, "_run_git", side_effect=recording_run_git):
+            overlay = collect_git_status_overlay(self.root, timeout_seconds=5.0)
+
+        lib_file = self.root / "lib" / "lib.py"
+        self.assertEqual(overlay.get(lib_file), GIT_STATUS_CHANGED | GIT_STATUS_UNSTAGED)
+        self.assertEqual(overlay.get(self.root / "lib" / "vendor" / "inner" / "scratch.txt"), GIT_STATUS_UNTRACKED)
+        self.assertTrue(overlay.get(self.root / "lib", 0) & GIT_STATUS_CHANGED)
+        self.assertEqual(overlay.file_flags(self.root / "main.py"), 0)
+        self.assertEqual(
+            sorted(status_roots),
+            sorted([self.root, self.root / "lib", self.root / "lib" / "vendor" / "inner"]),
+        )
+
+        preview = build_unified_diff_preview_for_path(
+            lib_file,
+            colorize=False,
+            status_flags=overlay.file_flags(lib_file),
+            timeout_seconds=5.0,
+        )
+        self.assertEqual(preview, "  a = 1\n- b = 2\n+ b = 3")
+
+    def test_repo_context_is_cached_per_submodule(self) -> None:
+        sub_dir = self.root / "lib" / "vendor" / "inner"
+        first = resolve_git_repo_context(sub_dir, 5.0)
+
+        with mock.patch.object(git_status_module.subprocess, "run") as run:
+            second = resolve_git_repo_context(sub_dir, 5.0)
+
+        run.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], sub_dir)
+        self.assertNotEqual(resolve_git_repo_context(self.root, 5.0)[0], sub_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Tests for git status coordination across multi-repo workspaces.
+
+Covers repository discovery across roots, merged overlays, per-repo watch
+signatures, and re-collecting only the repository that changed.
+"""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from lazyviewer.file_tree_model.watch import build_git_watch_signature, resolve_git_paths
+from lazyviewer.git_status import GIT_STATUS_CHANGED, GIT_STATUS_UNTRACKED, GitStatusOverlay, collect_git_status_overlays
+from lazyviewer.git_workspace import WorkspaceGitCoordinator, merge_workspace_overlays
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=root, check=True, stdout=subprocess.DEVNULL)
+
+
+def _init_repo(root: Path) -> None:
+    root.mkdir(parents=True)
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "tests@example.com")
+    _git(root, "config", "user.name", "Tests")
+    (root / "tracked.txt").write_text("one\n", encoding="utf-8")
+    _git(root, "add", "-A")
+    _git(root, "commit", "-q", "-m", "initial")
+
+
+class MergeWorkspaceOverlaysTests(unittest.TestCase):
+    def test_merged_trie_keeps_flags_and_per_root_authority(self) -> None:
+        first_root = Path("/work/alpha")
+        second_root = Path("/work/beta/pkg")
+        first = GitStatusOverlay(first_root, {"a.py": GIT_STATUS_CHANGED}, repo_root=first_root)
+        second = GitStatusOverlay(second_root, {"sub/b.py": GIT_STATUS_UNTRACKED})
+
+        merged = merge_workspace_overlays([first, second])
+
+        assert isinstance(merged, GitStatusOverlay)
+        self.assertEqual(merged.root, Path("/work"))
+        self.assertEqual(merged.get(first_root / "a.py"), GIT_STATUS_CHANGED)
+        self.assertEqual(merged.get(first_root), GIT_STATUS_CHANGED)
+        self.assertEqual(merged.get(second_root / "sub"), GIT_STATUS_UNTRACKED)
+        self.assertEqual(merged.file_flags(first_root / "clean.py"), 0)
+        self.assertIsNone(merged.file_flags(second_root / "sub" / "b.py"))
+
+    def test_plain_mapping_overlays_merge_into_dict(self) -> None:
+        merged = merge_workspace_overlays([{Path("/a/x"): 1}, {Path("/b/y"): 2, Path("/a/x"): 2}])
+
+        self.assertEqual(merged, {Path("/a/x"): 3, Path("/b/y"): 2})
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is required")
+class WorkspaceGitCoordinatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        base = Path(self._tmp.name).resolve()
+        self.repo_a = base / "repo_a"
+        self.repo_b = base / "repo_b"
+        self.plain = base / "plain"
+        _init_repo(self.repo_a)
+        _init_repo(self.repo_b)
+        (self.repo_a / "src").mkdir()
+        self.plain.mkdir()
+        self.collected: list[tuple[Path, ...]] = []
+        self.threads: set[str] = set()
+        self._collect_lock = threading.Lock()
+
+        def collect(tree_roots):
+            with self._collect_lock:
+                self.collected.append(tuple(tree_roots))
+                self.threads.add(threading.current_thread().name)
+            return collect_git_status_overlays(tree_roots, timeout_seconds=5.0)
+
+        self.coordinator = WorkspaceGitCoordinator(
+            collect,
+            resolve_git_paths=lambda root: resolve_git_paths(root, timeout_seconds=5.0),
+            build_git_watch_signature=build_git_watch_signature,
+        )
+        self.roots = [self.repo_a, self.repo_a / "src", self.repo_b, self.plain]
+
+    def tearDown(self) -> None:
+        self.coordinator.close()
+        self._tmp.cleanup()
+
+    def test_discovers_distinct_repositories_across_roots(self) -> None:
+        self.coordinator.reset(self.roots)
+
+        self.assertEqual(len(self.coordinator.repos), 3)
+        self.assertIs(
+            self.coordinator.repo_for_root(self.repo_a),
+            self.coordinator.repo_for_root(self.repo_a / "src"),
+        )
+        plain_repo = self.coordinator.repo_for_root(self.plain)
+        assert plain_repo is not None
+        self.assertIsNone(plain_repo.git_dir)
+
+    def test_collects_all_roots_concurrently_into_one_overlay(self) -> None:
+        (self.repo_a / "tracked.txt").write_text("two\n", encoding="utf-8")
+        (self.repo_b / "new.txt").write_text("x\n", encoding="utf-8")
+        (self.repo_a / "src" / "mod.py").write_text("x\n", encoding="utf-8")
+
+        overlay = self.coordinator.collect(self.roots)
+
+        self.assertEqual(overlay.get(self.repo_a / "tracked.txt", 0) & GIT_STATUS_CHANGED, GIT_STATUS_CHANGED)
+        self.assertEqual(overlay.get(self.repo_b / "new.txt"), GIT_STATUS_UNTRACKED)
+        self.assertEqual(overlay.get(self.repo_a / "src" / "mod.py"), GIT_STATUS_UNTRACKED)
+        self.assertEqual(
+            sorted(self.collected),
+            sorted([(self.repo_a, self.repo_a / "src"), (self.repo_b,), (self.plain,)]),
+        )
+        self.assertTrue(all(name.startswith("lazyviewer-git-workspace") for name in self.threads))
+
+    def test_only_changed_repository_is_recollected(self) -> None:
+        self.coordinator.collect(self.roots)
+        self.assertEqual(self.coordinator.poll_changed(), [])
+        self.collected.clear()
+
+        (self.repo_b / "tracked.txt").write_text("two\n", encoding="utf-8")
+        _git(self.repo_b, "add", "tracked.txt")
+        changed = self.coordinator.poll_changed()
+        overlay = self.coordinator.collect(self.roots, changed)
+
+        self.assertEqual([repo.repo_root for repo in changed], [self.repo_b])
+        self.assertEqual(self.collected, [(self.repo_b,)])
+        self.assertTrue(overlay.get(self.repo_b / "tracked.txt", 0) & GIT_STATUS_CHANGED)
+
+    def test_change_during_collect_is_reported_by_next_poll(self) -> None:
+        def collect(tree_roots):
+            overlays = collect_git_status_overlays(tree_roots, timeout_seconds=5.0)
+            if self.repo_b in tree_roots:
+                (self.repo_b / "tracked.txt").write_text("two\n", encoding="utf-8")
+                _git(self.repo_b, "add", "tracked.txt")
+            return overlays
+
+        coordinator = WorkspaceGitCoordinator(
+            collect,
+            resolve_git_paths=lambda root: resolve_git_paths(root, timeout_seconds=5.0),
+            build_git_watch_signature=build_git_watch_signature,
+        )
+        self.addCleanup(coordinator.close)
+        coordinator.collect([self.repo_b])
+
+        self.assertEqual([repo.repo_root for repo in coordinator.poll_changed()], [self.repo_b])
+
+
+if __name__ == "__main__":
+    unittest.main()
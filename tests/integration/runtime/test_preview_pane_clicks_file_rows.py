@@ -219,7 +219,8 @@ class AppRuntimePreviewClickTestsPart2(unittest.TestCase):
             with mock.patch("lazyviewer.runtime.app.run_main_loop", side_effect=fake_run_main_loop), mock.patch(
                 "lazyviewer.runtime.app.TerminalController", _FakeTerminalController
             ), mock.patch("lazyviewer.runtime.app.collect_project_file_labels", return_value=[]), mock.patch(
-                "lazyviewer.runtime.app.collect_git_status_overlay", return_value=overlay
+                "lazyviewer.runtime.app.collect_git_status_overlays",
+                side_effect=lambda tree_roots, **_kwargs: [overlay for _root in tree_roots],
             ), mock.patch(
                 "lazyviewer.runtime.app.os.isatty", return_value=True
             ), mock.patch(
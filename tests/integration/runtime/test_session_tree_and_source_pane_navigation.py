@@ -10,11 +10,14 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
 import unittest
 from unittest import mock
 
 from lazyviewer.runtime import app as app_runtime
+from lazyviewer.source_pane import directory as directory_preview_module
 from lazyviewer.render.ansi import ANSI_ESCAPE_RE
 from lazyviewer.runtime.screen import (
     _centered_scroll_start,
@@ -466,3 +469,125 @@ class AppRuntimeSessionTestsPart1(unittest.TestCase):
             self.assertEqual(snapshots["after_reroot_parent_depth0_dirs"], [root.resolve(), root.resolve()])
             self.assertEqual(snapshots["after_reroot_parent_selected"], nested.resolve())
             self.assertEqual(snapshots["after_reroot_parent_selected_scope"], root.resolve())
+
+    def test_expand_subtree_key_streams_rows_and_escape_only_cancels(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            for name in ("pkg/sub/deep", "pkg/other"):
+                (root / name).mkdir(parents=True)
+            for name in ("pkg/a.py", "pkg/sub/b.py", "pkg/sub/deep/c.py", "pkg/other/d.py"):
+                (root / name).write_text("x = 1\n", encoding="utf-8")
+            snapshots: dict[str, object] = {}
+
+            class _FakeTerminalController:
+                def __init__(self, stdin_fd: int, stdout_fd: int) -> None:
+                    self.stdin_fd = stdin_fd
+                    self.stdout_fd = stdout_fd
+
+                def supports_kitty_graphics(self) -> bool:
+                    return False
+
+            def fake_run_main_loop(**kwargs) -> None:
+                state = kwargs["state"]
+                handle_normal_key = _callback(kwargs, "handle_normal_key")
+                poll_subtree_expand = _callback(kwargs, "maybe_poll_subtree_expand")
+                state.selected_idx = next(
+                    idx for idx, entry in enumerate(state.tree_entries) if entry.path.resolve() == root / "pkg"
+                )
+                self.assertFalse(handle_normal_key("O", 120))
+                snapshots["running_escape_quits"] = handle_normal_key("ESC", 120)
+                snapshots["cancel_status"] = state.status_message
+                self.assertFalse(handle_normal_key("O", 120))
+                deadline = time.monotonic() + 5.0
+                while time.monotonic() < deadline and "expanded" not in state.status_message:
+                    poll_subtree_expand()
+                    time.sleep(0.005)
+
+                snapshots["paths"] = [entry.path.resolve() for entry in state.tree_entries]
+                snapshots["selected"] = state.tree_entries[state.selected_idx].path.resolve()
+                snapshots["status"] = state.status_message
+                snapshots["idle_escape_quits"] = handle_normal_key("ESC", 120)
+
+            with mock.patch("lazyviewer.runtime.app.run_main_loop", side_effect=fake_run_main_loop), mock.patch(
+                "lazyviewer.runtime.app.TerminalController", _FakeTerminalController
+            ), mock.patch("lazyviewer.runtime.app.collect_project_file_labels", return_value=[]), mock.patch(
+                "lazyviewer.runtime.app.os.isatty", return_value=True
+            ), mock.patch("lazyviewer.runtime.app.sys.stdin.fileno", return_value=0), mock.patch(
+                "lazyviewer.runtime.app.sys.stdout.fileno", return_value=1
+            ), mock.patch("lazyviewer.runtime.app.load_show_hidden", return_value=False), mock.patch(
+                "lazyviewer.runtime.app.load_left_pane_percent", return_value=None
+            ):
+                app_runtime.run_pager("", root, "monokai", True, False)
+
+            self.assertEqual(
+                snapshots["paths"],
+                [
+                    root,
+                    root / "pkg",
+                    root / "pkg" / "other",
+                    root / "pkg" / "other" / "d.py",
+                    root / "pkg" / "sub",
+                    root / "pkg" / "sub" / "deep",
+                    root / "pkg" / "sub" / "deep" / "c.py",
+                    root / "pkg" / "sub" / "b.py",
+                    root / "pkg" / "a.py",
+                ],
+            )
+            self.assertEqual(snapshots["selected"], root / "pkg")
+            self.assertEqual(snapshots["status"], "expanded 7 entries")
+            self.assertFalse(snapshots["running_escape_quits"])
+            self.assertEqual(snapshots["cancel_status"], "expand stopped: 0 entries")
+            self.assertTrue(snapshots["idle_escape_quits"])
+
+    def test_directory_preview_doc_labels_are_patched_in_by_preview_poll(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "mod.py").write_text('"""Module summary."""\n', encoding="utf-8")
+            snapshots: dict[str, object] = {}
+            release = threading.Event()
+            real_parse = directory_preview_module.cached_top_file_doc_summary
+
+            def gated_parse(path, size_bytes):
+                release.wait(5.0)
+                return real_parse(path, size_bytes)
+
+            class _FakeTerminalController:
+                def __init__(self, stdin_fd: int, stdout_fd: int) -> None:
+                    self.stdin_fd = stdin_fd
+                    self.stdout_fd = stdout_fd
+
+                def supports_kitty_graphics(self) -> bool:
+                    return False
+
+            def fake_run_main_loop(**kwargs) -> None:
+                state = kwargs["state"]
+                poll_preview = _callback(kwargs, "maybe_poll_directory_preview_results")
+                snapshots["initial"] = ANSI_ESCAPE_RE.sub("", state.rendered)
+                snapshots["early_poll"] = poll_preview()
+                release.set()
+                self.assertTrue(directory_preview_module.wait_for_directory_preview_doc_summaries(timeout=5.0))
+                snapshots["poll"] = poll_preview()
+                snapshots["patched"] = ANSI_ESCAPE_RE.sub("", state.rendered)
+                snapshots["repoll"] = poll_preview()
+
+            directory_preview_module.clear_directory_preview_cache()
+            with mock.patch.object(
+                directory_preview_module, "cached_top_file_doc_summary", side_effect=gated_parse
+            ), mock.patch("lazyviewer.runtime.app.run_main_loop", side_effect=fake_run_main_loop), mock.patch(
+                "lazyviewer.runtime.app.TerminalController", _FakeTerminalController
+            ), mock.patch("lazyviewer.runtime.app.collect_project_file_labels", return_value=[]), mock.patch(
+                "lazyviewer.runtime.app.os.isatty", return_value=True
+            ), mock.patch("lazyviewer.runtime.app.sys.stdin.fileno", return_value=0), mock.patch(
+                "lazyviewer.runtime.app.sys.stdout.fileno", return_value=1
+            ), mock.patch("lazyviewer.runtime.app.load_show_hidden", return_value=False), mock.patch(
+                "lazyviewer.runtime.app.load_left_pane_percent", return_value=None
+            ):
+                app_runtime.run_pager("", root, "monokai", True, False)
+            directory_preview_module.clear_directory_preview_cache()
+
+            self.assertIn("mod.py", snapshots["initial"])
+            self.assertNotIn("Module summary.", snapshots["initial"])
+            self.assertFalse(snapshots["early_poll"])
+            self.assertTrue(snapshots["poll"])
+            self.assertIn("mod.py  -- Module summary.", snapshots["patched"])
+            self.assertFalse(snapshots["repoll"])
@@ -1,4 +1,4 @@
-"""Performance budget tests for startup, scrolling, and search paths.
+"""Performance budget tests for startup, scrolling, search, and tree memory.
 
 These tests use synthetic large inputs with conservative time budgets so
 regressions are caught without depending on machine-specific microbenchmarks.
@@ -6,23 +6,34 @@ regressions are caught without depending on machine-specific microbenchmarks.
 
 from __future__ import annotations
 
+import gc
+import sys
 import tempfile
 import time
 import unittest
 from pathlib import Path
 from unittest import mock
 
-from lazyviewer.source_pane.diff import _ADDED_BG_SGR, _REMOVED_BG_SGR, _apply_line_background
+from lazyviewer.source_pane import diff as diff_module
+from lazyviewer.source_pane.diff import (
+    _ADDED_BG_SGR,
+    _REMOVED_BG_SGR,
+    DiffHunk,
+    _apply_line_background,
+    _build_annotated_source_preview,
+)
 from lazyviewer.runtime.navigation import JumpLocation
 from lazyviewer.render import render_dual_page
+from lazyviewer.render.ansi import ANSI_ESCAPE_RE
 from lazyviewer.tree_pane.panels.filter import TreeFilterController
 from lazyviewer.search.fuzzy import (
     clear_project_files_cache,
     collect_project_file_labels,
     fuzzy_match_label_index,
 )
+from lazyviewer.file_tree_model import DirectoryEntry, FileEntry
 from lazyviewer.runtime.state import AppState
-from lazyviewer.tree_model import TreeEntry, build_tree_entries
+from lazyviewer.tree_model import TreeEntry, VirtualTreeRows, VirtualTreeSection, build_tree_entries
 
 
 def _make_state(root: Path) -> AppState:
@@ -48,6 +59,21 @@ def _make_state(root: Path) -> AppState:
     )
 
 
+def _retained_bytes(root: object) -> int:
+    """Sum ``sys.getsizeof`` over every object reachable from ``root``, once each."""
+    seen: set[int] = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, type) or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
 class PerformanceBudgetTests(unittest.TestCase):
     def test_startup_budget_large_repo_tree_and_index_build(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
@@ -82,6 +108,31 @@ class PerformanceBudgetTests(unittest.TestCase):
             self.assertEqual(len(labels), file_count)
             self.assertLess(elapsed, 1.0, f"startup budget exceeded: {elapsed:.3f}s")
 
+    def test_memory_budget_500k_row_tree(self) -> None:
+        root = Path("/workspace/repo")
+        directories = []
+        for d_idx in range(500):
+            directory = root / f"pkg_{d_idx:03d}"
+            files = tuple(
+                FileEntry(
+                    parent=directory,
+                    name=f"module_{d_idx:03d}_{f_idx:04d}.py",
+                    file_size=100 + f_idx,
+                    mtime_ns=1_700_000_000_000_000_000 + d_idx * 1_000 + f_idx,
+                )
+                for f_idx in range(999)
+            )
+            directories.append(DirectoryEntry(path=directory, mtime_ns=1_700_000_000_000_000_000, children=files))
+        rows = VirtualTreeRows([VirtualTreeSection(DirectoryEntry(path=root, children=tuple(directories)), root)])
+        rows[len(rows) // 2]
+
+        bytes_per_row = _retained_bytes(rows) / len(rows)
+
+        self.assertEqual(len(rows), 500_001)
+        # Per file row: ~80 bytes of slotted entry, ~67 for its unique name,
+        # and 64 for the size/mtime ints; shared parent paths are amortized.
+        self.assertLess(bytes_per_row, 240, f"tree memory budget exceeded: {bytes_per_row:.0f} bytes/row")
+
     def test_scroll_budget_large_diff_frame_render(self) -> None:
         line_count = 20_000
         diff_lines: list[str] = []
@@ -126,6 +177,44 @@ class PerformanceBudgetTests(unittest.TestCase):
         self.assertTrue(writes)
         self.assertLess(elapsed, 0.25, f"diff scroll render budget exceeded: {elapsed:.3f}s")
 
+    def test_diff_build_budget_many_hunks_single_removed_line_lexing_pass(self) -> None:
+        hunk_count = 500
+        source_lines = [f"value_{idx:05d} = {idx}" for idx in range(hunk_count * 10)]
+        hunks = [
+            DiffHunk(
+                old_start=idx * 10 + 1,
+                old_count=2,
+                new_start=idx * 10 + 1,
+                new_count=1,
+                removed_lines=[f"old_{idx:05d} = '{idx}'", f"gone_{idx:05d} = None"],
+            )
+            for idx in range(hunk_count)
+        ]
+        colorize_calls: list[int] = []
+        real_colorize_source = diff_module.colorize_source
+
+        def counting_colorize_source(source: str, target: Path, style: str) -> str:
+            colorize_calls.append(source.count("\n") + 1)
+            return real_colorize_source(source, target, style)
+
+        with mock.patch.object(diff_module, "colorize_source", side_effect=counting_colorize_source):
+            start = time.perf_counter()
+            rendered = _build_annotated_source_preview(
+                source_lines,
+                source_lines,
+                hunks,
+                Path("demo.py"),
+                "monokai",
+                True,
+            )
+            elapsed = time.perf_counter() - start
+
+        rendered_lines = rendered.text.split("\n")
+        self.assertEqual(len(rendered_lines), len(source_lines) + hunk_count * 2)
+        self.assertIn("old_00499", ANSI_ESCAPE_RE.sub("", rendered_lines[-12]))
+        self.assertEqual(colorize_calls, [hunk_count * 2])
+        self.assertLess(elapsed, 1.0, f"many-hunk diff build budget exceeded: {elapsed:.3f}s")
+
     def test_search_budget_large_label_set(self) -> None:
         labels = [f"src/module_{idx:05d}/service_{idx % 113:03d}.py" for idx in range(60_000)]
         start = time.perf_counter()
@@ -78,6 +78,19 @@ class CliDefaultPathTests(unittest.TestCase):
             workspace_paths = run_pager.call_args.kwargs["workspace_paths"]
             self.assertEqual([item.resolve() for item in workspace_paths], [first.resolve(), second.resolve()])
 
+    def test_main_forwards_diff_base_option(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+
+            with mock.patch.object(
+                sys,
+                "argv",
+                ["lv", str(root), "--diff-base", "merge-base"],
+            ), mock.patch("lazyviewer.cli.run_pager") as run_pager:
+                cli.main()
+
+            self.assertEqual(run_pager.call_args.kwargs["diff_base"], "merge-base")
+
     def test_render_mode_prints_source_view_and_skips_runtime_pager(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp).resolve()
@@ -0,0 +1,108 @@
+"""Tests for the persistent top-of-file doc summary store.
+
+Covers warm starts answering from the store without reading files, stale
+entries not matching after a file changes, malformed stores being ignored,
+the entry cap, skipped writes when nothing changed, and control bytes in a
+tampered store being escaped on load.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from lazyviewer.file_tree_model import doc_summary as doc_summary_module
+from lazyviewer.file_tree_model.doc_summary import (
+    cached_top_file_doc_summary,
+    clear_doc_summary_cache,
+    load_doc_summary_store,
+    save_doc_summary_store,
+)
+
+
+class DocSummaryStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_doc_summary_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        self.store = self.root / "cache" / "doc_summaries.json"
+        self.source = self.root / "mod.py"
+        self.source.write_text('"""Module summary."""\n', encoding="utf-8")
+
+    def tearDown(self) -> None:
+        clear_doc_summary_cache()
+        self._tmp.cleanup()
+
+    def test_warm_start_reads_summary_from_store_without_opening_file(self) -> None:
+        self.assertEqual(cached_top_file_doc_summary(self.source, None), "Module summary.")
+        self.assertTrue(save_doc_summary_store(self.store))
+        clear_doc_summary_cache()
+
+        self.assertEqual(load_doc_summary_store(self.store), 1)
+        with mock.patch.object(doc_summary_module, "top_file_doc_summary") as parse:
+            self.assertEqual(cached_top_file_doc_summary(self.source, None), "Module summary.")
+        parse.assert_not_called()
+
+    def test_changed_file_does_not_match_stored_entry(self) -> None:
+        cached_top_file_doc_summary(self.source, None)
+        save_doc_summary_store(self.store)
+        clear_doc_summary_cache()
+
+        self.source.write_text('"""Rewritten summary."""\n', encoding="utf-8")
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        load_doc_summary_store(self.store)
+
+        self.assertEqual(cached_top_file_doc_summary(self.source, None), "Rewritten summary.")
+
+    def test_missing_or_malformed_store_is_ignored(self) -> None:
+        self.assertEqual(load_doc_summary_store(self.store), 0)
+        self.store.parent.mkdir(parents=True)
+        for payload in ("not json", "[]", '{"version": 99, "entries": []}', '{"version": 1, "entries": {}}'):
+            self.store.write_text(payload, encoding="utf-8")
+            self.assertEqual(load_doc_summary_store(self.store), 0)
+
+        self.store.write_text(
+            json.dumps({"version": 1, "entries": [["a", 1, 2, "ok"], ["b", "x", 2, "bad"], ["c", 1, 2]]}),
+            encoding="utf-8",
+        )
+        self.assertEqual(load_doc_summary_store(self.store), 1)
+
+    def test_loaded_summaries_are_sanitized(self) -> None:
+        self.store.parent.mkdir(parents=True)
+        self.store.write_text(
+            json.dumps({"version": 1, "entries": [[str(self.source), 0, 0, "bad \x1b[31m text"]]}),
+            encoding="utf-8",
+        )
+        load_doc_summary_store(self.store)
+
+        with doc_summary_module._DOC_SUMMARY_CACHE_LOCK:
+            summary = doc_summary_module._DOC_SUMMARY_CACHE[(str(self.source), 0, 0)]
+        self.assertEqual(summary, "bad \\x1b[31m text")
+
+    def test_store_is_capped_and_only_written_when_changed(self) -> None:
+        self.assertFalse(save_doc_summary_store(self.store))
+        self.assertFalse(self.store.exists())
+
+        entries = [[f"/f{idx}", idx, idx, f"s{idx}"] for idx in range(5)]
+        self.store.parent.mkdir(parents=True)
+        self.store.write_text(json.dumps({"version": 1, "entries": entries}), encoding="utf-8")
+        with mock.patch.object(doc_summary_module, "DOC_SUMMARY_CACHE_MAX", 3):
+            self.assertEqual(load_doc_summary_store(self.store), 3)
+            self.assertFalse(save_doc_summary_store(self.store))
+
+            cached_top_file_doc_summary(self.source, None)
+            self.assertTrue(save_doc_summary_store(self.store))
+
+        saved = json.loads(self.store.read_text(encoding="utf-8"))["entries"]
+        # Most recently used last; the oldest loaded entry made room.
+        self.assertEqual([entry[0] for entry in saved], ["/f3", "/f4", str(self.source)])
+        self.assertEqual(list(self.store.parent.iterdir()), [self.store])
+
+
+if __name__ == "__main__":
+    unittest.main()
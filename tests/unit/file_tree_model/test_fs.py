@@ -6,10 +6,27 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from lazyviewer.file_tree_model import DirectoryEntry, FileEntry, build_file_tree, list_directory_children
+from lazyviewer.file_tree_model import (
+    DirectoryChild,
+    DirectoryEntry,
+    FileEntry,
+    build_file_tree,
+    list_directory_children,
+)
 
 
 class FileTreeFsTests(unittest.TestCase):
+    def test_from_path_splits_full_path_into_parent_and_name(self) -> None:
+        target = Path("/repo/src/app.py")
+
+        entry = FileEntry.from_path(target, file_size=12, git_status_flags=3)
+        child = DirectoryChild.from_path(target, is_dir=False, file_size=12, mtime_ns=7)
+
+        self.assertEqual(entry, FileEntry(Path("/repo/src"), "app.py", 12, None, 3))
+        self.assertEqual(entry.path, target)
+        self.assertEqual((child.parent, child.name, child.mtime_ns), (Path("/repo/src"), "app.py", 7))
+        self.assertEqual(child.path, target)
+
     def test_build_file_tree_respects_expanded_directories(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp).resolve()
@@ -0,0 +1,175 @@
+"""Tests for the shared per-directory listing cache.
+
+Covers one scan serving the tree builder, directory preview, and watch
+signature; rescans on mtime changes; in-place writes picked up by re-stat
+(of every file, or only hot files for the tiered polling signatures);
+listings of freshly modified directories not being reused; and concurrent
+level-by-level prefetching.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from lazyviewer.file_tree_model import (
+    build_file_tree,
+    build_tree_watch_signature,
+    cached_directory_listings,
+    clear_directory_listing_cache,
+    list_directory_children,
+    prefetch_directory_listings,
+    stat_tree_hot_paths,
+)
+from lazyviewer.file_tree_model import listing as listing_module
+from lazyviewer.source_pane.directory import build_directory_preview, clear_directory_preview_cache
+
+
+def _backdate(path: Path) -> None:
+    """Pin ``path`` to a fixed old mtime so its listing counts as stable."""
+    os.utime(path, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+
+
+class DirectoryListingCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_directory_preview_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        (self.root / "a.py").write_text("a = 1\n", encoding="utf-8")
+        (self.root / "pkg").mkdir()
+        _backdate(self.root)
+
+    def tearDown(self) -> None:
+        clear_directory_preview_cache()
+        self._tmp.cleanup()
+
+    def _scanned(self) -> mock.MagicMock:
+        return mock.patch.object(listing_module, "_scan_directory", wraps=listing_module._scan_directory)
+
+    def test_tree_preview_and_signature_share_one_scan(self) -> None:
+        with self._scanned() as scan:
+            build_file_tree(self.root, {self.root}, show_hidden=False)
+            build_directory_preview(self.root, show_hidden=False, max_depth=1)
+            build_tree_watch_signature(self.root, {self.root}, show_hidden=False)
+
+        self.assertEqual([call.args[0] for call in scan.call_args_list], [self.root])
+
+    def test_children_share_their_parent_path(self) -> None:
+        root_entry = build_file_tree(self.root, {self.root}, show_hidden=False)
+        file_entry = root_entry.children[-1]
+
+        self.assertEqual(file_entry.path, self.root / "a.py")
+        self.assertIs(file_entry.parent, listing_module.cached_directory_listing(self.root).children[0].parent)
+        self.assertFalse(hasattr(file_entry, "__dict__"))
+
+    def test_mtime_change_rescans_directory(self) -> None:
+        list_directory_children(self.root, show_hidden=False)
+        (self.root / "b.py").write_text("b = 1\n", encoding="utf-8")
+
+        children, _error, _mtime_ns = list_directory_children(self.root, show_hidden=False)
+
+        self.assertEqual([child.name for child in children], ["pkg", "a.py", "b.py"])
+
+    def test_in_place_write_is_picked_up_by_signature_restat(self) -> None:
+        signature = build_tree_watch_signature(self.root, {self.root}, show_hidden=False)
+        (self.root / "a.py").write_text("a = 1\nb = 2\n", encoding="utf-8")
+        _backdate(self.root)
+
+        with self._scanned() as scan:
+            changed_signature = build_tree_watch_signature(self.root, {self.root}, show_hidden=False)
+            children, _error, _mtime_ns = list_directory_children(self.root, show_hidden=False)
+
+        scan.assert_not_called()
+        self.assertNotEqual(signature, changed_signature)
+        self.assertEqual(children[1].file_size, len("a = 1\nb = 2\n"))
+
+    def test_tiered_signatures_stat_only_directories_and_hot_files(self) -> None:
+        (self.root / "b.py").write_text("b = 1\n", encoding="utf-8")
+        _backdate(self.root)
+        hot = [self.root / "a.py"]
+        signature = build_tree_watch_signature(self.root, {self.root}, False, directories_only=True)
+        hot_stats = stat_tree_hot_paths(hot)
+
+        (self.root / "b.py").write_text("b = 22\n", encoding="utf-8")
+        _backdate(self.root)
+        with mock.patch("lazyviewer.file_tree_model.watch.restat_directory_listing_files") as restat_all:
+            cold_edit = build_tree_watch_signature(self.root, {self.root}, False, directories_only=True)
+            (self.root / "a.py").write_text("a = 333\n", encoding="utf-8")
+            _backdate(self.root)
+            hot_edit_stats = stat_tree_hot_paths(hot)
+        (self.root / "c.py").write_text("c = 1\n", encoding="utf-8")
+        added = build_tree_watch_signature(self.root, {self.root}, False, directories_only=True)
+
+        restat_all.assert_not_called()
+        self.assertEqual(signature, cold_edit)
+        self.assertNotEqual(hot_stats, hot_edit_stats)
+        self.assertEqual(hot_edit_stats[self.root / "a.py"][0], len("a = 333\n"))
+        self.assertNotEqual(cold_edit, added)
+        children, _error, _mtime_ns = list_directory_children(self.root, show_hidden=False)
+        self.assertEqual([child.file_size for child in children if child.name == "a.py"], [len("a = 333\n")])
+
+    def test_recently_modified_directory_is_not_reused(self) -> None:
+        clear_directory_listing_cache()
+        os.utime(self.root, None)
+
+        with self._scanned() as scan:
+            list_directory_children(self.root, show_hidden=False)
+            list_directory_children(self.root, show_hidden=True)
+
+        self.assertEqual(scan.call_count, 2)
+
+
+class ConcurrentDirectoryScanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_directory_preview_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        for name in ("a/deep/deeper", "b", "c"):
+            (self.root / name).mkdir(parents=True)
+            (self.root / name / "f.py").write_text("x = 1\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        clear_directory_preview_cache()
+        self._tmp.cleanup()
+
+    def test_sibling_directories_are_scanned_concurrently_in_order(self) -> None:
+        directories = [self.root / "a", self.root / "b", self.root / "c"]
+        barrier = threading.Barrier(len(directories), timeout=5)
+        real_scan = listing_module._scan_directory
+
+        def rendezvous_scan(directory: Path, mtime_ns: int | None):
+            barrier.wait()
+            return real_scan(directory, mtime_ns)
+
+        with mock.patch.object(listing_module, "_scan_directory", side_effect=rendezvous_scan):
+            listings = cached_directory_listings(directories)
+
+        self.assertEqual(
+            [listing.children[0].parent for listing in listings],
+            directories,
+        )
+
+    def test_build_file_tree_lists_each_expanded_directory_once(self) -> None:
+        expanded = {self.root, self.root / "a", self.root / "a" / "deep", self.root / "b"}
+        with mock.patch.object(listing_module, "_scan_directory", wraps=listing_module._scan_directory) as scan:
+            tree = build_file_tree(self.root, expanded, show_hidden=False)
+
+        self.assertCountEqual([call.args[0] for call in scan.call_args_list], expanded)
+        self.assertEqual([child.name for child in tree.children], ["a", "b", "c"])
+        self.assertEqual([child.name for child in tree.children[0].children[0].children], ["deeper"])
+        self.assertEqual([child.name for child in tree.children[1].children], ["f.py"])
+
+    def test_prefetch_honours_depth_and_entry_budgets(self) -> None:
+        by_depth = prefetch_directory_listings(self.root, show_hidden=False, max_depth=1)
+        by_entries = prefetch_directory_listings(self.root, show_hidden=False, max_entries=2)
+
+        self.assertCountEqual(by_depth, [self.root, self.root / "a", self.root / "b", self.root / "c"])
+        self.assertEqual(list(by_entries), [self.root])
+
+
+if __name__ == "__main__":
+    unittest.main()
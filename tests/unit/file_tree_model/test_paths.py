@@ -0,0 +1,70 @@
+"""Tests for the canonical-path cache and its invalidation."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from lazyviewer.file_tree_model import (
+    canonical_path,
+    clear_canonical_path_cache,
+    invalidate_canonical_paths,
+)
+
+
+class CanonicalPathCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_canonical_path_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        for name in ("one", "two"):
+            (self.root / name).mkdir()
+            (self.root / name / "f.py").write_text(name, encoding="utf-8")
+        self.link = self.root / "current"
+        self.link.symlink_to(self.root / "one")
+
+    def tearDown(self) -> None:
+        clear_canonical_path_cache()
+        self._tmp.cleanup()
+
+    def _retarget(self) -> None:
+        self.link.unlink()
+        self.link.symlink_to(self.root / "two")
+
+    def test_resolution_is_cached_until_the_directory_is_invalidated(self) -> None:
+        self.assertEqual(canonical_path(self.link / "f.py"), self.root / "one" / "f.py")
+        self._retarget()
+
+        self.assertEqual(canonical_path(self.link / "f.py"), self.root / "one" / "f.py")
+        invalidate_canonical_paths([self.root])
+        self.assertEqual(canonical_path(self.link / "f.py"), self.root / "two" / "f.py")
+
+    def test_invalidation_keeps_unrelated_directories(self) -> None:
+        canonical_path(self.link)
+        other = self.root / "two" / "f.py"
+        canonical_path(other)
+        self._retarget()
+
+        invalidate_canonical_paths([self.root / "two"])
+
+        self.assertEqual(canonical_path(self.link), self.root / "one")
+        self.assertEqual(canonical_path(other), other)
+
+    def test_relative_paths_are_resolved_against_the_working_directory(self) -> None:
+        previous = os.getcwd()
+        try:
+            os.chdir(self.root / "one")
+            first = canonical_path(Path("f.py"))
+            os.chdir(self.root / "two")
+            second = canonical_path(Path("f.py"))
+        finally:
+            os.chdir(previous)
+
+        self.assertEqual(first, self.root / "one" / "f.py")
+        self.assertEqual(second, self.root / "two" / "f.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
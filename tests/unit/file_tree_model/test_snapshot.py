@@ -5,8 +5,16 @@ from __future__ import annotations
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from lazyviewer.file_tree_model import build_file_tree_snapshot, refresh_file_tree_snapshot
+from lazyviewer.file_tree_model import build_file_tree, build_file_tree_snapshot, refresh_file_tree_snapshot
+from lazyviewer.file_tree_model import fs as fs_module
+from lazyviewer import gitignore
+from lazyviewer.gitignore import clear_gitignore_cache, get_gitignore_matcher, wait_for_gitignore_refresh
+
+
+def _child(entry, name: str):
+    return next(child for child in entry.children if child.path.name == name)
 
 
 class FileTreeSnapshotTests(unittest.TestCase):
@@ -56,6 +64,86 @@ class FileTreeSnapshotTests(unittest.TestCase):
             self.assertTrue(git_changed)
             self.assertNotEqual(refreshed.git_signature, snapshot.git_signature)
 
+    def test_refresh_rescans_only_directories_whose_mtime_changed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            deep = root / "a" / "b" / "c"
+            deep.mkdir(parents=True)
+            (root / "other").mkdir()
+            (root / "other" / "keep.py").write_text("x\n", encoding="utf-8")
+            expanded = {root, root / "a", root / "a" / "b", deep, root / "other"}
+            snapshot = build_file_tree_snapshot(root, expanded, show_hidden=False)
+
+            (deep / "new.py").write_text("y = 1\n", encoding="utf-8")
+            with mock.patch.object(
+                fs_module,
+                "list_directory_children",
+                wraps=fs_module.list_directory_children,
+            ) as listing:
+                refreshed, tree_changed, _git_changed = refresh_file_tree_snapshot(snapshot, expanded=expanded)
+
+            self.assertTrue(tree_changed)
+            self.assertEqual([call.args[0] for call in listing.call_args_list], [deep])
+            self.assertIs(_child(refreshed.root_entry, "other"), _child(snapshot.root_entry, "other"))
+            self.assertEqual(refreshed.root_entry, build_file_tree(root, expanded, show_hidden=False))
+
+    def test_refresh_rescans_changed_dirs_reported_by_watcher(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            target = root / "a.py"
+            target.write_text("a = 1\n", encoding="utf-8")
+            snapshot = build_file_tree_snapshot(root, {root}, show_hidden=False)
+
+            # In-place writes leave the directory mtime alone.
+            target.write_text("a = 1\nb = 2\n", encoding="utf-8")
+            unhinted, _tree_changed, _git_changed = refresh_file_tree_snapshot(snapshot)
+            hinted, _tree_changed, _git_changed = refresh_file_tree_snapshot(snapshot, changed_dirs={root})
+
+            self.assertIs(unhinted.root_entry, snapshot.root_entry)
+            self.assertEqual(_child(hinted.root_entry, "a.py").file_size, len("a = 1\nb = 2\n"))
+
+    def test_refresh_applies_expansion_and_overlay_changes_without_rescanning_others(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "pkg").mkdir()
+            (root / "pkg" / "mod.py").write_text("m\n", encoding="utf-8")
+            (root / "top.py").write_text("t\n", encoding="utf-8")
+            snapshot = build_file_tree_snapshot(root, {root}, show_hidden=False)
+
+            with mock.patch.object(
+                fs_module,
+                "list_directory_children",
+                wraps=fs_module.list_directory_children,
+            ) as listing:
+                refreshed, _tree_changed, _git_changed = refresh_file_tree_snapshot(
+                    snapshot,
+                    expanded={root, root / "pkg"},
+                    git_status_overlay={root / "top.py": 1},
+                )
+
+            self.assertEqual([call.args[0] for call in listing.call_args_list], [root / "pkg"])
+            self.assertEqual(_child(refreshed.root_entry, "top.py").git_status_flags, 1)
+            self.assertEqual([child.path.name for child in _child(refreshed.root_entry, "pkg").children], ["mod.py"])
+
+    def test_gitignore_change_refilters_subtrees_outside_changed_dirs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(gitignore, "GITIGNORE_STALE_CHECK_SECONDS", 0.0):
+            self.addCleanup(clear_gitignore_cache)
+            root = Path(tmp).resolve()
+            (root / "a").mkdir()
+            (root / "b").mkdir()
+            (root / "a" / "x.log").write_text("log\n", encoding="utf-8")
+            (root / "a" / "x.py").write_text("x\n", encoding="utf-8")
+            expanded = {root, root / "a", root / "b"}
+            snapshot = build_file_tree_snapshot(root, expanded, show_hidden=False, skip_gitignored=True)
+
+            (root / ".gitignore").write_text("*.log\n", encoding="utf-8")
+            get_gitignore_matcher(root)
+            wait_for_gitignore_refresh(5.0)
+            refreshed, tree_changed, _git_changed = refresh_file_tree_snapshot(snapshot, changed_dirs={root / "b"})
+
+            self.assertTrue(tree_changed)
+            self.assertEqual([child.path.name for child in _child(refreshed.root_entry, "a").children], ["x.py"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,68 +2,129 @@
 
 from __future__ import annotations
 
+import os
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest import mock
 
-from lazyviewer.gitignore import clear_gitignore_cache, get_gitignore_matcher
+from lazyviewer import gitignore
+from lazyviewer.gitignore import clear_gitignore_cache, get_gitignore_matcher, wait_for_gitignore_refresh
+
+
+def _touch_later(path: Path, text: str) -> None:
+    previous = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(previous.st_atime_ns, previous.st_mtime_ns + 1_000_000))
 
 
 class GitignoreMatcherCacheTests(unittest.TestCase):
     def setUp(self) -> None:
         clear_gitignore_cache()
+        throttle = mock.patch.object(gitignore, "GITIGNORE_STALE_CHECK_SECONDS", 0.0)
+        throttle.start()
+        self.addCleanup(throttle.stop)
 
     def tearDown(self) -> None:
+        wait_for_gitignore_refresh()
         clear_gitignore_cache()
 
-    def test_get_gitignore_matcher_reuses_cached_result_within_ttl(self) -> None:
+    def test_get_gitignore_matcher_reuses_cached_result_while_sources_unchanged(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp).resolve()
-            sentinel = mock.sentinel.matcher
-            with mock.patch("lazyviewer.gitignore._load_matcher", return_value=sentinel) as load_matcher:
+            (root / ".gitignore").write_text("*.log\n", encoding="utf-8")
+            with mock.patch("lazyviewer.gitignore._load_matcher", wraps=gitignore._load_matcher) as load_matcher:
                 first = get_gitignore_matcher(root)
+                assert first is not None
+                self.assertTrue(first.is_ignored(root / "x.log"))
+                (root / "new.txt").write_text("x\n", encoding="utf-8")
                 second = get_gitignore_matcher(root)
+                wait_for_gitignore_refresh()
 
-            self.assertIs(first, sentinel)
-            self.assertIs(second, sentinel)
+            self.assertIs(first, second)
             self.assertEqual(load_matcher.call_count, 1)
 
-    def test_get_gitignore_matcher_reloads_after_root_mtime_change(self) -> None:
+    def test_stale_matcher_keeps_serving_while_refresh_runs_in_background(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp).resolve()
-            first_matcher = mock.sentinel.first
-            second_matcher = mock.sentinel.second
-            with mock.patch(
-                "lazyviewer.gitignore._load_matcher",
-                side_effect=[first_matcher, second_matcher],
-            ) as load_matcher:
-                first = get_gitignore_matcher(root)
-                (root / "new.txt").write_text("x\n", encoding="utf-8")
-                second = get_gitignore_matcher(root)
+            stale = mock.Mock(is_stale=mock.Mock(return_value=True))
+            fresh = mock.Mock(is_stale=mock.Mock(return_value=False))
+            release = threading.Event()
+
+            def load(_root: Path):
+                if load.calls:
+                    release.wait(5.0)
+                    return fresh
+                load.calls += 1
+                return stale
+
+            load.calls = 0
+            with mock.patch("lazyviewer.gitignore._load_matcher", side_effect=load) as load_matcher:
+                self.assertIs(get_gitignore_matcher(root), stale)
+                self.assertIs(get_gitignore_matcher(root), stale)
+                self.assertIs(get_gitignore_matcher(root), stale)
+                release.set()
+                wait_for_gitignore_refresh(5.0)
+                self.assertIs(get_gitignore_matcher(root), fresh)
 
-            self.assertIs(first, first_matcher)
-            self.assertIs(second, second_matcher)
             self.assertEqual(load_matcher.call_count, 2)
 
-    def test_get_gitignore_matcher_reloads_after_ttl_expiry(self) -> None:
+    def test_source_stats_are_throttled_between_lookups(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp).resolve()
-            first_matcher = mock.sentinel.first
-            second_matcher = mock.sentinel.second
-            with mock.patch(
-                "lazyviewer.gitignore._load_matcher",
-                side_effect=[first_matcher, second_matcher],
-            ) as load_matcher, mock.patch(
-                "lazyviewer.gitignore.time.monotonic",
-                side_effect=[100.0, 103.0],
+            gitignore_path = root / ".gitignore"
+            gitignore_path.write_text("*.a\n", encoding="utf-8")
+            first = get_gitignore_matcher(root)
+            assert first is not None
+            self.assertTrue(first.is_ignored(root / "x.a", False))
+
+            with (
+                mock.patch.object(gitignore, "GITIGNORE_STALE_CHECK_SECONDS", 60.0),
+                mock.patch.object(first, "is_stale", wraps=first.is_stale) as is_stale,
             ):
-                first = get_gitignore_matcher(root)
-                second = get_gitignore_matcher(root)
+                _touch_later(gitignore_path, "*.b\n")
+                for _ in range(5):
+                    self.assertIs(get_gitignore_matcher(root), first)
+            self.assertEqual(is_stale.call_count, 0)
 
-            self.assertIs(first, first_matcher)
-            self.assertIs(second, second_matcher)
-            self.assertEqual(load_matcher.call_count, 2)
+            self.assertIs(get_gitignore_matcher(root), first)
+            wait_for_gitignore_refresh(5.0)
+            self.assertIsNot(get_gitignore_matcher(root), first)
+
+    def test_gitignore_edit_invalidates_matcher(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "pkg").mkdir()
+            nested = root / "pkg" / ".gitignore"
+            nested.write_text("*.a\n", encoding="utf-8")
+
+            first = get_gitignore_matcher(root)
+            assert first is not None
+            self.assertTrue(first.is_ignored(root / "pkg" / "x.a"))
+            self.assertFalse(first.is_stale())
+
+            _touch_later(nested, "*.b\n")
+            self.assertTrue(first.is_stale())
+            self.assertIs(get_gitignore_matcher(root), first)
+            wait_for_gitignore_refresh(5.0)
+            refreshed = get_gitignore_matcher(root)
+
+            assert refreshed is not None
+            self.assertIsNot(refreshed, first)
+            self.assertFalse(refreshed.is_ignored(root / "pkg" / "x.a"))
+            self.assertTrue(refreshed.is_ignored(root / "pkg" / "x.b"))
+
+    def test_probed_missing_gitignore_creation_invalidates_matcher(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            matcher = get_gitignore_matcher(root)
+            assert matcher is not None
+            self.assertFalse(matcher.is_ignored(root / "x.tmp", False))
+
+            (root / ".gitignore").write_text("*.tmp\n", encoding="utf-8")
+
+            self.assertTrue(matcher.is_stale())
 
 
 if __name__ == "__main__":
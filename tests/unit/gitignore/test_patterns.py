@@ -0,0 +1,296 @@
+"""Tests for the in-process gitignore rule engine.
+
+Covers pattern translation (anchoring, negation, directory-only, ``**``),
+per-directory precedence, ``info/exclude``, tracked-file exemptions, behavior
+outside repositories, and parity with ``git`` on a mixed fixture.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from lazyviewer import gitignore as gitignore_module
+from lazyviewer.gitignore import (
+    _IgnoreRules,
+    _parse_index_paths,
+    clear_gitignore_cache,
+    get_gitignore_matcher,
+    wait_for_gitignore_refresh,
+)
+
+
+def clear_matchers_only() -> None:
+    with gitignore_module._GITIGNORE_MATCHER_CACHE_LOCK:
+        gitignore_module._GITIGNORE_MATCHER_CACHE.clear()
+
+
+def _rules(*lines: str) -> _IgnoreRules:
+    rules = _IgnoreRules.from_lines(list(lines))
+    assert rules is not None
+    return rules
+
+
+class IgnorePatternTests(unittest.TestCase):
+    def test_unanchored_patterns_match_basename_at_any_depth(self) -> None:
+        rules = _rules("*.log")
+
+        self.assertTrue(rules.match("debug.log", False))
+        self.assertTrue(rules.match("a/b/debug.log", False))
+        self.assertIsNone(rules.match("debug.log.txt", False))
+
+    def test_patterns_with_slash_are_anchored(self) -> None:
+        rules = _rules("/build", "docs/*.md")
+
+        self.assertTrue(rules.match("build", True))
+        self.assertIsNone(rules.match("src/build", True))
+        self.assertTrue(rules.match("docs/readme.md", False))
+        self.assertIsNone(rules.match("docs/api/readme.md", False))
+
+    def test_directory_only_patterns_skip_files(self) -> None:
+        rules = _rules("cache/")
+
+        self.assertTrue(rules.match("cache", True))
+        self.assertTrue(rules.match("pkg/cache", True))
+        self.assertIsNone(rules.match("cache", False))
+
+    def test_last_matching_pattern_wins_including_negation(self) -> None:
+        rules = _rules("*.txt", "!keep.txt", "keep.txt.bak")
+
+        self.assertTrue(rules.match("drop.txt", False))
+        self.assertFalse(rules.match("keep.txt", False))
+        self.assertIsNone(rules.match("other.py", False))
+
+    def test_double_star_forms(self) -> None:
+        rules = _rules("**/gen", "logs/**", "a/**/z")
+
+        self.assertTrue(rules.match("gen", True))
+        self.assertTrue(rules.match("x/y/gen", True))
+        self.assertTrue(rules.match("logs/2024/app.log", False))
+        self.assertIsNone(rules.match("logs", True))
+        self.assertTrue(rules.match("a/z", False))
+        self.assertTrue(rules.match("a/b/c/z", False))
+
+    def test_character_classes_escapes_and_comments(self) -> None:
+        rules = _rules("# comment", "file[0-9].txt", "\\#hash", "\\!bang", "trail\\ ", "[!a]x")
+
+        self.assertTrue(rules.match("file7.txt", False))
+        self.assertIsNone(rules.match("fileA.txt", False))
+        self.assertTrue(rules.match("#hash", False))
+        self.assertTrue(rules.match("!bang", False))
+        self.assertTrue(rules.match("trail ", False))
+        self.assertTrue(rules.match("bx", False))
+        self.assertIsNone(rules.match("ax", False))
+
+
+class IndexParsingTests(unittest.TestCase):
+    @unittest.skipIf(shutil.which("git") is None, "git is required")
+    def test_parses_index_paths_for_v2_and_v4(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+            (root / "src" / "pkg").mkdir(parents=True)
+            names = ["a.txt", "src/pkg/long_module_name.py", "src/pkg/long_module_other.py"]
+            for name in names:
+                (root / name).write_text("x\n", encoding="utf-8")
+            subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+
+            self.assertEqual(_parse_index_paths((root / ".git" / "index").read_bytes()), names)
+            subprocess.run(["git", "update-index", "--index-version", "4"], cwd=root, check=True)
+            self.assertEqual(_parse_index_paths((root / ".git" / "index").read_bytes()), names)
+
+
+class GitIgnoreMatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_gitignore_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        self._env = mock.patch.dict(os.environ, {"XDG_CONFIG_HOME": str(self.root / "_xdg")})
+        self._env.start()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        clear_gitignore_cache()
+        self._tmp.cleanup()
+
+    def _write(self, rel_path: str, text: str = "x\n") -> Path:
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_works_outside_git_repositories(self) -> None:
+        self._write(".gitignore", "*.tmp\nout/\n")
+        self._write("keep.py")
+        self._write("scratch.tmp")
+        self._write("out/result.txt")
+
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        self.assertFalse(matcher.is_ignored(self.root / "keep.py"))
+        self.assertTrue(matcher.is_ignored(self.root / "scratch.tmp"))
+        self.assertTrue(matcher.is_ignored(self.root / "out"))
+        self.assertTrue(matcher.is_ignored(self.root / "out" / "result.txt"))
+
+    def test_nested_gitignore_overrides_parent_and_reinclusion_stops_at_excluded_dir(self) -> None:
+        self._write(".gitignore", "*.gen\nvendor/\n")
+        self._write("pkg/.gitignore", "!keep.gen\n")
+        self._write("pkg/keep.gen")
+        self._write("pkg/drop.gen")
+        self._write("vendor/.gitignore", "!*\n")
+        self._write("vendor/lib.py")
+
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        self.assertFalse(matcher.is_ignored(self.root / "pkg" / "keep.gen"))
+        self.assertTrue(matcher.is_ignored(self.root / "pkg" / "drop.gen"))
+        self.assertTrue(matcher.is_ignored(self.root / "vendor" / "lib.py"))
+
+    @unittest.skipIf(shutil.which("git") is None, "git is required")
+    def test_info_exclude_and_tracked_files(self) -> None:
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+        self._write(".gitignore", "*.cfg\nbuild/\n")
+        self._write(".git/info/exclude", "local-notes.md\n")
+        self._write("local-notes.md")
+        self._write("forced.cfg")
+        self._write("other.cfg")
+        self._write("build/tracked.txt")
+        self._write("build/untracked.txt")
+        subprocess.run(["git", "add", "-f", "forced.cfg", "build/tracked.txt"], cwd=self.root, check=True)
+
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        self.assertTrue(matcher.is_ignored(self.root / "local-notes.md"))
+        self.assertFalse(matcher.is_ignored(self.root / "forced.cfg"))
+        self.assertTrue(matcher.is_ignored(self.root / "other.cfg"))
+        self.assertFalse(matcher.is_ignored(self.root / "build"))
+        self.assertFalse(matcher.is_ignored(self.root / "build" / "tracked.txt"))
+        self.assertTrue(matcher.is_ignored(self.root / "build" / "untracked.txt"))
+        self.assertFalse(matcher.is_ignored(self.root / ".git"))
+
+    def test_core_excludes_file_from_user_config(self) -> None:
+        excludes = self._write("_home/global-ignore", "*.swp\n")
+        self._write("_xdg/git/config", f'[core]\n\texcludesFile = "{excludes}"\n')
+        self._write("notes.swp")
+
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        self.assertTrue(matcher.is_ignored(self.root / "notes.swp"))
+
+    def test_compiled_rules_are_reused_until_gitignore_changes(self) -> None:
+        gitignore = self._write(".gitignore", "*.a\n")
+        self._write("x.a")
+        self._write("x.b")
+
+        with (
+            mock.patch("lazyviewer.gitignore._IgnoreRules.from_lines", wraps=_IgnoreRules.from_lines) as compile_rules,
+            mock.patch("lazyviewer.gitignore.GITIGNORE_STALE_CHECK_SECONDS", 0.0),
+        ):
+            first = get_gitignore_matcher(self.root)
+            assert first is not None
+            self.assertTrue(first.is_ignored(self.root / "x.a"))
+            clear_matchers_only()
+            second = get_gitignore_matcher(self.root)
+            assert second is not None
+            self.assertIsNot(first, second)
+            self.assertTrue(second.is_ignored(self.root / "x.a"))
+            self.assertEqual(compile_rules.call_count, 1)
+
+            previous = gitignore.stat()
+            gitignore.write_text("*.b\n", encoding="utf-8")
+            os.utime(gitignore, ns=(previous.st_atime_ns, previous.st_mtime_ns + 1_000_000))
+            get_gitignore_matcher(self.root)
+            wait_for_gitignore_refresh(5.0)
+            third = get_gitignore_matcher(self.root)
+            assert third is not None
+            self.assertFalse(third.is_ignored(self.root / "x.a"))
+            self.assertTrue(third.is_ignored(self.root / "x.b"))
+            self.assertEqual(compile_rules.call_count, 2)
+
+    @unittest.skipIf(shutil.which("git") is None, "git is required")
+    def test_matches_git_on_mixed_fixture(self) -> None:
+        subprocess.run(["git", "init", "-q"], cwd=self.root, check=True)
+        self._write(".gitignore", "*.o\n/dist\n**/tmp/\ndocs/**/*.html\n!docs/keep/*.html\nlogs/*\n!logs/.keep\n")
+        self._write("src/.gitignore", "generated_*\n!generated_ok.py\n")
+        for rel_path in [
+            "main.c",
+            "main.o",
+            "src/lib/util.o",
+            "dist/app.bin",
+            "src/dist/keep.txt",
+            "src/tmp/cache.bin",
+            "tmp/x.txt",
+            "docs/a/index.html",
+            "docs/keep/page.html",
+            "docs/readme.md",
+            "logs/app.log",
+            "logs/.keep",
+            "src/generated_api.py",
+            "src/generated_ok.py",
+            "src/pkg/generated_model.py",
+        ]:
+            self._write(rel_path)
+
+        proc = subprocess.run(
+            ["git", "ls-files", "-z", "--others", "-i", "--exclude-standard"],
+            cwd=self.root,
+            check=True,
+            stdout=subprocess.PIPE,
+        )
+        expected = {raw.decode() for raw in proc.stdout.split(b"\0") if raw}
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        actual: set[str] = set()
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if name not in {".git", "_xdg"}]
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                if matcher.is_ignored(path):
+                    actual.add(path.relative_to(self.root).as_posix())
+
+        self.assertEqual(actual, expected)
+
+    def test_filter_children_matches_per_path_checks(self) -> None:
+        self._write(".gitignore", "*.o\nbuild/\n!keep.o\n")
+        self._write("src/.gitignore", "gen_*\n")
+        for rel_path in ["src/a.py", "src/a.o", "src/keep.o", "src/gen_x.py", "src/build/out.txt", "build/x.txt"]:
+            self._write(rel_path)
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        for directory in [self.root, self.root / "src", self.root / "src" / "build"]:
+            names = sorted(os.listdir(directory))
+            dir_names = {name for name in names if (directory / name).is_dir()}
+            expected = [name for name in names if not matcher.is_ignored(directory / name)]
+            self.assertEqual(matcher.filter_children(directory, names, dir_names), expected)
+
+    def test_filter_children_does_not_resolve_each_child(self) -> None:
+        self._write(".gitignore", "*.tmp\n")
+        big = self.root / "big"
+        big.mkdir()
+        names = [f"file_{idx}.{'tmp' if idx % 2 else 'py'}" for idx in range(2_000)]
+        for name in names:
+            (big / name).touch()
+        matcher = get_gitignore_matcher(self.root)
+        assert matcher is not None
+
+        with mock.patch("os.path.realpath", wraps=os.path.realpath) as realpath:
+            kept = matcher.filter_children(big, names)
+
+        self.assertEqual(len(kept), 1_000)
+        self.assertTrue(all(name.endswith(".py") for name in kept))
+        self.assertLessEqual(realpath.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
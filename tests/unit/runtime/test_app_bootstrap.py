@@ -28,6 +28,7 @@ class AppStateBootstrapTests(unittest.TestCase):
                     image_path=None,
                     image_format=None,
                     is_git_diff_preview=False,
+                    diff_folds={},
                 )
 
             bootstrap = AppStateBootstrap(
@@ -95,6 +96,7 @@ class AppStateBootstrapTests(unittest.TestCase):
                     image_path=None,
                     image_format=None,
                     is_git_diff_preview=False,
+                    diff_folds={},
                 ),
                 git_features_default_enabled=True,
                 tree_size_labels_default_enabled=True,
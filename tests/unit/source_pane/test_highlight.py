@@ -9,7 +9,13 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
-from lazyviewer.source_pane.diff import _ADDED_BG_SGR, _apply_line_background
+from lazyviewer.render.ansi import slice_ansi_line
+from lazyviewer.source_pane.diff import (
+    _ADDED_BG_SGR,
+    _apply_line_background,
+    _ensure_diff_trailing_char_contrast,
+    _format_marked_line,
+)
 from lazyviewer.source_pane.highlighting import rendered_preview_row
 from lazyviewer.source_pane.syntax import colorize_source, sanitize_terminal_text
 
@@ -102,6 +108,28 @@ class HighlightSanitizationTests(unittest.TestCase):
         self.assertEqual(nonspace_foregrounds[-2], "33")
         self.assertEqual(nonspace_foregrounds[-1], "33")
 
+    def test_git_diff_rows_are_contrast_repaired_at_build_time_and_sliced_per_frame(self) -> None:
+        raw_edge = f"\033[{_ADDED_BG_SGR}mvalue"
+        self.assertNotEqual(_ensure_diff_trailing_char_contrast(raw_edge), raw_edge)
+
+        diff_line = _format_marked_line("+", "\033[90mvalue\033[39;49;00m = \033[38;5;240m1", True)
+        self.assertEqual(_ensure_diff_trailing_char_contrast(diff_line), diff_line)
+
+        rendered = rendered_preview_row(
+            [diff_line],
+            0,
+            width=8,
+            wrap_text=False,
+            text_x=2,
+            text_search_query="",
+            text_search_current_line=0,
+            text_search_current_column=0,
+            has_current_text_hit=False,
+            selection_range=None,
+            preview_is_git_diff=True,
+        )
+        self.assertEqual(rendered, slice_ansi_line(diff_line, 2, 8))
+
 
 if __name__ == "__main__":
     unittest.main()
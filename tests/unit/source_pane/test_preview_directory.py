@@ -1,7 +1,8 @@
 """Tests for preview generation across path types.
 
-Covers directory truncation/caching, text sanitization, binary/image handling,
-and git diff preview integration boundaries.
+Covers directory truncation/caching, background doc labels, text
+sanitization, binary/image handling, and git diff preview integration
+boundaries.
 """
 
 from __future__ import annotations
@@ -11,6 +12,7 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -18,7 +20,12 @@ from unittest import mock
 from lazyviewer import source_pane as preview
 from lazyviewer.gitignore import clear_gitignore_cache
 from lazyviewer.git_status import GIT_STATUS_CHANGED, GIT_STATUS_UNTRACKED
-import lazyviewer.tree_model.build as tree_model_build
+import lazyviewer.file_tree_model.listing as listing_module
+from lazyviewer.source_pane import directory as directory_module
+from lazyviewer.source_pane.directory import (
+    directory_preview_doc_label_generation,
+    wait_for_directory_preview_doc_summaries,
+)
 
 ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
 
@@ -26,6 +33,14 @@ ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
 def strip_ansi(text: str) -> str:
     return ANSI_RE.sub("", text)
 
+
+def build_labeled_directory_preview(root: Path, show_hidden: bool, **kwargs) -> tuple[str, bool]:
+    """Build a preview, let background doc labels land, and return the patched cache hit."""
+    preview.SourcePane.build_directory_preview(root, show_hidden, **kwargs)
+    assert wait_for_directory_preview_doc_summaries(timeout=5.0)
+    return preview.SourcePane.build_directory_preview(root, show_hidden, **kwargs)
+
+
 class PreviewBehaviorTestsPart1(unittest.TestCase):
     def setUp(self) -> None:
         preview.SourcePane._DIR_PREVIEW_CACHE.clear()
@@ -74,7 +89,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmp:
             root = Path(tmp)
             (root / "a.txt").write_text("a", encoding="utf-8")
-            original_scandir = tree_model_build.os.scandir
+            original_scandir = listing_module.os.scandir
             call_count = 0
 
             def counted_scandir(path):
@@ -82,7 +97,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
                 call_count += 1
                 return original_scandir(path)
 
-            with mock.patch("lazyviewer.tree_model.build.os.scandir", side_effect=counted_scandir):
+            with mock.patch("lazyviewer.file_tree_model.listing.os.scandir", side_effect=counted_scandir):
                 first = preview.SourcePane.build_directory_preview(
                     root,
                     show_hidden=False,
@@ -134,7 +149,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
             target = root / "module.py"
             target.write_text("# alpha summary\nvalue = 1\n", encoding="utf-8")
 
-            first_rendered, _ = preview.SourcePane.build_directory_preview(
+            first_rendered, _ = build_labeled_directory_preview(
                 root,
                 show_hidden=False,
                 max_depth=2,
@@ -147,7 +162,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
             target.write_text("# bravo summary\nvalue = 1\n", encoding="utf-8")
             os.utime(target, ns=(int(previous.st_atime_ns), int(previous.st_mtime_ns) + 1_000_000))
 
-            second_rendered, _ = preview.SourcePane.build_directory_preview(
+            second_rendered, _ = build_labeled_directory_preview(
                 root,
                 show_hidden=False,
                 max_depth=2,
@@ -235,7 +250,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
             comment_file.write_text("# Utility helpers for tests.\nvalue = 2\n", encoding="utf-8")
             plain_file.write_text("value = 3\n", encoding="utf-8")
 
-            rendered, truncated = preview.SourcePane.build_directory_preview(
+            rendered, truncated = build_labeled_directory_preview(
                 root,
                 show_hidden=False,
                 max_depth=2,
@@ -260,7 +275,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
             target = level_4 / "deep.py"
             target.write_text("# deep module\nvalue = 1\n", encoding="utf-8")
 
-            rendered, truncated = preview.SourcePane.build_directory_preview(
+            rendered, truncated = build_labeled_directory_preview(
                 root,
                 show_hidden=False,
             )
@@ -281,7 +296,7 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
                 "lazyviewer.source_pane.directory.cached_top_file_doc_summary",
                 return_value="summary",
             ) as summary_mock:
-                rendered, truncated = preview.SourcePane.build_directory_preview(
+                rendered, truncated = build_labeled_directory_preview(
                     root,
                     show_hidden=False,
                     max_depth=2,
@@ -297,7 +312,13 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
 
     def test_build_directory_preview_reuses_gitignore_matcher_cache_between_growth_renders(self) -> None:
         class _AllowAllMatcher:
-            def is_ignored(self, _path: Path) -> bool:
+            def is_ignored(self, _path: Path, _is_dir: bool | None = None) -> bool:
+                return False
+
+            def filter_children(self, _directory: Path, names, _dir_names=frozenset()) -> list[str]:
+                return list(names)
+
+            def is_stale(self) -> bool:
                 return False
 
         with tempfile.TemporaryDirectory() as tmp:
@@ -326,3 +347,86 @@ class PreviewBehaviorTestsPart1(unittest.TestCase):
 
             self.assertNotEqual(first, second)
             self.assertEqual(load_matcher.call_count, 1)
+
+
+class DirectoryPreviewDocLabelTests(unittest.TestCase):
+    def setUp(self) -> None:
+        preview.SourcePane.clear_directory_preview_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        (self.root / "alpha.py").write_text('"""Alpha summary."""\n', encoding="utf-8")
+        (self.root / "plain.py").write_text("value = 1\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        wait_for_directory_preview_doc_summaries(timeout=5.0)
+        preview.SourcePane.clear_directory_preview_cache()
+        self._tmp.cleanup()
+
+    def test_cold_preview_is_emitted_without_reading_files_then_patched_in_cache(self) -> None:
+        release = threading.Event()
+        real_parse = directory_module.cached_top_file_doc_summary
+
+        def gated_parse(path, size_bytes):
+            release.wait(5.0)
+            return real_parse(path, size_bytes)
+
+        generation = directory_preview_doc_label_generation(self.root)
+        with mock.patch.object(directory_module, "cached_top_file_doc_summary", side_effect=gated_parse):
+            first, _ = preview.SourcePane.build_directory_preview(self.root, show_hidden=False)
+            release.set()
+            self.assertTrue(wait_for_directory_preview_doc_summaries(timeout=5.0))
+
+        self.assertIn("├─ alpha.py", strip_ansi(first))
+        self.assertNotIn("Alpha summary.", strip_ansi(first))
+        self.assertGreater(directory_preview_doc_label_generation(self.root), generation)
+        with mock.patch.object(directory_module, "_cache_put") as cache_put:
+            second, _ = preview.SourcePane.build_directory_preview(self.root, show_hidden=False)
+        cache_put.assert_not_called()
+        self.assertIn("alpha.py  -- Alpha summary.", strip_ansi(second))
+        self.assertNotIn("plain.py  --", strip_ansi(second))
+
+    def test_warm_summary_cache_labels_rows_immediately(self) -> None:
+        build_labeled_directory_preview(self.root, show_hidden=False)
+        preview.SourcePane._DIR_PREVIEW_CACHE.clear()
+
+        with mock.patch.object(directory_module, "_schedule_doc_labels") as schedule:
+            rendered, _ = preview.SourcePane.build_directory_preview(self.root, show_hidden=False)
+
+        schedule.assert_not_called()
+        self.assertIn("alpha.py  -- Alpha summary.", strip_ansi(rendered))
+
+    def test_labels_for_dropped_preview_are_not_patched(self) -> None:
+        release = threading.Event()
+        real_parse = directory_module.cached_top_file_doc_summary
+
+        def gated_parse(path, size_bytes):
+            release.wait(5.0)
+            return real_parse(path, size_bytes)
+
+        generation = directory_preview_doc_label_generation(self.root)
+        with mock.patch.object(directory_module, "cached_top_file_doc_summary", side_effect=gated_parse):
+            preview.SourcePane.build_directory_preview(self.root, show_hidden=False)
+            preview.SourcePane._DIR_PREVIEW_CACHE.clear()
+            release.set()
+            self.assertTrue(wait_for_directory_preview_doc_summaries(timeout=5.0))
+
+        self.assertEqual(directory_preview_doc_label_generation(self.root), generation)
+        self.assertEqual(len(preview.SourcePane._DIR_PREVIEW_CACHE), 0)
+
+    def test_doc_label_generations_are_cleared_and_bounded(self) -> None:
+        build_labeled_directory_preview(self.root, show_hidden=False)
+        applied = directory_preview_doc_label_generation(self.root)
+        self.assertGreater(applied, 0)
+
+        preview.SourcePane.clear_directory_preview_cache()
+        self.assertEqual(directory_preview_doc_label_generation(self.root), 0)
+        build_labeled_directory_preview(self.root, show_hidden=False)
+        self.assertNotIn(directory_preview_doc_label_generation(self.root), {0, applied})
+
+        with mock.patch.object(directory_module, "DIR_PREVIEW_CACHE_MAX", 1):
+            other = self.root / "pkg"
+            other.mkdir()
+            (other / "beta.py").write_text('"""Beta summary."""\n', encoding="utf-8")
+            build_labeled_directory_preview(other, show_hidden=False)
+
+        self.assertEqual(list(directory_module._DOC_LABEL_GENERATIONS), [str(other)])
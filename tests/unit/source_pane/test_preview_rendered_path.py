@@ -17,7 +17,6 @@ from unittest import mock
 
 from lazyviewer import source_pane as preview
 from lazyviewer.git_status import GIT_STATUS_CHANGED, GIT_STATUS_UNTRACKED
-import lazyviewer.tree_model.build as tree_model_build
 
 ANSI_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
 
@@ -0,0 +1,111 @@
+"""Tests for lazy intra-line word diff in git-diff previews.
+
+Covers removed/added row pairing, token span computation, wrapped rows, and
+the emphasis layered on by ``rendered_preview_row``.
+"""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from lazyviewer.render.ansi import build_screen_lines
+from lazyviewer.source_pane.diff import _format_marked_line
+from lazyviewer.source_pane import worddiff
+from lazyviewer.source_pane.highlighting import rendered_preview_row
+from lazyviewer.source_pane.worddiff import (
+    WORD_DIFF_ADDED_BG_SGR,
+    WORD_DIFF_REMOVED_BG_SGR,
+    clear_word_diff_cache,
+    word_diff_row_spans,
+    word_diff_spans,
+)
+
+
+def _diff_lines(rows: list[tuple[str, str]]) -> list[str]:
+    return [_format_marked_line(marker, text, True) + "\n" for marker, text in rows]
+
+
+class WordDiffTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_word_diff_cache()
+
+    def test_word_diff_spans_mark_changed_tokens_only(self) -> None:
+        removed, added = word_diff_spans("value = compute(alpha)", "value = compute(beta)")
+
+        self.assertEqual(removed, ((16, 21),))
+        self.assertEqual(added, ((16, 20),))
+
+    def test_word_diff_spans_skip_unrelated_lines(self) -> None:
+        self.assertEqual(word_diff_spans("import os", "class Widget:"), ((), ()))
+
+    def test_rows_pair_positionally_within_hunk_block(self) -> None:
+        lines = _diff_lines(
+            [
+                (" ", "ctx = 0"),
+                ("-", "first = 1"),
+                ("-", "second = 2"),
+                ("+", "first = 10"),
+                ("+", "second = 20"),
+                ("+", "third = 30"),
+                (" ", "tail = 1"),
+            ]
+        )
+
+        self.assertIsNone(word_diff_row_spans(lines, 0, False))
+        self.assertEqual(word_diff_row_spans(lines, 2, False)[0], ((9, 10),))
+        self.assertEqual(word_diff_row_spans(lines, 4, False)[0], ((9, 11),))
+        self.assertIsNone(word_diff_row_spans(lines, 5, False))
+        self.assertIsNone(word_diff_row_spans(lines, 6, False))
+
+    def test_block_pairing_is_walked_once_per_preview(self) -> None:
+        lines = _diff_lines(
+            [("-", f"value_{idx} = {idx}") for idx in range(3)]
+            + [("+", f"value_{idx} = {idx + 10}") for idx in range(3)]
+        )
+
+        with mock.patch.object(worddiff, "_walk_run", wraps=worddiff._walk_run) as walk:
+            first = [word_diff_row_spans(lines, idx, False) for idx in range(6)]
+            walks_after_first_pass = walk.call_count
+            second = [word_diff_row_spans(lines, idx, False) for idx in range(6)]
+
+        self.assertEqual(walks_after_first_pass, 3)
+        self.assertEqual(walk.call_count, walks_after_first_pass)
+        self.assertEqual(first, second)
+        self.assertEqual(first[1][0], ((10, 11),))
+        self.assertEqual(first[4][0], ((10, 12),))
+
+        with mock.patch.object(worddiff, "_walk_run", wraps=worddiff._walk_run) as walk:
+            word_diff_row_spans(list(lines), 1, False)
+        self.assertGreater(walk.call_count, 0)
+
+    def test_wrapped_rows_get_spans_local_to_each_chunk(self) -> None:
+        rendered = "\n".join(
+            line.rstrip("\n")
+            for line in _diff_lines(
+                [
+                    ("-", "result = transform(data, 'alpha')"),
+                    ("+", "result = transform(data, 'omega')"),
+                ]
+            )
+        )
+        lines = build_screen_lines(rendered, 20, wrap=True)
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(word_diff_row_spans(lines, 2, True)[0], ())
+        self.assertEqual(word_diff_row_spans(lines, 3, True)[0], ((6, 11),))
+
+    def test_rendered_row_layers_word_background_and_restores_line_background(self) -> None:
+        lines = _diff_lines([("-", "flag = True"), ("+", "flag = False")])
+
+        removed_row = rendered_preview_row(lines, 0, 80, False, 0, "", 0, 0, False, None, preview_is_git_diff=True)
+        added_row = rendered_preview_row(lines, 1, 80, False, 0, "", 0, 0, False, None, preview_is_git_diff=True)
+        plain_row = rendered_preview_row(lines, 1, 80, False, 0, "", 0, 0, False, None)
+
+        self.assertIn(f"\033[{WORD_DIFF_REMOVED_BG_SGR}mTrue", removed_row)
+        self.assertIn(f"\033[{WORD_DIFF_ADDED_BG_SGR}mFalse", added_row)
+        self.assertNotIn(WORD_DIFF_ADDED_BG_SGR, plain_row)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Tests for virtualized tree rows over domain trees."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from lazyviewer.file_tree_model import build_file_tree, clear_directory_listing_cache
+from lazyviewer.file_tree_model import listing as listing_module
+from lazyviewer.tree_model import (
+    VirtualTreeRows,
+    VirtualTreeSection,
+    build_tree_entries,
+    next_directory_entry_index,
+    next_index_after_directory_subtree,
+    parent_directory_entry_index,
+    path_entry_index,
+)
+from lazyviewer.tree_model import virtual as virtual_module
+
+
+def _make_tree(root: Path) -> set[Path]:
+    for name in ("a/b", "a/c", "d"):
+        (root / name).mkdir(parents=True)
+    for name in ("a/b/one.py", "a/b/Two.py", "a/c/three.py", "a/x.py", "d/y.py", "top.py", "Zed.txt"):
+        (root / name).write_text(name, encoding="utf-8")
+    return {root, root / "a", root / "a" / "b", root / "a" / "c", root / "d"}
+
+
+def _virtual_rows(root: Path, expanded: set[Path], **kwargs) -> VirtualTreeRows:
+    domain_root = build_file_tree(root, expanded, show_hidden=False)
+    return VirtualTreeRows([VirtualTreeSection(domain_root, root)], **kwargs)
+
+
+class VirtualTreeRowsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_directory_listing_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        self.expanded = _make_tree(self.root)
+
+    def tearDown(self) -> None:
+        clear_directory_listing_cache()
+        self._tmp.cleanup()
+
+    def test_rows_match_flattened_list_and_round_trip_paths(self) -> None:
+        flat = build_tree_entries(self.root, self.expanded, show_hidden=False)
+        rows = _virtual_rows(self.root, self.expanded)
+
+        self.assertEqual(len(rows), len(flat))
+        self.assertEqual(list(rows), flat)
+        for idx, entry in enumerate(flat):
+            self.assertEqual(rows[idx], entry)
+            self.assertEqual(rows.path_at(idx), entry.path)
+            self.assertEqual(rows.index_of(entry.path), idx)
+        self.assertIsNone(rows.index_of(self.root / "missing.py"))
+        self.assertEqual(rows[-1], flat[-1])
+        self.assertEqual(rows[2:5], flat[2:5])
+
+    def test_navigation_helpers_agree_with_list_rows(self) -> None:
+        flat = build_tree_entries(self.root, self.expanded, show_hidden=False)
+        rows = _virtual_rows(self.root, self.expanded)
+
+        for idx in range(len(flat)):
+            for direction in (1, -1):
+                self.assertEqual(
+                    next_directory_entry_index(rows, idx, direction),
+                    next_directory_entry_index(flat, idx, direction),
+                )
+            self.assertEqual(parent_directory_entry_index(rows, idx), parent_directory_entry_index(flat, idx))
+            if flat[idx].is_dir:
+                self.assertEqual(
+                    next_index_after_directory_subtree(rows, idx),
+                    next_index_after_directory_subtree(flat, idx),
+                )
+            self.assertEqual(path_entry_index(rows, flat[idx].path), path_entry_index(flat, flat[idx].path))
+
+    def test_only_read_rows_are_materialized_within_window(self) -> None:
+        rows = _virtual_rows(self.root, self.expanded, window_rows=2)
+        with mock.patch.object(virtual_module, "TreeEntry", wraps=virtual_module.TreeEntry) as tree_entry:
+            rows[3]
+            rows[4]
+            rows[3]
+            rows[5]
+            rows.path_at(1)
+            rows.subtree_end(1)
+
+        self.assertEqual(tree_entry.call_count, 3)
+
+    def test_deferred_listing_stats_files_on_materialization(self) -> None:
+        with mock.patch.object(listing_module, "DIRECTORY_LISTING_LAZY_STAT_MIN_ENTRIES", 2):
+            rows = _virtual_rows(self.root, {self.root})
+        file_idx = rows.index_of(self.root / "top.py")
+        assert file_idx is not None
+
+        entry = rows[file_idx]
+
+        self.assertFalse(entry.is_dir)
+        self.assertEqual(entry.file_size, len("top.py"))
+        self.assertIsNotNone(entry.mtime_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
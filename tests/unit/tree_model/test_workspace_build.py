@@ -5,8 +5,10 @@ from __future__ import annotations
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from lazyviewer.tree_model import build_workspace_tree_entries
+from lazyviewer.file_tree_model import fs as fs_module
+from lazyviewer.tree_model import WorkspaceTreeRows, build_workspace_tree_entries
 
 
 class WorkspaceTreeBuildTests(unittest.TestCase):
@@ -30,5 +32,46 @@ class WorkspaceTreeBuildTests(unittest.TestCase):
             self.assertIn(nested / "demo.py", [entry.path.resolve() for entry in entries if not entry.is_dir])
 
 
+class WorkspaceTreeRowsTests(unittest.TestCase):
+    def test_refresh_patches_rows_in_place_with_one_directory_scan(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            deep = root / "a" / "b"
+            deep.mkdir(parents=True)
+            (deep / "one.py").write_text("1\n", encoding="utf-8")
+            (root / "z.py").write_text("z\n", encoding="utf-8")
+            expanded = {root, root / "a", deep}
+            tree_rows = WorkspaceTreeRows()
+            entries = tree_rows.build([root], root, expanded, None, show_hidden=False)
+            first_rows = list(entries)
+
+            (deep / "two.py").write_text("2\n", encoding="utf-8")
+            with mock.patch.object(
+                fs_module,
+                "list_directory_children",
+                wraps=fs_module.list_directory_children,
+            ) as listing:
+                patched = tree_rows.refresh([root], root, expanded, None, show_hidden=False, changed_dirs={deep})
+
+            self.assertTrue(patched)
+            self.assertIs(tree_rows.entries, entries)
+            self.assertEqual([call.args[0] for call in listing.call_args_list], [deep])
+            self.assertEqual(list(entries), build_workspace_tree_entries([root], root, expanded, None, show_hidden=False))
+            self.assertEqual(entries[-1], first_rows[-1])
+            self.assertIn(deep / "two.py", [entry.path for entry in entries])
+
+    def test_refresh_follows_collapse_and_requires_build_for_new_settings(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "pkg").mkdir()
+            (root / "pkg" / "mod.py").write_text("m\n", encoding="utf-8")
+            tree_rows = WorkspaceTreeRows()
+            tree_rows.build([root], root, {root, root / "pkg"}, None, show_hidden=False)
+
+            self.assertTrue(tree_rows.refresh([root], root, {root}, None, show_hidden=False))
+            self.assertEqual([entry.path for entry in tree_rows.entries], [root, root / "pkg"])
+            self.assertFalse(tree_rows.refresh([root], root, {root}, None, show_hidden=True))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -8,7 +8,7 @@ from pathlib import Path
 
 from lazyviewer.runtime.state import AppState
 from lazyviewer.tree_model import TreeEntry
-from lazyviewer.tree_pane.sync import PreviewSelection
+from lazyviewer.tree_pane.sync import PreviewSelection, TreeRefreshSync
 
 
 def _make_state(root: Path, entries: list[TreeEntry], selected_idx: int) -> AppState:
@@ -120,5 +120,24 @@ class PreviewSelectionTests(unittest.TestCase):
         self.assertEqual(state.current_path.resolve(), target_file.resolve())
 
 
+class TreeRefreshSyncTests(unittest.TestCase):
+    def test_overlay_refreshes_before_the_single_preview_render(self) -> None:
+        root = Path("/tmp/lazyviewer-sync-root")
+        state = _make_state(root, [TreeEntry(path=root, depth=0, is_dir=True)], selected_idx=0)
+        calls: list[tuple[str, dict]] = []
+        sync = TreeRefreshSync(
+            state=state,
+            rebuild_tree_entries=lambda **kwargs: calls.append(("rebuild", kwargs)),
+            refresh_rendered_for_current_path=lambda **kwargs: calls.append(("render", kwargs)),
+            schedule_tree_filter_index_warmup=lambda: None,
+            refresh_git_status_overlay=lambda **kwargs: calls.append(("overlay", kwargs)),
+        )
+
+        sync.sync_selected_target_after_tree_refresh(root, changed_dirs=frozenset({root}))
+
+        self.assertEqual([name for name, _kwargs in calls], ["rebuild", "overlay", "render"])
+        self.assertEqual(calls[1][1], {"force": False, "rerender": False})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,165 @@
+"""Tests for background recursive expansion of tree directories."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from lazyviewer.file_tree_model import clear_directory_listing_cache
+from lazyviewer.tree_pane import expand as expand_module
+from lazyviewer.tree_pane.expand import SubtreeExpandController, walk_subtree_levels
+
+
+def _make_tree(root: Path) -> None:
+    for name in ("a/b/c", "a/d", "e", ".hidden/inner"):
+        (root / name).mkdir(parents=True)
+    for name in ("a/one.py", "a/b/two.py", "a/b/c/three.py", "a/d/four.py", "e/five.py", "top.py"):
+        (root / name).write_text(name, encoding="utf-8")
+
+
+def _poll_until_idle(controller: SubtreeExpandController, timeout: float = 5.0) -> int:
+    polls = 0
+    deadline = time.monotonic() + timeout
+    while controller.active and time.monotonic() < deadline:
+        if controller.poll():
+            polls += 1
+        time.sleep(0.005)
+    return polls
+
+
+class WalkSubtreeLevelsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_directory_listing_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        _make_tree(self.root)
+
+    def tearDown(self) -> None:
+        clear_directory_listing_cache()
+        self._tmp.cleanup()
+
+    def test_yields_visible_directories_level_by_level(self) -> None:
+        batches = list(walk_subtree_levels(self.root, show_hidden=False, batch_directories=1))
+
+        self.assertEqual(
+            [batch.directories for batch in batches],
+            [
+                (self.root,),
+                (self.root / "a",),
+                (self.root / "e",),
+                (self.root / "a" / "b",),
+                (self.root / "a" / "d",),
+                (self.root / "a" / "b" / "c",),
+            ],
+        )
+        self.assertEqual([batch.done for batch in batches], [False] * 5 + [True])
+        self.assertEqual(batches[-1].entries, 11)
+        self.assertFalse(batches[-1].truncated)
+
+    def test_budget_leaves_directories_that_do_not_fit_collapsed(self) -> None:
+        batches = list(walk_subtree_levels(self.root, show_hidden=False, max_entries=6))
+
+        expanded = [path for batch in batches for path in batch.directories]
+        self.assertEqual(expanded, [self.root, self.root / "a"])
+        self.assertTrue(batches[-1].truncated)
+        self.assertTrue(batches[-1].done)
+        self.assertEqual(batches[-1].entries, 6)
+
+    def test_root_is_expanded_even_when_it_exceeds_the_budget(self) -> None:
+        batches = list(walk_subtree_levels(self.root, show_hidden=True, max_entries=1))
+
+        self.assertEqual([path for batch in batches for path in batch.directories], [self.root])
+        self.assertTrue(batches[-1].truncated)
+
+
+class SubtreeExpandControllerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        clear_directory_listing_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        _make_tree(self.root)
+        self.state = SimpleNamespace(
+            tree_root=self.root,
+            tree_roots=[self.root],
+            expanded={self.root, self.root / "a"},
+            workspace_expanded=[{self.root, self.root / "a"}],
+            show_hidden=False,
+            subtree_expand_max_entries=2_000,
+            tree_filter_active=False,
+            dirty=False,
+        )
+        self.rebuilds: list[dict[str, object]] = []
+        self.messages: list[str] = []
+        self.controller = SubtreeExpandController(
+            self.state,
+            lambda **kwargs: self.rebuilds.append(kwargs),
+            lambda: None,
+            self.messages.append,
+            lambda show_hidden: False,
+        )
+
+    def tearDown(self) -> None:
+        self.controller.cancel()
+        clear_directory_listing_cache()
+        self._tmp.cleanup()
+
+    def test_streams_expanded_directories_into_workspace_section(self) -> None:
+        self.controller.start(self.root / "a", workspace_section=0, workspace_root=self.root)
+        _poll_until_idle(self.controller)
+
+        expected = {
+            self.root,
+            self.root / "a",
+            self.root / "a" / "b",
+            self.root / "a" / "b" / "c",
+            self.root / "a" / "d",
+        }
+        self.assertEqual(self.state.workspace_expanded, [expected])
+        self.assertEqual(self.state.expanded, expected)
+        self.assertTrue(self.rebuilds)
+        self.assertTrue(all(kwargs == {"changed_dirs": frozenset()} for kwargs in self.rebuilds))
+        self.assertEqual(self.messages[-1], "expanded 7 entries")
+        self.assertFalse(self.controller.active)
+
+    def test_cancel_stops_the_walk_and_keeps_applied_rows(self) -> None:
+        release = threading.Event()
+        real_listings = expand_module.cached_directory_listings
+
+        def gated_listings(directories):
+            if self.root / "a" not in directories:
+                release.wait(5.0)
+            return real_listings(directories)
+
+        with mock.patch.object(expand_module, "cached_directory_listings", side_effect=gated_listings):
+            with mock.patch.object(expand_module, "SUBTREE_EXPAND_BATCH_DIRECTORIES", 1):
+                self.controller.start(self.root / "a", workspace_section=0, workspace_root=self.root)
+                deadline = time.monotonic() + 5.0
+                while not self.controller.poll() and time.monotonic() < deadline:
+                    time.sleep(0.005)
+
+                self.assertTrue(self.controller.cancel())
+                release.set()
+
+        self.assertFalse(self.controller.active)
+        self.assertFalse(self.controller.poll())
+        self.assertFalse(self.controller.cancel())
+        self.assertEqual(self.state.expanded, {self.root, self.root / "a"})
+        self.assertEqual(self.messages[-1], "expand stopped: 3 entries")
+
+    def test_collapsing_the_directory_drops_the_job(self) -> None:
+        self.controller.start(self.root / "a", workspace_section=0, workspace_root=self.root)
+        self.state.workspace_expanded = [{self.root}]
+        self.state.expanded = {self.root}
+        _poll_until_idle(self.controller)
+
+        self.assertEqual(self.state.expanded, {self.root})
+        self.assertEqual(self.rebuilds, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,12 +6,19 @@ Also validates git root/git-dir discovery from nested paths.
 
 from __future__ import annotations
 
+import errno
 import shutil
 import subprocess
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
+from lazyviewer.file_tree_model.inotify import inotify_available
+from lazyviewer.file_tree_model.watch import GitControlWatcher, TreeDirectoryWatcher
+from lazyviewer.tree_pane import watch as tree_watch_module
+from lazyviewer.tree_pane.watch import WatchRefreshContext
 from lazyviewer.watch import build_git_watch_signature, build_tree_watch_signature, resolve_git_paths
 
 
@@ -80,5 +87,410 @@ class WatchSignatureTests(unittest.TestCase):
             self.assertTrue(git_dir.exists())
 
 
+@unittest.skipUnless(inotify_available(), "inotify is required")
+class GitControlWatcherTests(unittest.TestCase):
+    def _make_git_dir(self, root: Path) -> Path:
+        git_dir = root / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+        (git_dir / "refs" / "heads" / "main").write_text("a\n", encoding="utf-8")
+        (git_dir / "index").write_bytes(b"index-v1")
+        return git_dir
+
+    def test_reports_changes_only_for_git_control_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            git_dir = self._make_git_dir(Path(tmp).resolve())
+            watcher = GitControlWatcher.create(git_dir)
+            assert watcher is not None
+            try:
+                self.assertFalse(watcher.poll_changed())
+                (git_dir / "COMMIT_EDITMSG").write_text("msg\n", encoding="utf-8")
+                self.assertFalse(watcher.poll_changed())
+
+                # Git updates the index by renaming a lock file into place.
+                (git_dir / "index.lock").write_bytes(b"index-v2")
+                (git_dir / "index.lock").replace(git_dir / "index")
+                self.assertTrue(watcher.poll_changed())
+                self.assertFalse(watcher.poll_changed())
+
+                (git_dir / "refs" / "heads" / "main").write_text("b\n", encoding="utf-8")
+                self.assertTrue(watcher.poll_changed())
+            finally:
+                watcher.close()
+
+    def test_follows_branch_switch_to_new_ref_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            git_dir = self._make_git_dir(Path(tmp).resolve())
+            (git_dir / "refs" / "heads" / "feature").mkdir()
+            (git_dir / "refs" / "heads" / "feature" / "x").write_text("a\n", encoding="utf-8")
+            watcher = GitControlWatcher.create(git_dir)
+            assert watcher is not None
+            try:
+                (git_dir / "HEAD").write_text("ref: refs/heads/feature/x\n", encoding="utf-8")
+                self.assertTrue(watcher.poll_changed())
+
+                (git_dir / "refs" / "heads" / "feature" / "x").write_text("b\n", encoding="utf-8")
+                self.assertTrue(watcher.poll_changed())
+                self.assertFalse(watcher.broken)
+            finally:
+                watcher.close()
+
+    def test_create_returns_none_without_git_dir(self) -> None:
+        self.assertIsNone(GitControlWatcher.create(None))
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(GitControlWatcher.create(Path(tmp) / "missing"))
+
+
+class _FakeGitWatcher:
+    def __init__(self) -> None:
+        self.broken = False
+        self.pending = False
+        self.closed = False
+
+    def fileno(self) -> int:
+        return 99
+
+    def poll_changed(self) -> bool:
+        pending, self.pending = self.pending, False
+        return self.broken or pending
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class WatchRefreshContextGitWatcherTests(unittest.TestCase):
+    def _refresh(self, context: WatchRefreshContext, state: SimpleNamespace, signatures: list[str]) -> None:
+        context.maybe_refresh_git(
+            state,
+            lambda **_kwargs: signatures.append("overlay"),
+            lambda **_kwargs: None,
+            build_git_watch_signature=lambda _git_dir: signatures.append("sig") or str(len(signatures)),
+            monotonic=lambda: 1000.0,
+            git_watch_poll_seconds=0.5,
+        )
+
+    def test_event_watcher_skips_signature_polling_until_activity(self) -> None:
+        watcher = _FakeGitWatcher()
+        context = WatchRefreshContext(git_signature="initial", git_watcher=watcher)
+        state = SimpleNamespace(git_features_enabled=True, rendered="", start=0, max_start=0, dirty=False)
+        calls: list[str] = []
+
+        self._refresh(context, state, calls)
+        self.assertEqual(calls, [])
+        self.assertEqual(context.wake_fds(state), (99,))
+
+        watcher.pending = True
+        self._refresh(context, state, calls)
+        self.assertEqual(calls, ["sig", "overlay"])
+
+    def test_broken_watcher_falls_back_to_polling(self) -> None:
+        watcher = _FakeGitWatcher()
+        watcher.broken = True
+        context = WatchRefreshContext(git_signature="initial", git_watcher=watcher)
+        state = SimpleNamespace(git_features_enabled=True, rendered="", start=0, max_start=0, dirty=False)
+
+        self._refresh(context, state, [])
+
+        self.assertTrue(watcher.closed)
+        self.assertIsNone(context.git_watcher)
+        self.assertEqual(context.wake_fds(state), ())
+
+
+@unittest.skipUnless(inotify_available(), "inotify is required")
+class TreeDirectoryWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name).resolve()
+        self.sub = self.root / "sub"
+        self.sub.mkdir()
+        watcher = TreeDirectoryWatcher.create()
+        assert watcher is not None
+        self.watcher = watcher
+
+    def tearDown(self) -> None:
+        self.watcher.close()
+        self._tmp.cleanup()
+
+    def test_reports_exactly_the_directories_that_changed(self) -> None:
+        self.assertTrue(self.watcher.sync({self.root, self.sub}, show_hidden=False))
+        self.assertEqual(self.watcher.poll_changed(), set())
+
+        (self.sub / "new.txt").write_text("x\n", encoding="utf-8")
+        self.assertEqual(self.watcher.poll_changed(), {self.sub})
+
+        (self.root / ".hidden").write_text("x\n", encoding="utf-8")
+        self.assertEqual(self.watcher.poll_changed(), set())
+
+    def test_sync_drops_collapsed_directories(self) -> None:
+        self.watcher.sync({self.root, self.sub}, show_hidden=False)
+        self.watcher.sync({self.root}, show_hidden=False)
+
+        (self.sub / "new.txt").write_text("x\n", encoding="utf-8")
+
+        self.assertEqual(self.watcher.poll_changed(), set())
+        self.assertEqual(self.watcher.watched_directories, frozenset({self.root}))
+
+    def test_watch_limit_breaks_watcher(self) -> None:
+        with mock.patch.object(self.watcher._inotify, "add_watch", return_value=None):
+            self.watcher._inotify.last_error = errno.ENOSPC
+            self.assertFalse(self.watcher.sync({self.root}, show_hidden=False))
+        self.assertTrue(self.watcher.broken)
+
+
+class _FakeTreeWatcher:
+    def __init__(self) -> None:
+        self.broken = False
+        self.pending: set[Path] = set()
+        self.synced: list[set[Path]] = []
+        self.closed = False
+
+    def fileno(self) -> int:
+        return 77
+
+    def sync(self, directories: set[Path], show_hidden: bool) -> bool:
+        self.synced.append(directories)
+        return not self.broken
+
+    def missing_directories(self) -> bool:
+        return False
+
+    def poll_changed(self) -> set[Path]:
+        pending, self.pending = self.pending, set()
+        return pending
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class WatchRefreshContextTreeWatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = Path("/work/project")
+        self.state = SimpleNamespace(
+            tree_root=self.root,
+            tree_roots=[self.root],
+            expanded={self.root, self.root / "src", Path("/elsewhere")},
+            dir_preview_path=None,
+            show_hidden=False,
+            tree_entries=[],
+            selected_idx=0,
+            current_path=self.root,
+            git_features_enabled=False,
+        )
+        self.refreshes: list[frozenset[Path] | None] = []
+        self.signature_calls = 0
+
+    def _refresh(self, context: WatchRefreshContext) -> None:
+        def build_signature(*_args, **_kwargs) -> str:
+            self.signature_calls += 1
+            return f"sig{self.signature_calls}"
+
+        context.maybe_refresh_tree(
+            self.state,
+            lambda **_kwargs: self.refreshes.append(context.tree_changed_dirs),
+            build_tree_watch_signature=build_signature,
+            stat_tree_hot_paths=lambda paths: dict.fromkeys(paths, (1, 1)),
+            monotonic=lambda: 1000.0,
+            tree_watch_poll_seconds=0.5,
+            tree_watch_full_signature_seconds=30.0,
+        )
+
+    def _poll(
+        self,
+        context: WatchRefreshContext,
+        now: float,
+        *,
+        structure: str = "dirs",
+        full: str = "full",
+        hot_stats: dict[Path, tuple[int | None, int | None]] | None = None,
+    ) -> list[bool]:
+        """Run one polled refresh and return, per built signature, whether it was the full one."""
+        built: list[bool] = []
+
+        def build_signature(_root, _expanded, _show_hidden, directories_only: bool = False) -> str:
+            built.append(not directories_only)
+            return structure if directories_only else full
+
+        context.maybe_refresh_tree(
+            self.state,
+            lambda **_kwargs: self.refreshes.append(context.tree_changed_dirs),
+            build_tree_watch_signature=build_signature,
+            stat_tree_hot_paths=lambda paths: {path: (hot_stats or {}).get(path, (1, 1)) for path in paths},
+            monotonic=lambda: now,
+            tree_watch_poll_seconds=0.5,
+            tree_watch_full_signature_seconds=30.0,
+        )
+        return built
+
+    def test_event_watcher_refreshes_with_changed_dirs_and_never_polls(self) -> None:
+        watcher = _FakeTreeWatcher()
+        context = WatchRefreshContext(tree_watcher=watcher)
+
+        self._refresh(context)
+        self.assertEqual(watcher.synced, [{self.root, self.root / "src"}])
+        self.assertEqual(context.wake_fds(self.state), (77,))
+
+        watcher.pending = {self.root / "src"}
+        self._refresh(context)
+        self._refresh(context)
+
+        self.assertEqual(self.refreshes, [frozenset({self.root / "src"})])
+        self.assertEqual(len(watcher.synced), 1)
+        self.assertEqual(self.signature_calls, 0)
+
+    def test_event_bursts_coalesce_into_one_refresh_per_poll_interval(self) -> None:
+        watcher = _FakeTreeWatcher()
+        context = WatchRefreshContext(tree_watcher=watcher)
+
+        def refresh(now: float, pending: set[Path] | None = None) -> None:
+            watcher.pending = pending or set()
+            context.maybe_refresh_tree(
+                self.state,
+                lambda **_kwargs: self.refreshes.append(context.tree_changed_dirs),
+                build_tree_watch_signature=lambda *_args, **_kwargs: "sig",
+                stat_tree_hot_paths=lambda paths: dict.fromkeys(paths, (1, 1)),
+                monotonic=lambda: now,
+                tree_watch_poll_seconds=0.5,
+                tree_watch_full_signature_seconds=30.0,
+                tree_watch_quiet_seconds=0.1,
+            )
+
+        refresh(1.0, {self.root / "src"})
+        refresh(1.05, {self.root})
+        refresh(1.1)
+        self.assertEqual(self.refreshes, [])
+        refresh(1.2)
+        self.assertEqual(self.refreshes, [frozenset({self.root, self.root / "src"})])
+
+        refresh(1.3, {self.root / "src"})
+        refresh(1.5)
+        self.assertEqual(len(self.refreshes), 1)
+        refresh(1.7)
+        self.assertEqual(self.refreshes[1:], [frozenset({self.root / "src"})])
+
+    def test_replaced_gitignore_matcher_rebuilds_whole_tree(self) -> None:
+        watcher = _FakeTreeWatcher()
+        context = WatchRefreshContext(tree_watcher=watcher)
+        matchers = {self.root: object()}
+
+        def refresh(now: float) -> None:
+            context.maybe_refresh_tree(
+                self.state,
+                lambda **_kwargs: self.refreshes.append(context.tree_changed_dirs),
+                build_tree_watch_signature=lambda *_args, **_kwargs: "sig",
+                stat_tree_hot_paths=lambda paths: dict.fromkeys(paths, (1, 1)),
+                monotonic=lambda: now,
+                tree_watch_poll_seconds=0.5,
+                tree_watch_full_signature_seconds=30.0,
+                gitignore_matchers=lambda _state: dict(matchers),
+            )
+
+        refresh(1.0)
+        matchers[self.root] = object()
+        refresh(1.2)
+        self.assertEqual(self.refreshes, [])
+
+        refresh(2.0)
+        refresh(3.0)
+        self.assertEqual(self.refreshes, [None])
+
+    def test_reported_directories_invalidate_canonical_paths(self) -> None:
+        watcher = _FakeTreeWatcher()
+        context = WatchRefreshContext(tree_watcher=watcher)
+        self._refresh(context)
+
+        watcher.pending = {self.root / "src"}
+        with mock.patch.object(tree_watch_module, "invalidate_canonical_paths") as invalidate, mock.patch.object(
+            tree_watch_module, "clear_canonical_path_cache"
+        ) as clear:
+            self._refresh(context)
+
+        invalidate.assert_called_once_with(frozenset({self.root / "src"}))
+        clear.assert_not_called()
+
+    def test_polled_signature_covers_recently_previewed_files(self) -> None:
+        context = WatchRefreshContext()
+        hot_paths: list[tuple[Path, ...]] = []
+
+        def stat_hot(hot) -> dict[Path, tuple[int | None, int | None]]:
+            hot_paths.append(hot)
+            return dict.fromkeys(hot, (1, 1))
+
+        previews = [self.root / f"f{idx}.py" for idx in range(tree_watch_module.TREE_WATCH_HOT_PATHS_MAX + 1)]
+        for now, preview in enumerate([*previews, previews[1]]):
+            self.state.current_path = preview
+            context.maybe_refresh_tree(
+                self.state,
+                lambda **_kwargs: None,
+                build_tree_watch_signature=lambda *_args, **_kwargs: "sig",
+                stat_tree_hot_paths=stat_hot,
+                monotonic=lambda now=now: float(now),
+                tree_watch_poll_seconds=0.5,
+                tree_watch_full_signature_seconds=30.0,
+            )
+        self.state.dir_preview_path = self.root
+        self.state.current_path = self.root
+        self.assertEqual(context.hot_tree_paths(self.state), (*previews[2:], previews[1]))
+
+        self.assertEqual(hot_paths[0], (previews[0],))
+        self.assertEqual(len(hot_paths[-1]), tree_watch_module.TREE_WATCH_HOT_PATHS_MAX)
+
+    def test_previewing_a_new_file_is_not_a_tree_change(self) -> None:
+        context = WatchRefreshContext()
+        self.state.current_path = self.root / "a.py"
+        self._poll(context, 1.0, hot_stats={self.root / "a.py": (10, 100)})
+
+        self.state.current_path = self.root / "b.py"
+        self._poll(context, 2.0, hot_stats={self.root / "a.py": (10, 100), self.root / "b.py": (20, 200)})
+
+        self.assertEqual(self.refreshes, [])
+        self.assertEqual(set(context.tree_hot_stats), {self.root / "a.py", self.root / "b.py"})
+
+    def test_write_to_a_file_hot_on_the_previous_poll_refreshes(self) -> None:
+        context = WatchRefreshContext()
+        self.state.current_path = self.root / "a.py"
+        self._poll(context, 1.0, hot_stats={self.root / "a.py": (10, 100)})
+        self._poll(context, 2.0, hot_stats={self.root / "a.py": (12, 101)})
+
+        self.assertEqual(self.refreshes, [None])
+
+    def test_periodic_full_signature_catches_cold_file_writes(self) -> None:
+        context = WatchRefreshContext()
+        self.assertEqual(self._poll(context, 1.0), [False])
+        self.assertEqual(self._poll(context, 31.0), [False, True])
+        self.assertEqual(self._poll(context, 32.0, full="cold-edit"), [False])
+        self.assertEqual(self.refreshes, [])
+
+        self.assertEqual(self._poll(context, 62.0, full="cold-edit"), [False, True])
+
+        self.assertEqual(self.refreshes, [None])
+
+    def test_baseline_records_full_signature(self) -> None:
+        context = WatchRefreshContext()
+        context.baseline_tree_signatures(
+            self.state,
+            build_tree_watch_signature=lambda *_args, directories_only=False: "dirs" if directories_only else "full",
+            stat_tree_hot_paths=lambda paths: dict.fromkeys(paths, (1, 1)),
+            now=5.0,
+        )
+
+        self.assertEqual((context.tree_signature, context.tree_full_signature), ("dirs", "full"))
+        self.assertEqual(context.tree_full_last_poll, 5.0)
+        self.assertEqual(self._poll(context, 36.0, full="cold-edit"), [False, True])
+        self.assertEqual(self.refreshes, [None])
+
+    def test_broken_watcher_refreshes_once_then_polls(self) -> None:
+        watcher = _FakeTreeWatcher()
+        watcher.broken = True
+        context = WatchRefreshContext(tree_watcher=watcher)
+
+        self._refresh(context)
+
+        self.assertTrue(watcher.closed)
+        self.assertIsNone(context.tree_watcher)
+        self.assertEqual(self.refreshes, [None])
+        # Directories-only baseline plus the first due full signature.
+        self.assertEqual(self.signature_calls, 2)
+
+
 if __name__ == "__main__":
     unittest.main()